@@ -1,6 +1,17 @@
 
 import asyncio
 import re
+import time
+from collections import deque
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+from logging import (
+    getLogger,
+    Logger
+)
 from typing import Any, Callable, Coroutine
 
 from bs4 import BeautifulSoup, ResultSet, Tag
@@ -10,9 +21,11 @@ from playwright.async_api import (
     async_playwright,
     BrowserContext,
     Page,
+    Playwright,
     TimeoutError as PlaywrightTimeoutError,
 )
 from backend.agent.prompts import (
+    COMPUTER_USE_DOM_INSTRUCTIONS,
     COMPUTER_USE_SYSTEM_PROMPT,
     USER_PROMPT,
 )
@@ -20,32 +33,97 @@ from backend.backend_utils.browser import (
     AsyncBrowserContextMaganer,
     init_chrome_page,
 )
-from backend.backend_utils.common import SafeAsyncList
+from backend.backend_utils.cache import (
+    CachedQuote,
+    quote_cache,
+    QuoteCache,
+    QuoteKey
+)
+from backend.backend_utils.common import (
+    KeyedSemaphore,
+    LearnedProviderStatus,
+    ObservationMode,
+    SafeAsyncList,
+    SingleFlight
+)
 from backend.backend_utils.computer_use import (
+    click_element,
     ComputerUseSession,
-    generate_content_config,
+    links_match,
     run_computer_use_loop,
+    runtime,
     save_product,
+    SelectorLearner,
+    take_dom_snapshot,
+    type_into_element,
+)
+from backend.backend_utils.computer_use.promotion import (
+    get_candidate_definition,
+    record_candidate,
+    record_validation,
 )
 from backend.backend_utils.exceptions import LoginFailedException
+from backend.backend_utils.governor import provider_governor
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.progress import current_progress, JobProgress
+from backend.backend_utils.quotes import (
+    dump_entries,
+    make_records,
+    ProviderNotice,
+    QuoteRecord,
+    SearchEntry,
+    to_model_text
+)
+from backend.backend_utils.speculation import speculative_executor
+from backend.backend_utils.structured_data import search_structured_data
 from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.tool_result import ToolResult
+from backend.database.repositories import ToolResultRepository
 
 from shared.exceptions import ProviderNotSupportedException
 from shared.playwright.page_utilities import close_page_resources
 from shared.provider.base_provider import BaseProvider
+from shared.provider.learned_provider import (
+    LearnedProvider,
+    normalize_domain
+)
 from shared.provider.registry import get_provider
+from shared.shared_utils.common import ProviderDefinition
+
+
+logger: Logger = getLogger("agent-tools")
+
+# strong references to fire-and-forget tasks (see asyncio docs)
+_background_tasks: set[asyncio.Task] = set()
+
+# store searches running for some job, joined by identical ones
+_store_searches: SingleFlight[list[SearchEntry]] = SingleFlight(
+    "store_searches"
+)
+
+# store pages open per client
+_client_pages: KeyedSemaphore = KeyedSemaphore(
+    "client_pages",
+    settings.CLIENT_MAX_PAGES
+)
 
 
 async def search_products(
         config: RunnableConfig,
-        products: list[str]
-    ) -> str:
+        products: list[str],
+        stores: list[str] | None = None
+    ) -> tuple[str, list[dict[str, Any]]]:
     """
     Searches for multiple products across the selected providers.
 
     This function iterates through the list of products and retrieves 
     details from each provider, respecting a maximum number of results 
-    for each individual product search.
+    for each individual product search. Products with a cached quote 
+    are answered from the quote cache without opening a browser. 
+    Products already being searched speculatively for the same 
+    request reuse those searches. Stores are searched concurrently 
+    and each one is reported to the job as soon as it completes.
 
     Parameters
     ----------
@@ -56,450 +134,1987 @@ async def search_products(
     products : list[str] 
         A list of product names, models, or keywords to investigate.
 
+    stores : list[str] or None, optional
+        Restrict the search to these selected stores, e.g. to 
+        search one store again or to search each store in its own 
+        call. Default is None, which searches every selected store.
+
     Returns
     -------
-    str
-        A concatenated and formatted string containing the aggregated 
-        search results, structured for easy parsing or LLM consumption.
+    tuple[str, list[dict[str, Any]]]
+        The results grouped by product and store, one line per 
+        result with title, price, availability and link, and the 
+        full quote records (the tool artifact, not shown to the 
+        model).
     """
-    
+
+    selected_stores: list[str] | None = (
+        config.get("configurable", {}).get("selected_stores", None)
+    )
+
+    if not selected_stores:
+        return (
+            "No store is currently selected. To perform a "
+            "search, please choose at least one store using "
+            "the 'Select Store' button in the sidebar.",
+            []
+        )
+
+    if stores:
+        wanted: set[str] = {s.strip().casefold() for s in stores}
+        selected_stores = [
+            s for s in selected_stores if s.casefold() in wanted
+        ]
+
+        if not selected_stores:
+            return (
+                "None of the requested stores is selected. The "
+                "selected stores are: {}.".format(
+                    ", ".join(
+                        config["configurable"]["selected_stores"]
+                    )
+                ),
+                []
+            )
+
+        # speculative searches cover every selected store
+        configurable: dict[str, Any] = dict(config["configurable"])
+        configurable.pop("speculation_id", None)
+        configurable["selected_stores"] = selected_stores
+        config = {"configurable": configurable}
+
+    entries: list[SearchEntry] = await find_quotes(config, products)
+
+    return (
+        to_model_text(entries) or "No result found.",
+        dump_entries(entries)
+    )
+
+
+async def find_quotes(
+        config: RunnableConfig,
+        products: list[str]
+    ) -> list[SearchEntry]:
+    """
+    Search products on the selected stores and return the typed 
+    results.
+
+    This is the pipeline behind `search_products`, for callers 
+    that need the records rather than the text shown to the model. 
+    The stores are searched concurrently; when the search runs 
+    inside a job, each store is reported to the job's progress as 
+    soon as it completes, so that partial results are available 
+    while the slow stores (e.g. computer use) are still running. 
+    If the search is cancelled (e.g. with its job), the store 
+    searches are cancelled and their browsers closed.
+
+    Parameters
+    ----------
+    config : langchain_core.runnables.RunnableConfig
+        Configuration with the `client_id`, `selected_stores`, 
+        `items_per_store` and, optionally, `speculation_id` 
+        configurables.
+
+    products : list[str]
+        Product queries.
+
+    Returns
+    -------
+    list[SearchEntry]
+        The quote records and provider notices, grouped by store 
+        in the order of the selected stores, or an empty list if 
+        no store is selected.
+    """
+
     client_id: str | None
     selected_stores: list[str] | None
     limit_per_product: int = 1
 
-    web_search_results_list: SafeAsyncList
+    if config.get("configurable", {}).get("speculation_id"):
+        return await __search_with_speculation(config, products)
+
     browser_context_manager: AsyncBrowserContextMaganer
 
+    client_id = (
+        config
+        .get("configurable", {})
+        .get("client_id", None)
+    )
+    selected_stores = (
+        config
+        .get("configurable", {})
+        .get("selected_stores", None)
+    )
+    limit_per_product = (
+        config
+        .get("configurable", {})
+        .get("items_per_store", 1)
+    )
+
+    if not selected_stores:
+        return []
+
+    progress: JobProgress | None = current_progress()
+    started: float = time.perf_counter()
+
+    if progress:
+        await progress.search_started(selected_stores)
+
+    store_results: dict[str, SafeAsyncList] = {}
+
     async with async_playwright() as apw:
-        client_id = (
-            config
-            .get("configurable", {})
-            .get("client_id", None)
+        browser_context_manager = AsyncBrowserContextMaganer(
+            apw, 
+            client_id
+        )
+
+        tasks: dict[asyncio.Task, str] = {}
+        pages_to_close: list[Page] = []
+
+        try:
+            for store in selected_stores:
+                store_results[store] = SafeAsyncList()
+
+                search: Coroutine[Any, Any, Any] | None = (
+                    await __prepare_store_search(
+                        apw,
+                        browser_context_manager,
+                        store,
+                        client_id,
+                        products,
+                        store_results[store],
+                        limit_per_product,
+                        pages_to_close
+                    )
+                )
+
+                if search:
+                    tasks[asyncio.create_task(search)] = store
+
+                else:
+                    await __store_completed(
+                        progress,
+                        store,
+                        store_results[store],
+                        started
+                    )
+
+            async for task in asyncio.as_completed(tasks):
+                task.result()
+
+                await __store_completed(
+                    progress,
+                    tasks[task],
+                    store_results[tasks[task]],
+                    started
+                )
+
+        finally:
+            # also reached when the job is cancelled: stop the store
+            # searches before releasing their browsers
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions = True)
+
+            # clean up
+            for page in pages_to_close:
+                await close_page_resources(page)
+
+    return [
+        entry
+        for store in selected_stores
+        for entry in await store_results[store].get_all()
+    ]
+
+
+async def __store_completed(
+        progress: JobProgress | None,
+        store: str,
+        results: SafeAsyncList,
+        started: float
+    ) -> None:
+    """
+    Record the completion of the search on a store and report its 
+    results to the job's progress, if any.
+    """
+
+    elapsed_ms: float = (time.perf_counter() - started) * 1000
+
+    metrics.observe("search.store_ms", elapsed_ms)
+
+    if progress:
+        await progress.store_completed(
+            store,
+            await results.get_all(),
+            elapsed_ms
+        )
+
+
+async def recall_search_results(
+        config: RunnableConfig,
+        products: list[str]
+    ) -> tuple[str, list[dict[str, Any]]]:
+    """
+    Reads the results of searches already made in this chat.
+
+    Use it instead of searching again when the products were 
+    already searched in the conversation, e.g. to answer follow-up 
+    questions about prices, availability or links. No store is 
+    contacted.
+
+    Parameters
+    ----------
+    config : langchain_core.runnables.RunnableConfig 
+        Configuration for the LangChain runnable, containing callbacks, 
+        tags, and other execution metadata.
+
+    products : list[str] 
+        Products whose stored results are needed. An empty list 
+        returns the latest stored results.
+
+    Returns
+    -------
+    tuple[str, list[dict[str, Any]]]
+        The stored results, in the same format as `search_products`, 
+        each preceded by the products and the time of the search, 
+        and the stored quote records (the tool artifact).
+    """
+
+    client_id: str | None = (
+        config.get("configurable", {}).get("client_id", None)
+    )
+    chat_id: str | None = (
+        config.get("configurable", {}).get("chat_id", None)
+    )
+
+    if not client_id or not chat_id:
+        return "No stored results are available.", []
+
+    async with AsyncSessionLocal() as db:
+        records: list[ToolResult] = await ToolResultRepository.get_recent(
+            db,
+            client_id,
+            chat_id,
+            max_age = timedelta(seconds = settings.TOOL_RESULT_MAX_AGE)
+        )
+
+    selected: list[ToolResult] = []
+    missing: list[str] = []
+
+    if not products:
+        selected = records[:3]
+
+    for product in products:
+        key: str = " ".join(product.casefold().split())
+        record: ToolResult | None = next(
+            (
+                r for r in records 
+                if key in (" ".join(p.casefold().split()) for p in r.products)
+            ),
+            None
+        )
+
+        if record is None:
+            missing.append(product)
+
+        elif record not in selected:
+            selected.append(record)
+
+    now: datetime = datetime.now(timezone.utc)
+    blocks: list[str] = []
+    artifact: list[dict[str, Any]] = []
+
+    for record in selected:
+        created_at: datetime = record.created_at
+
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo = timezone.utc)
+
+        minutes: int = int((now - created_at).total_seconds() // 60)
+
+        blocks.append(
+            "Stored results for {} (searched {} minute(s) ago):\n{}".format(
+                ", ".join(f"'{p}'" for p in record.products),
+                minutes,
+                record.content
+            )
+        )
+        artifact.extend(record.records or [])
+
+    if missing:
+        blocks.append(
+            "No stored results for {}. Use `search_products` to "
+            "search them.".format(", ".join(f"'{p}'" for p in missing))
         )
-        selected_stores = (
-            config
-            .get("configurable", {})
-            .get("selected_stores", None)
+
+    return (
+        "\n\n".join(blocks) or "No stored results are available.",
+        artifact
+    )
+
+
+async def __search_with_speculation(
+        config: RunnableConfig,
+        products: list[str]
+    ) -> list[SearchEntry]:
+    """
+    Search the products of a tool call, reusing the speculative 
+    searches started for the same request.
+
+    Products without a matching speculation, and those whose 
+    speculative search failed, are searched normally.
+
+    Parameters
+    ----------
+    config : langchain_core.runnables.RunnableConfig
+        Configuration of the tool call, with a `speculation_id`.
+
+    products : list[str]
+        Products requested by the tool call.
+
+    Returns
+    -------
+    list[SearchEntry]
+        The search entries, as `find_quotes`.
+    """
+
+    configurable: dict[str, Any] = dict(config.get("configurable", {}))
+    speculation_id: str = configurable.pop("speculation_id")
+    search_config: RunnableConfig = {"configurable": configurable}
+
+    claimed: dict[str, asyncio.Task]
+    remaining: list[str]
+
+    claimed, remaining = speculative_executor.claim(
+        speculation_id,
+        products
+    )
+
+    if not claimed:
+        return await find_quotes(search_config, products)
+
+    outputs: list[Any] = await asyncio.gather(
+        *claimed.values(),
+        *([find_quotes(search_config, remaining)] if remaining else []),
+        return_exceptions = True
+    )
+
+    results: list[SearchEntry] = []
+    failed: list[str] = []
+
+    for product, output in zip(claimed, outputs):
+        if isinstance(output, BaseException):
+            failed.append(product)
+
+        else:
+            results.extend(output)
+
+    progress: JobProgress | None = current_progress()
+
+    if progress:
+        # speculative searches do not report progress while running
+        await progress.results_reused(list(results))
+
+    if remaining:
+        if isinstance(outputs[-1], BaseException):
+            raise outputs[-1]
+
+        results.extend(outputs[-1])
+
+    if failed:
+        results.extend(await find_quotes(search_config, failed))
+
+    return results
+
+
+async def __prepare_store_search(
+        apw: Playwright,
+        browser_context_manager: AsyncBrowserContextMaganer,
+        store: str,
+        client_id: str | None,
+        products: list[str],
+        result_list: SafeAsyncList,
+        limit_per_product: int,
+        pages_to_close: list[Page],
+        use_cache: bool = True
+    ) -> Coroutine[Any, Any, None] | None:
+    """
+    Prepare the search of the products on a single store.
+
+    Products with a cached quote are answered immediately from 
+    the quote cache. For the others, the search coroutine is 
+    returned, so that the caller can run the stores concurrently. 
+    When it runs, it opens the page the search needs (a provider 
+    context for registered providers, a Chrome page for external 
+    stores), unless an identical search (same store, products, 
+    limit and, for login-gated providers, client) is already 
+    running for another job: the coroutine then waits for that 
+    search and reuses its entries, so only one browser does the 
+    work. A client has at most `CLIENT_MAX_PAGES` store pages 
+    open at the same time; its further searches wait for a page 
+    to close.
+
+    Parameters
+    ----------
+    apw : playwright.async_api.Playwright
+        Running Playwright instance.
+
+    browser_context_manager : AsyncBrowserContextMaganer
+        Manager of the client's provider contexts.
+
+    store : str
+        Provider name or URL of an external store.
+
+    client_id : str or None
+        Client requesting the search.
+
+    products : list of str
+        Product queries.
+
+    result_list : SafeAsyncList
+        Container where quote records and provider notices are 
+        appended.
+
+    limit_per_product : int
+        Maximum number of results per product.
+
+    pages_to_close : list of Page
+        Pages opened for the search. The caller closes them once 
+        the returned coroutine has completed.
+
+    use_cache : bool, optional
+        Whether cached quotes may answer the search. Background 
+        refreshes pass False. Default is True.
+
+    Returns
+    -------
+    Coroutine or None
+        The search coroutine, or None if nothing is left to search 
+        (all products were cached, or the store failed and a 
+        notice was appended to `result_list`).
+    """
+
+    try:
+        provider_instance: BaseProvider = get_provider(
+            store
+        )
+
+        remaining: list[str] = await __serve_cached_quotes(
+            store,
+            provider_instance,
+            client_id,
+            products,
+            result_list,
+            limit_per_product,
+            use_cache
+        )
+
+        if not remaining:
+            return None
+
+        async def search(
+                entries: SafeAsyncList
+            ) -> None:
+            """
+            Open the provider's page and search the products.
+            """
+
+            async with (
+                _client_pages.hold(client_id),
+                provider_governor.page(
+                    normalize_domain(provider_instance.url),
+                    provider_instance.max_concurrent_pages,
+                    provider_instance.requests_per_second
+                )
+            ):
+                context: BrowserContext | None = (
+                    await browser_context_manager.ensure_provider_context(
+                        client_id,
+                        provider_instance
+                    )
+                )
+                
+                if not context:
+                    return
+
+                page: Page = await context.new_page()
+                pages_to_close.append(page)
+
+                try:
+                    await __search_in_website(
+                        provider_instance,
+                        page,
+                        remaining,
+                        entries,
+                        limit_per_product,
+                        client_id
+                    )
+
+                finally:
+                    # release the provider's browser with the slots
+                    await close_page_resources(page)
+
+        return __coalesced_search(
+            store,
+            __quote_key(
+                store,
+                provider_instance,
+                client_id,
+                remaining,
+                limit_per_product
+            ),
+            search,
+            result_list
+        )
+
+    except ProviderNotSupportedException:
+        remaining = await __serve_cached_quotes(
+            store,
+            None,
+            client_id,
+            products,
+            result_list,
+            limit_per_product,
+            use_cache
+        )
+
+        if not remaining:
+            return None
+
+        async def search_external(
+                entries: SafeAsyncList
+            ) -> None:
+            """
+            Open a Chrome page and search the products.
+            """
+
+            async with (
+                _client_pages.hold(client_id),
+                provider_governor.page(normalize_domain(store))
+            ):
+                page: Page = await init_chrome_page(
+                    apw,
+                    settings.HEADLESS
+                )
+                pages_to_close.append(page)
+
+                try:
+                    await __search_external_store(
+                        store,
+                        page,
+                        remaining,
+                        entries,
+                        limit_per_product,
+                        client_id
+                    )
+
+                finally:
+                    # the Chrome instance may be shared by other 
+                    # stores: only the page is closed here
+                    await page.close()
+
+        return __coalesced_search(
+            store,
+            __quote_key(
+                store,
+                None,
+                client_id,
+                remaining,
+                limit_per_product
+            ),
+            search_external,
+            result_list
+        )
+
+    except LoginFailedException as lfe:
+        await result_list.add(
+            ProviderNotice(provider = store, message = str(lfe))
+        )
+
+    except Exception as e:
+        await result_list.add(
+            ProviderNotice(provider = store, message = str(e))
         )
-        limit_per_product = (
-            config
-            .get("configurable", {})
-            .get("items_per_store", 1)
+
+    return None
+
+
+async def __coalesced_search(
+        store: str,
+        key: QuoteKey,
+        search: Callable[[SafeAsyncList], Coroutine[Any, Any, None]],
+        result_list: SafeAsyncList
+    ) -> None:
+    """
+    Run a store search, or join the identical one running for 
+    another job, and add its entries to `result_list`. Failures 
+    of the store are reported as a provider notice.
+    """
+
+    async def run() -> list[SearchEntry]:
+        """
+        Run the search and return its entries.
+        """
+
+        entries: SafeAsyncList = SafeAsyncList()
+
+        try:
+            await search(entries)
+
+        except LoginFailedException as lfe:
+            await entries.add(
+                ProviderNotice(provider = store, message = str(lfe))
+            )
+
+        except Exception as e:
+            await entries.add(
+                ProviderNotice(provider = store, message = str(e))
+            )
+
+        return await entries.get_all()
+
+    await result_list.extend(await _store_searches.do(key, run))
+
+
+def __quote_key(
+        store: str,
+        provider: BaseProvider | None,
+        client_id: str | None,
+        query: str | list[str],
+        limit_per_product: int
+    ) -> QuoteKey:
+    """
+    Build the quote-cache key of a search on a store.
+
+    Parameters
+    ----------
+    store : str
+        Provider name or URL of an external store.
+
+    provider : BaseProvider or None
+        Registered provider of the store, or None for an external 
+        store.
+
+    client_id : str or None
+        Client requesting the search. Only login-gated providers 
+        use it, since their prices may depend on the account.
+
+    query : str or list of str
+        Product query, or the queries of a computer-use session.
+
+    limit_per_product : int
+        Maximum number of results per product.
+
+    Returns
+    -------
+    QuoteKey
+        The cache key.
+    """
+
+    if provider is None:
+        return QuoteCache.make_key(
+            normalize_domain(store),
+            query,
+            limit_per_product
         )
 
-        if not selected_stores:
-            return (
-                "No store is currently selected. To perform a "
-                "search, please choose at least one store using "
-                "the 'Select Store' button in the sidebar."
-            )
-        
-        web_search_results_list = SafeAsyncList()
-        browser_context_manager = AsyncBrowserContextMaganer(
-            apw, 
-            client_id
-        )
+    return QuoteCache.make_key(
+        provider.name,
+        query,
+        limit_per_product,
+        client_id if provider.login_required else None
+    )
+
+
+async def __serve_cached_quotes(
+        store: str,
+        provider: BaseProvider | None,
+        client_id: str | None,
+        products: list[str],
+        result_list: SafeAsyncList,
+        limit_per_product: int,
+        use_cache: bool = True
+    ) -> list[str]:
+    """
+    Answer products from the quote cache and return the others.
+
+    Fresh and stale quotes are both appended to `result_list`; 
+    stale ones are then refreshed by a background search 
+    (stale-while-revalidate). For external stores, the remaining 
+    products are also looked up as a whole, since a computer-use 
+    session caches its results under the full list of queries.
+
+    Parameters
+    ----------
+    store : str
+        Provider name or URL of an external store.
+
+    provider : BaseProvider or None
+        Registered provider of the store, or None for an external 
+        store.
+
+    client_id : str or None
+        Client requesting the search.
+
+    products : list of str
+        Product queries.
+
+    result_list : SafeAsyncList
+        Container where cached quote records are appended.
+
+    limit_per_product : int
+        Maximum number of results per product.
+
+    use_cache : bool, optional
+        If False, or if the cache is disabled, every product is 
+        returned unchanged. Default is True.
+
+    Returns
+    -------
+    list of str
+        Products that still need a search.
+    """
+
+    if not use_cache or not settings.QUOTE_CACHE_ENABLED:
+        return products
+
+    remaining: list[str] = []
+    stale: list[tuple[QuoteKey, str]] = []
+
+    for item in products:
+        item: str = item.strip()
+
+        if not item:
+            continue
+
+        key: QuoteKey = __quote_key(
+            store,
+            provider,
+            client_id,
+            item,
+            limit_per_product
+        )
+        cached: CachedQuote | None = quote_cache.get(key)
+
+        if not cached:
+            remaining.append(item)
+            continue
+
+        await result_list.extend(cached.records)
+
+        if cached.stale:
+            stale.append((key, item))
+
+    if provider is None and len(remaining) > 1:
+        key = __quote_key(
+            store,
+            provider,
+            client_id,
+            remaining,
+            limit_per_product
+        )
+        cached = quote_cache.get(key)
+
+        if cached:
+            await result_list.extend(cached.records)
+
+            if cached.stale:
+                stale.extend((key, item) for item in remaining)
+
+            remaining = []
+
+    claimed: list[QuoteKey] = [
+        key for key in dict.fromkeys(key for key, _ in stale)
+        if quote_cache.begin_refresh(key)
+    ]
+
+    if claimed:
+        task: asyncio.Task = asyncio.create_task(
+            __refresh_quotes(
+                store,
+                client_id,
+                [item for key, item in stale if key in claimed],
+                limit_per_product,
+                claimed
+            )
+        )
+
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    return remaining
+
+
+async def __refresh_quotes(
+        store: str,
+        client_id: str | None,
+        products: list[str],
+        limit_per_product: int,
+        keys: list[QuoteKey]
+    ) -> None:
+    """
+    Search stale products again to refresh their cached quotes.
+
+    The search runs in its own Playwright instance, bypasses the 
+    cache on read, and stores its results like any other search. 
+    Its records are discarded.
+
+    Parameters
+    ----------
+    store : str
+        Provider name or URL of an external store.
+
+    client_id : str or None
+        Client whose search found the stale quotes.
+
+    products : list of str
+        Products to search again.
+
+    limit_per_product : int
+        Maximum number of results per product.
+
+    keys : list of QuoteKey
+        Keys claimed with `QuoteCache.begin_refresh`, released 
+        when the refresh ends.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+        Failures are logged and the stale quotes are kept until 
+        they expire.
+    """
+
+    pages_to_close: list[Page] = []
+
+    try:
+        async with async_playwright() as apw:
+            task: Coroutine[Any, Any, None] | None = (
+                await __prepare_store_search(
+                    apw,
+                    AsyncBrowserContextMaganer(apw, client_id),
+                    store,
+                    client_id,
+                    products,
+                    SafeAsyncList(),
+                    limit_per_product,
+                    pages_to_close,
+                    use_cache = False
+                )
+            )
+
+            try:
+                if task:
+                    await task
+
+            finally:
+                for page in pages_to_close:
+                    await close_page_resources(page)
+
+    except Exception as e:
+        logger.warning(f"quote refresh failed for {store}: {e}")
+
+    finally:
+        for key in keys:
+            quote_cache.end_refresh(key)
+
+  
+async def __search_in_website(
+        provider: BaseProvider,
+        page: Page,
+        products: list[str],
+        result_list: SafeAsyncList,
+        limit_per_product: int = 1,
+        client_id: str | None = None
+    ) -> None:
+    """
+    Search one or more products on a provider's website and append
+    quote records to a shared asynchronous result container.
+
+    The function navigates to the provider homepage and, for each 
+    non-empty product string, delegates the search and extraction 
+    to `__search_item`. The collected data (title, availability, 
+    price, link) is turned into `QuoteRecord` entries.
+
+    Errors occurring during individual product searches are captured
+    and appended to `result_list` without interrupting the overall
+    execution flow.
+
+    When the provider is a learned provider, the search is 
+    recorded as a success if some product was extracted, and as a 
+    failure if result lists appeared but its selectors extracted 
+    nothing. Repeated failures send the store back to computer use.
+
+    Every product is tagged with the tier that produced it 
+    (`"scripted"` or `"learned"`) under the `"source"` key, and 
+    the per-query attempts and hits are recorded in `metrics`.
+
+    Parameters
+    ----------
+    provider : BaseProvider
+        Concrete provider implementation responsible for defining
+        the target URL and all selectors required to perform
+        search and data extraction.
+
+    page : playwright.async_api.Page
+        Initialized Playwright page instance used for navigation,
+        interaction, and HTML retrieval.
+
+    products : list of str
+        Collection of product names or search queries.
+        Leading and trailing whitespace is removed.
+        Empty strings are ignored.
+
+    result_list : SafeAsyncList
+        Asynchronous thread-safe container where quote records
+        and provider notices (errors) are appended.
+
+    limit_per_product : int, optional
+        Maximum number of result entries extracted for each
+        product query. Default is 1.
+
+    client_id : str or None, optional
+        Client requesting the search, used to scope the cached 
+        quotes of login-gated providers. Default is None.
+
+    Returns
+    -------
+    None
+        The function does not return a value. It mutates
+        `result_list` by appending search entries.
+
+    Raises
+    ------
+    None
+        Exceptions are handled internally. Any error is
+        converted into a `ProviderNotice` and appended
+        to `result_list`.
+    """
+
+    found_any: bool = False
+    selectors_missed: bool = False
+    tier: str = (
+        "learned" if isinstance(provider, LearnedProvider) else "scripted"
+    )
+
+    domain: str = normalize_domain(provider.url)
+
+    try:
+        async with provider_governor.request(domain):
+            await page.goto(provider.url)
+            await provider.close_all_popups(page)
+            await page.wait_for_load_state("load")
+        
+        for item in products:
+            item: str = item.strip()
+
+            if not item:
+                continue
+
+            try:
+                async with provider_governor.request(domain):
+                    products_data: list[dict[str, str]] | None = (
+                        await __search_item(
+                            provider,
+                            page,
+                            item,
+                            limit_per_product
+                        )
+                    )
+
+                metrics.increment("search.tier.attempts", tier = tier)
+
+                if products_data is None:
+                    await result_list.add(
+                        ProviderNotice(
+                            provider = provider.name,
+                            query = item,
+                            message = f"No result found for '{item}'."
+                        )
+                    )
+
+                    continue
+
+                if not products_data:
+                    # the results appeared, the selectors found nothing
+                    selectors_missed = True
+                    continue
+
+                found_any = True
+
+                metrics.increment("search.tier.hits", tier = tier)
+
+                for p in products_data:
+                    p["source"] = tier
+
+                records: list[QuoteRecord] = make_records(
+                    provider.name,
+                    products_data,
+                    [item]
+                )
+
+                quote_cache.set(
+                    __quote_key(
+                        provider.name,
+                        provider,
+                        client_id,
+                        item,
+                        limit_per_product
+                    ),
+                    records,
+                    provider.cache_ttl
+                )
+
+                await result_list.extend(records)
+
+            except Exception as e:
+                await result_list.add(
+                    ProviderNotice(
+                        provider = provider.name,
+                        query = item,
+                        message = f"Error searching '{item}': {e}"
+                    )
+                )
+
+    except Exception as e:
+        await result_list.add(
+            ProviderNotice(
+                provider = provider.name,
+                message = f"Fatal error: {str(e)}"
+            )
+        )
+
+    # a product the store does not carry (no result list) or an
+    # error says nothing about the learned selectors
+    if isinstance(provider, LearnedProvider) and (
+        found_any or selectors_missed
+    ):
+        await record_validation(provider.domain, found_any)
+
+
+async def __search_item(
+        provider: BaseProvider,
+        page: Page,
+        item: str,
+        limit_per_product: int = 1
+    ) -> list[dict[str, str]] | None:
+    """
+    Search a single product on a provider's website and extract
+    the matching results.
+
+    The function fills the provider's search input, waits for 
+    the results to load and extracts up to `limit_per_product`
+    matches from the rendered HTML.
+
+    Parameters
+    ----------
+    provider : BaseProvider
+        Provider defining the selectors used for search and
+        extraction.
+
+    page : playwright.async_api.Page
+        Page already navigated to the provider's website.
+
+    item : str
+        Product name or search query.
+
+    limit_per_product : int, optional
+        Maximum number of result entries extracted. Default is 1.
+
+    Returns
+    -------
+    list of dict[str, str] or None
+        The extracted products (keys `"name"`, `"availability"`,
+        `"price"` and `"link"`), an empty list if result
+        containers were found but could not be parsed, or `None`
+        if no result container appeared at all.
+
+    Raises
+    ------
+    Exception
+        Any Playwright or parsing error is propagated to the
+        caller.
+    """
+
+    for inputbox in ["textbox", "combobox", "searchbox"]:
+        try:
+            await page.get_by_role(
+                inputbox, 
+                name = provider.search_texts
+            ).fill(
+                item,
+                timeout = 500
+            )
+            await page.keyboard.press("Enter")
+            break
+
+        except PlaywrightTimeoutError:
+            continue
+
+    found: str | None = await __wait_for_any_selector(
+        page, 
+        provider.result_container
+    )
+
+    if not found:
+        return None
+
+    _ = await __wait_for_any_selector(
+        page, 
+        provider.title_classes
+    )
+    _ = await __wait_for_all_selectors(
+        page, 
+        dict(provider.availability_classes)
+    )
+    _ = await __wait_for_any_selector(
+        page, 
+        provider.price_classes
+    )
+
+    await page.wait_for_load_state("load")
+
+    html: str = await page.content()
+    soup: BeautifulSoup = BeautifulSoup(html, "html.parser")
+
+    product_containers: ResultSet[Tag] = soup.select(
+        found, 
+        limit = limit_per_product
+    )
+    
+    if not product_containers:
+        return []
+
+    titles: list[str]
+    availabilities: list[str]
+    prices: list[str]
+    links: list[str]
+    
+    titles, availabilities, prices, links = (
+        await asyncio.gather(
+            __select_text(
+                product_containers, 
+                provider.title_classes
+            ),
+            __select_all_text(
+                product_containers,
+                dict(provider.availability_classes),
+                provider.availability_texts
+            ),
+            __select_text(
+                product_containers,
+                provider.price_classes
+            ),
+            __extract_attribute_from_selectors(
+                product_containers,
+                provider.product_link_selectors,
+               ["href"] 
+            )
+        )
+    )
+
+    products_data: list[dict[str, str]] = []
+
+    for name, avail, price, link in zip(
+        titles, 
+        availabilities, 
+        prices,
+        links
+    ):
+        if link[0] == "/":
+            link = provider.url + link
+
+        products_data.append({
+            "name": name,
+            "availability": avail,
+            "price": price,
+            "link": link
+        })
+
+    return products_data
+
+
+async def __search_external_store(
+        store: str,
+        page: Page,
+        products: list[str],
+        result_list: SafeAsyncList,
+        limit_per_product: int = 1,
+        client_id: str | None = None
+    ) -> None:
+    """
+    Search products on a store that has no registered provider.
+
+    Each product is first looked up through the structured data 
+    (JSON-LD, microdata, OpenGraph) of the store's search results. 
+    Only the products this tier cannot answer are handed over to 
+    the computer-use loop, in a single session.
+
+    Products found by the structured tier are tagged with 
+    `"source": "structured_data"`, and the per-query attempts and 
+    hits are recorded in `metrics`.
+
+    Parameters
+    ----------
+    store : str
+        URL of the external store.
+
+    page : playwright.async_api.Page
+        Page used by both tiers.
+
+    products : list of str
+        Collection of product names or search queries.
+        Empty strings are ignored.
+
+    result_list : SafeAsyncList
+        Asynchronous thread-safe list where quote records and 
+        provider notices are appended.
+
+    limit_per_product : int, optional
+        Maximum number of items requested per product.
+        Default is 1.
+
+    client_id : str or None, optional
+        Client requesting the search, whose page slots the 
+        computer-use shards take. Default is None.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+        Structured-data failures are logged and the affected
+        products fall back to computer use.
+    """
+
+    domain: str = normalize_domain(store)
+    remaining: list[str] = []
+
+    for item in products:
+        item: str = item.strip()
+
+        if not item:
+            continue
+
+        if not settings.STRUCTURED_DATA_ENABLED:
+            remaining.append(item)
+            continue
+
+        products_data: list[dict[str, str]] = []
+
+        try:
+            metrics.increment(
+                "search.tier.attempts",
+                tier = "structured_data"
+            )
+
+            async with provider_governor.request(domain):
+                products_data = await search_structured_data(
+                    page,
+                    store,
+                    item,
+                    limit_per_product
+                )
+
+        except Exception as e:
+            logger.debug(f"structured data search failed on {store}: {e}")
+
+        if not products_data:
+            remaining.append(item)
+            continue
+
+        metrics.increment("search.tier.hits", tier = "structured_data")
+
+        for p in products_data:
+            p["source"] = "structured_data"
+
+        records: list[QuoteRecord] = make_records(
+            store,
+            products_data,
+            [item]
+        )
+
+        quote_cache.set(
+            __quote_key(store, None, None, item, limit_per_product),
+            records
+        )
+
+        await result_list.extend(records)
+
+    if not remaining:
+        return
+
+    if settings.STRUCTURED_DATA_ENABLED:
+        # hand the model the same blank page it would otherwise start from
+        try:
+            await page.goto("about:blank")
+
+        except Exception:
+            pass
+
+    await __search_with_computer_use(
+        store,
+        page,
+        remaining,
+        result_list,
+        limit_per_product,
+        client_id
+    )
+
+
+async def __search_with_computer_use(
+        provider_url: str,
+        page: Page,
+        products: list[str],
+        result_list: SafeAsyncList,
+        limit_per_product: int = 1,
+        client_id: str | None = None
+    ) -> None:
+    """
+    Search for products on a website using an AI-driven computer-use 
+    loop and append formatted results to a shared asynchronous container.
+
+    This function takes the shared generative AI client and the cached
+    browser-interaction configuration from the computer-use `runtime`,
+    builds a prompt describing the requested products, and executes a
+    computer-use session that interacts with the provided Playwright
+    page. Extracted product data is collected into `products_data` 
+    and turned into quote records before being appended to 
+    `result_list`. Each record is assigned the query the model 
+    reported in its `save_product` call, or else the query its 
+    title matches best; only the queries answered by a record 
+    count as hits of the tier.
+
+    When `COMPUTER_USE_SHARD_SIZE` is set and the product list is 
+    longer, the products are split into shards, each searched by 
+    its own session. The shards run in `page` one after the other 
+    and, concurrently, in extra pages of the same browser, each 
+    taking its own client page slot and store page slot (see
+    `__run_computer_use_shards`), within the process-wide session 
+    limit. Their products are merged in input order.
+
+    If no product information is gathered, a fallback message is added
+    instead. All exceptions are silently handled to prevent interruption
+    of the calling workflow.
+
+    Depending on `COMPUTER_USE_OBSERVATION`, the model observes 
+    screenshots, a text snapshot of the page with element IDs, or 
+    both; in the DOM mode coordinate-based actions are disabled.
+
+    When learned providers are enabled, the session is observed by a
+    `SelectorLearner` and, after a successful run, the inferred
+    definition is validated and persisted in the background.
+
+    Parameters
+    ----------
+    provider_url : str
+        Base URL of the target website. Used in the generated prompt
+        and as the provider of the records.
+
+    page : playwright.async_api.Page
+        Initialized Playwright page instance used as the execution
+        environment for the computer-use loop.
+
+    products : list of str
+        List of product names or search queries to be included
+        in the generated prompt.
+
+    result_list : SafeAsyncList
+        Asynchronous thread-safe list where quote records and 
+        provider notices are appended.
+
+    limit_per_product : int, optional
+        Maximum number of items requested per product in the
+        generated prompt. Default is 1.
+
+    client_id : str or None, optional
+        Client requesting the search, whose page slots the extra 
+        shard pages take. Default is None.
+
+    Returns
+    -------
+    None
+        The function does not return a value. It appends
+        quote records (or a fallback notice) to `result_list`.
+
+    Raises
+    ------
+    None
+        All exceptions are suppressed internally. Failures
+        result in an empty `products_data` collection,
+        triggering a fallback message.
+
+    Notes
+    -----
+    The function relies on an AI-driven interaction loop rather than
+    deterministic DOM scraping. The quality and completeness of the
+    results depend on the model's ability to correctly interpret and
+    navigate the webpage.
+    """
+
+    products_data: list[dict[str, str]] = []
+
+    learner: SelectorLearner | None = (
+        SelectorLearner()
+        if settings.LEARNED_PROVIDERS_ENABLED and not settings.CLI_MODE
+        else None
+    )
+
+    shards: list[list[str]] = __shard_products(
+        products,
+        settings.COMPUTER_USE_SHARD_SIZE
+    )
+
+    try:
+        # shards are contiguous slices, so concatenating their
+        # results keeps the products in input order
+        shard_results: list[list[dict[str, str]]] = (
+            await __run_computer_use_shards(
+                provider_url,
+                page,
+                shards,
+                limit_per_product,
+                learner,
+                client_id
+            )
+        )
+
+        for shard_data in shard_results:
+            products_data.extend(shard_data)
+
+    except Exception:
+        pass
+
+    finally:
+        if learner and products_data:
+            task: asyncio.Task = asyncio.create_task(
+                __learn_provider(
+                    provider_url,
+                    learner,
+                    products,
+                    list(products_data),
+                    limit_per_product
+                )
+            )
+
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+        metrics.increment(
+            "search.tier.attempts",
+            len(products),
+            tier = "computer_use"
+        )
+
+        if products_data:
+            for p in products_data:
+                p["source"] = "computer_use"
+
+            records: list[QuoteRecord] = make_records(
+                provider_url,
+                products_data,
+                products
+            )
+
+            # a query is a hit when a saved product answers it
+            metrics.increment(
+                "search.tier.hits",
+                len({r.query for r in records if r.query is not None}),
+                tier = "computer_use"
+            )
+
+            quote_cache.set(
+                __quote_key(
+                    provider_url,
+                    None,
+                    None,
+                    products,
+                    limit_per_product
+                ),
+                records
+            )
+
+            await result_list.extend(records)
+
+        else:
+            await result_list.add(
+                ProviderNotice(
+                    provider = provider_url,
+                    message = "No result found for any of the products."
+                )
+            )
+
+
+def __shard_products(
+        products: list[str],
+        shard_size: int
+    ) -> list[list[str]]:
+    """
+    Split a product list into contiguous shards.
+
+    Parameters
+    ----------
+    products : list of str
+        Product queries, in input order.
+
+    shard_size : int
+        Maximum number of products per shard. Values lower than 
+        1 disable sharding.
+
+    Returns
+    -------
+    list of list of str
+        The shards, in input order. A single shard holding all 
+        products is returned when sharding is disabled or not 
+        needed.
+    """
+
+    if shard_size < 1 or len(products) <= shard_size:
+        return [products]
+
+    return [
+        products[i:i + shard_size]
+        for i in range(0, len(products), shard_size)
+    ]
+
+
+async def __run_computer_use_shards(
+        provider_url: str,
+        page: Page,
+        shards: list[list[str]],
+        limit_per_product: int,
+        learner: SelectorLearner | None,
+        client_id: str | None
+    ) -> list[list[dict[str, str]]]:
+    """
+    Run one computer-use session per shard, in `page` and in as 
+    many extra pages as the page limits allow.
+
+    The caller already holds a client page slot and a store page 
+    slot for `page`, which runs the pending shards one after the 
+    other. Each extra page first takes its own slots (from 
+    `_client_pages` and `provider_governor`), then runs pending 
+    shards too. `page` never waits for a slot, so the shards 
+    cannot deadlock on the slots their caller holds: extra pages 
+    still waiting when no shard is left are cancelled.
+
+    Parameters
+    ----------
+    provider_url : str
+        Base URL of the target website.
+
+    page : playwright.async_api.Page
+        Page held by the caller.
+
+    shards : list of list of str
+        Product queries of each shard.
+
+    limit_per_product : int
+        Maximum number of items requested per product.
 
-        tasks: list[Coroutine[Any, Any, Any]] = []
-        pages_to_close: list[Page] = []
+    learner : SelectorLearner or None
+        Learner observing the sessions, if any.
 
-        for store in selected_stores:
-            try:
-                provider_instance: BaseProvider = get_provider(
-                    store
-                )
+    client_id : str or None
+        Client requesting the search.
 
-                context: BrowserContext | None = (
-                    await browser_context_manager.ensure_provider_context(
-                        client_id,
-                        provider_instance
-                    )
-                )
-                
-                if context:
-                    page: Page = await context.new_page()
-                    pages_to_close.append(page)
+    Returns
+    -------
+    list of list of dict[str, str]
+        Products saved by the session of each shard, in shard 
+        order.
+    """
 
-                    tasks.append(
-                        __search_in_website(
-                            provider_instance,
-                            page,
-                            products,
-                            web_search_results_list,
-                            limit_per_product
-                        )
-                    )
+    pending: deque[int] = deque(range(len(shards)))
+    results: list[list[dict[str, str]]] = [[] for _ in shards]
+    working: set[asyncio.Task] = set()
+
+    async def run_pending(
+            own_page: bool
+        ) -> None:
+        """
+        Run the pending shards one after the other.
+        """
+
+        while pending:
+            i: int = pending.popleft()
+
+            results[i] = await __run_computer_use_session(
+                provider_url,
+                page,
+                shards[i],
+                limit_per_product,
+                learner,
+                own_page = own_page
+            )
 
-            except ProviderNotSupportedException:
-                page = await init_chrome_page(
-                    apw,
-                    settings.HEADLESS
-                )
-                pages_to_close.append(page)
+    async def run_in_extra_page() -> None:
+        """
+        Take the slots of an extra page, then run pending shards.
+        """
 
-                tasks.append(
-                    __search_with_computer_use(
-                        store,
-                        page,
-                        products,
-                        web_search_results_list,
-                        limit_per_product
-                    )
-                )
+        async with (
+            _client_pages.hold(client_id),
+            provider_governor.page(normalize_domain(provider_url))
+        ):
+            working.add(asyncio.current_task())
 
-            except LoginFailedException as lfe:
-                await web_search_results_list.add(
-                    await __format_block(store, str(lfe))
-                )
+            await run_pending(own_page = True)
 
-            except Exception as e:
-                await web_search_results_list.add(
-                    await __format_block(store, str(e))
-                )
+    helpers: list[asyncio.Task] = [
+        asyncio.create_task(run_in_extra_page())
+        for _ in range(len(shards) - 1)
+    ]
 
-        await asyncio.gather(*tasks)
+    try:
+        await run_pending(own_page = False)
 
-        # clean up
-        for page in pages_to_close:
-            await close_page_resources(page)
+        for helper in helpers:
+            if helper not in working:
+                helper.cancel()
 
-    web_search_results_str = "\n\n".join(
-        [result for result in await web_search_results_list.get_all()]
-    )
+        await asyncio.gather(*helpers, return_exceptions = True)
 
-    return web_search_results_str
+    finally:
+        for helper in helpers:
+            helper.cancel()
 
-  
-async def __search_in_website(
-        provider: BaseProvider,
+    return results
+
+
+async def __run_computer_use_session(
+        provider_url: str,
         page: Page,
         products: list[str],
-        result_list: SafeAsyncList,
-        limit_per_product: int = 1
-    ) -> None:
+        limit_per_product: int,
+        learner: SelectorLearner | None,
+        own_page: bool = False
+    ) -> list[dict[str, str]]:
     """
-    Search one or more products on a provider's website and append
-    formatted result blocks to a shared asynchronous result container.
-
-    The function navigates to the provider homepage, performs a search
-    for each non-empty product string, waits for the results to load,
-    extracts up to `limit_per_product` matches, and formats the
-    collected data (title, availability, price, link) into structured
-    blocks.
+    Run one computer-use session for a subset of the products.
 
-    Errors occurring during individual product searches are captured
-    and appended to `result_list` without interrupting the overall
-    execution flow.
+    The session waits for a free slot of the computer-use 
+    `runtime`, which caps the concurrent sessions of the whole 
+    process. When `own_page` is True, the session opens its own 
+    page in the browser context of `page` once the slot is 
+    acquired, and closes it when done.
 
     Parameters
     ----------
-    provider : BaseProvider
-        Concrete provider implementation responsible for defining
-        the target URL and all selectors required to perform
-        search and data extraction.
+    provider_url : str
+        Base URL of the target website.
 
     page : playwright.async_api.Page
-        Initialized Playwright page instance used for navigation,
-        interaction, and HTML retrieval.
+        Page to drive or, if `own_page` is True, whose browser 
+        context hosts the session's page.
 
     products : list of str
-        Collection of product names or search queries.
-        Leading and trailing whitespace is removed.
-        Empty strings are ignored.
+        Product queries handled by this session.
 
-    result_list : SafeAsyncList
-        Asynchronous thread-safe container where formatted
-        result blocks (successes or errors) are appended.
+    limit_per_product : int
+        Maximum number of items requested per product.
 
-    limit_per_product : int, optional
-        Maximum number of result entries extracted for each
-        product query. Default is 1.
+    learner : SelectorLearner or None
+        Learner observing the session. A learner can be shared by 
+        concurrent sessions on the same store.
+
+    own_page : bool, optional
+        Whether to run in a dedicated page. Default is False.
 
     Returns
     -------
-    None
-        The function does not return a value. It mutates
-        `result_list` by appending formatted entries.
+    list of dict[str, str]
+        Products saved by the model, possibly partial if the 
+        session failed midway.
 
     Raises
     ------
     None
-        Exceptions are handled internally. Any error is
-        converted into a formatted message and appended
-        to `result_list`.s
+        All exceptions are suppressed internally.
     """
 
-    try:
-        await page.goto(provider.url)
-        await provider.close_all_popups(page)
-        await page.wait_for_load_state("load")
-        
-        for item in products:
-            item: str = item.strip()
+    products_data: list[dict[str, str]] = []
 
-            if not item:
-                continue
+    observation: ObservationMode = ObservationMode(
+        settings.COMPUTER_USE_OBSERVATION
+    )
+    system_prompt: str = COMPUTER_USE_SYSTEM_PROMPT
 
-            try:
-                for inputbox in ["textbox", "combobox", "searchbox"]:
-                    try:
-                        await page.get_by_role(
-                            inputbox, 
-                            name = provider.search_texts
-                        ).fill(
-                            item,
-                            timeout = 500
-                        )
-                        await page.keyboard.press("Enter")
-                        break
+    excluded_functions: list[str] = [
+        "drag_and_drop", 
+        "open_web_browser",
+        "key_combination"
+    ]
+    custom_functions: list[Callable[..., Any]] = [
+        save_product
+    ]
 
-                    except PlaywrightTimeoutError:
-                        continue
+    if observation != ObservationMode.SCREENSHOT:
+        system_prompt += COMPUTER_USE_DOM_INSTRUCTIONS
+        custom_functions += [click_element, type_into_element]
 
-                found: str | None = await __wait_for_any_selector(
-                    page, 
-                    provider.result_container
-                )
+    if observation == ObservationMode.DOM:
+        # without screenshots the model cannot aim at coordinates
+        excluded_functions += [
+            "click_at",
+            "hover_at",
+            "scroll_at",
+            "type_text_at"
+        ]
 
-                if not found:
-                    formatted_block = await __format_block(
-                        provider.name,
-                        f"No result found for '{item}'."
-                    )
-                    await result_list.add(formatted_block)
+    async with runtime.session_slot():
+        session_page: Page | None = None
 
-                    continue
-            
-                _ = await __wait_for_any_selector(
-                    page, 
-                    provider.title_classes
-                )
-                _ = await __wait_for_all_selectors(
-                    page, 
-                    dict(provider.availability_classes)
-                )
-                _ = await __wait_for_any_selector(
-                    page, 
-                    provider.price_classes
-                )
+        try:
+            session_page = (
+                await page.context.new_page() if own_page else page
+            )
 
-                await page.wait_for_load_state("load")
+            config: genai.types.GenerateContentConfig = runtime.get_config(
+                system_prompt,
+                excluded_functions,
+                custom_functions
+            )
 
-                html: str = await page.content()
-                soup: BeautifulSoup = BeautifulSoup(html, "html.parser")
+            initial_screenshot: bytes | None = (
+                await session_page.screenshot(type = "png")
+                if observation != ObservationMode.DOM
+                else None
+            )
+            initial_snapshot: str | None = (
+                await take_dom_snapshot(session_page)
+                if observation != ObservationMode.SCREENSHOT
+                else None
+            )
 
-                product_containers: ResultSet[Tag] = soup.select(
-                    found, 
-                    limit = limit_per_product
-                )
-                
-                if not product_containers:
-                    continue
+            formatted_products: str = "\n".join(
+                f"- {p}" for p in products
+            )
 
-                titles: list[str]
-                availabilities: list[str]
-                prices: list[str]
-                links: list[str]
-                
-                titles, availabilities, prices, links = (
-                    await asyncio.gather(
-                        __select_text(
-                            product_containers, 
-                            provider.title_classes
-                        ),
-                        __select_all_text(
-                            product_containers,
-                            dict(provider.availability_classes),
-                            provider.availability_texts
-                        ),
-                        __select_text(
-                            product_containers,
-                            provider.price_classes
-                        ),
-                        __extract_attribute_from_selectors(
-                            product_containers,
-                            provider.product_link_selectors,
-                           ["href"] 
-                        )
-                    )
-                )
+            prompt_filled: str = USER_PROMPT.format(
+                products = formatted_products,
+                store = provider_url,
+                items_per_product = limit_per_product
+            )
 
-                products_data: list[dict[str, str]] = []
+            session: ComputerUseSession = ComputerUseSession(
+                prompt_filled,
+                initial_screenshot,
+                initial_snapshot
+            )
 
-                for name, avail, price, link in zip(
-                    titles, 
-                    availabilities, 
-                    prices,
-                    links
-                ):
-                    if link[0] == "/":
-                        link = provider.url + link
+            await run_computer_use_loop(
+                runtime.client,
+                session_page,
+                session,
+                config,
+                products_data,
+                learner = learner,
+                observation = observation,
+                screenshot_every = settings.COMPUTER_USE_SCREENSHOT_EVERY,
+                domain = normalize_domain(provider_url)
+            )
 
-                    products_data.append({
-                        "name": name,
-                        "availability": avail,
-                        "price": price,
-                        "link": link
-                    })
+        except Exception:
+            pass
 
-                await result_list.add(
-                    await __format_block(
-                        provider.name,
-                        products_data            
-                    )
-                )
+        finally:
+            if own_page and session_page:
+                try:
+                    await session_page.close()
 
-            except Exception as e:
-                await result_list.add(
-                    await __format_block(
-                        provider.name,
-                        f"Error searching '{item}': {e}"
-                    )
-                )
+                except Exception:
+                    pass
 
-    except Exception as e:
-        await result_list.add(
-            await __format_block(
-                provider.name,
-                f"Fatal error: {str(e)}"
-            )
-        )
+    return products_data
 
 
-async def __search_with_computer_use(
+async def __learn_provider(
         provider_url: str,
-        page: Page,
+        learner: SelectorLearner,
         products: list[str],
-        result_list: SafeAsyncList,
-        limit_per_product: int = 1
+        products_data: list[dict[str, str]],
+        limit_per_product: int
     ) -> None:
     """
-    Search for products on a website using an AI-driven computer-use 
-    loop and append formatted results to a shared asynchronous container.
-
-    This function initializes a generative AI client configured for
-    browser-based interaction, builds a prompt describing the requested
-    products, and executes a computer-use session that interacts with
-    the provided Playwright page. Extracted product data is collected
-    into `products_data` and formatted before being appended to
-    `result_list`.
+    Validate or record a provider definition after a successful
+    computer-use run.
 
-    If no product information is gathered, a fallback message is added
-    instead. All exceptions are silently handled to prevent interruption
-    of the calling workflow.
+    If the store already has a candidate definition, it is validated 
+    by replaying the same searches with the scripted pipeline and 
+    comparing the results with the products saved by the model. If 
+    there is no candidate, or the candidate has just been rejected, 
+    the definition inferred by `learner` becomes the new candidate.
 
     Parameters
     ----------
     provider_url : str
-        Base URL of the target website. Used in the generated prompt
-        and in result formatting.
+        URL of the external store.
 
-    page : playwright.async_api.Page
-        Initialized Playwright page instance used as the execution
-        environment for the computer-use loop.
+    learner : SelectorLearner
+        Learner that observed the computer-use session.
 
     products : list of str
-        List of product names or search queries to be included
-        in the generated prompt.
+        Product queries of the session.
 
-    result_list : SafeAsyncList
-        Asynchronous thread-safe list where formatted
-        result blocks are appended.
+    products_data : list of dict[str, str]
+        Products saved by the model during the session.
 
-    limit_per_product : int, optional
-        Maximum number of items requested per product in the
-        generated prompt. Default is 1.
+    limit_per_product : int
+        Maximum number of results requested per product.
 
     Returns
     -------
     None
-        The function does not return a value. It appends
-        formatted results (or a fallback message) to `result_list`.
 
     Raises
     ------
     None
-        All exceptions are suppressed internally. Failures
-        result in an empty `products_data` collection,
-        triggering a fallback message.
-
-    Notes
-    -----
-    The function relies on an AI-driven interaction loop rather than
-    deterministic DOM scraping. The quality and completeness of the
-    results depend on the model's ability to correctly interpret and
-    navigate the webpage.
+        Failures are logged and never reach the caller.
     """
 
-    products_data: list[dict[str, str]] = []
-
-    excluded_functions: list[str] = [
-        "drag_and_drop", 
-        "open_web_browser",
-        "key_combination"
-    ]
-    custom_functions: list[Callable[..., Any]] = [
-        save_product
-    ]
+    domain: str = normalize_domain(provider_url)
 
     try:
-        client: genai.Client = genai.Client()
+        candidate: ProviderDefinition | None = (
+            await get_candidate_definition(domain)
+        )
 
-        config: genai.types.GenerateContentConfig = (
-            generate_content_config(
-                client,
-                COMPUTER_USE_SYSTEM_PROMPT,
-                excluded_functions,
-                custom_functions
+        if candidate:
+            success: bool = await __validate_definition(
+                candidate,
+                products,
+                products_data,
+                limit_per_product
             )
-        )
 
-        initial_screenshot: bytes = await page.screenshot(
-            type = "png"
-        )
+            status: LearnedProviderStatus | None = (
+                await record_validation(domain, success)
+            )
 
-        formatted_products: str = "\n".join(
-            f"- {p}" for p in products
-        )
+            if status != LearnedProviderStatus.REJECTED:
+                return
 
-        prompt_filled: str = USER_PROMPT.format(
-            products = formatted_products,
-            store = provider_url,
-            items_per_product = limit_per_product
+        definition: ProviderDefinition | None = (
+            learner.build_definition(provider_url)
         )
 
-        session: ComputerUseSession = ComputerUseSession(
-            prompt_filled,
-            initial_screenshot
+        if definition:
+            await record_candidate(domain, definition)
+
+    except Exception as e:
+        logger.warning(f"provider learning failed for {domain}: {e}")
+
+
+async def __validate_definition(
+        definition: ProviderDefinition,
+        products: list[str],
+        products_data: list[dict[str, str]],
+        limit_per_product: int
+    ) -> bool:
+    """
+    Check whether a learned definition reproduces the products 
+    saved by a computer-use run.
+
+    The searches are replayed in a dedicated headless browser 
+    with the scripted pipeline. The validation succeeds when at 
+    least half of the links saved by the model are found again.
+
+    Parameters
+    ----------
+    definition : ProviderDefinition
+        Candidate definition to validate.
+
+    products : list of str
+        Product queries of the computer-use run.
+
+    products_data : list of dict[str, str]
+        Products saved by the model.
+
+    limit_per_product : int
+        Maximum number of results extracted per product.
+
+    Returns
+    -------
+    bool
+        `True` if the definition reproduced the run, `False`
+        otherwise (including when it cannot be instantiated).
+    """
+
+    saved_links: list[str] = [
+        p.get("link", "N/A") for p in products_data
+        if p.get("link", "N/A") != "N/A"
+    ]
+
+    if not saved_links:
+        return False
+
+    try:
+        provider: LearnedProvider = await asyncio.to_thread(
+            LearnedProvider,
+            definition
         )
 
-        await run_computer_use_loop(
-            client,
-            page,
-            session,
-            config,
-            products_data
+    except Exception:
+        return False
+
+    found_links: list[str] = []
+
+    async with async_playwright() as apw:
+        page: Page
+        manager: AsyncBrowserContextMaganer = AsyncBrowserContextMaganer(
+            apw
         )
 
-    except:
-        pass
+        _, _, page = await manager.create_browser_context()
+        domain: str = normalize_domain(provider.url)
 
-    finally:
-        if products_data:
-            await result_list.add(
-                await __format_block(
-                    provider_url,
-                    products_data
-                )
-            )
+        try:
+            # paced like the searches, but without a page slot: the 
+            # run being validated may still hold one on the domain
+            async with provider_governor.request(domain):
+                await page.goto(provider.url)
+                await provider.close_all_popups(page)
+                await page.wait_for_load_state("load")
 
-        else:
-            await result_list.add(
-                await __format_block(
-                    provider_url,
-                    "No result found for any of the products."
-                )
-            )
+            for item in products:
+                if not item.strip():
+                    continue
+
+                try:
+                    async with provider_governor.request(domain):
+                        found: list[dict[str, str]] | None = (
+                            await __search_item(
+                                provider,
+                                page,
+                                item.strip(),
+                                limit_per_product
+                            )
+                        )
+
+                except Exception:
+                    found = None
+
+                found_links.extend(p["link"] for p in found or [])
+
+        except Exception:
+            pass
+
+        finally:
+            await close_page_resources(page)
+
+    matched: int = sum(
+        any(links_match(saved, found) for found in found_links)
+        for saved in saved_links
+    )
+
+    return matched * 2 >= len(saved_links)
 
 
 async def __normalize_selectors(
@@ -838,57 +2453,3 @@ async def __extract_attribute_from_selectors(
         results.append(found_val)
 
     return results
-
-
-async def __format_block(
-        provider_name: str,
-        products: list[dict[str, str]] | str
-    ) -> str:
-    """
-    Format product data into a provider-prefixed text block.
-
-    If `products` is a list of dictionaries, each entry
-    is formatted as a single line with fields separated
-    by `" | "` and prefixed by the uppercased provider name.
-
-    If `products` is a string, it is treated as a message
-    and formatted as a single provider-prefixed line.
-
-    Parameters
-    ----------
-    provider_name : str
-        Name of the provider. It is converted to uppercase
-        in the output.
-
-    products : list of dict[str, str] or str
-        Either a list of product dictionaries containing
-        keys such as `"name"`, `"availability"`,
-        `"price"`, and `"link"`, or a plain message string.
-
-    Returns
-    -------
-    str
-        A formatted string containing one or more lines
-        ready for aggregation or display.
-    """
-    
-    if isinstance(products, list):
-        formatted_lines: list[str] = []
-
-        for p in products:
-            line = " | ".join([
-                provider_name.upper(),
-                p.get("name", "N/A"),
-                p.get("availability", "N/A"),
-                p.get("price", "N/A"),
-                p.get("link", "N/A")
-            ])
-
-            formatted_lines.append(line)
-    
-        return "\n".join(formatted_lines)
-    
-    else:
-        return " | ".join(
-            [provider_name.upper(), products]
-        )
\ No newline at end of file
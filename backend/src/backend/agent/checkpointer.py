@@ -0,0 +1,536 @@
+import random
+import zlib
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+from typing import Any, AsyncIterator, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    WRITES_IDX_MAP
+)
+from sqlalchemy import delete, desc, func, select, Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.backend_utils.metrics import metrics
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.chat import Chat
+from backend.database.models.graph_checkpoint import (
+    GraphCheckpoint,
+    GraphCheckpointWrite
+)
+
+
+class SQLAlchemyCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    Asynchronous LangGraph checkpointer stored in the application
+    database.
+
+    Every checkpoint is saved whole (channel values included) in
+    the `graph_checkpoints` table, serialized with the saver's
+    serializer (msgpack for messages) and compressed with zlib.
+    Pending task writes go to `graph_checkpoint_writes`, so that
+    an interrupted turn resumes from its last completed step.
+    Only the newest `keep` checkpoints of each thread are kept.
+
+    Only the asynchronous interface is implemented: the graph
+    must be run with `ainvoke` / `astream`.
+    """
+
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession] = (
+                AsyncSessionLocal
+            ),
+            keep: int = 3,
+            compression_level: int = 6
+        ):
+        """
+        Initialize the saver.
+
+        Parameters
+        ----------
+        session_factory : async_sessionmaker, optional
+            Factory of the sessions used to access the database.
+            Default is the application's session factory.
+
+        keep : int, optional
+            Number of checkpoints kept per thread and namespace.
+            Default is 3.
+
+        compression_level : int, optional
+            zlib compression level of the stored blobs. Default
+            is 6.
+        """
+
+        super().__init__()
+
+        self._session_factory: async_sessionmaker[AsyncSession] = (
+            session_factory
+        )
+        self._keep: int = max(keep, 1)
+        self._compression_level: int = compression_level
+
+
+    def __dump(
+            self,
+            value: Any
+        ) -> tuple[str, bytes]:
+        """
+        Serialize and compress a value.
+        """
+
+        value_type, data = self.serde.dumps_typed(value)
+
+        return value_type, zlib.compress(data, self._compression_level)
+
+
+    def __load(
+            self,
+            value_type: str,
+            data: bytes
+        ) -> Any:
+        """
+        Decompress and deserialize a value.
+        """
+
+        return self.serde.loads_typed((value_type, zlib.decompress(data)))
+
+
+    async def __to_tuple(
+            self,
+            db: AsyncSession,
+            row: GraphCheckpoint
+        ) -> CheckpointTuple:
+        """
+        Build a checkpoint tuple from a stored row and its writes.
+        """
+
+        writes = await db.execute(
+            select(GraphCheckpointWrite)
+            .where(
+                GraphCheckpointWrite.thread_id == row.thread_id,
+                GraphCheckpointWrite.checkpoint_ns == row.checkpoint_ns,
+                GraphCheckpointWrite.checkpoint_id == row.checkpoint_id
+            )
+            .order_by(
+                GraphCheckpointWrite.task_id,
+                GraphCheckpointWrite.idx
+            )
+        )
+
+        def config_of(checkpoint_id: str) -> RunnableConfig:
+            """
+            Return the configuration addressing a checkpoint of
+            the row's thread.
+            """
+
+            return {
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": checkpoint_id
+                }
+            }
+
+        return CheckpointTuple(
+            config = config_of(row.checkpoint_id),
+            checkpoint = self.__load(row.checkpoint_type, row.checkpoint),
+            metadata = self.__load(
+                row.metadata_type,
+                row.checkpoint_metadata
+            ),
+            parent_config = (
+                config_of(row.parent_checkpoint_id)
+                if row.parent_checkpoint_id else None
+            ),
+            pending_writes = [
+                (w.task_id, w.channel, self.__load(w.value_type, w.value))
+                for w in writes.scalars()
+            ]
+        )
+
+
+    async def aget_tuple(
+            self,
+            config: RunnableConfig
+        ) -> CheckpointTuple | None:
+        """
+        Fetch a checkpoint tuple.
+
+        Parameters
+        ----------
+        config : RunnableConfig
+            Configuration with the `thread_id`, and optionally the
+            `checkpoint_ns` and `checkpoint_id`. Without an ID, the
+            newest checkpoint of the thread is returned.
+
+        Returns
+        -------
+        CheckpointTuple or None
+            The checkpoint, or None if there is none.
+        """
+
+        configurable: dict[str, Any] = config["configurable"]
+
+        stmt: Select = (
+            select(GraphCheckpoint)
+            .where(
+                GraphCheckpoint.thread_id == configurable["thread_id"],
+                GraphCheckpoint.checkpoint_ns == configurable.get(
+                    "checkpoint_ns",
+                    ""
+                )
+            )
+        )
+
+        if checkpoint_id := get_checkpoint_id(config):
+            stmt = stmt.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+
+        else:
+            stmt = stmt.order_by(desc(GraphCheckpoint.checkpoint_id)).limit(1)
+
+        async with self._session_factory() as db:
+            row: GraphCheckpoint | None = (
+                (await db.execute(stmt)).scalar_one_or_none()
+            )
+
+            return await self.__to_tuple(db, row) if row else None
+
+
+    async def alist(
+            self,
+            config: RunnableConfig | None,
+            *,
+            filter: dict[str, Any] | None = None,
+            before: RunnableConfig | None = None,
+            limit: int | None = None
+        ) -> AsyncIterator[CheckpointTuple]:
+        """
+        List checkpoints, newest first.
+
+        Parameters
+        ----------
+        config : RunnableConfig or None
+            Configuration selecting the thread (and optionally the
+            namespace and checkpoint).
+
+        filter : dict or None, optional
+            Metadata values the checkpoints must match.
+
+        before : RunnableConfig or None, optional
+            Only checkpoints older than this one are listed.
+
+        limit : int or None, optional
+            Maximum number of checkpoints listed.
+
+        Yields
+        ------
+        CheckpointTuple
+            The matching checkpoints.
+        """
+
+        stmt: Select = select(GraphCheckpoint).order_by(
+            desc(GraphCheckpoint.checkpoint_id)
+        )
+
+        if config:
+            configurable: dict[str, Any] = config["configurable"]
+
+            stmt = stmt.where(
+                GraphCheckpoint.thread_id == configurable["thread_id"]
+            )
+
+            if "checkpoint_ns" in configurable:
+                stmt = stmt.where(
+                    GraphCheckpoint.checkpoint_ns
+                    == configurable["checkpoint_ns"]
+                )
+
+            if checkpoint_id := get_checkpoint_id(config):
+                stmt = stmt.where(
+                    GraphCheckpoint.checkpoint_id == checkpoint_id
+                )
+
+        if before and (before_id := get_checkpoint_id(before)):
+            stmt = stmt.where(GraphCheckpoint.checkpoint_id < before_id)
+
+        async with self._session_factory() as db:
+            rows: list[GraphCheckpoint] = list(
+                (await db.execute(stmt)).scalars()
+            )
+
+            for row in rows:
+                if limit is not None and limit <= 0:
+                    break
+
+                checkpoint_tuple: CheckpointTuple = await self.__to_tuple(
+                    db,
+                    row
+                )
+
+                if filter and not all(
+                    checkpoint_tuple.metadata.get(k) == v
+                    for k, v in filter.items()
+                ):
+                    continue
+
+                if limit is not None:
+                    limit -= 1
+
+                yield checkpoint_tuple
+
+
+    async def aput(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        """
+        Store a checkpoint and prune the oldest ones of its thread.
+
+        Parameters
+        ----------
+        config : RunnableConfig
+            Configuration of the parent checkpoint.
+
+        checkpoint : Checkpoint
+            The checkpoint to store.
+
+        metadata : CheckpointMetadata
+            Metadata of the checkpoint.
+
+        new_versions : ChannelVersions
+            Channel versions written by this step (unused: the
+            channel values are stored with every checkpoint).
+
+        Returns
+        -------
+        RunnableConfig
+            Configuration addressing the stored checkpoint.
+        """
+
+        configurable: dict[str, Any] = config["configurable"]
+        thread_id: str = configurable["thread_id"]
+        checkpoint_ns: str = configurable.get("checkpoint_ns", "")
+
+        checkpoint_type, checkpoint_data = self.__dump(checkpoint)
+        metadata_type, metadata_data = self.__dump(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        async with self._session_factory() as db:
+            await db.merge(
+                GraphCheckpoint(
+                    thread_id = thread_id,
+                    checkpoint_ns = checkpoint_ns,
+                    checkpoint_id = checkpoint["id"],
+                    parent_checkpoint_id = configurable.get("checkpoint_id"),
+                    checkpoint_type = checkpoint_type,
+                    checkpoint = checkpoint_data,
+                    metadata_type = metadata_type,
+                    checkpoint_metadata = metadata_data
+                )
+            )
+
+            await self.__prune(db, thread_id, checkpoint_ns)
+            await db.commit()
+
+        metrics.observe("checkpoint.bytes", len(checkpoint_data))
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"]
+            }
+        }
+
+
+    async def aput_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        """
+        Store the pending writes of a task.
+
+        Parameters
+        ----------
+        config : RunnableConfig
+            Configuration of the checkpoint the writes belong to.
+
+        writes : sequence of tuple[str, Any]
+            Channel and value of each write.
+
+        task_id : str
+            Identifier of the task.
+
+        task_path : str, optional
+            Path of the task in the graph. Default is "".
+        """
+
+        configurable: dict[str, Any] = config["configurable"]
+
+        async with self._session_factory() as db:
+            for position, (channel, value) in enumerate(writes):
+                value_type, value_data = self.__dump(value)
+
+                await db.merge(
+                    GraphCheckpointWrite(
+                        thread_id = configurable["thread_id"],
+                        checkpoint_ns = configurable.get("checkpoint_ns", ""),
+                        checkpoint_id = configurable["checkpoint_id"],
+                        task_id = task_id,
+                        idx = WRITES_IDX_MAP.get(channel, position),
+                        channel = channel,
+                        value_type = value_type,
+                        value = value_data,
+                        task_path = task_path
+                    )
+                )
+
+            await db.commit()
+
+
+    async def adelete_thread(
+            self,
+            thread_id: str
+        ) -> None:
+        """
+        Delete all checkpoints and writes of a thread.
+
+        Parameters
+        ----------
+        thread_id : str
+            The thread to delete.
+        """
+
+        async with self._session_factory() as db:
+            await db.execute(
+                delete(GraphCheckpointWrite)
+                .where(GraphCheckpointWrite.thread_id == thread_id)
+            )
+            await db.execute(
+                delete(GraphCheckpoint)
+                .where(GraphCheckpoint.thread_id == thread_id)
+            )
+            await db.commit()
+
+
+    async def adelete_orphans(
+            self,
+            older_than: timedelta
+        ) -> int:
+        """
+        Delete the threads whose chat no longer exists.
+
+        Parameters
+        ----------
+        older_than : timedelta
+            Only threads whose newest checkpoint is older than 
+            this are deleted, so that the checkpoints of a chat 
+            that is being created are kept.
+
+        Returns
+        -------
+        int
+            The number of deleted threads.
+        """
+
+        threshold: datetime = datetime.now(timezone.utc) - older_than
+
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(GraphCheckpoint.thread_id)
+                .where(GraphCheckpoint.thread_id.not_in(select(Chat.chat_id)))
+                .group_by(GraphCheckpoint.thread_id)
+                .having(func.max(GraphCheckpoint.created_at) < threshold)
+            )
+
+            thread_ids: list[str] = list(result.scalars())
+
+        for thread_id in thread_ids:
+            await self.adelete_thread(thread_id)
+
+        return len(thread_ids)
+
+
+    def get_next_version(
+            self,
+            current: str | None,
+            channel: None
+        ) -> str:
+        """
+        Return the next version of a channel, as a sortable string.
+        """
+
+        if current is None:
+            current_version: int = 0
+
+        elif isinstance(current, int):
+            current_version = current
+
+        else:
+            current_version = int(current.split(".")[0])
+
+        return f"{current_version + 1:032}.{random.random():016}"
+
+
+    async def __prune(
+            self,
+            db: AsyncSession,
+            thread_id: str,
+            checkpoint_ns: str
+        ) -> None:
+        """
+        Delete the checkpoints of a thread older than the newest
+        `keep`, together with their writes.
+        """
+
+        stale = await db.execute(
+            select(GraphCheckpoint.checkpoint_id)
+            .where(
+                GraphCheckpoint.thread_id == thread_id,
+                GraphCheckpoint.checkpoint_ns == checkpoint_ns
+            )
+            .order_by(desc(GraphCheckpoint.checkpoint_id))
+            .offset(self._keep)
+        )
+
+        stale_ids: list[str] = list(stale.scalars())
+
+        if not stale_ids:
+            return
+
+        for model in (GraphCheckpointWrite, GraphCheckpoint):
+            await db.execute(
+                delete(model)
+                .where(
+                    model.thread_id == thread_id,
+                    model.checkpoint_ns == checkpoint_ns,
+                    model.checkpoint_id.in_(stale_ids)
+                )
+            )
+
+        metrics.increment("checkpoint.pruned", len(stale_ids))
+
+
+checkpointer: SQLAlchemyCheckpointSaver = SQLAlchemyCheckpointSaver(
+    keep = settings.CHECKPOINT_KEEP
+)
@@ -0,0 +1,251 @@
+import asyncio
+import time
+from logging import (
+    getLogger,
+    Logger
+)
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from backend.agent.history.message_adapter import to_langchain_messages
+from backend.agent.prompts import HISTORY_SUMMARY_PROMPT
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.telemetry import record_llm_call
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.chat import Chat
+from backend.database.models.message import Message
+from backend.database.repositories import (
+    ChatRepository,
+    MessageRepository
+)
+
+
+SUMMARY_MODEL: str = "gemini-2.5-flash-lite"
+
+logger: Logger = getLogger("history-window")
+
+_summarizer: ChatGoogleGenerativeAI | None = None
+_summarizing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def estimate_tokens(
+        text: str
+    ) -> int:
+    """
+    Estimate the number of tokens of a text (about four
+    characters per token).
+    """
+
+    return len(text) // 4 + 1
+
+
+async def load_history(
+        client_id: str,
+        chat_id: str,
+        exclude_id: int | None = None
+    ) -> list[BaseMessage]:
+    """
+    Load the conversation history to send to the agent.
+
+    Only the messages not yet folded into the chat summary are
+    read, at most `HISTORY_WINDOW_MESSAGES` of them, and the
+    oldest are dropped until the window fits
+    `HISTORY_TOKEN_BUDGET` (the newest message is always kept).
+    The summary, if any, is prepended as a system message. When
+    the window is full, the summary is updated in the background
+    so that the next turns start from a shorter window.
+
+    Parameters
+    ----------
+    client_id : str
+        Identifier of the client.
+
+    chat_id : str
+        Identifier of the chat.
+
+    exclude_id : int | None, optional
+        ID of a message left out of the window, e.g. the user 
+        message of the current turn, which the agent receives 
+        separately. Default is None.
+
+    Returns
+    -------
+    list[BaseMessage]
+        The summary (if any) followed by the recent messages,
+        oldest first.
+    """
+
+    async with AsyncSessionLocal() as db:
+        chat: Chat | None = await db.get(Chat, chat_id)
+
+        summary: str | None = chat.summary if chat else None
+        summary_message_id: int | None = (
+            chat.summary_message_id if chat else None
+        )
+
+        recent: list[Message] = await MessageRepository.get_recent_messages(
+            db,
+            client_id,
+            chat_id,
+            limit = settings.HISTORY_WINDOW_MESSAGES,
+            after_id = summary_message_id,
+            exclude_id = exclude_id
+        )
+
+    if len(recent) >= settings.HISTORY_WINDOW_MESSAGES:
+        schedule_summary_update(client_id, chat_id)
+
+    budget: int = settings.HISTORY_TOKEN_BUDGET
+
+    if summary:
+        budget -= estimate_tokens(summary)
+
+    window: list[Message] = []
+
+    for message in reversed(recent):
+        budget -= estimate_tokens(message.content)
+
+        if budget < 0 and window:
+            break
+
+        window.insert(0, message)
+
+    metrics.observe("history.window.messages", len(window))
+    metrics.observe(
+        "history.window.tokens",
+        settings.HISTORY_TOKEN_BUDGET - max(budget, 0)
+    )
+
+    history: list[BaseMessage] = to_langchain_messages(window)
+
+    if summary:
+        history.insert(
+            0,
+            SystemMessage(
+                content = f"Summary of the earlier conversation:\n{summary}"
+            )
+        )
+
+    return history
+
+
+def schedule_summary_update(
+        client_id: str,
+        chat_id: str
+    ) -> None:
+    """
+    Update the summary of a chat in the background, unless an
+    update of the same chat is already running.
+
+    Parameters
+    ----------
+    client_id : str
+        Identifier of the client.
+
+    chat_id : str
+        Identifier of the chat.
+    """
+
+    if chat_id in _summarizing:
+        return
+
+    _summarizing.add(chat_id)
+
+    task: asyncio.Task = asyncio.create_task(
+        update_summary(client_id, chat_id)
+    )
+
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(lambda _: _summarizing.discard(chat_id))
+
+
+async def update_summary(
+        client_id: str,
+        chat_id: str
+    ) -> None:
+    """
+    Fold the older unsummarized messages of a chat into its
+    summary.
+
+    All messages after the current summary except the newest
+    `HISTORY_WINDOW_MESSAGES // 2` are summarized together with
+    the previous summary, so each message is read by the model
+    only once. Failures are logged and leave the summary as it
+    was.
+
+    Parameters
+    ----------
+    client_id : str
+        Identifier of the client.
+
+    chat_id : str
+        Identifier of the chat.
+    """
+
+    global _summarizer
+
+    keep: int = settings.HISTORY_WINDOW_MESSAGES // 2
+
+    try:
+        async with AsyncSessionLocal() as db:
+            chat: Chat | None = await db.get(Chat, chat_id)
+
+            if not chat:
+                return
+
+            pending: list[Message] = (
+                await MessageRepository.get_recent_messages(
+                    db,
+                    client_id,
+                    chat_id,
+                    after_id = chat.summary_message_id
+                )
+            )
+
+            to_fold: list[Message] = pending[:len(pending) - keep]
+
+            if not to_fold:
+                return
+
+            if _summarizer is None:
+                _summarizer = ChatGoogleGenerativeAI(
+                    model = SUMMARY_MODEL,
+                    temperature = 0
+                )
+
+            prompt: str = HISTORY_SUMMARY_PROMPT.format(
+                summary = chat.summary or "(empty)",
+                messages = "\n\n".join(
+                    f"{m.role}: {m.content}" for m in to_fold
+                )
+            )
+
+            started: float = time.perf_counter()
+            response = await _summarizer.ainvoke(prompt)
+            usage: dict = response.usage_metadata or {}
+
+            record_llm_call(
+                model = SUMMARY_MODEL,
+                component = "history_summary",
+                input_tokens = usage.get("input_tokens"),
+                output_tokens = usage.get("output_tokens"),
+                latency_ms = (time.perf_counter() - started) * 1000
+            )
+
+            await ChatRepository.update_summary(
+                db,
+                chat_id,
+                response.text.strip(),
+                to_fold[-1].id
+            )
+            await db.commit()
+
+        metrics.increment("history.summary.updates")
+        metrics.increment("history.summary.messages", len(to_fold))
+
+    except Exception as e:
+        logger.warning(f"summary update failed for chat {chat_id}: {e}")
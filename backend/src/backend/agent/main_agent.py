@@ -1,11 +1,18 @@
 
 import asyncio
+import time
 
 from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
     AnyMessage,
     HumanMessage, 
-    SystemMessage
+    message_chunk_to_message,
+    SystemMessage,
+    ToolMessage
 )
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import (
@@ -16,16 +23,43 @@ from langgraph.graph import (
 )
 from langgraph.prebuilt import ToolNode, tools_condition
 
-from backend.agent.agent_tools import search_products
+from backend.agent.agent_tools import (
+    recall_search_results,
+    search_products
+)
+from backend.agent.checkpointer import checkpointer
 from backend.agent.prompts import SYSTEM_PROMPT
+from backend.agent.rendering import (
+    detect_language,
+    needs_explanation,
+    render_quotation
+)
+from backend.backend_utils.progress import (
+    current_progress,
+    JobProgress
+)
+from backend.backend_utils.quotes import (
+    load_entries,
+    QuoteRecord,
+    SearchEntry
+)
+from backend.backend_utils.telemetry import record_llm_call
 from backend.config import settings
 
 
+LLM_MODEL: str = "gemini-2.5-flash"
+
 llm: ChatGoogleGenerativeAI = ChatGoogleGenerativeAI(
-    model = "gemini-2.5-flash",
+    model = LLM_MODEL,
     temperature = 0.3
 )
 
+# the model reads the compact text, the records travel as artifacts
+tools: list[BaseTool] = [
+    tool(search_products, response_format = "content_and_artifact"),
+    tool(recall_search_results, response_format = "content_and_artifact")
+]
+
 
 async def agent_node(
         state: MessagesState
@@ -36,10 +70,12 @@ async def agent_node(
 
     The function prepends a system-level instruction to the 
     current conversation state and invokes the language model 
-    with the `search_products` tool bound. The model may decide to:
+    with the `search_products` and `recall_search_results` tools 
+    bound. The model may decide to:
 
     - Produce a direct response to the user.
-    - Call the scraping tool.
+    - Call the scraping tool, or read the results of earlier 
+      searches of the chat.
     - Call the tool and then synthesize a response using its output.
 
     The returned value is structured to be compatible with the
@@ -67,7 +103,10 @@ async def agent_node(
     -----
     The language model instance must already be configured
     with the appropriate provider, temperature, and credentials.
-    Tool binding occurs dynamically at invocation time.
+    Tool binding occurs dynamically at invocation time. Token usage 
+    and latency of every invocation are recorded with 
+    `record_llm_call`. The response is streamed, and its text is 
+    sent to the clients of the current job as it is generated.
     """
 
     system_message: SystemMessage = SystemMessage(
@@ -76,15 +115,188 @@ async def agent_node(
 
     messages: list[AnyMessage] = [system_message] + state["messages"]
 
-    response = await llm.bind_tools(
-        [search_products]
-    ).ainvoke(
-        messages
+    progress: JobProgress | None = current_progress()
+    started: float = time.perf_counter()
+    chunk: AIMessageChunk | None = None
+
+    async for delta in llm.bind_tools(tools).astream(messages):
+        chunk = delta if chunk is None else chunk + delta
+
+        if progress:
+            progress.answer_token(delta.text)
+
+    response: AIMessage = message_chunk_to_message(
+        chunk if chunk is not None else AIMessageChunk(content = "")
+    )
+
+    usage: dict = response.usage_metadata or {}
+
+    record_llm_call(
+        model = LLM_MODEL,
+        component = "agent",
+        input_tokens = usage.get("input_tokens"),
+        output_tokens = usage.get("output_tokens"),
+        latency_ms = (time.perf_counter() - started) * 1000
     )
 
     return {"messages": [response]}
 
 
+def __last_search(
+        state: MessagesState
+    ) -> tuple[list[str], list[ToolMessage]]:
+    """
+    Return the products requested by the last tool calls and the
+    tool messages answering them.
+    """
+
+    tool_messages: list[ToolMessage] = []
+    queries: list[str] = []
+
+    for message in reversed(state["messages"]):
+        if isinstance(message, ToolMessage):
+            tool_messages.insert(0, message)
+            continue
+
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls:
+                queries.extend(tool_call["args"].get("products", []))
+
+        break
+
+    return queries, tool_messages
+
+
+def __last_user_text(
+        state: MessagesState
+    ) -> str | None:
+    """
+    Return the text of the last user message, if any.
+    """
+
+    for message in reversed(state["messages"]):
+        if isinstance(message, HumanMessage):
+            return message.text
+
+    return None
+
+
+def __tool_entries(
+        tool_messages: list[ToolMessage]
+    ) -> list[SearchEntry]:
+    """
+    Return the search entries carried as artifacts by tool messages.
+    """
+
+    return [
+        entry
+        for message in tool_messages
+        for entry in load_entries(message.artifact)
+    ]
+
+
+def route_after_search(
+        state: MessagesState,
+        config: RunnableConfig
+    ) -> str:
+    """
+    Choose how the search results are turned into the answer.
+
+    The `render_mode` configurable (or the `RESULT_RENDERING` 
+    setting) selects it: `"template"` always renders the results 
+    directly, `"llm"` always hands them back to the model, and 
+    `"auto"` renders them unless the last user message asks for 
+    an explanation, a comparison or advice, or is not in a 
+    language the template is written in (see `detect_language`), 
+    since the answer must be in the user's language. Only fresh 
+    `search_products` results are rendered: results recalled with 
+    `recall_search_results` and tool outputs without quote records 
+    (e.g. no store selected) always go back to the model.
+
+    Parameters
+    ----------
+    state : MessagesState
+        The current graph state.
+
+    config : RunnableConfig
+        Configuration of the run.
+
+    Returns
+    -------
+    str
+        `"render"` or `"agent"`.
+    """
+
+    mode: str = (
+        config.get("configurable", {}).get("render_mode")
+        or 
+        settings.RESULT_RENDERING
+    )
+
+    _, tool_messages = __last_search(state)
+
+    if mode == "llm" or any(
+        message.name != search_products.__name__
+        for message in tool_messages
+    ):
+        return "agent"
+
+    if not any(
+        isinstance(entry, QuoteRecord) 
+        for entry in __tool_entries(tool_messages)
+    ):
+        return "agent"
+
+    if mode == "template":
+        return "render"
+
+    text: str | None = __last_user_text(state)
+
+    if (
+        text is None 
+        or needs_explanation(text) 
+        or detect_language(text) is None
+    ):
+        return "agent"
+
+    return "render"
+
+
+async def render_node(
+        state: MessagesState
+    ) -> dict:
+    """
+    Turn the search results into the final answer without a 
+    second model call, with the labels in the language of the 
+    last user message (English if it cannot be told).
+
+    Parameters
+    ----------
+    state : MessagesState
+        The current graph state, ending with the tool messages 
+        of the search.
+
+    Returns
+    -------
+    dict
+        A dictionary with a single `"messages"` key containing 
+        the rendered answer.
+    """
+
+    queries: list[str]
+    tool_messages: list[ToolMessage]
+
+    queries, tool_messages = __last_search(state)
+
+    content: str = render_quotation(
+        __tool_entries(tool_messages),
+        queries,
+        detect_language(__last_user_text(state) or "") or "en"
+    )
+
+    return {"messages": [AIMessage(content = content)]}
+
+
 # graph assembly
 workflow = StateGraph(MessagesState)
 
@@ -92,9 +304,11 @@ workflow.add_node("agent", agent_node)
 
 workflow.add_node(
     "website_search",
-    ToolNode([search_products])
+    ToolNode(tools)
 )
 
+workflow.add_node("render", render_node)
+
 workflow.add_edge(START, "agent")
 
 workflow.add_conditional_edges(
@@ -106,10 +320,23 @@ workflow.add_conditional_edges(
     }
 )
 
-workflow.add_edge("website_search", "agent")
+workflow.add_conditional_edges(
+    "website_search",
+    route_after_search,
+    {
+        "render": "render",
+        "agent": "agent"
+    }
+)
+
+workflow.add_edge("render", END)
 
 graph = workflow.compile(
-    checkpointer = InMemorySaver() if settings.CLI_MODE else None
+    checkpointer = (
+        InMemorySaver() if settings.CLI_MODE 
+        else checkpointer if settings.CHECKPOINTER_ENABLED 
+        else None
+    )
 )
 
 
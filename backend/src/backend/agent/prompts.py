@@ -34,7 +34,16 @@ _ui_instructions: str = (
     "without mentioning store selection.\n\n"
 
     "When a search is requested, use the `search_products` tool to "
-    "perform the search.\n\n"
+    "perform the search. Leave its `stores` argument empty to search "
+    "every selected store; set it only when the user asks about "
+    "specific stores (e.g. to check one store again).\n\n"
+
+    "If the products were already searched in this conversation and "
+    "the user asks a follow-up question about them (e.g. a price, an "
+    "availability or a link), use the `recall_search_results` tool "
+    "instead, which reads the stored results without contacting the "
+    "stores. Search again only if the user asks for updated results "
+    "or the stored ones do not cover the products.\n\n"
 )
 
 
@@ -194,6 +203,9 @@ COMPUTER_USE_SYSTEM_PROMPT: str = (
     "way. Copy the full URL exactly as displayed, including protocol "
     "('https://' or 'http://'), subdomain, path, and query parameters.\n\n"
 
+    "Set the `query` of `save_product` to the product code or product "
+    "name, exactly as received, whose search found the product.\n\n"
+
     "When you have processed all products in the user's list and called "
     "'save_product' for each one, you must explicitly state 'TASK_FINISHED' "
     "as your final response.\n\n"
@@ -207,10 +219,40 @@ COMPUTER_USE_SYSTEM_PROMPT: str = (
 )
 
 
+COMPUTER_USE_DOM_INSTRUCTIONS: str = (
+    "Besides (or instead of) screenshots, you receive a text snapshot "
+    "of the page. It starts with the current URL and title, followed by "
+    "one line per visible element. Interactive elements are prefixed by "
+    "an ID in square brackets, e.g. '[12] link \"iPhone 16 128GB\" -> "
+    "https://...'. Prefer the `click_element` and `type_into_element` "
+    "tools with these IDs over coordinate-based actions. IDs are only "
+    "valid for the snapshot they appear in: after a navigation, use the "
+    "IDs of the latest snapshot. The URL shown after '->' for a link, or "
+    "the URL at the top of the snapshot while a product page is open, "
+    "counts as the address bar for the `save_product` link.\n\n"
+)
+
+
 USER_PROMPT: str = (
     "Search for the following product(s):\n"
     "{products}\n\n"
     "Use ONLY the following website to perform the search:\n"
     "* {store}\n\n"
     "For each product, search {items_per_product} results."
-)
\ No newline at end of file
+)
+
+
+HISTORY_SUMMARY_PROMPT: str = (
+    "You maintain the running summary of a conversation between a user "
+    "and an assistant that prepares quotations by searching products in "
+    "online stores. Update the summary with the new messages below.\n\n"
+    "Keep: the products the user asked for (with their exact codes and "
+    "names), the stores involved, prices, availability and links that "
+    "were found, and any preference or decision the user expressed. "
+    "Drop greetings and formatting. Write in the user's language, as "
+    "plain text, in at most 200 words.\n\n"
+    "Current summary:\n"
+    "{summary}\n\n"
+    "New messages:\n"
+    "{messages}"
+)
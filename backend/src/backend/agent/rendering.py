@@ -0,0 +1,265 @@
+import re
+
+from backend.backend_utils.quotes import (
+    match_query,
+    ProviderNotice,
+    QuoteRecord,
+    SearchEntry
+)
+
+
+# words opening a question: they only count at the start of a
+# sentence, since most of them ("che", "come") are common elsewhere
+_QUESTION_STARTS: frozenset[str] = frozenset({
+    # english
+    "what", "which", "why", "how", "who", "when", "where", "should",
+    "can", "could", "is", "are", "does", "do",
+    # italian
+    "cosa", "che", "quale", "quali", "qual", "perché", "perche", 
+    "come", "quando", "dove", "chi", "quanto", "quanti"
+})
+# explicit requests of a comparison, an explanation or an advice,
+# matched anywhere in the message
+_ADVICE_PHRASES: re.Pattern = re.compile(
+    r"\b(?:"
+    # english
+    r"compare|comparison|explain|recommend|recommendation|"
+    r"difference|differences|is better|better than|which one|"
+    # italian
+    r"confronta|confrontare|confronto|spiega|spiegami|spiegare|"
+    r"consiglia|consigliami|consigliare|consiglio|conviene|"
+    r"convenga|differenza|differenze|è meglio|meglio di"
+    r")\b"
+)
+# common words telling the language of a message, for the
+# languages the quotation template is written in
+_LANGUAGE_WORDS: dict[str, frozenset[str]] = {
+    "en": frozenset({
+        "the", "an", "of", "for", "and", "with", "to", "on", "is",
+        "are", "find", "search", "look", "price", "prices", "please",
+        "my", "want", "need", "show", "get", "hello", "hi",
+        "cheapest", "available"
+    }),
+    "it": frozenset({
+        "il", "lo", "la", "le", "gli", "di", "del", "della", "dei",
+        "delle", "per", "con", "un", "una", "uno", "e", "è", "cerca",
+        "cercami", "trova", "trovami", "prezzo", "prezzi", "mi", "voglio",
+        "vorrei", "dammi", "mostra", "ciao", "salve", "grazie",
+        "disponibile", "economico"
+    })
+}
+# labels of the quotation template, per language
+_LABELS: dict[str, dict[str, str]] = {
+    "en": {
+        "header": "| Item | Store | Product | Availability | Price | Link |",
+        "view": "View product",
+        "best": "Best price per item",
+        "none": "No result found for {}."
+    },
+    "it": {
+        "header": (
+            "| Articolo | Negozio | Prodotto | Disponibilità | Prezzo "
+            "| Link |"
+        ),
+        "view": "Vedi prodotto",
+        "best": "Miglior prezzo per articolo",
+        "none": "Nessun risultato trovato per {}."
+    }
+}
+_SENTENCE_END: re.Pattern = re.compile(r"[.!;:\n]+")
+_TOKEN: re.Pattern = re.compile(r"[^\W_]+")
+
+
+def needs_explanation(
+        user_input: str
+    ) -> bool:
+    """
+    Tell whether a message asks for more than the quotation itself.
+
+    Parameters
+    ----------
+    user_input : str
+        The message of the user.
+
+    Returns
+    -------
+    bool
+        `True` if the message contains a question mark, a sentence 
+        starting with a question word, or a phrase asking for an 
+        explanation, a comparison or an advice, in which case the 
+        results must be presented by the model.
+    """
+
+    if "?" in user_input:
+        return True
+
+    text: str = user_input.casefold()
+
+    if _ADVICE_PHRASES.search(text):
+        return True
+
+    for sentence in _SENTENCE_END.split(text):
+        tokens: list[str] = _TOKEN.findall(sentence)
+
+        if tokens and tokens[0] in _QUESTION_STARTS:
+            return True
+
+    return False
+
+
+def detect_language(
+        user_input: str
+    ) -> str | None:
+    """
+    Tell the language of a message among those the quotation 
+    template is written in.
+
+    Parameters
+    ----------
+    user_input : str
+        The message of the user.
+
+    Returns
+    -------
+    str or None
+        `"en"` or `"it"`, whichever has more common words in the 
+        message, or `None` if neither does (e.g. a message made 
+        only of product codes).
+    """
+
+    tokens: list[str] = _TOKEN.findall(user_input.casefold())
+    scores: dict[str, int] = {
+        language: sum(token in words for token in tokens)
+        for language, words in _LANGUAGE_WORDS.items()
+    }
+    best: int = max(scores.values())
+
+    if not best or list(scores.values()).count(best) > 1:
+        return None
+
+    return max(scores, key = scores.__getitem__)
+
+
+def __cheaper(
+        record: QuoteRecord,
+        other: QuoteRecord
+    ) -> bool:
+    """
+    Tell whether a record is cheaper than another. Prices in two
+    different known currencies are not compared.
+    """
+
+    if record.currency and other.currency and (
+        record.currency != other.currency
+    ):
+        return False
+
+    return record.amount < other.amount
+
+
+def __cell(
+        value: str
+    ) -> str:
+    """
+    Escape a value for a markdown table cell.
+    """
+
+    return value.replace("|", "\\|").replace("\n", " ").strip()
+
+
+def render_quotation(
+        entries: list[SearchEntry],
+        queries: list[str],
+        language: str = "en"
+    ) -> str:
+    """
+    Render the results of `find_quotes` as the final answer.
+
+    Quote records are shown in a markdown table with the item 
+    they answer, followed by the best price found for each item 
+    (in the currency of the first priced result) and by the 
+    provider notices (e.g. nothing found, login 
+    failures).
+
+    Parameters
+    ----------
+    entries : list of SearchEntry
+        Quote records and provider notices.
+
+    queries : list of str
+        The searched items.
+
+    language : str, optional
+        Language of the labels, `"en"` or `"it"` (see 
+        `detect_language`). Default is `"en"`.
+
+    Returns
+    -------
+    str
+        The markdown answer.
+    """
+
+    labels: dict[str, str] = _LABELS.get(language, _LABELS["en"])
+    rows: list[str] = []
+    notes: list[str] = []
+    best: dict[str, QuoteRecord] = {}
+
+    for entry in entries:
+        provider: str = entry.provider.upper()
+
+        if isinstance(entry, ProviderNotice):
+            notes.append(f"- **{provider}**: {entry.message}")
+            continue
+
+        item: str | None = entry.query or match_query(entry.title, queries)
+
+        rows.append(
+            "| " + " | ".join([
+                __cell(item or "-"),
+                f"**{__cell(provider)}**",
+                __cell(entry.title),
+                __cell(entry.availability),
+                __cell(entry.price),
+                (
+                    f"[{labels['view']}]({entry.link})" 
+                    if entry.link else "N/A"
+                )
+            ]) + " |"
+        )
+
+        if item and entry.amount is not None and (
+            item not in best or __cheaper(entry, best[item])
+        ):
+            best[item] = entry
+
+    if not rows and not notes:
+        return labels["none"].format(
+            ", ".join(f"'{q}'" for q in queries)
+        )
+
+    sections: list[str] = []
+
+    if rows:
+        sections.append(
+            labels["header"] + "\n"
+            "| --- | --- | --- | --- | --- | --- |\n"
+            + "\n".join(rows)
+        )
+
+    if best:
+        sections.append(
+            f"**{labels['best']}**\n"
+            + "\n".join(
+                "- {}: {} (**{}**)".format(
+                    item,
+                    best[item].price,
+                    best[item].provider.upper()
+                )
+                for item in dict.fromkeys([*queries, *best]) if item in best
+            )
+        )
+
+    if notes:
+        sections.append("\n".join(notes))
+
+    return "\n\n".join(sections)
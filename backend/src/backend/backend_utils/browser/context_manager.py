@@ -587,7 +587,7 @@ class AsyncBrowserContextMaganer:
                         True
                     )
 
-            except:
+            except Exception:
                 raise LoginFailedException(provider)
                 
         return context
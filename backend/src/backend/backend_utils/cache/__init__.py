@@ -0,0 +1,6 @@
+from backend.backend_utils.cache.quote_cache import (
+    CachedQuote,
+    quote_cache,
+    QuoteCache,
+    QuoteKey
+)
\ No newline at end of file
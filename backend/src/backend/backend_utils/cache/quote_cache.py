@@ -0,0 +1,254 @@
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.quotes import QuoteRecord
+from backend.config import settings
+
+
+QuoteKey = tuple[str, str, int, str | None]
+
+
+class CachedQuote(NamedTuple):
+    """
+    Result of a cache lookup.
+
+    Attributes
+    ----------
+    records : list of QuoteRecord
+        The cached records, timestamped at the original search.
+
+    stale : bool
+        Whether the entry is past its TTL and should be refreshed.
+    """
+
+    records: list[QuoteRecord]
+    stale: bool
+
+
+class QuoteCache:
+    """
+    In-process cache of search results, placed between the agent
+    tool and the providers.
+
+    Entries are keyed by provider, normalized query and number of
+    items requested. Quotes from login-gated providers, whose
+    prices may depend on the client's account, are additionally
+    scoped by client.
+
+    Each entry is fresh for its TTL and then stale for a further
+    grace period. Stale entries are still served, so the caller
+    can answer immediately and refresh them in the background
+    (stale-while-revalidate). Lookups are counted in the
+    `quote_cache.lookups` metric, labelled by provider and outcome
+    (`hit`, `stale` or `miss`).
+    """
+
+
+    def __init__(
+            self,
+            max_entries: int = 2000
+        ):
+        """
+        Initialize an empty cache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of entries. The least recently used
+            entries are evicted first. Default is 2000.
+
+        Attributes
+        ----------
+        _entries : OrderedDict
+            Cached records with their freshness and expiry
+            deadlines, in least-recently-used order.
+
+        _refreshing : set
+            Keys with a background refresh in progress.
+        """
+
+        self._max_entries: int = max_entries
+        self._entries: OrderedDict[QuoteKey, dict[str, Any]] = OrderedDict()
+        self._refreshing: set[QuoteKey] = set()
+
+
+    @staticmethod
+    def make_key(
+            provider_name: str,
+            query: str | list[str],
+            items_per_store: int,
+            client_id: str | None = None
+        ) -> QuoteKey:
+        """
+        Build the cache key of a search.
+
+        Parameters
+        ----------
+        provider_name : str
+            Name of the provider, or URL of an external store.
+
+        query : str or list of str
+            Product query, or the queries of a search that cannot
+            be split per product (e.g. a computer-use session).
+
+        items_per_store : int
+            Number of results requested per product.
+
+        client_id : str or None, optional
+            Client the quote belongs to. Pass it only for
+            login-gated providers. Default is None.
+
+        Returns
+        -------
+        QuoteKey
+            Hashable key. Queries are compared case-insensitively
+            and with collapsed whitespace.
+        """
+
+        queries: list[str] = [query] if isinstance(query, str) else query
+
+        return (
+            provider_name.strip().lower(),
+            "\n".join(" ".join(q.casefold().split()) for q in queries),
+            items_per_store,
+            client_id
+        )
+
+
+    def get(
+            self,
+            key: QuoteKey
+        ) -> CachedQuote | None:
+        """
+        Look up a quote.
+
+        Parameters
+        ----------
+        key : QuoteKey
+            Key built with `make_key`.
+
+        Returns
+        -------
+        CachedQuote or None
+            The cached records and whether they are stale, or
+            `None` if there is no usable entry.
+        """
+
+        entry: dict[str, Any] | None = self._entries.get(key)
+        now: float = time.monotonic()
+
+        if entry and now >= entry["expires_at"]:
+            del self._entries[key]
+            entry = None
+
+        if not entry:
+            metrics.increment(
+                "quote_cache.lookups",
+                provider = key[0],
+                outcome = "miss"
+            )
+            return None
+
+        self._entries.move_to_end(key)
+        stale: bool = now >= entry["fresh_until"]
+
+        metrics.increment(
+            "quote_cache.lookups",
+            provider = key[0],
+            outcome = "stale" if stale else "hit"
+        )
+
+        # records are immutable, a shallow copy suffices
+        return CachedQuote(list(entry["records"]), stale)
+
+
+    def set(
+            self,
+            key: QuoteKey,
+            records: list[QuoteRecord],
+            ttl: int | None = None
+        ) -> None:
+        """
+        Store a quote.
+
+        Parameters
+        ----------
+        key : QuoteKey
+            Key built with `make_key`.
+
+        records : list of QuoteRecord
+            Records found by the search. Empty results are not
+            cached.
+
+        ttl : int or None, optional
+            Seconds the quote stays fresh. If None,
+            `QUOTE_CACHE_TTL` applies. Default is None.
+        """
+
+        if not records:
+            return
+
+        fresh_for: int = ttl if ttl is not None else settings.QUOTE_CACHE_TTL
+        now: float = time.monotonic()
+
+        self._entries[key] = {
+            "records": list(records),
+            "fresh_until": now + fresh_for,
+            "expires_at": now + fresh_for + settings.QUOTE_CACHE_STALE_TTL
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last = False)
+
+        metrics.set_gauge("quote_cache.entries", len(self._entries))
+
+
+    def begin_refresh(
+            self,
+            key: QuoteKey
+        ) -> bool:
+        """
+        Claim the background refresh of a stale entry.
+
+        Parameters
+        ----------
+        key : QuoteKey
+            Key of the stale entry.
+
+        Returns
+        -------
+        bool
+            `True` if the caller should refresh the entry, `False`
+            if a refresh is already in progress.
+        """
+
+        if key in self._refreshing:
+            return False
+
+        self._refreshing.add(key)
+
+        return True
+
+
+    def end_refresh(
+            self,
+            key: QuoteKey
+        ) -> None:
+        """
+        Release a refresh claimed with `begin_refresh`.
+
+        Parameters
+        ----------
+        key : QuoteKey
+            Key of the refreshed entry.
+        """
+
+        self._refreshing.discard(key)
+
+
+quote_cache: QuoteCache = QuoteCache(
+    max_entries = settings.QUOTE_CACHE_MAX_ENTRIES
+)
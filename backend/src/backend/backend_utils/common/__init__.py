@@ -1,2 +1,9 @@
-
-from backend.backend_utils.common.lists import SafeAsyncList
\ No newline at end of file
+from backend.backend_utils.common.enums import (
+    JobLane,
+    LearnedProviderStatus,
+    ObservationMode
+)
+from backend.backend_utils.common.flight import SingleFlight
+from backend.backend_utils.common.lists import SafeAsyncList
+from backend.backend_utils.common.process import PROCESS_ID
+from backend.backend_utils.common.slots import KeyedSemaphore
\ No newline at end of file
@@ -0,0 +1,71 @@
+from enum import Enum
+
+
+class LearnedProviderStatus(str, Enum):
+    """
+    Enum representing the lifecycle of a provider definition 
+    inferred from computer-use runs.
+
+    Attributes
+    ----------
+    CANDIDATE : str
+        The definition has been inferred but is still being
+        validated against later computer-use runs.
+
+    PROMOTED : str
+        The definition passed validation and replaces computer 
+        use for its domain.
+
+    REJECTED : str
+        The definition failed validation and is no longer used.
+    """
+
+    CANDIDATE = "CANDIDATE"
+    PROMOTED = "PROMOTED"
+    REJECTED = "REJECTED"
+
+
+class ObservationMode(str, Enum):
+    """
+    Enum representing what the computer-use model observes after 
+    each action.
+
+    Attributes
+    ----------
+    SCREENSHOT : str
+        A PNG screenshot of the viewport. Actions target pixel 
+        coordinates.
+
+    DOM : str
+        A pruned text snapshot of the page in which interactive 
+        elements carry stable IDs. Actions target element IDs and 
+        no screenshot is sent.
+
+    HYBRID : str
+        The text snapshot on every turn, plus a screenshot on the 
+        first turn and periodically afterwards. Both element and 
+        coordinate actions are available.
+    """
+
+    SCREENSHOT = "screenshot"
+    DOM = "dom"
+    HYBRID = "hybrid"
+
+
+class JobLane(str, Enum):
+    """
+    Enum representing the scheduler lane a job runs in.
+
+    Attributes
+    ----------
+    HEAVY : str
+        Jobs that open browsers or call the models (chat messages,
+        logins, credential checks).
+
+    LIGHT : str
+        Jobs that only touch the database or saved sessions (login 
+        status checks, chat clearing and deletion).
+    """
+
+    HEAVY = "heavy"
+    LIGHT = "light"
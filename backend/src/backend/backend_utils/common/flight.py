@@ -0,0 +1,156 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar
+)
+
+from backend.backend_utils.metrics import metrics
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalescing of identical concurrent calls.
+
+    The first caller of `do` with a key (the leader) runs the
+    call; the callers arriving with the same key while it runs
+    wait for it and receive the same result, or the same
+    exception. If the leader is cancelled, one of the waiting
+    callers runs the call again and the others wait for it, so a
+    cancelled job never fails the jobs that joined it.
+
+    Calls run by a leader and calls shared with it are counted as
+    the `singleflight.calls` counter, labelled by flight name and
+    outcome (`led` or `shared`).
+    """
+
+
+    def __init__(
+            self,
+            name: str
+        ):
+        """
+        Initialize a flight group.
+
+        Parameters
+        ----------
+        name : str
+            Name of the group, used as metric label.
+
+        Attributes
+        ----------
+        _calls : dict[Hashable, asyncio.Future]
+            Result of the running call of each key.
+        """
+
+        self.name: str = name
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+
+
+    def in_flight(
+            self,
+            key: Hashable
+        ) -> bool:
+        """
+        Tell whether a call with a key is running.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the call.
+
+        Returns
+        -------
+        bool
+            True if a caller of `do` would join a running call.
+        """
+
+        return key in self._calls
+
+
+    async def do(
+            self,
+            key: Hashable,
+            call: Callable[[], Awaitable[T]]
+        ) -> T:
+        """
+        Run a call, or join the running call with the same key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies identical calls.
+
+        call : callable
+            Coroutine function run when no call with the key is
+            running.
+
+        Returns
+        -------
+        T
+            The result of the call.
+        """
+
+        while key in self._calls:
+            running: asyncio.Future[T] = self._calls[key]
+
+            metrics.increment(
+                "singleflight.calls",
+                flight = self.name,
+                outcome = "shared"
+            )
+
+            try:
+                return await asyncio.shield(running)
+
+            except asyncio.CancelledError:
+                task: asyncio.Task | None = asyncio.current_task()
+
+                # the leader was cancelled, not this caller: join the
+                # waiter that took over, or take over
+                if running.cancelled() and not (
+                    task and task.cancelling()
+                ):
+                    continue
+
+                raise
+
+        future: asyncio.Future[T] = (
+            asyncio.get_running_loop().create_future()
+        )
+        # the outcome may have no waiter: mark it as retrieved
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception()
+        )
+        self._calls[key] = future
+
+        metrics.increment(
+            "singleflight.calls",
+            flight = self.name,
+            outcome = "led"
+        )
+
+        try:
+            result: T = await call()
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        else:
+            future.set_result(result)
+
+            return result
+
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -1,6 +1,6 @@
 
 import asyncio
-from typing import Any
+from typing import Any, Iterable
 
 
 class SafeAsyncList:
@@ -57,6 +57,28 @@ class SafeAsyncList:
             self._list.append(item)
 
 
+    async def extend(
+            self, 
+            items: Iterable[Any]
+        ) -> None:
+        """
+        Append several items to the list safely, keeping them 
+        contiguous.
+
+        Parameters
+        ----------
+        items : Iterable[Any]
+            The items to append to the list.
+
+        Returns
+        -------
+        None
+        """
+
+        async with self._lock:
+            self._list.extend(items)
+
+
     async def get_all(
             self
         ) -> list:
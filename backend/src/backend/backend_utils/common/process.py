@@ -0,0 +1,10 @@
+import os
+import socket
+import uuid
+
+
+# identifies this process as the owner of jobs and the origin 
+# of the job notifications it sends
+PROCESS_ID: str = (
+    f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+)
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+from backend.backend_utils.metrics import metrics
+
+
+class KeyedSemaphore:
+    """
+    One semaphore per key (e.g. per client), created on first use
+    and dropped once no task holds or waits for it.
+
+    The time spent waiting for a slot is published as the
+    `slots.wait_ms` summary, labelled by semaphore name.
+    """
+
+
+    def __init__(
+            self,
+            name: str,
+            limit: int
+        ):
+        """
+        Initialize a keyed semaphore.
+
+        Parameters
+        ----------
+        name : str
+            Name of the semaphore, used as metric label.
+
+        limit : int
+            Number of slots per key.
+
+        Attributes
+        ----------
+        _semaphores : dict[Hashable, asyncio.Semaphore]
+            The semaphore of each key in use.
+
+        _users : dict[Hashable, int]
+            Number of tasks holding or waiting for each key.
+        """
+
+        self.name: str = name
+        self.limit: int = max(limit, 1)
+        self._semaphores: dict[Hashable, asyncio.Semaphore] = {}
+        self._users: dict[Hashable, int] = {}
+
+
+    @asynccontextmanager
+    async def hold(
+            self,
+            key: Hashable
+        ) -> AsyncIterator[None]:
+        """
+        Hold a slot of a key for the duration of the block,
+        waiting for one if all are taken.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key.
+
+        Yields
+        ------
+        None
+        """
+
+        semaphore: asyncio.Semaphore = self._semaphores.setdefault(
+            key,
+            asyncio.Semaphore(self.limit)
+        )
+        self._users[key] = self._users.get(key, 0) + 1
+        started: float = time.perf_counter()
+
+        try:
+            async with semaphore:
+                metrics.observe(
+                    "slots.wait_ms",
+                    (time.perf_counter() - started) * 1000,
+                    semaphore = self.name
+                )
+
+                yield
+
+        finally:
+            self._users[key] -= 1
+
+            if not self._users[key]:
+                del self._users[key]
+                del self._semaphores[key]
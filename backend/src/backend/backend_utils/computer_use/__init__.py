@@ -2,10 +2,23 @@
 from backend.backend_utils.computer_use.configuration import (
     generate_content_config
 )
-from backend.backend_utils.computer_use.custom import save_product
+from backend.backend_utils.computer_use.custom import (
+    click_element,
+    save_product,
+    type_into_element
+)
+from backend.backend_utils.computer_use.dom_snapshot import take_dom_snapshot
 from backend.backend_utils.computer_use.functions import (
     get_function_responses,
     execute_function_calls
 )
+from backend.backend_utils.computer_use.learner import (
+    links_match,
+    SelectorLearner
+)
 from backend.backend_utils.computer_use.runner import run_computer_use_loop
+from backend.backend_utils.computer_use.runtime import (
+    ComputerUseRuntime,
+    runtime
+)
 from backend.backend_utils.computer_use.session import ComputerUseSession
\ No newline at end of file
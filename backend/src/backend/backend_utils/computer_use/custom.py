@@ -1,3 +1,4 @@
+from typing import Any
 
 
 def save_product(
@@ -5,6 +6,7 @@ def save_product(
         availability: str,
         price: str,
         link: str,
+        query: str
     ) -> dict[str, str]:
     """
     Create a structured representation of a product.
@@ -30,6 +32,10 @@ def save_product(
     link : str
         The URL linking to the product detail page.
 
+    query : str
+        The product code or name, exactly as received, whose
+        search found this product.
+
     Returns
     -------
     dict[str, str]
@@ -40,7 +46,8 @@ def save_product(
             "name": <str>,
             "availability": <str>,
             "price": <str>,
-            "link": <str>
+            "link": <str>,
+            "query": <str>
         }
 
     Notes
@@ -54,6 +61,76 @@ def save_product(
         "availability": availability,
         "price": price,
         "link": link,
+        "query": query
     }
 
-    return product_info
\ No newline at end of file
+    return product_info
+
+def click_element(
+        element_id: int
+    ) -> dict[str, int]:
+    """
+    Click an element of the page by its ID.
+
+    The ID is the number shown in square brackets next to the
+    element in the page snapshot (e.g. `[12] link "..."`).
+
+    Parameters
+    ----------
+    element_id : int
+        ID of the element to click, as shown in the snapshot.
+
+    Returns
+    -------
+    dict[str, int]
+        A dictionary with the `"element_id"` to click.
+
+    Notes
+    -----
+    The function only structures the call: the click is performed
+    by the computer-use loop.
+    """
+
+    return {"element_id": element_id}
+
+
+def type_into_element(
+        element_id: int,
+        text: str,
+        press_enter: bool
+    ) -> dict[str, Any]:
+    """
+    Replace the content of an input of the page and type a text.
+
+    The ID is the number shown in square brackets next to the
+    input in the page snapshot (e.g. `[3] input[search] "Search"`).
+
+    Parameters
+    ----------
+    element_id : int
+        ID of the input to type into, as shown in the snapshot.
+
+    text : str
+        Text to type, exactly as it must appear in the input.
+
+    press_enter : bool
+        Whether to press Enter after typing, e.g. to submit a
+        search.
+
+    Returns
+    -------
+    dict[str, Any]
+        A dictionary with the `"element_id"`, `"text"` and
+        `"press_enter"` values.
+
+    Notes
+    -----
+    The function only structures the call: the typing is performed
+    by the computer-use loop.
+    """
+
+    return {
+        "element_id": element_id,
+        "text": text,
+        "press_enter": press_enter
+    }
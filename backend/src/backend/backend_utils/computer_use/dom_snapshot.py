@@ -0,0 +1,182 @@
+from playwright.async_api import Locator, Page
+
+
+ELEMENT_ID_ATTRIBUTE: str = "data-cu-id"
+
+_SNAPSHOT_JS: str = """
+({attribute, maxElements, maxText}) => {
+    const INTERACTIVE = (
+        "a[href], button, input:not([type='hidden']), select, textarea, "
+        + "[role='button'], [role='link'], [role='searchbox'], "
+        + "[role='combobox'], [role='tab'], [role='menuitem'], "
+        + "[contenteditable='true']"
+    );
+    const CONTENT = "h1, h2, h3, h4, [itemprop='price'], [class*='price' i]";
+    const PRICE = /\\d[\\d.,\\s]*\\s?(€|eur|\\$|£)|(€|\\$|£)\\s?\\d/i;
+
+    window.__cuNextId = window.__cuNextId || 1;
+
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+
+        return (
+            rect.width > 0 && rect.height > 0
+            && style.visibility !== "hidden" && style.display !== "none"
+            && rect.bottom > 0 && rect.top < window.innerHeight * 3
+        );
+    };
+
+    const clip = (value) => {
+        const text = (value || "").replace(/\\s+/g, " ").trim();
+        return text.length > maxText ? text.slice(0, maxText) + "…" : text;
+    };
+
+    const label = (el) => clip(
+        el.getAttribute("aria-label")
+        || el.innerText
+        || el.getAttribute("placeholder")
+        || el.getAttribute("title")
+        || el.getAttribute("alt")
+        || el.value
+        || ""
+    );
+
+    const role = (el) => {
+        const explicit = el.getAttribute("role");
+        if (explicit) return explicit;
+
+        const tag = el.tagName.toLowerCase();
+        if (tag === "a") return "link";
+        if (tag === "input") return "input[" + (el.type || "text") + "]";
+        if (/^h[1-6]$/.test(tag)) return "heading";
+
+        return tag;
+    };
+
+    const lines = [];
+    const seen = new Set();
+
+    for (const el of document.querySelectorAll(INTERACTIVE + ", " + CONTENT)) {
+        if (lines.length >= maxElements) break;
+        if (!visible(el)) continue;
+
+        const interactive = el.matches(INTERACTIVE);
+        const text = label(el);
+
+        if (!interactive && !(el.matches("h1, h2, h3, h4") || PRICE.test(text))) {
+            continue;
+        }
+
+        if (!text && !el.matches("input, select, textarea")) continue;
+
+        const key = role(el) + "|" + text;
+        if (!interactive && seen.has(key)) continue;
+        seen.add(key);
+
+        let line = "";
+
+        if (interactive) {
+            let id = el.getAttribute(attribute);
+
+            if (!id) {
+                id = String(window.__cuNextId++);
+                el.setAttribute(attribute, id);
+            }
+
+            line = "[" + id + "] ";
+        }
+
+        line += role(el) + ' "' + text + '"';
+
+        if (el.tagName === "A") {
+            line += " -> " + el.href;
+        }
+
+        lines.push(line);
+    }
+
+    return {
+        url: location.href,
+        title: document.title,
+        lines: lines
+    };
+}
+"""
+
+
+async def take_dom_snapshot(
+        page: Page,
+        max_elements: int = 250,
+        max_text: int = 120
+    ) -> str:
+    """
+    Build a pruned text snapshot of the current page.
+
+    Only visible interactive elements (links, buttons, inputs, ...),
+    headings and price-looking texts are kept. Interactive elements
+    are tagged with a `data-cu-id` attribute, whose value is shown
+    in square brackets and can be passed to the element-based
+    actions. IDs are stable for the lifetime of a document: an
+    element keeps its ID across snapshots until the page navigates.
+
+    Parameters
+    ----------
+    page : Page
+        Page to describe.
+
+    max_elements : int, optional
+        Maximum number of lines in the snapshot. Default is 250.
+
+    max_text : int, optional
+        Maximum number of characters per element label.
+        Default is 120.
+
+    Returns
+    -------
+    str
+        The URL and title of the page followed by one line per
+        element, e.g. `[12] link "iPhone 16 128GB" -> https://...`.
+    """
+
+    snapshot: dict = await page.evaluate(
+        _SNAPSHOT_JS,
+        {
+            "attribute": ELEMENT_ID_ATTRIBUTE,
+            "maxElements": max_elements,
+            "maxText": max_text
+        }
+    )
+
+    return "\n".join([
+        f"URL: {snapshot['url']}",
+        f"TITLE: {snapshot['title']}",
+        "",
+        *snapshot["lines"]
+    ])
+
+
+def locate_element(
+        page: Page,
+        element_id: int | str
+    ) -> Locator:
+    """
+    Return a locator for an element listed in a DOM snapshot.
+
+    Parameters
+    ----------
+    page : Page
+        Page the snapshot was taken on.
+
+    element_id : int or str
+        ID shown in square brackets in the snapshot.
+
+    Returns
+    -------
+    Locator
+        Locator matching the element carrying the ID.
+    """
+
+    return page.locator(
+        f"[{ELEMENT_ID_ATTRIBUTE}='{int(element_id)}']"
+    ).first
@@ -14,7 +14,14 @@ from google.genai.types import (
     FunctionResponseBlob
 )
 
+from backend.backend_utils.common import ObservationMode
 from backend.backend_utils.computer_use.custom import save_product
+from backend.backend_utils.computer_use.dom_snapshot import (
+    locate_element,
+    take_dom_snapshot
+)
+from backend.backend_utils.computer_use.learner import SelectorLearner
+from backend.backend_utils.metrics import metrics
 
 
 def denormalize_x(
@@ -105,10 +112,75 @@ async def __scroll(
             pass
 
 
+async def get_viewport(
+        page: Page
+    ) -> dict[str, int]:
+    """
+    Read the size of the page viewport in pixels.
+
+    Parameters
+    ----------
+    page : Page
+        Playwright page to measure.
+
+    Returns
+    -------
+    dict[str, int]
+        Dictionary with `"width"` and `"height"` keys.
+    """
+
+    return await page.evaluate(
+        """
+        () => ({
+            width: window.innerWidth,
+            height: window.innerHeight
+        })
+        """
+    )
+
+
+async def __element_center(
+        page: Page,
+        element_id: int
+    ) -> tuple[int, int] | None:
+    """
+    Compute the pixel center of an element listed in a snapshot.
+
+    Parameters
+    ----------
+    page : Page
+        Page the snapshot was taken on.
+
+    element_id : int
+        ID of the element in the snapshot.
+
+    Returns
+    -------
+    tuple of int or None
+        The `(x, y)` center of the element, or `None` if it is 
+        not rendered.
+    """
+
+    box: dict[str, float] | None = await locate_element(
+        page,
+        element_id
+    ).bounding_box()
+
+    if not box:
+        return None
+
+    return (
+        int(box["x"] + box["width"] / 2),
+        int(box["y"] + box["height"] / 2)
+    )
+
+
 async def execute_function_calls(
         candidate: Candidate,
         page: Page,
-        result_list: list[dict[str, str]]
+        result_list: list[dict[str, str]],
+        learner: SelectorLearner | None = None,
+        viewport: dict[str, int] | None = None
     ) -> list[tuple[str, dict]]:
     """
     Execute a series of function calls generated by a model 
@@ -130,6 +202,16 @@ async def execute_function_calls(
     result_list : list of dict
         List where saved product entries are appended.
 
+    learner : SelectorLearner or None, optional
+        Learner notified of the elements the model interacts 
+        with and of the products it saves. Default is None.
+
+    viewport : dict[str, int] or None, optional
+        Viewport size used to denormalize coordinates. The size 
+        does not change during a session, so callers should read 
+        it once with `get_viewport` and pass it on every turn. If 
+        None, it is read from the page. Default is None.
+
     Returns
     -------
     list of tuple
@@ -140,14 +222,7 @@ async def execute_function_calls(
     results: list[tuple[str, dict]] = []
     function_calls: list[FunctionCall] = []
 
-    page_viewport: dict[str, int] = await page.evaluate(
-        """
-        () => ({
-            width: window.innerWidth,
-            height: window.innerHeight
-        })
-        """
-    )
+    page_viewport: dict[str, int] = viewport or await get_viewport(page)
 
     for part in candidate.content.parts:
         if part.function_call:
@@ -171,6 +246,13 @@ async def execute_function_calls(
                             page_viewport["height"]
                         )
 
+                        if learner:
+                            await learner.observe_click(
+                                page,
+                                actual_x,
+                                actual_y
+                            )
+
                         await page.mouse.click(actual_x, actual_y)
 
                         action_result = {"status": "ok"} 
@@ -189,6 +271,14 @@ async def execute_function_calls(
                         text: str = args["text"]
                         press_enter: bool = args["press_enter"]
 
+                        if learner:
+                            await learner.observe_input(
+                                page,
+                                actual_x,
+                                actual_y,
+                                press_enter
+                            )
+
                         await page.mouse.click(actual_x, actual_y)
 
                         await page.keyboard.press("ControlOrMeta+A")
@@ -203,6 +293,50 @@ async def execute_function_calls(
 
                         action_result = {"status": "ok"} 
 
+                case "click_element":
+                    if args:
+                        element_id: int = int(args["element_id"])
+
+                        if learner:
+                            center: tuple[int, int] | None = (
+                                await __element_center(page, element_id)
+                            )
+
+                            if center:
+                                await learner.observe_click(page, *center)
+
+                        await locate_element(page, element_id).click(
+                            timeout = 5000
+                        )
+
+                        action_result = {"status": "ok"}
+
+                case "type_into_element":
+                    if args:
+                        element_id = int(args["element_id"])
+                        text = args["text"]
+                        press_enter = args.get("press_enter", False)
+
+                        if learner:
+                            center = await __element_center(page, element_id)
+
+                            if center:
+                                await learner.observe_input(
+                                    page,
+                                    *center,
+                                    press_enter
+                                )
+
+                        element = locate_element(page, element_id)
+
+                        await element.fill("", timeout = 5000)
+                        await element.press_sequentially(text, delay = 100)
+
+                        if press_enter:
+                            await element.press("Enter")
+
+                        action_result = {"status": "ok"}
+
                 case "wait_5_seconds":
                     await page.wait_for_load_state(
                         "networkidle",
@@ -271,11 +405,15 @@ async def execute_function_calls(
                             name = args.get("name", "N/A"),
                             availability = args.get("availability", "N/A"),
                             price = args.get("price", "N/A"),
-                            link = args.get("link", "N/A")
+                            link = args.get("link", "N/A"),
+                            query = args.get("query", "N/A")
                         )
 
                         result_list.append(product_entry)
 
+                        if learner:
+                            learner.observe_saved_product(product_entry)
+
                         action_result = {"status": "saved"}  
 
                 case _:
@@ -296,14 +434,22 @@ async def execute_function_calls(
 
 async def get_function_responses(
         page: Page,
-        results: list[tuple[str, dict]]
+        results: list[tuple[str, dict]],
+        observation: ObservationMode = ObservationMode.SCREENSHOT,
+        include_screenshot: bool = True
     ) -> list[FunctionResponse]:
     """
     Convert executed function call results into structured 
     `FunctionResponse` objects.
 
-    Takes screenshots and the current page URL for each 
-    function response.
+    Every response carries the current page URL. What the model 
+    observes depends on `observation`:
+
+    - `SCREENSHOT`: a screenshot is attached to each response.
+    - `DOM`: the text snapshot of the page is added to the last 
+      response, under the `"page"` key; no screenshot is taken.
+    - `HYBRID`: as `DOM`, plus a screenshot attached to the last 
+      response when `include_screenshot` is True.
 
     Parameters
     ----------
@@ -314,34 +460,72 @@ async def get_function_responses(
         List of tuples containing function name and result 
         dictionary.
 
+    observation : ObservationMode, optional
+        What the model observes after its actions. Default is 
+        `ObservationMode.SCREENSHOT`.
+
+    include_screenshot : bool, optional
+        Whether to attach a screenshot in `HYBRID` mode. Ignored 
+        by the other modes. Default is True.
+
     Returns
     -------
     list of FunctionResponse
         A list of `FunctionResponse` objects containing
         the function name, response data, and associated 
-        screenshot.
+        observation.
     """
 
-    screenshot_bytes = await page.screenshot(type="png")
+    screenshot_bytes: bytes | None = None
+    snapshot: str | None = None
+
+    if (
+        observation == ObservationMode.SCREENSHOT
+        or
+        (observation == ObservationMode.HYBRID and include_screenshot)
+    ):
+        screenshot_bytes = await page.screenshot(type="png")
+
+    if observation != ObservationMode.SCREENSHOT:
+        snapshot = await take_dom_snapshot(page)
+
+    metrics.observe(
+        "computer_use.observation.bytes",
+        len(screenshot_bytes or b"") + len((snapshot or "").encode()),
+        mode = observation.value
+    )
+
     current_url = page.url
     function_responses = []
 
-    for name, result in results:
+    for i, (name, result) in enumerate(results):
+        is_last: bool = i == len(results) - 1
+
         response_data = {"url": current_url}
         response_data.update(result)
 
+        if snapshot and is_last:
+            response_data["page"] = snapshot
+
+        parts: list[FunctionResponsePart] = []
+
+        if screenshot_bytes and (
+            observation == ObservationMode.SCREENSHOT or is_last
+        ):
+            parts.append(
+                FunctionResponsePart(
+                    inline_data = FunctionResponseBlob(
+                        mime_type = "image/png",
+                        data = screenshot_bytes
+                    )
+                )
+            )
+
         function_responses.append(
             FunctionResponse(
                 name = name,
                 response = response_data,
-                parts = [
-                    FunctionResponsePart(
-                        inline_data = FunctionResponseBlob(
-                            mime_type = "image/png",
-                            data = screenshot_bytes
-                        )
-                    )
-                ]
+                parts = parts
             )
         )
 
@@ -0,0 +1,382 @@
+import re
+from collections import Counter
+from typing import Any
+from urllib.parse import urlparse
+
+from playwright.async_api import Page
+
+from shared.provider.learned_provider import normalize_domain
+from shared.shared_utils.common import ProviderDefinition
+
+
+_AVAILABLE_TEXTS: str = (
+    r"aggiungi|carrello|add to (?:cart|basket)|acquista|buy|"
+    r"disponibil|in stock"
+)
+
+_INSPECT_INPUT_JS: str = """
+({x, y}) => {
+    let el = document.elementFromPoint(x, y);
+
+    if (!el) return null;
+
+    if (!el.matches("input, textarea")) {
+        const scope = el.closest("form") || el;
+        el = scope.querySelector(
+            "input[type='search'], input[type='text'], input:not([type])"
+        );
+    }
+
+    if (!el) return null;
+
+    const label = (
+        el.getAttribute("aria-label")
+        || el.getAttribute("placeholder")
+        || el.getAttribute("title")
+        || (el.labels && el.labels[0] ? el.labels[0].innerText : "")
+        || ""
+    );
+
+    return {name: label.trim()};
+}
+"""
+
+_INSPECT_RESULT_JS: str = """
+({x, y, availableTexts}) => {
+    const PRICE = /(\\d[\\d.,\\s]*\\s?(€|eur|\\$|£))|((€|\\$|£)\\s?\\d)/i;
+    const AVAILABLE = new RegExp(availableTexts, "i");
+    const NOT_AVAILABLE = /non disponibile|esaurit|out of stock|unavailable|sold out/i;
+
+    const classes = (el) => Array.from(el.classList)
+        .filter((c) => /^[a-zA-Z_-][\\w-]*$/.test(c) && !/\\d{3,}/.test(c))
+        .slice(0, 3);
+
+    const signature = (el) => (
+        el.tagName.toLowerCase()
+        + classes(el).map((c) => "." + CSS.escape(c)).join("")
+    );
+
+    const text = (el) => (el.innerText || "").trim();
+
+    const target = document.elementFromPoint(x, y);
+    const link = target ? target.closest("a[href]") : null;
+
+    if (!link) return null;
+
+    let container = null;
+
+    for (let el = link.parentElement; el && el !== document.body; el = el.parentElement) {
+        if (!classes(el).length) continue;
+
+        let count = 0;
+
+        try {
+            count = document.querySelectorAll(signature(el)).length;
+        } catch (e) {
+            continue;
+        }
+
+        if (count >= 2 && PRICE.test(text(el))) {
+            container = el;
+            break;
+        }
+    }
+
+    if (!container) return null;
+
+    const descendants = Array.from(container.querySelectorAll("*"))
+        .filter((el) => classes(el).length);
+
+    const prices = descendants
+        .filter((el) => text(el).length <= 40 && PRICE.test(text(el)))
+        .sort((a, b) => text(a).length - text(b).length);
+
+    let title = text(link).length > 5 ? link : null;
+
+    if (!title) {
+        title = descendants.find((el) => /^H[1-6]$/.test(el.tagName)) || null;
+    }
+
+    const available = descendants
+        .filter((el) => text(el).length <= 40 && AVAILABLE.test(text(el)))
+        .map(signature);
+
+    const notAvailable = descendants
+        .filter((el) => text(el).length <= 40 && NOT_AVAILABLE.test(text(el)))
+        .map(signature);
+
+    return {
+        href: link.href,
+        container: signature(container),
+        link: signature(link),
+        title: title ? signature(title) : null,
+        price: prices.length ? signature(prices[0]) : null,
+        available: Array.from(new Set(available)),
+        not_available: Array.from(new Set(notAvailable))
+    };
+}
+"""
+
+
+def _normalize_link(
+        url: str
+    ) -> str:
+    """
+    Reduce a product URL to host and path for comparison.
+
+    Parameters
+    ----------
+    url : str
+        Absolute product URL.
+
+    Returns
+    -------
+    str
+        Host (without `www.`) followed by the path without the
+        trailing slash. Query string and fragment are dropped.
+    """
+
+    parsed = urlparse(url.strip())
+    host: str = (parsed.hostname or "").removeprefix("www.")
+
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def links_match(
+        first: str,
+        second: str
+    ) -> bool:
+    """
+    Check whether two product URLs point to the same page.
+
+    Parameters
+    ----------
+    first : str
+        First product URL.
+
+    second : str
+        Second product URL.
+
+    Returns
+    -------
+    bool
+        `True` if both URLs share host and path, ignoring
+        scheme, `www.`, query string and fragment.
+    """
+
+    if not first or not second or "N/A" in (first, second):
+        return False
+
+    return _normalize_link(first) == _normalize_link(second)
+
+
+class SelectorLearner:
+    """
+    Observe a computer-use session and infer the selectors a
+    scripted `BaseProvider` would need for the same store.
+
+    The learner inspects the DOM under the coordinates the model
+    types into and clicks on. Clicks on result links are kept as
+    candidate observations and become confirmed once the model
+    saves a product whose link matches the clicked one.
+
+    All observation methods are best-effort: failures are
+    swallowed so that learning never interferes with the
+    computer-use loop.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize an empty learner.
+
+        Attributes
+        ----------
+        _search_names : list of str
+            Accessible names of the inputs the model submitted
+            searches into.
+
+        _candidates : dict of str to dict
+            Result-link observations keyed by normalized link.
+
+        _confirmed : list of dict
+            Observations whose link was later saved by the model.
+        """
+
+        self._search_names: list[str] = []
+        self._candidates: dict[str, dict[str, Any]] = {}
+        self._confirmed: list[dict[str, Any]] = []
+
+
+    async def observe_input(
+            self,
+            page: Page,
+            x: int,
+            y: int,
+            press_enter: bool
+        ) -> None:
+        """
+        Record the search input the model is about to type into.
+
+        Parameters
+        ----------
+        page : Page
+            Page the model is interacting with.
+
+        x : int
+            Horizontal pixel coordinate of the interaction.
+
+        y : int
+            Vertical pixel coordinate of the interaction.
+
+        press_enter : bool
+            Whether the typed text is submitted, which marks the
+            input as a search field.
+        """
+
+        if not press_enter:
+            return
+
+        try:
+            info: dict[str, str] | None = await page.evaluate(
+                _INSPECT_INPUT_JS,
+                {"x": x, "y": y}
+            )
+
+            if info and info.get("name"):
+                self._search_names.append(info["name"])
+
+        except Exception:
+            pass
+
+
+    async def observe_click(
+            self,
+            page: Page,
+            x: int,
+            y: int
+        ) -> None:
+        """
+        Record the result card under a click, if any.
+
+        Parameters
+        ----------
+        page : Page
+            Page the model is interacting with.
+
+        x : int
+            Horizontal pixel coordinate of the click.
+
+        y : int
+            Vertical pixel coordinate of the click.
+        """
+
+        try:
+            info: dict[str, Any] | None = await page.evaluate(
+                _INSPECT_RESULT_JS,
+                {"x": x, "y": y, "availableTexts": _AVAILABLE_TEXTS}
+            )
+
+            if info and info.get("href"):
+                self._candidates[_normalize_link(info["href"])] = info
+
+        except Exception:
+            pass
+
+
+    def observe_saved_product(
+            self,
+            product: dict[str, str]
+        ) -> None:
+        """
+        Confirm the click observation matching a saved product.
+
+        Parameters
+        ----------
+        product : dict[str, str]
+            Product entry created by `save_product`.
+        """
+
+        link: str = product.get("link", "")
+
+        if not link or link == "N/A":
+            return
+
+        observation: dict[str, Any] | None = self._candidates.pop(
+            _normalize_link(link),
+            None
+        )
+
+        if observation:
+            self._confirmed.append(observation)
+
+
+    def build_definition(
+            self,
+            provider_url: str
+        ) -> ProviderDefinition | None:
+        """
+        Build a provider definition from the collected observations.
+
+        Parameters
+        ----------
+        provider_url : str
+            URL of the store the session was run on.
+
+        Returns
+        -------
+        ProviderDefinition or None
+            The inferred definition, or `None` if the session did
+            not expose a search input and at least one confirmed
+            result with title and price.
+        """
+
+        confirmed: list[dict[str, Any]] = [
+            obs for obs in self._confirmed
+            if obs.get("title") and obs.get("price")
+        ]
+
+        if not self._search_names or not confirmed:
+            return None
+
+        def most_common(
+                key: str
+            ) -> str:
+            """
+            Return the most frequent value of `key` among the
+            confirmed observations.
+            """
+
+            return Counter(obs[key] for obs in confirmed).most_common(1)[0][0]
+
+        available: list[str] = sorted({
+            sel for obs in confirmed for sel in obs.get("available", [])
+        })
+        not_available: list[str] = sorted({
+            sel for obs in confirmed for sel in obs.get("not_available", [])
+        })
+
+        parsed = urlparse(
+            provider_url if "://" in provider_url
+            else f"https://{provider_url}"
+        )
+
+        return ProviderDefinition(
+            availability_classes = {
+                "available": available,
+                "not_available": not_available
+            },
+            availability_texts = _AVAILABLE_TEXTS if available else None,
+            popup_selectors = [],
+            price_classes = [most_common("price")],
+            product_link_selectors = [most_common("link")],
+            provider_name = normalize_domain(provider_url),
+            provider_url = f"{parsed.scheme}://{parsed.netloc}",
+            result_container = [most_common("container")],
+            search_texts = re.escape(
+                Counter(self._search_names).most_common(1)[0][0]
+            ),
+            title_classes = [most_common("title")]
+        )
@@ -0,0 +1,218 @@
+import asyncio
+from logging import (
+    getLogger,
+    Logger
+)
+
+from backend.backend_utils.common import LearnedProviderStatus
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.learned_provider import (
+    LearnedProvider as LearnedProviderRecord
+)
+from backend.database.repositories import LearnedProviderRepository
+
+from shared.provider.learned_provider import LearnedProvider
+from shared.provider.registry import (
+    register_learned_provider,
+    unregister_learned_provider
+)
+from shared.shared_utils.common import ProviderDefinition
+
+
+logger: Logger = getLogger("provider-learner")
+
+
+async def __register(
+        definition: ProviderDefinition
+    ) -> bool:
+    """
+    Instantiate a learned provider and register it for its domain.
+
+    The instantiation runs in a worker thread because
+    `BaseProvider` checks the reachability of the store URL
+    with a blocking HTTP request.
+
+    Parameters
+    ----------
+    definition : ProviderDefinition
+        Definition of the provider to register.
+
+    Returns
+    -------
+    bool
+        `True` if the provider was registered, `False` if the
+        definition could not be instantiated.
+    """
+
+    try:
+        provider: LearnedProvider = await asyncio.to_thread(
+            LearnedProvider,
+            definition
+        )
+
+    except Exception as e:
+        logger.warning(
+            f"could not load learned provider "
+            f"{definition.get('provider_url')}: {e}"
+        )
+        return False
+
+    register_learned_provider(provider)
+
+    return True
+
+
+async def load_promoted_providers() -> int:
+    """
+    Register every promoted learned provider stored in the database.
+
+    Intended to be called once at server startup, so that promoted
+    stores skip computer use from the first request.
+
+    Returns
+    -------
+    int
+        Number of providers registered.
+    """
+
+    async with AsyncSessionLocal() as db:
+        records: list[LearnedProviderRecord] = (
+            await LearnedProviderRepository.get_promoted(db)
+        )
+
+    loaded: list[bool] = await asyncio.gather(
+        *(__register(ProviderDefinition(**r.definition)) for r in records)
+    )
+
+    return sum(loaded)
+
+
+async def get_candidate_definition(
+        domain: str
+    ) -> ProviderDefinition | None:
+    """
+    Retrieve the definition currently under validation for a domain.
+
+    Parameters
+    ----------
+    domain : str
+        Normalized domain of the external store.
+
+    Returns
+    -------
+    ProviderDefinition or None
+        The candidate definition, or `None` if the domain has no
+        definition awaiting validation.
+    """
+
+    async with AsyncSessionLocal() as db:
+        record: LearnedProviderRecord | None = (
+            await LearnedProviderRepository.get(db, domain)
+        )
+
+    if record and record.status == LearnedProviderStatus.CANDIDATE:
+        return ProviderDefinition(**record.definition)
+
+    return None
+
+
+async def record_candidate(
+        domain: str,
+        definition: ProviderDefinition
+    ) -> None:
+    """
+    Persist a freshly inferred definition as a candidate.
+
+    Parameters
+    ----------
+    domain : str
+        Normalized domain of the external store.
+
+    definition : ProviderDefinition
+        Definition inferred from a computer-use run.
+
+    Returns
+    -------
+    None
+    """
+
+    async with AsyncSessionLocal() as db:
+        await LearnedProviderRepository.upsert_candidate(
+            db,
+            domain,
+            definition
+        )
+        await db.commit()
+
+    logger.info(f"new provider definition candidate for {domain}")
+
+
+async def record_validation(
+        domain: str,
+        success: bool
+    ) -> LearnedProviderStatus | None:
+    """
+    Persist the outcome of a validation and update the registry.
+
+    A definition reaching the promotion threshold is registered
+    and replaces computer use for its domain; a rejected one 
+    (after a failed validation, or `LEARNED_PROVIDER_DEMOTION_THRESHOLD`
+    consecutive failed searches once promoted) is removed from 
+    the registry.
+
+    Parameters
+    ----------
+    domain : str
+        Normalized domain of the external store.
+
+    success : bool
+        Whether the definition reproduced a later run's results
+        (or found products, once promoted).
+
+    Returns
+    -------
+    LearnedProviderStatus or None
+        The updated status, or `None` if the domain is unknown.
+    """
+
+    status: LearnedProviderStatus | None = None
+    definition: ProviderDefinition | None = None
+
+    async with AsyncSessionLocal() as db:
+        record: LearnedProviderRecord | None = (
+            await LearnedProviderRepository.get(db, domain)
+        )
+        previous: LearnedProviderStatus | None = (
+            record.status if record else None
+        )
+
+        status = await LearnedProviderRepository.record_validation(
+            db,
+            domain,
+            success,
+            settings.LEARNED_PROVIDER_PROMOTION_THRESHOLD,
+            settings.LEARNED_PROVIDER_DEMOTION_THRESHOLD
+        )
+
+        if record:
+            definition = ProviderDefinition(**record.definition)
+
+        await db.commit()
+
+    if status == previous:
+        return status
+
+    match status:
+        case LearnedProviderStatus.PROMOTED if definition:
+            if await __register(definition):
+                logger.info(f"promoted learned provider for {domain}")
+
+        case LearnedProviderStatus.REJECTED:
+            unregister_learned_provider(domain)
+            logger.info(f"rejected learned provider for {domain}")
+
+        case _:
+            pass
+
+    return status
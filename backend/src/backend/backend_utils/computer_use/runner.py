@@ -1,18 +1,30 @@
 
 
+import time
+from contextlib import nullcontext
+
 from playwright.async_api import Page
 from google.genai import Client
 from google.genai.types import (
     GenerateContentResponse, 
+    GenerateContentResponseUsageMetadata,
     GenerateContentConfig, 
     Candidate
 )
 
+from backend.backend_utils.common import ObservationMode
+from backend.backend_utils.computer_use.learner import SelectorLearner
 from backend.backend_utils.computer_use.session import ComputerUseSession
 from backend.backend_utils.computer_use.functions import (
     execute_function_calls, 
-    get_function_responses
+    get_function_responses,
+    get_viewport
 )
+from backend.backend_utils.governor import provider_governor
+from backend.backend_utils.telemetry import record_llm_call
+
+
+COMPUTER_USE_MODEL: str = "gemini-3-flash-preview"
 
 
 async def run_computer_use_loop(
@@ -21,7 +33,11 @@ async def run_computer_use_loop(
         session: ComputerUseSession,
         config: GenerateContentConfig,
         result_list: list[dict[str, str]],
-        max_iter: int = 10
+        max_iter: int = 10,
+        learner: SelectorLearner | None = None,
+        observation: ObservationMode = ObservationMode.SCREENSHOT,
+        screenshot_every: int = 3,
+        domain: str | None = None
     ) -> None:
     """
     Run an iterative loop where the model interacts with the 
@@ -30,12 +46,16 @@ async def run_computer_use_loop(
     In each iteration, the model generates content using the 
     provided session contents and configuration. The resulting 
     candidate is used to perform browser actions, and results 
-    are recorded and added to the session.
+    are recorded and added to the session. Token usage, image 
+    payload and latency of every call are recorded with 
+    `record_llm_call`.
 
     Parameters
     ----------
     client : Client
-        Google GenAI client used to generate content.
+        Google GenAI client used to generate content. Calls go 
+        through its asynchronous interface, so the event loop is 
+        not blocked while the model is thinking.
 
     page : Page
         Playwright page instance used to execute browser actions.
@@ -54,31 +74,83 @@ async def run_computer_use_loop(
         Maximum number of iterations to run the loop. Defatult to 
         10.
 
+    learner : SelectorLearner or None, optional
+        Learner observing the session to infer a scripted provider
+        definition. Default is None.
+
+    observation : ObservationMode, optional
+        What the model observes after each turn. Default is 
+        `ObservationMode.SCREENSHOT`.
+
+    screenshot_every : int, optional
+        In `HYBRID` mode, a screenshot is attached every 
+        `screenshot_every` turns in addition to the text 
+        snapshot. Default is 3.
+
+    domain : str or None, optional
+        Normalized domain of the store. If given, the browser 
+        actions of each turn are paced by the provider governor 
+        of the domain, like the other searches on the store. 
+        Default is None.
+
     Returns
     -------
     None
         The function modifies the session and result_list in-place.
     """
 
-    for _ in range(max_iter):
+    # the viewport does not change during a session
+    viewport: dict[str, int] = await get_viewport(page)
+
+    for turn in range(max_iter):
+        started: float = time.perf_counter()
+
         response: GenerateContentResponse = (
-            client.models.generate_content(
-                model = "gemini-3-flash-preview",
+            await client.aio.models.generate_content(
+                model = COMPUTER_USE_MODEL,
                 contents = session.contents,
                 config = config,
             )
         )
 
+        usage: GenerateContentResponseUsageMetadata = (
+            response.usage_metadata
+            or GenerateContentResponseUsageMetadata()
+        )
+
+        # thinking tokens are billed as output
+        record_llm_call(
+            model = COMPUTER_USE_MODEL,
+            component = "computer_use",
+            input_tokens = usage.prompt_token_count,
+            output_tokens = (
+                (usage.candidates_token_count or 0)
+                + (usage.thoughts_token_count or 0)
+            ),
+            latency_ms = (time.perf_counter() - started) * 1000,
+            image_bytes = session.image_bytes
+        )
+
         candidate: Candidate = response.candidates[0]
         session.add_model_candidate(candidate)
 
-        results = await execute_function_calls(
-            candidate, 
-            page,
-            result_list
-        )
+        # an action also waits for the page to settle: pace it, but
+        # do not take its duration as the store's latency
+        async with (
+            provider_governor.request(domain, timed = False)
+            if domain else nullcontext()
+        ):
+            results = await execute_function_calls(
+                candidate, 
+                page,
+                result_list,
+                learner,
+                viewport
+            )
         function_responses = await get_function_responses(
             page, 
             results, 
+            observation,
+            include_screenshot = (turn + 1) % max(screenshot_every, 1) == 0
         )
         session.add_function_responses(function_responses)
\ No newline at end of file
@@ -0,0 +1,223 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+from google import genai
+from google.genai.types import HttpOptions
+
+from backend.backend_utils.computer_use.configuration import (
+    generate_content_config
+)
+from backend.backend_utils.metrics import metrics
+from backend.config import settings
+
+
+ConfigKey = tuple[str | None, tuple[str, ...], tuple[Callable[..., Any], ...]]
+
+
+class ComputerUseRuntime:
+    """
+    Process-level holder of the resources shared by computer-use
+    sessions.
+
+    A single GenAI client is kept for the lifetime of the process,
+    backed by a pooled asynchronous HTTP transport, so that
+    sessions reuse open connections instead of paying a TLS
+    handshake each. Content configurations are memoised, so that
+    tool declarations (including the introspection of custom
+    functions) are built once per combination of prompt, excluded
+    functions and custom functions. The runtime also caps the 
+    number of browser sessions driven by the model at the same 
+    time across the whole process.
+    """
+
+
+    def __init__(
+            self,
+            max_sessions: int = 4,
+            max_connections: int = 20,
+            keepalive_expiry: float = 60.0
+        ):
+        """
+        Initialize an empty runtime. The client is created lazily.
+
+        Parameters
+        ----------
+        max_sessions : int, optional
+            Maximum number of concurrent computer-use sessions.
+            Default is 4.
+
+        max_connections : int, optional
+            Maximum number of pooled connections. Default is 20.
+
+        keepalive_expiry : float, optional
+            Seconds an idle connection is kept open. Default is 60.
+
+        Attributes
+        ----------
+        _client : genai.Client or None
+            Shared client, created on first use.
+
+        _http_client : httpx.AsyncClient or None
+            Connection pool used by `_client.aio`. The GenAI SDK 
+            leaves user-provided transports open, so the runtime 
+            closes it itself.
+
+        _configs : dict
+            Memoised configurations keyed by prompt, excluded
+            functions and custom functions.
+
+        _sessions : asyncio.Semaphore
+            Slots of the concurrent computer-use sessions.
+
+        _active_sessions : int
+            Number of sessions currently holding a slot.
+        """
+
+        self._max_connections: int = max_connections
+        self._keepalive_expiry: float = keepalive_expiry
+
+        self._client: genai.Client | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._configs: dict[ConfigKey, genai.types.GenerateContentConfig] = {}
+
+        self._sessions: asyncio.Semaphore = asyncio.Semaphore(
+            max(max_sessions, 1)
+        )
+        self._active_sessions: int = 0
+
+
+    @property
+    def client(
+            self
+        ) -> genai.Client:
+        """
+        Return the shared GenAI client, creating it on first use.
+
+        Returns
+        -------
+        genai.Client
+            Client whose asynchronous interface (`client.aio`) runs
+            on a pooled `httpx.AsyncClient`.
+        """
+
+        if self._client is None:
+            self._http_client = httpx.AsyncClient(
+                limits = httpx.Limits(
+                    max_connections = self._max_connections,
+                    max_keepalive_connections = self._max_connections,
+                    keepalive_expiry = self._keepalive_expiry
+                ),
+                timeout = httpx.Timeout(120.0, connect = 10.0)
+            )
+
+            self._client = genai.Client(
+                http_options = HttpOptions(
+                    httpx_async_client = self._http_client
+                )
+            )
+
+        return self._client
+
+
+    def get_config(
+            self,
+            system_prompt: str | None = None,
+            excluded_functions: list[str] | None = None,
+            custom_functions: list[Callable[..., Any]] | None = None
+        ) -> genai.types.GenerateContentConfig:
+        """
+        Return the content configuration for a set of tools,
+        building it only the first time.
+
+        Parameters
+        ----------
+        system_prompt : str or None, optional
+            System-level instructions. Default is None.
+
+        excluded_functions : list of str or None, optional
+            Names of pre-defined functions to exclude. The order
+            does not matter. Default is None.
+
+        custom_functions : list of callable or None, optional
+            Python callables exposed to the model. Default is None.
+
+        Returns
+        -------
+        genai.types.GenerateContentConfig
+            The shared configuration. It must not be mutated.
+        """
+
+        key: ConfigKey = (
+            system_prompt,
+            tuple(sorted(excluded_functions or [])),
+            tuple(custom_functions or [])
+        )
+
+        if key not in self._configs:
+            self._configs[key] = generate_content_config(
+                self.client,
+                system_prompt,
+                excluded_functions,
+                custom_functions
+            )
+
+        return self._configs[key]
+
+
+    @asynccontextmanager
+    async def session_slot(
+            self
+        ) -> AsyncIterator[None]:
+        """
+        Wait for and hold one of the computer-use session slots.
+
+        The number of active sessions is published as the 
+        `computer_use.sessions.active` gauge.
+
+        Yields
+        ------
+        None
+        """
+
+        async with self._sessions:
+            self._active_sessions += 1
+            metrics.set_gauge(
+                "computer_use.sessions.active",
+                self._active_sessions
+            )
+
+            try:
+                yield
+
+            finally:
+                self._active_sessions -= 1
+                metrics.set_gauge(
+                    "computer_use.sessions.active",
+                    self._active_sessions
+                )
+
+
+    async def aclose(
+            self
+        ) -> None:
+        """
+        Close the shared client and its connections.
+
+        The runtime can be used again afterwards: a new client is
+        created on the next access.
+        """
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+runtime: ComputerUseRuntime = ComputerUseRuntime(
+    max_sessions = settings.COMPUTER_USE_MAX_SESSIONS
+)
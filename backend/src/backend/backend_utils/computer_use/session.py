@@ -9,19 +9,28 @@ from google.genai.types import (
 )
 
 
+# replaces the text snapshots superseded by a newer one
+OUTDATED_SNAPSHOT: str = "(outdated page snapshot removed)"
+
+
 class ComputerUseSession:
     """
     Represents a session of model-driven computer interactions.
 
     Maintains a list of `Content` objects representing user prompts,
     screenshots, model-generated candidates, and tool responses.
+
+    The whole history is sent on every turn, so only the latest 
+    text snapshot of the page is kept in it: when a new one is 
+    added, the previous ones are replaced by `OUTDATED_SNAPSHOT`.
     """
 
 
     def __init__(
             self,
             user_prompt: str, 
-            initial_screenshot: bytes
+            initial_screenshot: bytes | None = None,
+            initial_snapshot: str | None = None
         ):
         """
         Initialize a new computer use session.
@@ -31,20 +40,36 @@ class ComputerUseSession:
         user_prompt : str
             Initial prompt from the user describing the tasks or queries.
 
-        initial_screenshot : bytes
+        initial_screenshot : bytes or None, optional
             Screenshot of the initial browser state encoded as PNG.
+            Default is None.
+
+        initial_snapshot : str or None, optional
+            Text snapshot of the initial page, used by the DOM and 
+            hybrid observation modes. Default is None.
         """
 
+        parts: list[Part] = [Part(text = user_prompt)]
+
+        self._initial_snapshot: Part | None = (
+            Part(text = initial_snapshot) if initial_snapshot else None
+        )
+
+        if self._initial_snapshot:
+            parts.append(self._initial_snapshot)
+
+        if initial_screenshot:
+            parts.append(
+                Part.from_bytes(
+                    data = initial_screenshot,
+                    mime_type = "image/png"
+                )
+            )
+
         self._contents: list[Content] = [
             Content(
                 role = "user",
-                parts = [
-                    Part(text = user_prompt),
-                    Part.from_bytes(
-                        data = initial_screenshot,
-                        mime_type = "image/png"
-                    )
-                ]
+                parts = parts
             )
         ]
 
@@ -67,6 +92,42 @@ class ComputerUseSession:
         return self._contents
 
 
+    @property
+    def image_bytes(
+            self
+        ) -> int:
+        """
+        Return the size of the images carried by the session.
+
+        The whole history is sent on every turn, so this is the 
+        image payload of the next model call.
+
+        Returns
+        -------
+        int
+            Total size in bytes of the inline images, including 
+            those attached to function responses.
+        """
+
+        total: int = 0
+
+        for content in self._contents:
+            for part in content.parts or []:
+                if part.inline_data and part.inline_data.data:
+                    total += len(part.inline_data.data)
+
+                if part.function_response:
+                    for response_part in part.function_response.parts or []:
+                        if (
+                            response_part.inline_data 
+                            and 
+                            response_part.inline_data.data
+                        ):
+                            total += len(response_part.inline_data.data)
+
+        return total
+
+
     def add_model_candidate(
             self, 
             candidate: Candidate
@@ -93,6 +154,8 @@ class ComputerUseSession:
         Append function/tool responses to the session contents.
 
         Each response is wrapped into a Content object with role 'tool'.
+        If the responses carry a text snapshot of the page (under 
+        the `"page"` key), the previous snapshots are dropped.
 
         Parameters
         ----------
@@ -100,6 +163,11 @@ class ComputerUseSession:
             Responses returned from executing model-instructed functions
             on the browser or other tools.
         """
+
+        responses = list(responses)
+
+        if any("page" in (response.response or {}) for response in responses):
+            self.__drop_snapshots()
         
         self._contents.append(
             Content(
@@ -109,4 +177,26 @@ class ComputerUseSession:
                     for response in responses
                 ]
             )
-        )
\ No newline at end of file
+        )
+
+
+    def __drop_snapshots(
+            self
+        ) -> None:
+        """
+        Replace the text snapshots in the history with a placeholder.
+        """
+
+        if self._initial_snapshot:
+            self._initial_snapshot.text = OUTDATED_SNAPSHOT
+            self._initial_snapshot = None
+
+        for content in self._contents:
+            for part in content.parts or []:
+                response: FunctionResponse | None = part.function_response
+
+                if response and "page" in (response.response or {}):
+                    response.response = {
+                        **response.response,
+                        "page": OUTDATED_SNAPSHOT
+                    }
\ No newline at end of file
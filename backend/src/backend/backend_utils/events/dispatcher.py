@@ -1,11 +1,54 @@
 
+import re
+import uuid
+from datetime import timedelta
+from typing import Any
+from logging import (
+    getLogger,
+    Logger
+)
+
 from langchain_core.runnables import Runnable
-from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage
+)
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 
-from backend.agent.history.message_adapter import to_langchain_messages
+from backend.agent.agent_tools import find_quotes
+from backend.agent.history.window import load_history
+from backend.agent.rendering import detect_language, render_quotation
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.progress import suspend_progress
+from backend.backend_utils.quotes import (
+    dump_entries,
+    SearchEntry,
+    to_model_text
+)
+from backend.backend_utils.speculation import (
+    extract_candidate_queries,
+    is_code_word,
+    is_identifier_word,
+    speculative_executor
+)
+from backend.config import settings
 from backend.database.engine import AsyncSessionLocal
 from backend.database.models.message import Message
-from backend.database.repositories import MessageRepository
+from backend.database.models.tool_result import ToolResult
+from backend.database.repositories import (
+    MessageRepository,
+    ToolResultRepository
+)
+
+
+logger: Logger = getLogger("dispatcher")
+
+_SEGMENT_SEPARATORS: re.Pattern = re.compile(r"[,;\n]+")
+_LIST_MARKER: re.Pattern = re.compile(r"^(?:[-*\u2022]|\d+[.)])\s+")
 
 
 def __normalize_content(
@@ -45,22 +88,402 @@ def __normalize_content(
     return ""
 
 
+def __extract_product_codes(
+        user_input: str
+    ) -> list[str] | None:
+    """
+    Extract the product codes from a message made only of codes.
+
+    The message is split on commas, semicolons and newlines, and 
+    list markers are removed. Each segment must be a code, or a 
+    short identifier of up to three words (e.g. "RTX 4090") where 
+    every word is either a code or an uppercase token, and at 
+    least one is a code. Longer segments are accepted only when 
+    every word is a code, and each word is then a separate code.
+
+    Parameters
+    ----------
+    user_input : str
+        The text input from the user.
+
+    Returns
+    -------
+    list of str or None
+        The codes in input order, without duplicates, or `None` 
+        if the message contains anything else (plain words, 
+        questions, instructions) and must be handled by the agent.
+    """
+
+    if "?" in user_input:
+        return None
+
+    codes: list[str] = []
+    seen: set[str] = set()
+
+    for segment in _SEGMENT_SEPARATORS.split(user_input):
+        segment = _LIST_MARKER.sub("", segment.strip()).strip()
+
+        if not segment:
+            continue
+
+        words: list[str] = segment.split()
+
+        if not any(is_code_word(w) for w in words):
+            return None
+
+        if len(words) <= 3:
+            if not all(is_identifier_word(w) for w in words):
+                return None
+
+            candidates: list[str] = [" ".join(words)]
+
+        elif all(is_code_word(w) for w in words):
+            candidates = words
+
+        else:
+            return None
+
+        for code in candidates:
+            if code.casefold() not in seen:
+                seen.add(code.casefold())
+                codes.append(code)
+
+    return codes or None
+
+
+def __start_speculation(
+        user_input: str,
+        config: dict
+    ) -> str | None:
+    """
+    Start searching the likely products of a message before the 
+    agent asks for them.
+
+    Parameters
+    ----------
+    user_input : str
+        The text input from the user.
+
+    config : dict
+        Runnable configuration of the request.
+
+    Returns
+    -------
+    str or None
+        Identifier of the speculation, to be passed to the tool 
+        as `speculation_id`, or `None` if the message has no 
+        candidate products.
+    """
+
+    queries: list[str] = extract_candidate_queries(
+        user_input,
+        settings.SPECULATION_MAX_QUERIES
+    )
+
+    if not queries:
+        return None
+
+    speculation_id: str = str(uuid.uuid4())
+    search_config: dict = {
+        "configurable": dict(config["configurable"])
+    }
+
+    async def search(query: str) -> list[SearchEntry]:
+        """
+        Search a single query with the request configuration.
+        """
+
+        with suspend_progress():
+            return await find_quotes(search_config, [query])
+
+    speculative_executor.start(speculation_id, queries, search)
+
+    return speculation_id
+
+
+async def __is_interrupted_turn(
+        agent: Runnable,
+        config: dict,
+        user_input: str
+    ) -> bool:
+    """
+    Tell whether the last turn of the chat was interrupted while 
+    answering the same message, so that it can be resumed from 
+    its last checkpoint instead of starting over.
+
+    Parameters
+    ----------
+    agent : Runnable
+        The compiled agent graph.
+
+    config : dict
+        Runnable configuration of the request, with the 
+        `thread_id`.
+
+    user_input : str
+        The text input from the user.
+
+    Returns
+    -------
+    bool
+        `True` if the graph has pending steps and its last user 
+        message is `user_input`.
+    """
+
+    if not settings.CHECKPOINTER_ENABLED:
+        return False
+
+    try:
+        snapshot = await agent.aget_state(config)
+
+    except Exception as e:
+        logger.warning(f"could not read the checkpoint: {e}")
+        return False
+
+    if not snapshot.next:
+        return False
+
+    human_messages: list[BaseMessage] = [
+        m for m in snapshot.values.get("messages", []) 
+        if isinstance(m, HumanMessage)
+    ]
+
+    resumed: bool = bool(human_messages) and (
+        human_messages[-1].text == user_input
+    )
+
+    if resumed:
+        metrics.increment("checkpoint.resumed_turns")
+
+    return resumed
+
+
+def __turn_messages(
+        messages: list[BaseMessage]
+    ) -> list[BaseMessage]:
+    """
+    Return the messages produced after the last user message.
+    """
+
+    for position in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[position], HumanMessage):
+            return messages[position + 1:]
+
+    return messages
+
+
+def __collect_searches(
+        messages: list[BaseMessage]
+    ) -> list[tuple[list[str], str, list[dict[str, Any]]]]:
+    """
+    Pair the `search_products` calls of a turn with their outputs.
+
+    Parameters
+    ----------
+    messages : list of BaseMessage
+        Messages produced by the agent during the turn.
+
+    Returns
+    -------
+    list of tuple[list of str, str, list of dict[str, Any]]
+        The searched products, the tool output and the dumped 
+        records of each call.
+    """
+
+    requested: dict[str, list[str]] = {}
+    searches: list[tuple[list[str], str, list[dict[str, Any]]]] = []
+
+    for message in messages:
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls:
+                if tool_call["name"] == "search_products":
+                    requested[tool_call["id"]] = (
+                        tool_call["args"].get("products", [])
+                    )
+
+        elif (
+            isinstance(message, ToolMessage) 
+            and 
+            message.tool_call_id in requested
+        ):
+            searches.append(
+                (
+                    requested[message.tool_call_id], 
+                    message.text,
+                    message.artifact or []
+                )
+            )
+
+    return searches
+
+
+async def __store_search_results(
+        client_id: str,
+        chat_id: str,
+        selected_stores: list[str],
+        searches: list[tuple[list[str], str, list[dict[str, Any]]]]
+    ) -> None:
+    """
+    Persist the outputs of the searches made during a turn, so 
+    that follow-up questions can be answered with 
+    `recall_search_results`. Failures are logged and ignored.
+
+    Parameters
+    ----------
+    client_id : str
+        Identifier of the client.
+
+    chat_id : str
+        Identifier of the chat.
+
+    selected_stores : list of str
+        Stores the searches ran on.
+
+    searches : list of tuple[list of str, str, list of dict[str, Any]]
+        The searched products, the output and the dumped records 
+        of each search.
+    """
+
+    if not searches:
+        return
+
+    try:
+        async with AsyncSessionLocal() as db:
+            for products, content, records in searches:
+                await ToolResultRepository.save(
+                    db,
+                    client_id,
+                    chat_id,
+                    "search_products",
+                    products,
+                    selected_stores,
+                    content,
+                    records
+                )
+
+            await db.commit()
+
+    except Exception as e:
+        logger.warning(f"could not store search results of {chat_id}: {e}")
+
+
+async def __stored_results_index(
+        client_id: str,
+        chat_id: str
+    ) -> SystemMessage | None:
+    """
+    Build a short note listing the searches stored for a chat, 
+    so the agent knows it can recall them instead of searching 
+    again.
+
+    Parameters
+    ----------
+    client_id : str
+        Identifier of the client.
+
+    chat_id : str
+        Identifier of the chat.
+
+    Returns
+    -------
+    SystemMessage or None
+        The note, or `None` if the chat has no fresh results.
+    """
+
+    async with AsyncSessionLocal() as db:
+        records: list[ToolResult] = await ToolResultRepository.get_recent(
+            db,
+            client_id,
+            chat_id,
+            max_age = timedelta(seconds = settings.TOOL_RESULT_MAX_AGE)
+        )
+
+    if not records:
+        return None
+
+    lines: list[str] = [
+        "- {} on {}".format(
+            ", ".join(f"'{p}'" for p in record.products),
+            ", ".join(record.stores) or "no store"
+        )
+        for record in records
+    ]
+
+    return SystemMessage(
+        content = (
+            "Stored results of searches made in this conversation "
+            "(read them with `recall_search_results` instead of "
+            "searching again, unless the user asks for updated "
+            "results):\n" + "\n".join(lines)
+        )
+    )
+
+
+async def __chat_language(
+        client_id: str,
+        chat_id: str
+    ) -> str:
+    """
+    Return the language of the latest user message of a chat 
+    whose language can be told, or English.
+    """
+
+    async with AsyncSessionLocal() as db:
+        recent: list[Message] = await MessageRepository.get_recent_messages(
+            db,
+            client_id,
+            chat_id,
+            limit = settings.HISTORY_WINDOW_MESSAGES
+        )
+
+    for message in reversed(recent):
+        if message.role != "user":
+            continue
+
+        language: str | None = detect_language(message.content)
+
+        if language:
+            return language
+
+    return "en"
+
+
 async def dispatch_chat(
         agent: Runnable,
         user_input: str,
         client_id: str,
         chat_id: str,
         selected_stores: list[str],
-        items_per_store: int
+        items_per_store: int,
+        message_id: int | None = None
     ) -> str:
     """
     Send a user message to the agent and retrieve the 
     AI response.
 
-    This function fetches previous messages from the 
-    database, converts them to LangChain messages, 
-    invokes the agent with the current user input, and
-    normalizes the returned response content.
+    This function loads the conversation history (a 
+    bounded window of recent messages plus the chat 
+    summary), invokes the agent with the current user 
+    input, and normalizes the returned response content.
+
+    Messages made only of product codes take a fast path 
+    instead: when stores are selected, the codes are 
+    searched directly and the results are rendered as a 
+    quotation table, so the agent (and its model calls) 
+    is skipped. The table is labelled in the language of the 
+    latest user message of the chat that tells it.
+    Anything else goes through the agent, while the products 
+    the message most likely refers to are already searched 
+    speculatively: if the agent's tool call asks for them, the 
+    in-flight searches are reused.
+
+    The outputs of the searches are stored per chat, and the 
+    agent is told which ones are available, so that follow-up 
+    questions are answered from them instead of searching again.
+
+    With the checkpointer enabled, the chat ID is the graph 
+    thread: a turn interrupted while answering the same message 
+    resumes from its last checkpoint instead of starting over.
 
     Parameters
     ----------
@@ -82,6 +505,11 @@ async def dispatch_chat(
     items_per_store : int
         Number of items to query per store.
 
+    message_id : int | None, optional
+        ID of the stored copy of `user_input`, left out of the 
+        history since the input is sent as the current turn. 
+        Default is None.
+
     Returns
     -------
     str
@@ -90,31 +518,96 @@ async def dispatch_chat(
         is returned instead.
     """
 
-    async with AsyncSessionLocal() as db:
-        previous_messages: list[Message] = (
-            await MessageRepository.get_all_messages(
-                db,
-                client_id,
-                chat_id
-            )
+    config: dict = {
+        "configurable": {
+            "client_id": client_id,
+            "chat_id": chat_id,
+            "selected_stores": selected_stores,
+            "items_per_store": items_per_store
+        }
+    }
+
+    if settings.FAST_PATH_ENABLED:
+        codes: list[str] | None = (
+            __extract_product_codes(user_input) 
+            if selected_stores else None
         )
 
-    lc_messages: list[BaseMessage] = to_langchain_messages(
-        previous_messages
+        metrics.increment(
+            "chat.fast_path",
+            route = "template" if codes else "agent"
+        )
+
+        if codes:
+            try:
+                entries: list[SearchEntry] = await find_quotes(
+                    config, 
+                    codes
+                )
+
+                await __store_search_results(
+                    client_id,
+                    chat_id,
+                    selected_stores,
+                    [(codes, to_model_text(entries), dump_entries(entries))]
+                )
+
+                return render_quotation(
+                    entries,
+                    codes,
+                    await __chat_language(client_id, chat_id)
+                )
+
+            except Exception as e:
+                return str(e)
+
+    speculation_id: str | None = (
+        __start_speculation(user_input, config) 
+        if settings.SPECULATION_ENABLED and selected_stores else None
     )
 
+    if speculation_id:
+        config["configurable"]["speculation_id"] = speculation_id
+
+    if settings.CHECKPOINTER_ENABLED:
+        config["configurable"]["thread_id"] = chat_id
+
+    graph_input: dict | None = None
+
+    if not await __is_interrupted_turn(agent, config, user_input):
+        lc_messages: list[BaseMessage] = await load_history(
+            client_id,
+            chat_id,
+            exclude_id = message_id
+        )
+
+        stored_index: SystemMessage | None = await __stored_results_index(
+            client_id,
+            chat_id
+        )
+
+        if stored_index:
+            lc_messages.append(stored_index)
+
+        if settings.CHECKPOINTER_ENABLED:
+            # the checkpointed state is replaced by the bounded window
+            lc_messages.insert(0, RemoveMessage(id = REMOVE_ALL_MESSAGES))
+
+        graph_input = {
+            "messages": lc_messages + [HumanMessage(user_input)]
+        }
+
     try:
         messages: dict = await agent.ainvoke(
-            input = {
-                "messages": lc_messages + [HumanMessage(user_input)]
-            },
-            config = {
-                "configurable": {
-                    "client_id": client_id,
-                    "selected_stores": selected_stores,
-                    "items_per_store": items_per_store
-                }
-            }
+            input = graph_input,
+            config = config
+        )
+
+        await __store_search_results(
+            client_id,
+            chat_id,
+            selected_stores,
+            __collect_searches(__turn_messages(messages["messages"]))
         )
 
         ai_response: BaseMessage = messages["messages"][-1]
@@ -122,4 +615,8 @@ async def dispatch_chat(
         return __normalize_content(ai_response.content)
 
     except Exception as e:
-        return str(e)
\ No newline at end of file
+        return str(e)
+
+    finally:
+        if speculation_id:
+            speculative_executor.finish(speculation_id)
\ No newline at end of file
@@ -1,8 +1,14 @@
 
+from logging import (
+    getLogger,
+    Logger
+)
 from playwright.async_api import StorageState
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 
+from backend.agent.checkpointer import checkpointer
 from backend.agent.main_agent import graph as agent
 from backend.backend_utils.browser.login_service import (
     validate_state,
@@ -10,9 +16,11 @@ from backend.backend_utils.browser.login_service import (
     execute_autologin
 )
 from backend.backend_utils.events.dispatcher import dispatch_chat
+from backend.config import settings
 from backend.database.models.chat import Chat
 from backend.database.models.client import Client
 from backend.database.models.login_context import LoginContext
+from backend.database.models.message import Message
 from backend.database.repositories import (
     ChatRepository,
     ClientRepository,
@@ -44,6 +52,9 @@ from shared.events.metadata import (
 from shared.shared_utils.common import LoginStatus
 
 
+logger: Logger = getLogger("event-handler")
+
+
 class EventHandler:
     """
     Central handler for managing different types of client events.
@@ -216,7 +227,8 @@ class EventHandler:
     async def handle_event(
             db: AsyncSession,
             event: Event,
-            client_id: str
+            client_id: str,
+            job_id: str | None = None
         ) -> dict[str, Any]:
         """
         Dispatch an incoming event to the appropriate handler.
@@ -232,6 +244,11 @@ class EventHandler:
         client_id : str
             Identifier of the client that triggered the event.
 
+        job_id : str | None, optional
+            The job processing the event. Chat messages are saved 
+            with it, so that a retried job does not save them 
+            twice. Default is None.
+
         Returns
         -------
         dict[str, Any]
@@ -252,7 +269,8 @@ class EventHandler:
                 return await EventHandler.__handle_chat_message(
                     db, 
                     event, 
-                    client_id
+                    client_id,
+                    job_id
                 )
             
             case ClearChatMessagesEvent():
@@ -377,12 +395,17 @@ class EventHandler:
     async def __handle_chat_message(
             db: AsyncSession,
             event: ChatMessageEvent,
-            client_id: str
+            client_id: str,
+            job_id: str | None = None
         ) -> dict[str, Any]:
         """
         Handle a chat message event by saving user message, 
         invoking the agent, and saving the assistant response.
 
+        When a job is retried after a crash, the messages it 
+        already saved are not saved again, and an answer already 
+        saved is returned without invoking the agent.
+
         Parameters
         ----------
         db : AsyncSession
@@ -394,6 +417,9 @@ class EventHandler:
         client_id : str
             Client identifier.
 
+        job_id : str | None, optional
+            The job processing the event, if any.
+
         Returns
         -------
         dict[str, Any]
@@ -402,6 +428,7 @@ class EventHandler:
         """
 
         ai_response: str | None = None
+        user_message: Message | None = None
 
         role: str = event.role
         message: str = event.content
@@ -431,13 +458,44 @@ class EventHandler:
             client_id
         )
 
-        await MessageRepository.save_message(
-            db,
-            client_id,
-            chat_id,
-            role,
-            message
-        )
+        if job_id:
+            answer: Message | None = (
+                await MessageRepository.get_job_message(
+                    db,
+                    job_id,
+                    "assistant"
+                )
+            )
+
+            if answer:
+                return ChatMessageEvent(
+                    role = "assistant",
+                    content = answer.content,
+                    metadata = BaseMetadata(
+                        chat_id = chat_id
+                    )
+                ).model_dump()
+
+            user_message = await MessageRepository.get_job_message(
+                db,
+                job_id,
+                role
+            )
+
+        if user_message is None:
+            user_message = await MessageRepository.save_message(
+                db,
+                client_id,
+                chat_id,
+                role,
+                message,
+                job_id = job_id
+            )
+
+        # the agent (its checkpointer, the stored search results) 
+        # writes through other sessions: holding this session's 
+        # write open would lock them out on SQLite
+        await db.commit()
 
         ai_response = await dispatch_chat(
             agent,
@@ -445,7 +503,8 @@ class EventHandler:
             client_id,
             chat_id,
             all_selected_stores,
-            items_per_store
+            items_per_store,
+            message_id = user_message.id
         )
 
         await MessageRepository.save_message(
@@ -453,7 +512,8 @@ class EventHandler:
             client_id,
             chat_id,
             role = "assistant",
-            content = ai_response
+            content = ai_response,
+            job_id = job_id
         )
 
         result_event: Event = ChatMessageEvent(
@@ -506,10 +566,20 @@ class EventHandler:
                 chat_id,
             )
 
+            await ChatRepository.update_summary(db, chat_id, None, None)
+
+            # the checkpointer writes through its own session
+            await db.commit()
+
+            if settings.CHECKPOINTER_ENABLED:
+                await checkpointer.adelete_thread(chat_id)
+
             success = True
 
-        except:
-            pass
+        except SQLAlchemyError as e:
+            await db.rollback()
+
+            logger.warning(f"could not clear chat {chat_id}: {e}")
 
         result_event: Event = ClearChatMessagesResultEvent(
             metadata = metadata,
@@ -552,7 +622,7 @@ class EventHandler:
 
             success = True
 
-        except:
+        except Exception:
             pass
 
         result_event: Event = DeleteClientChatsResultEvent(
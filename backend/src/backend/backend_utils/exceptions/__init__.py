@@ -4,4 +4,7 @@ from backend.backend_utils.exceptions.login_failed import (
 )
 from backend.backend_utils.exceptions.manual_fallback import (
     ManualFallbackException
+)
+from backend.backend_utils.exceptions.queue_full import (
+    QueueFullException
 )
\ No newline at end of file
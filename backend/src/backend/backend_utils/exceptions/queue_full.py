@@ -0,0 +1,36 @@
+class QueueFullException(Exception):
+    """
+    Exception raised when a job cannot be queued because the 
+    queue of its lane is full.
+
+    Parameters
+    ----------
+    lane : str
+        The lane whose queue is full.
+
+    retry_after : int
+        Suggested number of seconds before retrying.
+
+    Attributes
+    ----------
+    lane : str
+        The lane whose queue is full.
+
+    retry_after : int
+        Suggested number of seconds before retrying.
+    """
+
+
+    def __init__(
+            self,
+            lane: str,
+            retry_after: int
+        ):
+
+        self.lane = lane
+        self.retry_after = retry_after
+
+        super().__init__(
+            f"The {lane} job queue is full. "
+            f"Retry in {retry_after} second(s)."
+        )
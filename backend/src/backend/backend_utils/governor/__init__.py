@@ -0,0 +1,4 @@
+from backend.backend_utils.governor.provider_governor import (
+    provider_governor,
+    ProviderGovernor
+)
\ No newline at end of file
@@ -0,0 +1,399 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from logging import (
+    getLogger,
+    Logger
+)
+from typing import Any, AsyncIterator
+
+from backend.backend_utils.metrics import metrics
+from backend.config import settings
+
+from shared.provider.base_provider import BaseProvider
+from shared.provider.learned_provider import normalize_domain
+from shared.provider.registry import all_providers
+
+
+logger: Logger = getLogger("provider-governor")
+
+
+def _registered_provider(
+        domain: str
+    ) -> BaseProvider | None:
+    """
+    Return the registered provider of a domain, if any.
+    """
+
+    return next(
+        (
+            provider for provider in all_providers()
+            if normalize_domain(provider.url) == domain
+        ),
+        None
+    )
+
+
+class _DomainLimits:
+    """
+    Limits and observed behaviour of one store domain.
+    """
+
+
+    def __init__(
+            self,
+            max_pages: int,
+            requests_per_second: float
+        ):
+        """
+        Initialize the limits of a domain at their configured
+        maximum.
+
+        Attributes
+        ----------
+        limit : float
+            Current number of pages allowed at the same time,
+            between 1 and `max_pages`.
+
+        in_use : int
+            Pages currently open on the domain.
+
+        next_request_at : float
+            Monotonic time before which no request may start.
+
+        latency_ms : float or None
+            Moving average of the latency of the successful
+            requests.
+
+        decreased_at : float
+            Monotonic time of the last decrease of `limit`.
+
+        changed : asyncio.Condition
+            Notified when a page is released or `limit` grows.
+        """
+
+        self.max_pages: int = max(max_pages, 1)
+        self.requests_per_second: float = requests_per_second
+        self.limit: float = float(self.max_pages)
+        self.in_use: int = 0
+        self.next_request_at: float = 0.0
+        self.latency_ms: float | None = None
+        self.decreased_at: float = 0.0
+        self.changed: asyncio.Condition = asyncio.Condition()
+
+
+    def rate(
+            self
+        ) -> float:
+        """
+        Return the current requests per second, reduced in the
+        same proportion as the page limit.
+        """
+
+        return self.requests_per_second * self.limit / self.max_pages
+
+
+class ProviderGovernor:
+    """
+    Process-wide politeness limits of the store domains.
+
+    Every search on a store, from any job, goes through the
+    governor of the store's domain: a page is opened only when the
+    domain has fewer than its current limit of pages open (`page`),
+    and each request to the domain (a product search, a structured
+    data lookup, a computer-use action) is spaced to respect its
+    requests per second (`request`).
+
+    The limits start at the values configured on the provider
+    (`max_concurrent_pages`, `requests_per_second`), or at the
+    `PROVIDER_MAX_PAGES` and `PROVIDER_REQUESTS_PER_SECOND`
+    defaults for external stores, and adapt with AIMD: each
+    successful request raises the page limit by `1 / limit`, while
+    a failed request, or one slower than `PROVIDER_SLOW_FACTOR`
+    times the average latency, halves it (at most once per average
+    latency, so a burst of failures counts once). The request rate
+    follows the page limit.
+
+    The current limits are published as the `provider.limit`,
+    `provider.rate` and `provider.pages` gauges and the decreases
+    as the `provider.backoffs` counter, labelled by domain, and
+    returned by `snapshot`.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize a governor with no known domain.
+
+        Attributes
+        ----------
+        _domains : dict[str, _DomainLimits]
+            Limits of each domain searched so far.
+        """
+
+        self._domains: dict[str, _DomainLimits] = {}
+
+
+    def limits(
+            self,
+            domain: str,
+            max_pages: int | None = None,
+            requests_per_second: float | None = None
+        ) -> _DomainLimits:
+        """
+        Return the limits of a domain, created on first use.
+
+        Parameters
+        ----------
+        domain : str
+            Normalized domain of the store.
+
+        max_pages : int or None, optional
+            Maximum pages configured for the store. If `None`, the
+            value of the registered provider of the domain applies,
+            or else `PROVIDER_MAX_PAGES`.
+
+        requests_per_second : float or None, optional
+            Request rate configured for the store. If `None`, the
+            value of the registered provider of the domain applies,
+            or else `PROVIDER_REQUESTS_PER_SECOND`.
+
+        Returns
+        -------
+        _DomainLimits
+            The limits of the domain. Values passed after the
+            first use are ignored; since the provider's own limits
+            are looked up, they apply whichever method (`page` or
+            `request`) uses the domain first.
+        """
+
+        if domain not in self._domains:
+            provider: BaseProvider | None = _registered_provider(domain)
+
+            if provider is not None:
+                max_pages = max_pages or provider.max_concurrent_pages
+                requests_per_second = (
+                    requests_per_second or provider.requests_per_second
+                )
+
+            self._domains[domain] = _DomainLimits(
+                max_pages or settings.PROVIDER_MAX_PAGES,
+                requests_per_second or settings.PROVIDER_REQUESTS_PER_SECOND
+            )
+
+        return self._domains[domain]
+
+
+    @asynccontextmanager
+    async def page(
+            self,
+            domain: str,
+            max_pages: int | None = None,
+            requests_per_second: float | None = None
+        ) -> AsyncIterator[None]:
+        """
+        Hold one of the pages allowed on a domain for the duration
+        of the block, waiting for one if the limit is reached.
+
+        Parameters
+        ----------
+        domain : str
+            Normalized domain of the store.
+
+        max_pages : int or None, optional
+            Maximum pages configured for the store.
+
+        requests_per_second : float or None, optional
+            Request rate configured for the store.
+
+        Yields
+        ------
+        None
+        """
+
+        limits: _DomainLimits = self.limits(
+            domain,
+            max_pages,
+            requests_per_second
+        )
+
+        async with limits.changed:
+            await limits.changed.wait_for(
+                lambda: limits.in_use < int(limits.limit)
+            )
+            limits.in_use += 1
+
+        self.__publish(domain, limits)
+
+        try:
+            yield
+
+        finally:
+            async with limits.changed:
+                limits.in_use -= 1
+                limits.changed.notify()
+
+            self.__publish(domain, limits)
+
+
+    @asynccontextmanager
+    async def request(
+            self,
+            domain: str,
+            timed: bool = True
+        ) -> AsyncIterator[None]:
+        """
+        Run a request to a domain once its rate allows it, and
+        adapt the limits of the domain to its outcome. Exceptions
+        raised in the block count as failures and are re-raised.
+
+        Parameters
+        ----------
+        domain : str
+            Normalized domain of the store.
+
+        timed : bool, optional
+            Whether the duration of the block is a latency of the
+            store. Long blocks that include other work (e.g. a
+            computer-use action) pass False. Default is True.
+
+        Yields
+        ------
+        None
+        """
+
+        limits: _DomainLimits = self.limits(domain)
+        now: float = time.monotonic()
+        start_at: float = max(now, limits.next_request_at)
+
+        limits.next_request_at = start_at + 1 / limits.rate()
+
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+        started: float = time.perf_counter()
+
+        try:
+            yield
+
+        except Exception:
+            await self.__record(domain, limits, None)
+            raise
+
+        await self.__record(
+            domain,
+            limits,
+            (time.perf_counter() - started) * 1000 if timed else None,
+            failed = False
+        )
+
+
+    def snapshot(
+            self
+        ) -> dict[str, dict[str, Any]]:
+        """
+        Return the current limits of every domain.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Per domain: the current and configured page limits, the
+            pages open, the current and configured requests per
+            second and the average latency in milliseconds.
+        """
+
+        return {
+            domain: {
+                "limit": int(limits.limit),
+                "max_pages": limits.max_pages,
+                "pages": limits.in_use,
+                "requests_per_second": round(limits.rate(), 3),
+                "max_requests_per_second": limits.requests_per_second,
+                "latency_ms": (
+                    round(limits.latency_ms, 1)
+                    if limits.latency_ms is not None else None
+                )
+            }
+            for domain, limits in self._domains.items()
+        }
+
+
+    async def __record(
+            self,
+            domain: str,
+            limits: _DomainLimits,
+            latency_ms: float | None,
+            failed: bool = True
+        ) -> None:
+        """
+        Adapt the limits of a domain to the outcome of a request.
+        """
+
+        average: float | None = limits.latency_ms
+        slow: bool = (
+            latency_ms is not None
+            and average is not None
+            and latency_ms > settings.PROVIDER_SLOW_FACTOR * average
+        )
+
+        if latency_ms is not None and not failed:
+            limits.latency_ms = (
+                latency_ms if average is None
+                else 0.8 * average + 0.2 * latency_ms
+            )
+
+        now: float = time.monotonic()
+
+        if failed or slow:
+            cooldown: float = max((average or 0.0) / 1000, 1.0)
+
+            if now - limits.decreased_at < cooldown:
+                return
+
+            limits.limit = max(limits.limit / 2, 1.0)
+            limits.decreased_at = now
+
+            metrics.increment("provider.backoffs", domain = domain)
+
+            logger.info(
+                f"{domain}: {'failure' if failed else 'slow response'}, "
+                f"limit lowered to {int(limits.limit)} page(s)"
+            )
+
+        else:
+            grown: bool = int(limits.limit + 1 / limits.limit) > int(
+                limits.limit
+            )
+            limits.limit = min(
+                limits.limit + 1 / limits.limit,
+                float(limits.max_pages)
+            )
+
+            if grown:
+                async with limits.changed:
+                    limits.changed.notify()
+
+        self.__publish(domain, limits)
+
+
+    def __publish(
+            self,
+            domain: str,
+            limits: _DomainLimits
+        ) -> None:
+        """
+        Publish the current limits of a domain.
+        """
+
+        metrics.set_gauge("provider.limit", int(limits.limit), domain = domain)
+        metrics.set_gauge(
+            "provider.rate",
+            round(limits.rate(), 3),
+            domain = domain
+        )
+        metrics.set_gauge("provider.pages", limits.in_use, domain = domain)
+
+
+provider_governor: ProviderGovernor = ProviderGovernor()
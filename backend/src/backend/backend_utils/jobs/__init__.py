@@ -0,0 +1,12 @@
+from backend.backend_utils.jobs.runner import (
+    cancel_job,
+    event_lane,
+    load_event,
+    run_event_job
+)
+from backend.backend_utils.jobs.scheduler import (
+    job_scheduler,
+    JobRunner,
+    JobScheduler
+)
+from backend.backend_utils.jobs.worker import JobWorker
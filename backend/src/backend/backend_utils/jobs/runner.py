@@ -0,0 +1,362 @@
+import asyncio
+from logging import (
+    getLogger,
+    Logger
+)
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from backend.backend_utils.common import (
+    JobLane,
+    PROCESS_ID
+)
+from backend.backend_utils.events.handler import EventHandler
+from backend.backend_utils.notifications import (
+    job_events,
+    job_notifier
+)
+from backend.backend_utils.progress import track_progress
+from backend.backend_utils.telemetry import (
+    track_usage,
+    UsageRecorder
+)
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.repositories import JobRepository
+
+from shared.events import Event
+from shared.events.chat import ChatMessageEvent
+from shared.events.credentials import StoreCredentialsEvent
+from shared.events.error import ErrorEvent
+from shared.events.login import TriggerAutoLoginEvent
+from shared.events.metadata import BaseMetadata
+from shared.shared_utils.common import JobStatus
+
+
+logger: Logger = getLogger("job-runner")
+
+# processing task of each job running in this process
+_running_jobs: dict[str, asyncio.Task] = {}
+
+# jobs stopped because another process recovered them
+_lost_jobs: set[str] = set()
+
+_event_adapter: TypeAdapter[Event] = TypeAdapter(Event)
+
+
+def event_lane(
+        event: Event
+    ) -> JobLane:
+    """
+    Return the scheduler lane of an event.
+
+    Parameters
+    ----------
+    event : Event
+        The event of the job.
+
+    Returns
+    -------
+    JobLane
+        `HEAVY` for the events that open browsers or call the 
+        models (chat messages, logins, credential checks), `LIGHT` 
+        otherwise.
+    """
+
+    match event:
+        case (
+            ChatMessageEvent() 
+            | TriggerAutoLoginEvent() 
+            | StoreCredentialsEvent()
+        ):
+            return JobLane.HEAVY
+
+        case _:
+            return JobLane.LIGHT
+
+
+def load_event(
+        payload: dict[str, Any]
+    ) -> Event:
+    """
+    Rebuild the event of a job from its stored payload.
+
+    Parameters
+    ----------
+    payload : dict[str, Any]
+        The `payload` of the job.
+
+    Returns
+    -------
+    Event
+        The event.
+
+    Raises
+    ------
+    pydantic.ValidationError
+        If the payload is not a valid event.
+    """
+
+    return _event_adapter.validate_python(payload)
+
+
+async def run_event_job(
+        job_id: str, 
+        client_id: str,
+        event: Event,
+        owner_id: str = PROCESS_ID
+    ) -> None:
+    """
+    Execute the event asynchronously and update job status in 
+    the database.
+
+    Processes the event via the EventHandler, sets job status to 
+    RUNNING, COMPLETED, or FAILED, and records the results or errors. 
+    The model calls performed while processing the event are stored 
+    with the job, together with their token, latency and cost totals, 
+    and the stores completed so far are published as the job's 
+    progress. A heartbeat renewing the job's lease is written every 
+    `WORKER_HEARTBEAT_INTERVAL` seconds while the event is processed. 
+    Commits all changes to the database, then notifies the requests 
+    waiting for the job. The status changes are published as 
+    `"status"` events, the last one holding the whole job.
+
+    The processing can be stopped with `cancel_job`, or by marking 
+    the job as cancelled from any process, which is noticed at the 
+    next heartbeat; the job then ends as `CANCELLED`. Jobs cancelled 
+    while queued, or before they are marked as running, are 
+    skipped.
+
+    If the lease of the job is lost (the heartbeats failed for 
+    longer than `JOB_LEASE_SECONDS`) and the job is recovered by 
+    another process, the processing is stopped without storing 
+    anything, so that the job is not completed twice.
+
+    Parameters
+    ----------
+    job_id : str
+        ID of the job to update.
+
+    client_id : str
+        ID of the client associated with the job.
+
+    event : Event
+        The event to process.
+
+    owner_id : str, optional
+        The process running the job (default is the process ID).
+
+    Returns
+    -------
+    None
+    """
+
+    async with AsyncSessionLocal() as db:
+        queued: dict[str, Any] | None = await JobRepository.get(db, job_id)
+
+    if queued and queued["status"] == JobStatus.CANCELLED:
+        return
+
+    work: asyncio.Task = asyncio.create_task(
+        __process(job_id, client_id, event, owner_id)
+    )
+    _running_jobs[job_id] = work
+
+    heartbeat_task: asyncio.Task = asyncio.create_task(
+        __heartbeat(job_id, owner_id)
+    )
+
+    job_events.publish(job_id, "status", {"status": JobStatus.RUNNING})
+
+    try:
+        await work
+
+    except asyncio.CancelledError:
+        # the runner itself is being stopped (e.g. shutdown)
+        if asyncio.current_task().cancelling():
+            raise
+
+        if job_id in _lost_jobs:
+            logger.warning(f"job {job_id} lost its lease, stopped")
+
+        else:
+            await __finish_cancelled(job_id)
+
+    finally:
+        heartbeat_task.cancel()
+        _running_jobs.pop(job_id, None)
+        _lost_jobs.discard(job_id)
+
+
+def cancel_job(
+        job_id: str
+    ) -> bool:
+    """
+    Cancel the processing of a job running in this process.
+
+    The cancellation reaches the store searches, the browsers and 
+    the model calls of the job. The job is then marked as 
+    `CANCELLED` by `run_event_job`.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+
+    Returns
+    -------
+    bool
+        True if the job was running in this process.
+    """
+
+    work: asyncio.Task | None = _running_jobs.get(job_id)
+
+    if work is None or work.done():
+        return False
+
+    work.cancel()
+
+    return True
+
+
+async def __process(
+        job_id: str, 
+        client_id: str,
+        event: Event,
+        owner_id: str
+    ) -> None:
+    """
+    Process the event of a job and store its outcome.
+    """
+
+    recorder: UsageRecorder = UsageRecorder()
+
+    async with AsyncSessionLocal() as db:
+        try:
+            started: bool = await JobRepository.set_running(
+                db,
+                job_id,
+                owner_id,
+                settings.JOB_LEASE_SECONDS
+            )
+            await db.commit()
+
+            # cancelled after it was queued or claimed
+            if not started:
+                logger.info(f"job {job_id} cancelled before starting")
+
+                return
+        
+            with track_usage() as recorder, track_progress(job_id):
+                result: dict = await EventHandler.handle_event(
+                    db,
+                    event,
+                    client_id,
+                    job_id
+                )
+
+            await JobRepository.set_result(
+                db,
+                job_id, 
+                result
+            )
+
+        except Exception as e:
+            await db.rollback()
+
+            metadata: BaseMetadata | None = None
+
+            if getattr(getattr(event, "metadata", None), "chat_id", None):
+                metadata = BaseMetadata(
+                    chat_id = event.metadata.chat_id
+                )
+
+            error_event: Event = ErrorEvent(
+                message = str(e),
+                metadata = metadata
+            )
+
+            await JobRepository.set_error(
+                db,
+                job_id, 
+                str(e)
+            )
+
+            await JobRepository.set_result(
+                db,
+                job_id,
+                result = error_event.model_dump()
+            )
+
+        if recorder.calls:
+            await JobRepository.set_usage(
+                db,
+                job_id,
+                recorder.calls,
+                recorder.totals()
+            )
+
+        await db.commit()
+
+        job: dict[str, Any] | None = await JobRepository.get(db, job_id)
+
+    job_notifier.notify(job_id)
+
+    if job:
+        job_events.publish(job_id, "status", job)
+
+
+async def __finish_cancelled(
+        job_id: str
+    ) -> None:
+    """
+    Mark a job whose processing was cancelled and notify its 
+    waiters.
+    """
+
+    async with AsyncSessionLocal() as db:
+        await JobRepository.set_cancelled(db, job_id)
+        await db.commit()
+
+        job: dict[str, Any] | None = await JobRepository.get(db, job_id)
+
+    logger.info(f"job {job_id} cancelled")
+
+    job_notifier.notify(job_id)
+
+    if job:
+        job_events.publish(job_id, "status", job)
+
+
+async def __heartbeat(
+        job_id: str,
+        owner_id: str
+    ) -> None:
+    """
+    Write the heartbeat of a running job until cancelled, and stop 
+    the job if it was cancelled or recovered by another process.
+    """
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                status: JobStatus | None = await JobRepository.heartbeat(
+                    db, 
+                    job_id,
+                    owner_id,
+                    settings.JOB_LEASE_SECONDS
+                )
+                await db.commit()
+
+            if status is None:
+                _lost_jobs.add(job_id)
+                cancel_job(job_id)
+
+            elif status == JobStatus.CANCELLED:
+                cancel_job(job_id)
+
+        except Exception as e:
+            logger.warning(f"could not write heartbeat of {job_id}: {e}")
+
+        await asyncio.sleep(settings.WORKER_HEARTBEAT_INTERVAL)
@@ -0,0 +1,479 @@
+import asyncio
+import math
+import time
+from collections import deque
+from logging import (
+    getLogger,
+    Logger
+)
+from typing import Awaitable, Callable
+
+from backend.backend_utils.common import JobLane
+from backend.backend_utils.exceptions import QueueFullException
+from backend.backend_utils.metrics import metrics
+from backend.config import settings
+
+
+logger: Logger = getLogger("job-scheduler")
+
+JobRunner = Callable[[], Awaitable[None]]
+
+
+class JobScheduler:
+    """
+    In-process scheduler running the jobs created by the server.
+
+    Each lane has a bounded queue and a fixed number of workers,
+    so heavy jobs (browsers, model calls) cannot starve light ones
+    and a burst of requests is queued instead of run all at once.
+    When a queue is full, `submit` raises `QueueFullException`
+    with a retry delay estimated from the queue length and the
+    average duration of the lane's jobs.
+
+    Within a lane, jobs are queued per client and the workers
+    serve the clients in turn (round-robin), so a client with many
+    jobs cannot delay the jobs of the others. A client runs at
+    most `client_running` jobs of a lane at the same time and
+    queues at most `client_queue_size` more; further jobs of that
+    client are rejected, while the other clients are still
+    served.
+
+    The queue depth and the running jobs of each lane are
+    published as the `jobs.queue_depth` and `jobs.running`
+    gauges, the clients with queued jobs as the
+    `jobs.clients_waiting` gauge, the time spent in the queue as
+    the `jobs.wait_ms` summary and the rejected submissions as the
+    `jobs.rejected` counter, all labelled by lane.
+    """
+
+
+    def __init__(
+            self,
+            lanes: dict[JobLane, tuple[int, int]],
+            client_running: int = 2,
+            client_queue_size: int = 8
+        ):
+        """
+        Initialize a scheduler. Workers start with `start`.
+
+        Parameters
+        ----------
+        lanes : dict[JobLane, tuple[int, int]]
+            Number of workers and queue size of each lane.
+
+        client_running : int, optional
+            Maximum number of jobs of a lane run at the same time
+            for one client (default is 2).
+
+        client_queue_size : int, optional
+            Maximum number of jobs of a lane queued for one client
+            (default is 8).
+
+        Attributes
+        ----------
+        _queues : dict[JobLane, dict[str, deque]]
+            Jobs waiting for a worker, with their enqueue time,
+            per client.
+
+        _turns : dict[JobLane, deque[str]]
+            Clients with queued jobs, in the order they are
+            served.
+
+        _queued : dict[JobLane, int]
+            Number of queued jobs per lane.
+
+        _ready : dict[JobLane, asyncio.Event]
+            Set when a job is queued or ends, to wake the idle
+            workers of the lane.
+
+        _durations : dict[JobLane, float]
+            Moving average of the duration of the jobs of each
+            lane, in seconds.
+
+        _running : dict[JobLane, int]
+            Number of jobs being processed per lane.
+
+        _client_running : dict[JobLane, dict[str, int]]
+            Number of jobs being processed per lane and client.
+
+        _workers : list[asyncio.Task]
+            The worker tasks.
+        """
+
+        self._lanes: dict[JobLane, tuple[int, int]] = lanes
+        self._client_limit: int = max(client_running, 1)
+        self._client_queue_size: int = client_queue_size
+        self._queues: dict[
+            JobLane,
+            dict[str, deque[tuple[str, JobRunner, float]]]
+        ] = {lane: {} for lane in lanes}
+        self._turns: dict[JobLane, deque[str]] = {
+            lane: deque() for lane in lanes
+        }
+        self._queued: dict[JobLane, int] = {lane: 0 for lane in lanes}
+        self._ready: dict[JobLane, asyncio.Event] = {
+            lane: asyncio.Event() for lane in lanes
+        }
+        self._durations: dict[JobLane, float] = {
+            lane: 1.0 for lane in lanes
+        }
+        self._running: dict[JobLane, int] = {lane: 0 for lane in lanes}
+        self._client_running: dict[JobLane, dict[str, int]] = {
+            lane: {} for lane in lanes
+        }
+        self._workers: list[asyncio.Task] = []
+
+
+    def start(
+            self
+        ) -> None:
+        """
+        Start the workers of every lane.
+        """
+
+        for lane, (workers, _) in self._lanes.items():
+            for _ in range(workers):
+                self._workers.append(
+                    asyncio.create_task(self.__work(lane))
+                )
+
+
+    async def stop(
+            self
+        ) -> None:
+        """
+        Cancel the workers, including the jobs they are running.
+        Queued jobs are dropped.
+        """
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions = True)
+
+        self._workers.clear()
+
+        for lane in self._lanes:
+            self._queues[lane].clear()
+            self._turns[lane].clear()
+            self._queued[lane] = 0
+
+
+    def has_capacity(
+            self,
+            lane: JobLane,
+            client_id: str | None = None
+        ) -> bool:
+        """
+        Tell whether a job of a lane can currently be queued.
+
+        Parameters
+        ----------
+        lane : JobLane
+            The lane.
+
+        client_id : str or None, optional
+            The client submitting the job. If given, its own
+            queue is checked as well.
+
+        Returns
+        -------
+        bool
+            `False` if the queue of the lane, or of the client,
+            is full.
+        """
+
+        if self._queued[lane] >= self._lanes[lane][1]:
+            return False
+
+        return client_id is None or self.__client_queued(
+            lane,
+            client_id
+        ) < self._client_queue_size
+
+
+    def retry_after(
+            self,
+            lane: JobLane,
+            client_id: str | None = None
+        ) -> int:
+        """
+        Estimate when a rejected job of a lane could be queued.
+
+        Parameters
+        ----------
+        lane : JobLane
+            The lane.
+
+        client_id : str or None, optional
+            The client whose job was rejected. When its own queue
+            is the full one, the estimate is based on it.
+
+        Returns
+        -------
+        int
+            Seconds until a queue slot is expected to free up,
+            at least 1.
+        """
+
+        workers: int = max(self._lanes[lane][0], 1)
+        queued: int = self._queued[lane]
+
+        if client_id is not None and (
+            self._queued[lane] < self._lanes[lane][1]
+        ):
+            workers = min(workers, self._client_limit)
+            queued = self.__client_queued(lane, client_id)
+
+        return max(
+            1,
+            math.ceil(self._durations[lane] * (queued + 1) / workers)
+        )
+
+
+    def submit(
+            self,
+            lane: JobLane,
+            job_id: str,
+            runner: JobRunner,
+            client_id: str = ""
+        ) -> None:
+        """
+        Queue a job.
+
+        Parameters
+        ----------
+        lane : JobLane
+            The lane the job runs in.
+
+        job_id : str
+            The ID of the job, used in logs.
+
+        runner : callable
+            Coroutine function processing the job. It must handle
+            its own errors; exceptions are only logged.
+
+        client_id : str, optional
+            The client the job belongs to. Jobs submitted without
+            a client share one queue.
+
+        Raises
+        ------
+        QueueFullException
+            If the queue of the lane, or of the client, is full.
+        """
+
+        if not self.has_capacity(lane, client_id):
+            metrics.increment("jobs.rejected", lane = lane.value)
+
+            raise QueueFullException(
+                lane.value,
+                self.retry_after(lane, client_id)
+            )
+
+        if client_id not in self._queues[lane]:
+            self._queues[lane][client_id] = deque()
+            self._turns[lane].append(client_id)
+
+        self._queues[lane][client_id].append(
+            (job_id, runner, time.monotonic())
+        )
+        self._queued[lane] += 1
+        self._ready[lane].set()
+
+        self.__publish(lane)
+
+
+    def remove(
+            self,
+            job_id: str
+        ) -> bool:
+        """
+        Drop a queued job, e.g. because it was cancelled, so that 
+        its place in the queues of its lane and client is freed 
+        at once.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Returns
+        -------
+        bool
+            True if the job was queued.
+        """
+
+        for lane, queues in self._queues.items():
+            for client_id, queue in queues.items():
+                entry: tuple[str, JobRunner, float] | None = next(
+                    (e for e in queue if e[0] == job_id),
+                    None
+                )
+
+                if entry is None:
+                    continue
+
+                queue.remove(entry)
+
+                if not queue:
+                    del queues[client_id]
+                    self._turns[lane].remove(client_id)
+
+                self._queued[lane] -= 1
+                self.__publish(lane)
+
+                return True
+
+        return False
+
+
+    def __client_queued(
+            self,
+            lane: JobLane,
+            client_id: str
+        ) -> int:
+        """
+        Return the number of queued jobs of a client.
+        """
+
+        return len(self._queues[lane].get(client_id, ()))
+
+
+    def __next(
+            self,
+            lane: JobLane
+        ) -> tuple[str, str, JobRunner, float] | None:
+        """
+        Take the next job of a lane: the first job of the next
+        client in turn that runs fewer jobs than its limit. The
+        client then waits for the others to be served.
+        """
+
+        turns: deque[str] = self._turns[lane]
+        running: dict[str, int] = self._client_running[lane]
+
+        for _ in range(len(turns)):
+            client_id: str = turns[0]
+            turns.rotate(-1)
+
+            if running.get(client_id, 0) >= self._client_limit:
+                continue
+
+            queue: deque[tuple[str, JobRunner, float]] = (
+                self._queues[lane][client_id]
+            )
+            job_id, runner, enqueued_at = queue.popleft()
+
+            if not queue:
+                del self._queues[lane][client_id]
+                turns.remove(client_id)
+
+            self._queued[lane] -= 1
+
+            return client_id, job_id, runner, enqueued_at
+
+        return None
+
+
+    async def __work(
+            self,
+            lane: JobLane
+        ) -> None:
+        """
+        Process the jobs of a lane, one at a time.
+
+        Parameters
+        ----------
+        lane : JobLane
+            The lane served by the worker.
+        """
+
+        running: dict[str, int] = self._client_running[lane]
+
+        while True:
+            job: tuple[str, str, JobRunner, float] | None = (
+                self.__next(lane)
+            )
+
+            if job is None:
+                self._ready[lane].clear()
+                await self._ready[lane].wait()
+                continue
+
+            client_id, job_id, runner, enqueued_at = job
+            started: float = time.monotonic()
+
+            metrics.observe(
+                "jobs.wait_ms",
+                (started - enqueued_at) * 1000,
+                lane = lane.value
+            )
+
+            self._running[lane] += 1
+            running[client_id] = running.get(client_id, 0) + 1
+            self.__publish(lane)
+
+            try:
+                await runner()
+
+            except Exception as e:
+                logger.error(f"job {job_id} crashed: {e}")
+
+            finally:
+                self._running[lane] -= 1
+                running[client_id] -= 1
+
+                if not running[client_id]:
+                    del running[client_id]
+
+                self._durations[lane] = (
+                    0.8 * self._durations[lane]
+                    + 0.2 * (time.monotonic() - started)
+                )
+                self.__publish(lane)
+
+                # a client may have dropped below its limit
+                self._ready[lane].set()
+
+
+    def __publish(
+            self,
+            lane: JobLane
+        ) -> None:
+        """
+        Publish the queue depth, waiting clients and running jobs
+        of a lane.
+        """
+
+        metrics.set_gauge(
+            "jobs.queue_depth",
+            self._queued[lane],
+            lane = lane.value
+        )
+        metrics.set_gauge(
+            "jobs.clients_waiting",
+            len(self._turns[lane]),
+            lane = lane.value
+        )
+        metrics.set_gauge(
+            "jobs.running",
+            self._running[lane],
+            lane = lane.value
+        )
+
+
+job_scheduler: JobScheduler = JobScheduler(
+    {
+        JobLane.HEAVY: (
+            settings.JOB_HEAVY_WORKERS,
+            settings.JOB_HEAVY_QUEUE_SIZE
+        ),
+        JobLane.LIGHT: (
+            settings.JOB_LIGHT_WORKERS,
+            settings.JOB_LIGHT_QUEUE_SIZE
+        )
+    },
+    client_running = settings.JOB_CLIENT_MAX_RUNNING,
+    client_queue_size = settings.JOB_CLIENT_QUEUE_SIZE
+)
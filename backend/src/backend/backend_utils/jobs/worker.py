@@ -0,0 +1,232 @@
+import asyncio
+from logging import (
+    getLogger,
+    Logger
+)
+
+from backend.backend_utils.common import (
+    JobLane,
+    PROCESS_ID
+)
+from backend.backend_utils.jobs.runner import (
+    load_event,
+    run_event_job
+)
+from backend.backend_utils.metrics import metrics
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.job import Job
+from backend.database.repositories import JobRepository
+
+from shared.events import Event
+
+
+logger: Logger = getLogger("job-worker")
+
+
+class JobWorker:
+    """
+    Worker process running the jobs queued in the database.
+
+    With `JOB_EXECUTION=external` the server only creates the job
+    rows, with the event as payload. Any number of workers (on
+    any node sharing the database) claim them with
+    `JobRepository.claim_next`, which locks the rows with
+    `SKIP LOCKED`, so a job is run exactly once. Each worker
+    runs at most as many jobs per lane as the lane's workers
+    setting, and only claims jobs of the lanes with free slots. 
+    Across all workers, a client runs at most 
+    `JOB_CLIENT_MAX_RUNNING` jobs of a lane, and the clients with 
+    fewer running jobs are served first.
+
+    The running jobs of each lane are published as the
+    `worker.running` gauge and the claimed jobs as the
+    `worker.claimed` counter, labelled by lane.
+    """
+
+
+    def __init__(
+            self,
+            lanes: dict[JobLane, int],
+            owner_id: str = PROCESS_ID
+        ):
+        """
+        Initialize a worker. Jobs are claimed once `run` starts.
+
+        Parameters
+        ----------
+        lanes : dict[JobLane, int]
+            Maximum number of jobs run at the same time per lane.
+
+        owner_id : str, optional
+            Identifier written on the claimed jobs (default is the
+            process ID).
+
+        Attributes
+        ----------
+        _running : dict[JobLane, set[asyncio.Task]]
+            The jobs being run per lane.
+
+        _freed : asyncio.Event
+            Set when a job ends, to wake a worker whose lanes are
+            all busy.
+        """
+
+        self.owner_id: str = owner_id
+        self._lanes: dict[JobLane, int] = lanes
+        self._running: dict[JobLane, set[asyncio.Task]] = {
+            lane: set() for lane in lanes
+        }
+        self._freed: asyncio.Event = asyncio.Event()
+
+
+    async def run(
+            self
+        ) -> None:
+        """
+        Claim and run jobs until cancelled. On cancellation, the
+        running jobs are cancelled as well.
+        """
+
+        logger.info(f"worker {self.owner_id} started")
+
+        try:
+            while True:
+                free: list[JobLane] = [
+                    lane for lane, limit in self._lanes.items()
+                    if len(self._running[lane]) < limit
+                ]
+
+                if not free:
+                    self._freed.clear()
+                    await self._freed.wait()
+                    continue
+
+                job: Job | None = await self.__claim(free)
+
+                if job is None:
+                    await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
+                    continue
+
+                self.__start(job)
+
+        finally:
+            tasks: list[asyncio.Task] = [
+                task
+                for running in self._running.values()
+                for task in running
+            ]
+
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions = True)
+
+            logger.info(f"worker {self.owner_id} stopped")
+
+
+    async def __claim(
+            self,
+            lanes: list[JobLane]
+        ) -> Job | None:
+        """
+        Claim the next pending job of some lanes. Database errors
+        are logged and reported as no job.
+        """
+
+        try:
+            async with AsyncSessionLocal() as db:
+                job: Job | None = await JobRepository.claim_next(
+                    db,
+                    self.owner_id,
+                    [lane.value for lane in lanes],
+                    settings.JOB_LEASE_SECONDS,
+                    settings.JOB_CLIENT_MAX_RUNNING
+                )
+                await db.commit()
+
+                return job
+
+        except Exception as e:
+            logger.warning(f"could not claim a job: {e}")
+
+            return None
+
+
+    def __start(
+            self,
+            job: Job
+        ) -> None:
+        """
+        Run a claimed job in the background.
+        """
+
+        lane: JobLane = JobLane(job.lane)
+        task: asyncio.Task = asyncio.create_task(
+            self.__run_job(job.id, job.client_id, job.payload)
+        )
+
+        self._running[lane].add(task)
+        task.add_done_callback(lambda t: self.__finished(lane, t))
+
+        metrics.increment("worker.claimed", lane = lane.value)
+        self.__publish(lane)
+
+
+    async def __run_job(
+            self,
+            job_id: str,
+            client_id: str,
+            payload: dict
+        ) -> None:
+        """
+        Parse the payload of a job and process its event.
+        """
+
+        try:
+            event: Event = load_event(payload)
+
+        except Exception as e:
+            async with AsyncSessionLocal() as db:
+                await JobRepository.set_error(
+                    db,
+                    job_id,
+                    f"invalid job payload: {e}"
+                )
+                await db.commit()
+
+            return
+
+        await run_event_job(job_id, client_id, event, self.owner_id)
+
+
+    def __finished(
+            self,
+            lane: JobLane,
+            task: asyncio.Task
+        ) -> None:
+        """
+        Release the slot of a finished job.
+        """
+
+        self._running[lane].discard(task)
+        self._freed.set()
+        self.__publish(lane)
+
+        if not task.cancelled() and task.exception():
+            logger.error(f"job crashed: {task.exception()}")
+
+
+    def __publish(
+            self,
+            lane: JobLane
+        ) -> None:
+        """
+        Publish the running jobs of a lane.
+        """
+
+        metrics.set_gauge(
+            "worker.running",
+            len(self._running[lane]),
+            lane = lane.value
+        )
@@ -0,0 +1,4 @@
+from backend.backend_utils.metrics.registry import (
+    metrics,
+    MetricsRegistry
+)
\ No newline at end of file
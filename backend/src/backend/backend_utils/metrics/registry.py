@@ -0,0 +1,207 @@
+import threading
+from typing import Any
+
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    In-process registry of counters, gauges and summaries.
+
+    Metrics are identified by a name and an optional set of 
+    string labels (e.g. `tier="scripted"`). Values live in memory 
+    only and are exposed through the `GET /metrics` endpoint.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize an empty registry.
+
+        Attributes
+        ----------
+        _counters : dict
+            Monotonic counters keyed by name and labels.
+
+        _gauges : dict
+            Last-value gauges keyed by name and labels.
+
+        _summaries : dict
+            Count, sum, min and max of observed values keyed by 
+            name and labels.
+
+        _lock : threading.Lock
+            Lock protecting updates coming from worker threads.
+        """
+
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._summaries: dict[str, dict[LabelKey, dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    def __key(
+            labels: dict[str, Any]
+        ) -> LabelKey:
+        """
+        Build a hashable key from a label mapping.
+
+        Parameters
+        ----------
+        labels : dict[str, Any]
+            Label names and values.
+
+        Returns
+        -------
+        LabelKey
+            Sorted tuple of `(name, value)` pairs.
+        """
+
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+    def increment(
+            self,
+            name: str,
+            value: float = 1.0,
+            **labels: Any
+        ) -> None:
+        """
+        Increase a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter.
+
+        value : float, optional
+            Amount to add. Default is 1.
+
+        **labels : Any
+            Labels identifying the series.
+        """
+
+        key: LabelKey = MetricsRegistry.__key(labels)
+
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+
+    def set_gauge(
+            self,
+            name: str,
+            value: float,
+            **labels: Any
+        ) -> None:
+        """
+        Set a gauge to its current value.
+
+        Parameters
+        ----------
+        name : str
+            Name of the gauge.
+
+        value : float
+            Current value.
+
+        **labels : Any
+            Labels identifying the series.
+        """
+
+        key: LabelKey = MetricsRegistry.__key(labels)
+
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+
+    def observe(
+            self,
+            name: str,
+            value: float,
+            **labels: Any
+        ) -> None:
+        """
+        Record a single observation (e.g. a latency) in a summary.
+
+        Parameters
+        ----------
+        name : str
+            Name of the summary.
+
+        value : float
+            Observed value.
+
+        **labels : Any
+            Labels identifying the series.
+        """
+
+        key: LabelKey = MetricsRegistry.__key(labels)
+
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.setdefault(
+                key,
+                {"count": 0, "sum": 0.0, "min": value, "max": value}
+            )
+
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+
+
+    def snapshot(
+            self
+        ) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """
+        Return a JSON-serializable copy of all metrics.
+
+        Returns
+        -------
+        dict
+            Mapping with `"counters"`, `"gauges"` and `"summaries"` 
+            keys. Each maps metric names to a list of series, every 
+            series carrying its `labels` and values. Summaries also 
+            expose the `mean` of their observations.
+        """
+
+        with self._lock:
+            counters = {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+                for name, series in self._counters.items()
+            }
+            gauges = {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+                for name, series in self._gauges.items()
+            }
+            summaries = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        **summary,
+                        "mean": summary["sum"] / summary["count"]
+                    }
+                    for key, summary in series.items()
+                ]
+                for name, series in self._summaries.items()
+            }
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "summaries": summaries
+        }
+
+
+metrics: MetricsRegistry = MetricsRegistry()
@@ -0,0 +1,12 @@
+from backend.backend_utils.notifications.job_events import (
+    job_events,
+    JobEventBus
+)
+from backend.backend_utils.notifications.job_listener import (
+    job_listener,
+    JobChangeListener
+)
+from backend.backend_utils.notifications.job_notifier import (
+    job_notifier,
+    JobNotifier
+)
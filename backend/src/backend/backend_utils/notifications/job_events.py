@@ -0,0 +1,123 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from backend.backend_utils.metrics import metrics
+
+
+class JobEventBus:
+    """
+    In-process publish/subscribe of the events of running jobs.
+
+    The job runner, the progress reporter and the agent publish
+    what happens in a job (status changes, completed stores with
+    their records, tokens of the final answer) and the stream
+    endpoint forwards them to the subscribed clients as they
+    happen. Events are not stored: a subscriber only receives
+    the events published after it subscribed.
+
+    Each subscriber has a bounded queue; events published to a
+    full queue are dropped and counted in the `events.dropped`
+    counter.
+    """
+
+
+    def __init__(
+            self,
+            queue_size: int = 1000
+        ):
+        """
+        Initialize a bus without subscribers.
+
+        Parameters
+        ----------
+        queue_size : int, optional
+            Maximum number of undelivered events per subscriber 
+            (default is 1000).
+
+        Attributes
+        ----------
+        _subscribers : dict[str, set[asyncio.Queue]]
+            The queues of the current subscribers of each job.
+        """
+
+        self._queue_size: int = queue_size
+        self._subscribers: dict[
+            str, 
+            set[asyncio.Queue[tuple[str, dict[str, Any]]]]
+        ] = {}
+
+
+    @contextmanager
+    def subscribe(
+            self,
+            job_id: str
+        ) -> Iterator[asyncio.Queue[tuple[str, dict[str, Any]]]]:
+        """
+        Receive the events of a job published inside the block.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Yields
+        ------
+        asyncio.Queue
+            Queue receiving the `(kind, data)` pairs of the events.
+        """
+
+        queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(
+            maxsize = self._queue_size
+        )
+        subscribers: set[asyncio.Queue] = self._subscribers.setdefault(
+            job_id,
+            set()
+        )
+        subscribers.add(queue)
+
+        try:
+            yield queue
+
+        finally:
+            subscribers.discard(queue)
+
+            if (
+                not subscribers 
+                and 
+                self._subscribers.get(job_id) is subscribers
+            ):
+                del self._subscribers[job_id]
+
+
+    def publish(
+            self,
+            job_id: str,
+            kind: str,
+            data: dict[str, Any]
+        ) -> None:
+        """
+        Deliver an event to the subscribers of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        kind : str
+            Type of the event (e.g. `"status"`, `"store"`, 
+            `"token"`).
+
+        data : dict[str, Any]
+            JSON-compatible content of the event.
+        """
+
+        for queue in self._subscribers.get(job_id, ()):
+            try:
+                queue.put_nowait((kind, data))
+
+            except asyncio.QueueFull:
+                metrics.increment("events.dropped", kind = kind)
+
+
+job_events: JobEventBus = JobEventBus()
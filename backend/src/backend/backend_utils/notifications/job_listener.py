@@ -0,0 +1,181 @@
+import asyncio
+import json
+from logging import (
+    getLogger,
+    Logger
+)
+from typing import Any
+
+from backend.backend_utils.common import PROCESS_ID
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.notifications.job_events import job_events
+from backend.backend_utils.notifications.job_notifier import job_notifier
+from backend.database.actions.job_notify import JOB_CHANNEL
+from backend.database.engine import engine
+
+
+logger: Logger = getLogger("job-listener")
+
+
+class JobChangeListener:
+    """
+    Receiver of the job changes made by other processes.
+
+    On PostgreSQL, the listener holds a connection of the engine
+    that `LISTEN`s on the channel `notify_job` sends to, and
+    forwards every change made by another process (e.g. a job
+    completed by an external worker or another API process) to
+    the local waiters: the long polls are woken through
+    `job_notifier` and the streams receive a `"changed"` event
+    through `job_events`, after which both read the job again.
+    The connection is re-opened when it is lost.
+
+    With other databases the listener does not start and the
+    waiters rely on the in-process notifications only.
+    """
+
+
+    def __init__(
+            self,
+            reconnect_delay: float = 5.0
+        ):
+        """
+        Initialize a stopped listener.
+
+        Parameters
+        ----------
+        reconnect_delay : float, optional
+            Seconds to wait before re-opening a lost connection 
+            (default is 5.0).
+
+        Attributes
+        ----------
+        active : bool
+            True while notifications are being received.
+
+        _task : asyncio.Task or None
+            The task holding the listening connection.
+        """
+
+        self.active: bool = False
+        self._reconnect_delay: float = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+
+    def start(
+            self
+        ) -> None:
+        """
+        Start listening, if the database supports notifications.
+        """
+
+        if engine.dialect.name != "postgresql":
+            logger.info(
+                f"{engine.dialect.name} has no notifications, "
+                f"job changes are only notified in-process"
+            )
+            return
+
+        self._task = asyncio.create_task(self.__listen())
+
+
+    async def stop(
+            self
+        ) -> None:
+        """
+        Stop listening and release the connection.
+        """
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        await asyncio.gather(self._task, return_exceptions = True)
+
+        self._task = None
+
+
+    async def __listen(
+            self
+        ) -> None:
+        """
+        Hold a listening connection, re-opening it when lost.
+        """
+
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw: Any = await connection.get_raw_connection()
+                    driver: Any = raw.driver_connection
+                    closed: asyncio.Event = asyncio.Event()
+
+                    driver.add_termination_listener(
+                        lambda _: closed.set()
+                    )
+                    await driver.add_listener(JOB_CHANNEL, self.__received)
+
+                    self.active = True
+                    logger.info(f"listening on {JOB_CHANNEL}")
+
+                    try:
+                        await closed.wait()
+
+                    finally:
+                        self.active = False
+
+                        if not driver.is_closed():
+                            await driver.remove_listener(
+                                JOB_CHANNEL,
+                                self.__received
+                            )
+
+                logger.warning("listening connection lost")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.warning(f"could not listen on {JOB_CHANNEL}: {e}")
+
+            await asyncio.sleep(self._reconnect_delay)
+
+
+    def __received(
+            self,
+            connection: Any,
+            pid: int,
+            channel: str,
+            payload: str
+        ) -> None:
+        """
+        Forward a notification to the local waiters of its job.
+        """
+
+        try:
+            change: dict[str, Any] = json.loads(payload)
+            job_id: str = change["job_id"]
+
+        except (ValueError, KeyError):
+            return
+
+        if change.get("origin") == PROCESS_ID:
+            return
+
+        metrics.increment(
+            "notifications.received",
+            kind = change.get("kind", "unknown")
+        )
+
+        job_notifier.notify(job_id)
+        job_events.publish(
+            job_id,
+            "changed",
+            {
+                "kind": change.get("kind"),
+                "status": change.get("status")
+            }
+        )
+
+
+job_listener: JobChangeListener = JobChangeListener()
@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class JobNotifier:
+    """
+    In-process notifications of job changes.
+
+    Request handlers waiting for a job `watch` it and are woken
+    when the process running the job calls `notify` (e.g. on
+    completion or when its progress is published), instead of
+    reading the job from the database at a fixed interval.
+    Changes made in other processes are not notified.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize a notifier without watchers.
+
+        Attributes
+        ----------
+        _watchers : dict[str, set[asyncio.Event]]
+            The events of the current watchers of each job.
+        """
+
+        self._watchers: dict[str, set[asyncio.Event]] = {}
+
+
+    @contextmanager
+    def watch(
+            self,
+            job_id: str
+        ) -> Iterator[asyncio.Event]:
+        """
+        Watch the changes of a job inside the block.
+
+        Start watching before reading the job, so that a change
+        made right after the read is not missed.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Yields
+        ------
+        asyncio.Event
+            Set when the job changes.
+        """
+
+        changed: asyncio.Event = asyncio.Event()
+        watchers: set[asyncio.Event] = self._watchers.setdefault(
+            job_id,
+            set()
+        )
+        watchers.add(changed)
+
+        try:
+            yield changed
+
+        finally:
+            watchers.discard(changed)
+
+            if not watchers and self._watchers.get(job_id) is watchers:
+                del self._watchers[job_id]
+
+
+    def notify(
+            self,
+            job_id: str
+        ) -> None:
+        """
+        Wake the watchers of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the changed job.
+        """
+
+        for changed in self._watchers.get(job_id, ()):
+            changed.set()
+
+
+job_notifier: JobNotifier = JobNotifier()
@@ -0,0 +1,6 @@
+from backend.backend_utils.progress.reporter import (
+    current_progress,
+    JobProgress,
+    suspend_progress,
+    track_progress
+)
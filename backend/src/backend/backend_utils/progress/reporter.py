@@ -0,0 +1,319 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import (
+    datetime,
+    timezone
+)
+from logging import (
+    getLogger,
+    Logger
+)
+from typing import Any, Iterator
+
+from backend.backend_utils.notifications import (
+    job_events,
+    job_notifier
+)
+from backend.backend_utils.quotes import dump_entries, SearchEntry
+from backend.database.engine import AsyncSessionLocal
+from backend.database.repositories import JobRepository
+
+
+logger: Logger = getLogger("job-progress")
+
+
+class JobProgress:
+    """
+    Partial results of a running job.
+
+    A progress is bound to the current context with
+    `track_progress`, so the searches run by the job (directly or
+    through the agent's tool calls) report each store as soon as
+    it completes. Every report is published in the `progress`
+    column of the job, where clients polling the job can show the
+    results of the fast stores while the slow ones (e.g. computer
+    use) are still running, and sent right away to the clients
+    streaming the job's events, together with the tokens of the
+    final answer.
+    """
+
+
+    def __init__(
+            self,
+            job_id: str
+        ):
+        """
+        Initialize an empty progress.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job the progress belongs to.
+
+        Attributes
+        ----------
+        stores_total : int
+            Number of store searches started by the job.
+
+        stores : list of dict
+            One entry per completed store search, in completion
+            order.
+
+        records : list of dict
+            Dumped search entries of the completed stores.
+
+        _lock : asyncio.Lock
+            Serializes the publications, so that they are written
+            in order.
+        """
+
+        self.job_id: str = job_id
+        self.stores_total: int = 0
+        self.stores: list[dict[str, Any]] = []
+        self.records: list[dict[str, Any]] = []
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+
+    def snapshot(
+            self
+        ) -> dict[str, Any]:
+        """
+        Return the progress as a JSON-compatible dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The `stores_total`, `stores_done`, `stores` and
+            `records` of the progress.
+        """
+
+        return {
+            "stores_total": self.stores_total,
+            "stores_done": len(self.stores),
+            "stores": list(self.stores),
+            "records": list(self.records)
+        }
+
+
+    async def search_started(
+            self,
+            stores: list[str]
+        ) -> None:
+        """
+        Report the start of a search on some stores.
+
+        Parameters
+        ----------
+        stores : list of str
+            The stores being searched.
+        """
+
+        self.stores_total += len(stores)
+
+        job_events.publish(
+            self.job_id,
+            "search",
+            {"stores": list(stores), "stores_total": self.stores_total}
+        )
+
+        await self.__publish()
+
+
+    async def store_completed(
+            self,
+            store: str,
+            entries: list[SearchEntry],
+            elapsed_ms: float
+        ) -> None:
+        """
+        Report the completion of the search on a store.
+
+        Parameters
+        ----------
+        store : str
+            The store.
+
+        entries : list of SearchEntry
+            Quote records and notices produced by the store.
+
+        elapsed_ms : float
+            Time since the search started, in milliseconds.
+        """
+
+        self.__append(store, entries, round(elapsed_ms, 1))
+
+        await self.__publish()
+
+
+    async def results_reused(
+            self,
+            entries: list[SearchEntry]
+        ) -> None:
+        """
+        Report results obtained without a new search (e.g. claimed
+        speculative searches), as one completed store per provider.
+
+        Parameters
+        ----------
+        entries : list of SearchEntry
+            The reused quote records and notices.
+        """
+
+        by_provider: dict[str, list[SearchEntry]] = {}
+
+        for entry in entries:
+            by_provider.setdefault(entry.provider, []).append(entry)
+
+        if not by_provider:
+            return
+
+        self.stores_total += len(by_provider)
+
+        for provider, provider_entries in by_provider.items():
+            self.__append(provider, provider_entries, None)
+
+        await self.__publish()
+
+
+    def answer_token(
+            self,
+            text: str
+        ) -> None:
+        """
+        Stream a piece of the final answer as the model writes it.
+        Tokens are sent to the subscribers of the job only, not 
+        stored.
+
+        Parameters
+        ----------
+        text : str
+            The new text.
+        """
+
+        if text:
+            job_events.publish(self.job_id, "token", {"text": text})
+
+
+    def __append(
+            self,
+            store: str,
+            entries: list[SearchEntry],
+            elapsed_ms: float | None
+        ) -> None:
+        """
+        Add a completed store and its entries, and send them to 
+        the subscribers of the job.
+        """
+
+        completed: dict[str, Any] = {
+            "store": store,
+            "results": sum(1 for e in entries if e.type == "quote"),
+            "elapsed_ms": elapsed_ms,
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        }
+        records: list[dict[str, Any]] = dump_entries(entries)
+
+        self.stores.append(completed)
+        self.records.extend(records)
+
+        job_events.publish(
+            self.job_id,
+            "store",
+            {
+                **completed,
+                "records": records,
+                "stores_done": len(self.stores),
+                "stores_total": self.stores_total
+            }
+        )
+
+
+    async def __publish(
+            self
+        ) -> None:
+        """
+        Write the current snapshot to the job and notify its
+        watchers. Failures are logged and do not interrupt the job.
+        """
+
+        async with self._lock:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await JobRepository.set_progress(
+                        db,
+                        self.job_id,
+                        self.snapshot()
+                    )
+                    await db.commit()
+
+                job_notifier.notify(self.job_id)
+
+            except Exception as e:
+                logger.warning(
+                    f"could not publish progress of {self.job_id}: {e}"
+                )
+
+
+_current_progress: ContextVar[JobProgress | None] = ContextVar(
+    "job_progress",
+    default = None
+)
+
+
+@contextmanager
+def track_progress(
+        job_id: str
+    ) -> Iterator[JobProgress]:
+    """
+    Bind a new `JobProgress` to the current context.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the running job.
+
+    Yields
+    ------
+    JobProgress
+        The progress receiving the reports made inside the block.
+    """
+
+    progress: JobProgress = JobProgress(job_id)
+    token: Token = _current_progress.set(progress)
+
+    try:
+        yield progress
+
+    finally:
+        _current_progress.reset(token)
+
+
+@contextmanager
+def suspend_progress() -> Iterator[None]:
+    """
+    Stop reporting progress inside the block (e.g. for speculative
+    searches, whose results may never be used).
+    """
+
+    token: Token = _current_progress.set(None)
+
+    try:
+        yield
+
+    finally:
+        _current_progress.reset(token)
+
+
+def current_progress() -> JobProgress | None:
+    """
+    Return the progress bound to the current context.
+
+    Returns
+    -------
+    JobProgress or None
+        The progress, or `None` outside `track_progress` (e.g. in
+        CLI mode).
+    """
+
+    return _current_progress.get()
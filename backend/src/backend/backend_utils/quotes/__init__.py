@@ -0,0 +1,15 @@
+from backend.backend_utils.quotes.records import (
+    make_records,
+    match_query,
+    parse_currency,
+    parse_price,
+    ProviderNotice,
+    QuoteRecord,
+    SearchEntry
+)
+from backend.backend_utils.quotes.serialization import (
+    compact_link,
+    dump_entries,
+    load_entries,
+    to_model_text
+)
@@ -0,0 +1,307 @@
+import re
+from datetime import (
+    datetime,
+    timezone
+)
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+_PRICE_NUMBER: re.Pattern = re.compile(r"\d[\d.,\s]*")
+_TOKEN: re.Pattern = re.compile(r"[^\W_]+")
+_CURRENCIES: dict[str, str] = {
+    "€": "EUR",
+    "eur": "EUR",
+    "$": "USD",
+    "usd": "USD",
+    "£": "GBP",
+    "gbp": "GBP",
+    "chf": "CHF"
+}
+_CURRENCY: re.Pattern = re.compile(
+    r"€|\$|£|\b(?:eur|usd|gbp|chf)\b",
+    re.IGNORECASE
+)
+
+
+class QuoteRecord(BaseModel):
+    """
+    A product found by a search on a store.
+
+    Attributes
+    ----------
+    type : Literal["quote"]
+        Discriminator of the record type.
+
+    provider : str
+        Name of the provider, or URL of the external store.
+
+    query : str or None
+        The product query the record answers, or `None` when it
+        could not be told (e.g. a computer-use session searching
+        several queries at once).
+
+    title : str
+        Name of the product as displayed by the store.
+
+    price : str
+        Price as displayed by the store.
+
+    amount : float or None
+        Numeric value of `price`, if it could be parsed.
+
+    currency : str or None
+        ISO 4217 code of the currency of `price`, if recognized.
+
+    availability : str
+        Availability as displayed by the store.
+
+    link : str or None
+        URL of the product page.
+
+    source : str
+        Tier that produced the record: `"scripted"`, `"learned"`,
+        `"structured_data"` or `"computer_use"`.
+
+    retrieved_at : datetime
+        When the store was read (UTC). Records served from the
+        quote cache keep the time of the original search.
+    """
+
+    model_config = ConfigDict(frozen = True)
+
+    type: Literal["quote"] = "quote"
+    provider: str
+    query: str | None
+    title: str
+    price: str
+    amount: float | None = None
+    currency: str | None = None
+    availability: str
+    link: str | None = None
+    source: str
+    retrieved_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc)
+    )
+
+
+class ProviderNotice(BaseModel):
+    """
+    A message of a provider in place of results (e.g. nothing
+    found, login failed).
+
+    Attributes
+    ----------
+    type : Literal["notice"]
+        Discriminator of the record type.
+
+    provider : str
+        Name of the provider, or URL of the external store.
+
+    query : str or None
+        The product query the message refers to, or `None` if it
+        refers to the whole search.
+
+    message : str
+        The message.
+    """
+
+    model_config = ConfigDict(frozen = True)
+
+    type: Literal["notice"] = "notice"
+    provider: str
+    query: str | None = None
+    message: str
+
+
+SearchEntry = QuoteRecord | ProviderNotice
+
+
+def parse_price(
+        price: str
+    ) -> float | None:
+    """
+    Parse a price string as displayed by a store.
+
+    Both "1.299,90 €" and "$1,299.90" styles are understood. A
+    single separator followed by exactly three digits is taken as
+    a thousands separator, unless both separators are present.
+
+    Parameters
+    ----------
+    price : str
+        The price as scraped.
+
+    Returns
+    -------
+    float or None
+        The amount, or `None` if the string holds no number.
+    """
+
+    match: re.Match | None = _PRICE_NUMBER.search(price)
+
+    if not match:
+        return None
+
+    number: str = "".join(match.group().split()).rstrip(".,")
+    decimal_at: int = max(number.rfind(","), number.rfind("."))
+
+    if (
+        len(number) - decimal_at - 1 == 3
+        and
+        ("," not in number or "." not in number)
+    ):
+        decimal_at = -1
+
+    if decimal_at == -1:
+        digits: str = number.replace(",", "").replace(".", "")
+
+    else:
+        digits = (
+            number[:decimal_at].replace(",", "").replace(".", "")
+            + "."
+            + number[decimal_at + 1:]
+        )
+
+    try:
+        return float(digits)
+
+    except ValueError:
+        return None
+
+
+def parse_currency(
+        price: str
+    ) -> str | None:
+    """
+    Recognize the currency of a price string.
+
+    Parameters
+    ----------
+    price : str
+        The price as scraped.
+
+    Returns
+    -------
+    str or None
+        The ISO 4217 code of the first currency symbol or code
+        found, or `None`.
+    """
+
+    match: re.Match | None = _CURRENCY.search(price)
+
+    return _CURRENCIES[match.group().casefold()] if match else None
+
+
+def match_query(
+        title: str,
+        queries: list[str]
+    ) -> str | None:
+    """
+    Return the query a product title most likely answers.
+
+    Parameters
+    ----------
+    title : str
+        Name of the product.
+
+    queries : list of str
+        The searched queries.
+
+    Returns
+    -------
+    str or None
+        The query with the largest share of its words found in
+        the title, or `None` if no query shares any word.
+    """
+
+    title_tokens: set[str] = set(_TOKEN.findall(title.casefold()))
+    best: str | None = None
+    best_score: float = 0.0
+
+    for query in queries:
+        query_tokens: set[str] = set(_TOKEN.findall(query.casefold()))
+
+        if not query_tokens:
+            continue
+
+        score: float = len(query_tokens & title_tokens) / len(query_tokens)
+
+        if score > best_score:
+            best, best_score = query, score
+
+    return best
+
+
+def __dedupe(
+        value: str
+    ) -> str:
+    """
+    Remove exact duplicates from a comma-separated value (e.g.
+    "Available, Available").
+    """
+
+    return ", ".join(dict.fromkeys(v.strip() for v in value.split(", ")))
+
+
+def make_records(
+        provider: str,
+        products: list[dict[str, str]],
+        queries: list[str]
+    ) -> list[QuoteRecord]:
+    """
+    Build the records of the products extracted from a store.
+
+    Parameters
+    ----------
+    provider : str
+        Name of the provider, or URL of the external store.
+
+    products : list of dict[str, str]
+        Extracted products, with the keys `"name"`,
+        `"availability"`, `"price"`, `"link"` and `"source"`, 
+        and optionally the `"query"` they were found with.
+
+    queries : list of str
+        The queries the products were searched with. A product 
+        reporting one of them answers it; otherwise, with a
+        single query every record answers it, and with several 
+        each record is assigned the query its title matches best.
+
+    Returns
+    -------
+    list of QuoteRecord
+        One record per product, timestamped now. Repeated values 
+        in the price and availability (as several matching 
+        elements may yield) are removed.
+    """
+
+    retrieved_at: datetime = datetime.now(timezone.utc)
+    records: list[QuoteRecord] = []
+
+    for p in products:
+        title: str = p.get("name") or "N/A"
+        price: str = __dedupe(p.get("price") or "N/A")
+        link: str = p.get("link") or "N/A"
+
+        records.append(
+            QuoteRecord(
+                provider = provider,
+                query = (
+                    p["query"] if p.get("query") in queries
+                    else queries[0] if len(queries) == 1
+                    else match_query(title, queries)
+                ),
+                title = title,
+                price = price,
+                amount = parse_price(price),
+                currency = parse_currency(price),
+                availability = __dedupe(p.get("availability") or "N/A"),
+                link = link if link != "N/A" else None,
+                source = p.get("source", "unknown"),
+                retrieved_at = retrieved_at
+            )
+        )
+
+    return records
@@ -0,0 +1,203 @@
+from datetime import (
+    datetime,
+    timezone
+)
+from typing import Annotated, Any
+from urllib.parse import (
+    parse_qsl,
+    urlencode,
+    urlsplit,
+    urlunsplit
+)
+
+from pydantic import Field, TypeAdapter
+
+from backend.backend_utils.quotes.records import (
+    ProviderNotice,
+    QuoteRecord,
+    SearchEntry
+)
+
+
+_TRACKING_PARAMS: frozenset[str] = frozenset({
+    "fbclid", "gclid", "msclkid", "psc", "qid", "ref", "ref_", "sr", "tag"
+})
+
+_entries_adapter: TypeAdapter[list[SearchEntry]] = TypeAdapter(
+    list[Annotated[SearchEntry, Field(discriminator = "type")]]
+)
+
+
+def dump_entries(
+        entries: list[SearchEntry]
+    ) -> list[dict[str, Any]]:
+    """
+    Convert search entries to JSON-compatible dictionaries.
+
+    Parameters
+    ----------
+    entries : list of SearchEntry
+        Quote records and provider notices.
+
+    Returns
+    -------
+    list of dict[str, Any]
+        The entries, with their `"type"` discriminator and the
+        timestamps as ISO 8601 strings.
+    """
+
+    return [entry.model_dump(mode = "json") for entry in entries]
+
+
+def load_entries(
+        data: list[dict[str, Any]] | None
+    ) -> list[SearchEntry]:
+    """
+    Rebuild search entries from the output of `dump_entries`.
+
+    Parameters
+    ----------
+    data : list of dict[str, Any] or None
+        The dumped entries.
+
+    Returns
+    -------
+    list of SearchEntry
+        The entries, or an empty list if `data` is empty.
+    """
+
+    return _entries_adapter.validate_python(data or [])
+
+
+def compact_link(
+        link: str
+    ) -> str:
+    """
+    Shorten a product URL by removing the fragment, the `www.`
+    prefix and the usual tracking parameters.
+    """
+
+    parts = urlsplit(link)
+    query: list[tuple[str, str]] = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values = True)
+        if k.casefold() not in _TRACKING_PARAMS
+        and not k.casefold().startswith("utm_")
+    ]
+
+    return urlunsplit((
+        parts.scheme,
+        parts.netloc.removeprefix("www."),
+        parts.path,
+        urlencode(query),
+        ""
+    ))
+
+
+def __price_text(
+        record: QuoteRecord
+    ) -> str:
+    """
+    Return the normalized price of a record, or the displayed one
+    if it could not be parsed.
+    """
+
+    if record.amount is not None and record.currency:
+        return f"{record.amount:.2f} {record.currency}"
+
+    return record.price
+
+
+def __age_text(
+        retrieved_at: datetime,
+        now: datetime
+    ) -> str:
+    """
+    Describe how long ago a store was read, if more than a
+    minute ago.
+    """
+
+    if retrieved_at.tzinfo is None:
+        retrieved_at = retrieved_at.replace(tzinfo = timezone.utc)
+
+    minutes: int = int((now - retrieved_at).total_seconds() // 60)
+
+    return f" (as of {minutes} min ago)" if minutes >= 1 else ""
+
+
+def to_model_text(
+        entries: list[SearchEntry],
+        now: datetime | None = None
+    ) -> str:
+    """
+    Serialize search entries for the language model.
+
+    Entries are grouped by query and, within a query, by provider,
+    so that each query and provider name is written once. Every
+    product takes one line with its title, price (normalized when
+    parsed), availability and shortened link, separated by `"; "`.
+    Records read more than a minute ago carry their age. Entries
+    that answer no specific query are listed last.
+
+    Parameters
+    ----------
+    entries : list of SearchEntry
+        Quote records and provider notices.
+
+    now : datetime or None, optional
+        Reference time for the ages. Default is the current time.
+
+    Returns
+    -------
+    str
+        The serialized entries, or an empty string if there are
+        none.
+    """
+
+    now = now or datetime.now(timezone.utc)
+
+    groups: dict[str | None, dict[str, list[SearchEntry]]] = {}
+
+    for entry in entries:
+        groups.setdefault(entry.query, {}).setdefault(
+            entry.provider, []
+        ).append(entry)
+
+    if None in groups:
+        groups[None] = groups.pop(None)
+
+    blocks: list[str] = []
+
+    for query, providers in groups.items():
+        lines: list[str] = [
+            f"# {query}" if query is not None else "# other results"
+        ]
+
+        for provider, provider_entries in providers.items():
+            records: list[QuoteRecord] = [
+                e for e in provider_entries if isinstance(e, QuoteRecord)
+            ]
+            notices: list[ProviderNotice] = [
+                e for e in provider_entries if isinstance(e, ProviderNotice)
+            ]
+
+            if records:
+                lines.append(
+                    provider
+                    + __age_text(min(r.retrieved_at for r in records), now)
+                    + ":"
+                )
+                lines.extend(
+                    "- " + "; ".join([
+                        r.title,
+                        __price_text(r),
+                        r.availability,
+                        compact_link(r.link) if r.link else "no link"
+                    ])
+                    for r in records
+                )
+
+            lines.extend(f"{provider}: {n.message}" for n in notices)
+
+        blocks.append("\n".join(lines))
+
+    return "\n\n".join(blocks)
@@ -0,0 +1,9 @@
+from backend.backend_utils.speculation.executor import (
+    speculative_executor,
+    SpeculativeExecutor
+)
+from backend.backend_utils.speculation.queries import (
+    extract_candidate_queries,
+    is_code_word,
+    is_identifier_word
+)
\ No newline at end of file
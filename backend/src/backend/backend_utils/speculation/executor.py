@@ -0,0 +1,209 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from backend.backend_utils.metrics import metrics
+
+
+class SpeculativeExecutor:
+    """
+    Run product searches ahead of the agent's tool call.
+
+    While the model is still deciding whether to search, the
+    searches for the products the message most likely refers to
+    are started in the background. When the tool call arrives,
+    its products are matched against the in-flight searches: the
+    matching ones are handed over to the tool (hits), the others
+    are cancelled when the request ends (waste).
+
+    Outcomes are counted in the `speculation.queries` metric,
+    labelled `hit` or `wasted`, and their running ratios are
+    published as the `speculation.hit_ratio` and
+    `speculation.waste_ratio` gauges. The time a hit was started
+    ahead of the tool call is observed as
+    `speculation.head_start_ms`.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize an executor without speculations.
+
+        Attributes
+        ----------
+        _speculations : dict
+            In-flight searches per speculation identifier, keyed
+            by normalized query, with their start time.
+
+        _settled : dict[str, int]
+            Number of speculative searches claimed (`hit`) and
+            cancelled unclaimed (`wasted`).
+        """
+
+        self._speculations: dict[
+            str,
+            dict[str, tuple[asyncio.Task, float]]
+        ] = {}
+        self._settled: dict[str, int] = {"hit": 0, "wasted": 0}
+
+
+    @staticmethod
+    def normalize(
+            query: str
+        ) -> str:
+        """
+        Normalize a query for matching (case-insensitive, with
+        collapsed whitespace).
+        """
+
+        return " ".join(query.casefold().split())
+
+
+    def start(
+            self,
+            speculation_id: str,
+            queries: list[str],
+            search: Callable[[str], Awaitable[Any]]
+        ) -> None:
+        """
+        Start the speculative searches of a request.
+
+        Parameters
+        ----------
+        speculation_id : str
+            Identifier of the request, passed to the tool through
+            the runnable configuration.
+
+        queries : list of str
+            Candidate product queries.
+
+        search : callable
+            Coroutine function searching a single query on the
+            selected stores and returning its results.
+        """
+
+        speculation: dict[str, tuple[asyncio.Task, float]] = (
+            self._speculations.setdefault(speculation_id, {})
+        )
+
+        for query in queries:
+            key: str = self.normalize(query)
+
+            if key not in speculation:
+                speculation[key] = (
+                    asyncio.create_task(search(query)),
+                    time.perf_counter()
+                )
+                metrics.increment("speculation.started")
+
+
+    def claim(
+            self,
+            speculation_id: str,
+            products: list[str]
+        ) -> tuple[dict[str, asyncio.Task], list[str]]:
+        """
+        Hand over the speculative searches matching a tool call.
+
+        Parameters
+        ----------
+        speculation_id : str
+            Identifier of the request.
+
+        products : list of str
+            Products requested by the tool call.
+
+        Returns
+        -------
+        tuple[dict[str, asyncio.Task], list[str]]
+            The claimed searches keyed by product, and the products
+            with no matching speculation, which must be searched
+            normally. A search is claimed at most once.
+        """
+
+        speculation: dict[str, tuple[asyncio.Task, float]] = (
+            self._speculations.get(speculation_id, {})
+        )
+
+        claimed: dict[str, asyncio.Task] = {}
+        remaining: list[str] = []
+
+        for product in products:
+            entry: tuple[asyncio.Task, float] | None = speculation.pop(
+                self.normalize(product),
+                None
+            )
+
+            if not entry or entry[0].cancelled():
+                remaining.append(product)
+                continue
+
+            claimed[product] = entry[0]
+
+            self.__record("hit")
+            metrics.observe(
+                "speculation.head_start_ms",
+                (time.perf_counter() - entry[1]) * 1000
+            )
+
+        return claimed, remaining
+
+
+    def finish(
+            self,
+            speculation_id: str
+        ) -> None:
+        """
+        Cancel the unclaimed searches of a request and count them
+        as wasted.
+
+        Parameters
+        ----------
+        speculation_id : str
+            Identifier of the request.
+        """
+
+        speculation: dict[str, tuple[asyncio.Task, float]] = (
+            self._speculations.pop(speculation_id, {})
+        )
+
+        for task, _ in speculation.values():
+            if task.done() and not task.cancelled():
+                # retrieve the outcome so a failed search is not reported
+                task.exception()
+
+            task.cancel()
+            self.__record("wasted")
+
+
+    def __record(
+            self,
+            outcome: str
+        ) -> None:
+        """
+        Count a settled speculative search and publish the hit and
+        waste ratios.
+
+        Parameters
+        ----------
+        outcome : str
+            Either `"hit"` or `"wasted"`.
+        """
+
+        self._settled[outcome] += 1
+        total: int = sum(self._settled.values())
+
+        metrics.increment("speculation.queries", outcome = outcome)
+        metrics.set_gauge(
+            "speculation.hit_ratio",
+            self._settled["hit"] / total
+        )
+        metrics.set_gauge(
+            "speculation.waste_ratio",
+            self._settled["wasted"] / total
+        )
+
+
+speculative_executor: SpeculativeExecutor = SpeculativeExecutor()
@@ -0,0 +1,130 @@
+import re
+
+
+_CODE_WORD: re.Pattern = re.compile(r"^[A-Za-z0-9][A-Za-z0-9.\-/_+#]*$")
+_QUOTED: re.Pattern = re.compile(r"[\"“]([^\"”\n]{3,60})[\"”]")
+_WORD_EDGES: str = ".,;:!?()[]{}'\""
+
+
+def is_code_word(
+        word: str
+    ) -> bool:
+    """
+    Tell whether a word looks like a product code.
+
+    Parameters
+    ----------
+    word : str
+        A single whitespace-free word.
+
+    Returns
+    -------
+    bool
+        `True` if the word has at least three characters,
+        contains a digit and only uses the characters found in
+        product codes (e.g. "MX-5521", "8GB-DDR4", "WD40").
+    """
+
+    return (
+        len(word) >= 3
+        and
+        any(c.isdigit() for c in word)
+        and
+        bool(_CODE_WORD.match(word))
+    )
+
+
+def is_identifier_word(
+        word: str
+    ) -> bool:
+    """
+    Tell whether a word can be part of a product identifier.
+
+    Parameters
+    ----------
+    word : str
+        A single whitespace-free word.
+
+    Returns
+    -------
+    bool
+        `True` for product codes and for uppercase tokens such as
+        brand or series names (e.g. "RTX", "SKU").
+    """
+
+    return (
+        is_code_word(word)
+        or
+        (word.isupper() and bool(_CODE_WORD.match(word)))
+    )
+
+
+def extract_candidate_queries(
+        text: str,
+        max_queries: int = 3
+    ) -> list[str]:
+    """
+    Guess the product queries contained in a free-text message.
+
+    Quoted strings are taken as they are. Elsewhere, runs of up
+    to three consecutive identifier words containing at least
+    one product code are taken (e.g. "RTX 4090" in "price of
+    the RTX 4090 please"). The guesses are meant for speculative
+    work: they may miss queries or include wrong ones.
+
+    Parameters
+    ----------
+    text : str
+        The message of the user.
+
+    max_queries : int, optional
+        Maximum number of queries returned. Default is 3.
+
+    Returns
+    -------
+    list of str
+        The candidate queries in order of appearance, without
+        duplicates.
+    """
+
+    candidates: list[str] = [
+        " ".join(q.split()) for q in _QUOTED.findall(text)
+    ]
+    run: list[str] = []
+
+    def close_run() -> None:
+        """
+        Turn the current run of identifier words into a candidate.
+        """
+
+        if any(is_code_word(w) for w in run):
+            candidates.append(" ".join(run))
+
+        run.clear()
+
+    for raw_word in _QUOTED.sub(" , ", text).split():
+        word: str = raw_word.strip(_WORD_EDGES)
+
+        if word and is_identifier_word(word) and len(run) < 3:
+            run.append(word)
+
+        else:
+            close_run()
+
+            if word and is_identifier_word(word):
+                run.append(word)
+
+        if raw_word[-1] in _WORD_EDGES:
+            close_run()
+
+    close_run()
+
+    seen: set[str] = set()
+    queries: list[str] = []
+
+    for query in candidates:
+        if query.casefold() not in seen:
+            seen.add(query.casefold())
+            queries.append(query)
+
+    return queries[:max_queries]
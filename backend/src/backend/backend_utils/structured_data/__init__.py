@@ -0,0 +1,5 @@
+from backend.backend_utils.structured_data.discovery import (
+    discover_search_template,
+    search_structured_data
+)
+from backend.backend_utils.structured_data.extractor import extract_products
\ No newline at end of file
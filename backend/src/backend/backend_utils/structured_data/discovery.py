@@ -0,0 +1,382 @@
+import time
+from urllib.parse import (
+    quote_plus,
+    urlencode,
+    urljoin,
+    urlparse
+)
+
+from bs4 import BeautifulSoup, Tag
+from playwright.async_api import Page
+
+from backend.backend_utils.structured_data.extractor import extract_products
+from backend.config import settings
+
+from shared.provider.learned_provider import normalize_domain
+
+
+SEARCH_TERMS: str = "{searchTerms}"
+
+# tried in order when a store exposes neither OpenSearch nor a GET form
+COMMON_SEARCH_PATHS: tuple[str, ...] = (
+    "/search?q={searchTerms}",
+    "/search?query={searchTerms}",
+    "/?s={searchTerms}",
+    "/catalogsearch/result/?q={searchTerms}",
+    "/search?text={searchTerms}",
+)
+
+_SEARCH_INPUT_NAMES: tuple[str, ...] = (
+    "q", "s", "query", "search", "text", "k", "keyword", "keywords"
+)
+
+_NAVIGATION_TIMEOUT_MS: int = 15000
+
+# search URL templates discovered so far, keyed by normalized domain
+_search_templates: dict[str, str] = {}
+
+# expiry (monotonic time) of the stores known to have no usable 
+# search URL, keyed by normalized domain
+_search_misses: dict[str, float] = {}
+
+
+def __base_url(
+        store_url: str
+    ) -> str:
+    """
+    Reduce a store URL to scheme and host.
+
+    Parameters
+    ----------
+    store_url : str
+        URL or bare host name of the store.
+
+    Returns
+    -------
+    str
+        The store origin, e.g. `"https://www.store.it"`.
+    """
+
+    parsed = urlparse(
+        store_url if "://" in store_url else f"https://{store_url}"
+    )
+
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def __template_from_form(
+        soup: BeautifulSoup,
+        page_url: str
+    ) -> str | None:
+    """
+    Build a search URL template from a GET search form.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        Parsed homepage.
+
+    page_url : str
+        URL of the homepage, used to resolve the form action.
+
+    Returns
+    -------
+    str or None
+        A URL containing the `{searchTerms}` placeholder, or
+        `None` if the page has no suitable form.
+    """
+
+    for form in soup.find_all("form"):
+        if str(form.get("method", "get")).lower() != "get":
+            continue
+
+        query_input: Tag | None = form.select_one("input[type='search']")
+
+        if not query_input:
+            query_input = next(
+                (
+                    i for i in form.find_all("input")
+                    if str(i.get("name", "")).lower() in _SEARCH_INPUT_NAMES
+                ),
+                None
+            )
+
+        if not query_input or not query_input.get("name"):
+            continue
+
+        params: dict[str, str] = {
+            str(hidden["name"]): str(hidden.get("value", ""))
+            for hidden in form.select("input[type='hidden'][name]")
+        }
+
+        query: str = urlencode(params)
+        query += "&" if query else ""
+        query += f"{quote_plus(str(query_input['name']))}={SEARCH_TERMS}"
+
+        action: str = urljoin(page_url, str(form.get("action") or page_url))
+
+        return f"{action.split('?', 1)[0]}?{query}"
+
+    return None
+
+
+async def __template_from_open_search(
+        page: Page,
+        soup: BeautifulSoup,
+        page_url: str
+    ) -> str | None:
+    """
+    Read the search URL template from an OpenSearch description.
+
+    Parameters
+    ----------
+    page : Page
+        Page whose request context is used to fetch the
+        description document.
+
+    soup : BeautifulSoup
+        Parsed homepage.
+
+    page_url : str
+        URL of the homepage, used to resolve the description link.
+
+    Returns
+    -------
+    str or None
+        The HTML search template, or `None` if the store does not
+        publish an OpenSearch description.
+    """
+
+    link: Tag | None = soup.select_one(
+        "link[rel='search'][type='application/opensearchdescription+xml']"
+    )
+
+    if not link or not link.get("href"):
+        return None
+
+    response = await page.request.get(
+        urljoin(page_url, str(link["href"])),
+        timeout = _NAVIGATION_TIMEOUT_MS
+    )
+
+    if not response.ok:
+        return None
+
+    description: BeautifulSoup = BeautifulSoup(
+        await response.text(),
+        "html.parser"
+    )
+
+    for url in description.find_all("url"):
+        template: str = str(url.get("template", ""))
+
+        if str(url.get("type", "text/html")) == "text/html" and template:
+            return urljoin(
+                page_url,
+                template.replace("{searchTerms?}", SEARCH_TERMS)
+            )
+
+    return None
+
+
+def __known_miss(
+        domain: str
+    ) -> bool:
+    """
+    Tell whether a domain recently turned out to have no usable 
+    search URL.
+    """
+
+    expires_at: float | None = _search_misses.get(domain)
+
+    if expires_at is None:
+        return False
+
+    if expires_at <= time.monotonic():
+        del _search_misses[domain]
+        return False
+
+    return True
+
+
+def __record_miss(
+        domain: str
+    ) -> None:
+    """
+    Remember for `STRUCTURED_DATA_MISS_TTL` seconds that a domain
+    has no usable search URL.
+    """
+
+    _search_misses[domain] = (
+        time.monotonic() + settings.STRUCTURED_DATA_MISS_TTL
+    )
+
+
+async def discover_search_template(
+        page: Page,
+        store_url: str
+    ) -> str | None:
+    """
+    Discover how to run a search on a store without a provider.
+
+    The homepage is inspected for an OpenSearch description and,
+    failing that, for a GET search form. Discovered templates are
+    cached per domain for the lifetime of the process.
+
+    Parameters
+    ----------
+    page : Page
+        Page used to load the homepage.
+
+    store_url : str
+        URL or bare host name of the store.
+
+    Returns
+    -------
+    str or None
+        A URL containing the `{searchTerms}` placeholder, or `None`
+        if the homepage does not advertise a search.
+    """
+
+    domain: str = normalize_domain(store_url)
+
+    if domain in _search_templates:
+        return _search_templates[domain]
+
+    await page.goto(
+        __base_url(store_url),
+        timeout = _NAVIGATION_TIMEOUT_MS
+    )
+
+    soup: BeautifulSoup = BeautifulSoup(await page.content(), "html.parser")
+
+    template: str | None = (
+        await __template_from_open_search(page, soup, page.url)
+        or __template_from_form(soup, page.url)
+    )
+
+    if template:
+        _search_templates[domain] = template
+
+    return template
+
+
+async def __search_template(
+        page: Page,
+        template: str,
+        item: str,
+        limit: int
+    ) -> list[dict[str, str]]:
+    """
+    Run a search through a URL template and extract the offers.
+
+    Parameters
+    ----------
+    page : Page
+        Page used for navigation.
+
+    template : str
+        URL containing the `{searchTerms}` placeholder.
+
+    item : str
+        Product query.
+
+    limit : int
+        Maximum number of products returned.
+
+    Returns
+    -------
+    list of dict[str, str]
+        Products found in the structured data of the results page.
+    """
+
+    await page.goto(
+        template.replace(SEARCH_TERMS, quote_plus(item)),
+        timeout = _NAVIGATION_TIMEOUT_MS
+    )
+    await page.wait_for_load_state("load")
+
+    return extract_products(await page.content(), page.url, item, limit)
+
+
+async def search_structured_data(
+        page: Page,
+        store_url: str,
+        item: str,
+        limit: int = 1
+    ) -> list[dict[str, str]]:
+    """
+    Search a product on a store by reading its structured data.
+
+    The search URL is taken from the store's OpenSearch
+    description or search form. If neither exists, the most
+    common search URL patterns are tried in order and the first
+    one returning offers is remembered for the domain.
+
+    A store whose homepage cannot be loaded, or on which no 
+    pattern returns offers, is skipped for the next
+    `STRUCTURED_DATA_MISS_TTL` seconds (returning an empty list
+    at once), so the other products of the job go straight to the
+    fallback instead of probing the store again.
+
+    Parameters
+    ----------
+    page : Page
+        Page used for navigation.
+
+    store_url : str
+        URL or bare host name of the store.
+
+    item : str
+        Product query.
+
+    limit : int, optional
+        Maximum number of products returned. Default is 1.
+
+    Returns
+    -------
+    list of dict[str, str]
+        Products with keys `"name"`, `"availability"`, `"price"`
+        and `"link"`. An empty list means the structured tier
+        found nothing and the caller should fall back.
+    """
+
+    domain: str = normalize_domain(store_url)
+
+    if __known_miss(domain):
+        return []
+
+    try:
+        template: str | None = await discover_search_template(
+            page,
+            store_url
+        )
+
+    except Exception:
+        __record_miss(domain)
+        return []
+
+    if template:
+        return await __search_template(page, template, item, limit)
+
+    for path in COMMON_SEARCH_PATHS:
+        candidate: str = urljoin(__base_url(store_url), path)
+
+        try:
+            products: list[dict[str, str]] = await __search_template(
+                page,
+                candidate,
+                item,
+                limit
+            )
+
+        except Exception:
+            continue
+
+        if products:
+            _search_templates[domain] = candidate
+            return products
+
+    __record_miss(domain)
+
+    return []
@@ -0,0 +1,474 @@
+import json
+import re
+from typing import Any, Iterator
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, Tag
+
+
+# share of the query words a product must mention to be returned
+MIN_RELEVANCE: float = 0.5
+
+_WORD_PATTERN: re.Pattern[str] = re.compile(r"[^\W_]+")
+
+
+def __as_list(
+        value: Any
+    ) -> list[Any]:
+    """
+    Wrap a scalar into a list, leaving lists untouched.
+
+    Parameters
+    ----------
+    value : Any
+        Value to wrap.
+
+    Returns
+    -------
+    list
+        `value` itself if it is a list, an empty list if it is
+        `None`, otherwise a single-element list.
+    """
+
+    if value is None:
+        return []
+
+    return value if isinstance(value, list) else [value]
+
+
+def __has_type(
+        node: dict[str, Any],
+        schema_type: str
+    ) -> bool:
+    """
+    Check whether a JSON-LD node declares a given schema.org type.
+
+    Parameters
+    ----------
+    node : dict[str, Any]
+        JSON-LD object.
+
+    schema_type : str
+        Type name without namespace (e.g. `"Product"`).
+
+    Returns
+    -------
+    bool
+        `True` if `@type` (string or list) contains the type.
+    """
+
+    return any(
+        str(t).rsplit("/", 1)[-1] == schema_type
+        for t in __as_list(node.get("@type"))
+    )
+
+
+def __walk_json_ld(
+        node: Any
+    ) -> Iterator[dict[str, Any]]:
+    """
+    Yield every schema.org `Product` found in a JSON-LD document.
+
+    Nested structures such as `@graph`, `ItemList` elements and
+    `ListItem.item` wrappers are traversed recursively.
+
+    Parameters
+    ----------
+    node : Any
+        Parsed JSON-LD value.
+
+    Yields
+    ------
+    dict[str, Any]
+        JSON-LD `Product` objects.
+    """
+
+    if isinstance(node, list):
+        for child in node:
+            yield from __walk_json_ld(child)
+
+    elif isinstance(node, dict):
+        if __has_type(node, "Product"):
+            yield node
+            return
+
+        for key in ("@graph", "itemListElement", "item", "mainEntity"):
+            if key in node:
+                yield from __walk_json_ld(node[key])
+
+
+def __short_availability(
+        value: Any
+    ) -> str:
+    """
+    Turn a schema.org availability URL into its short name.
+
+    Parameters
+    ----------
+    value : Any
+        Availability value (e.g. `"https://schema.org/InStock"`).
+
+    Returns
+    -------
+    str
+        The last path segment (e.g. `"InStock"`), or `"N/A"`.
+    """
+
+    if not value:
+        return "N/A"
+
+    return str(value).rstrip("/").rsplit("/", 1)[-1]
+
+
+def __format_price(
+        amount: Any,
+        currency: Any
+    ) -> str:
+    """
+    Join a price amount and its currency.
+
+    Parameters
+    ----------
+    amount : Any
+        Price amount as found in the markup.
+
+    currency : Any
+        ISO currency code, if any.
+
+    Returns
+    -------
+    str
+        The formatted price, or `"N/A"` if no amount is given.
+    """
+
+    if amount in (None, ""):
+        return "N/A"
+
+    return f"{amount} {currency}".strip() if currency else str(amount)
+
+
+def __from_json_ld(
+        soup: BeautifulSoup,
+        page_url: str
+    ) -> list[dict[str, str]]:
+    """
+    Extract products from JSON-LD scripts.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        Parsed page.
+
+    page_url : str
+        URL of the page, used to resolve relative links.
+
+    Returns
+    -------
+    list of dict[str, str]
+        Extracted products.
+    """
+
+    products: list[dict[str, str]] = []
+
+    for script in soup.select("script[type='application/ld+json']"):
+        try:
+            document: Any = json.loads(script.string or "", strict = False)
+
+        except (json.JSONDecodeError, TypeError):
+            continue
+
+        for node in __walk_json_ld(document):
+            offers: list[Any] = __as_list(node.get("offers"))
+            offer: dict[str, Any] = (
+                offers[0] if offers and isinstance(offers[0], dict)
+                else {}
+            )
+
+            products.append({
+                "name": str(node.get("name", "N/A")).strip(),
+                "availability": __short_availability(
+                    offer.get("availability")
+                ),
+                "price": __format_price(
+                    offer.get("price", offer.get("lowPrice")),
+                    offer.get("priceCurrency")
+                ),
+                "link": urljoin(
+                    page_url,
+                    str(node.get("url") or offer.get("url") or page_url)
+                ),
+                "identifiers": " ".join(
+                    str(node.get(k, ""))
+                    for k in ("sku", "mpn", "gtin13", "gtin", "productID")
+                )
+            })
+
+    return products
+
+
+def __itemprop(
+        scope: Tag,
+        prop: str
+    ) -> str | None:
+    """
+    Read the value of a microdata property within an item scope.
+
+    Parameters
+    ----------
+    scope : Tag
+        Element carrying `itemscope`.
+
+    prop : str
+        Name of the `itemprop`.
+
+    Returns
+    -------
+    str or None
+        The `content`, `href` or text value of the property.
+    """
+
+    elem: Tag | None = scope.select_one(f"[itemprop='{prop}']")
+
+    if not elem:
+        return None
+
+    for attr in ("content", "href", "src"):
+        if elem.has_attr(attr):
+            return str(elem[attr]).strip()
+
+    return elem.get_text(strip = True)
+
+
+def __from_microdata(
+        soup: BeautifulSoup,
+        page_url: str
+    ) -> list[dict[str, str]]:
+    """
+    Extract products from schema.org microdata.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        Parsed page.
+
+    page_url : str
+        URL of the page, used to resolve relative links.
+
+    Returns
+    -------
+    list of dict[str, str]
+        Extracted products.
+    """
+
+    products: list[dict[str, str]] = []
+
+    for scope in soup.select("[itemscope][itemtype*='schema.org/Product']"):
+        products.append({
+            "name": __itemprop(scope, "name") or "N/A",
+            "availability": __short_availability(
+                __itemprop(scope, "availability")
+            ),
+            "price": __format_price(
+                __itemprop(scope, "price"),
+                __itemprop(scope, "priceCurrency")
+            ),
+            "link": urljoin(page_url, __itemprop(scope, "url") or page_url),
+            "identifiers": " ".join(
+                __itemprop(scope, k) or ""
+                for k in ("sku", "mpn", "gtin13", "productID")
+            )
+        })
+
+    return products
+
+
+def __from_open_graph(
+        soup: BeautifulSoup,
+        page_url: str
+    ) -> list[dict[str, str]]:
+    """
+    Extract a single product from OpenGraph price tags.
+
+    Only pages declaring a price (`product:price:amount` or
+    `og:price:amount`) are considered product pages.
+
+    Parameters
+    ----------
+    soup : BeautifulSoup
+        Parsed page.
+
+    page_url : str
+        URL of the page.
+
+    Returns
+    -------
+    list of dict[str, str]
+        A single product, or an empty list.
+    """
+
+    def meta(
+            *names: str
+        ) -> str | None:
+        """
+        Return the content of the first matching meta property.
+        """
+
+        for name in names:
+            elem: Tag | None = soup.select_one(
+                f"meta[property='{name}'], meta[name='{name}']"
+            )
+
+            if elem and elem.get("content"):
+                return str(elem["content"]).strip()
+
+        return None
+
+    amount: str | None = meta("product:price:amount", "og:price:amount")
+
+    if not amount:
+        return []
+
+    return [{
+        "name": meta("og:title") or "N/A",
+        "availability": __short_availability(
+            meta("product:availability", "og:availability")
+        ),
+        "price": __format_price(
+            amount,
+            meta("product:price:currency", "og:price:currency")
+        ),
+        "link": urljoin(page_url, meta("og:url") or page_url),
+        "identifiers": meta("product:retailer_item_id") or ""
+    }]
+
+
+def __query_words(
+        query: str
+    ) -> list[str]:
+    """
+    Split a query into the words used to match products: words of
+    three letters or more, and any word with a digit (codes, 
+    sizes).
+    """
+
+    return [
+        word for word in _WORD_PATTERN.findall(query.lower())
+        if len(word) > 2 or any(c.isdigit() for c in word)
+    ]
+
+
+def __relevance(
+        product: dict[str, str],
+        query: str
+    ) -> float:
+    """
+    Score how well a product matches a query, from 0 to 1.
+
+    A product whose name or identifiers contain the whole query 
+    scores 1. Otherwise the score is the share of the query words 
+    it contains, and 0 if it misses a word with a digit: a 
+    different model code or size is a different product.
+    """
+
+    haystack: str = "".join(
+        f"{product['name']} {product['identifiers']}".lower().split()
+    )
+
+    if "".join(query.lower().split()) in haystack:
+        return 1.0
+
+    words: list[str] = __query_words(query)
+
+    if not words:
+        return 0.0
+
+    if any(
+        word not in haystack
+        for word in words if any(c.isdigit() for c in word)
+    ):
+        return 0.0
+
+    return sum(word in haystack for word in words) / len(words)
+
+
+def extract_products(
+        html: str,
+        page_url: str,
+        query: str | None = None,
+        limit: int = 1
+    ) -> list[dict[str, str]]:
+    """
+    Extract products from the structured data embedded in a page.
+
+    JSON-LD is preferred, then microdata, then OpenGraph price
+    tags. Products without a name, or without both price and
+    link, are discarded. When `query` is given, products are 
+    ranked by how well their name and identifiers (SKU, MPN, GTIN)
+    match it, and those matching less than `MIN_RELEVANCE` of its 
+    words (or missing one of its codes) are discarded: a page 
+    without results often still lists unrelated products, e.g. 
+    recommendations.
+
+    Parameters
+    ----------
+    html : str
+        Page HTML.
+
+    page_url : str
+        URL of the page, used to resolve relative links.
+
+    query : str or None, optional
+        Search query used for ranking and filtering. Default is 
+        None.
+
+    limit : int, optional
+        Maximum number of products returned. Default is 1.
+
+    Returns
+    -------
+    list of dict[str, str]
+        Products with keys `"name"`, `"availability"`, `"price"`
+        and `"link"`, deduplicated by link. Empty if no product 
+        matches the query.
+    """
+
+    soup: BeautifulSoup = BeautifulSoup(html, "html.parser")
+
+    candidates: list[dict[str, str]] = (
+        __from_json_ld(soup, page_url)
+        or __from_microdata(soup, page_url)
+        or __from_open_graph(soup, page_url)
+    )
+
+    scores: list[float] = [
+        __relevance(product, query) if query else 1.0
+        for product in candidates
+    ]
+
+    products: list[dict[str, str]] = []
+    seen_links: set[str] = set()
+
+    for score, product in sorted(
+        zip(scores, candidates),
+        key = lambda scored: -scored[0]
+    ):
+        if score < MIN_RELEVANCE:
+            break
+
+        if product["name"] == "N/A":
+            continue
+
+        if product["price"] == "N/A" and product["link"] == page_url:
+            continue
+
+        if product["link"] in seen_links:
+            continue
+
+        seen_links.add(product["link"])
+        product.pop("identifiers", None)
+        products.append(product)
+
+        if len(products) >= limit:
+            break
+
+    return products
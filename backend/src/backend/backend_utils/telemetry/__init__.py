@@ -0,0 +1,6 @@
+from backend.backend_utils.telemetry.pricing import estimate_cost
+from backend.backend_utils.telemetry.usage import (
+    record_llm_call,
+    track_usage,
+    UsageRecorder
+)
\ No newline at end of file
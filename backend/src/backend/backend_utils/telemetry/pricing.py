@@ -0,0 +1,45 @@
+# USD per million tokens as (input, output), from the Gemini API price list
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-computer-use-preview-10-2025": (1.25, 10.00),
+    "gemini-3-flash-preview": (0.50, 3.00),
+    "gemini-3-pro-preview": (2.00, 12.00),
+}
+
+
+def estimate_cost(
+        model: str,
+        input_tokens: int,
+        output_tokens: int
+    ) -> float | None:
+    """
+    Estimate the cost of a single model call.
+
+    Parameters
+    ----------
+    model : str
+        Name of the model.
+
+    input_tokens : int
+        Prompt tokens billed for the call, images included.
+
+    output_tokens : int
+        Generated tokens billed for the call, thinking included.
+
+    Returns
+    -------
+    float or None
+        Estimated cost in USD, or `None` if the model is not in
+        `MODEL_PRICING`.
+    """
+
+    price: tuple[float, float] | None = MODEL_PRICING.get(
+        model.removeprefix("models/")
+    )
+
+    if not price:
+        return None
+
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
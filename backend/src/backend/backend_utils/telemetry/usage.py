@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator
+
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.telemetry.pricing import estimate_cost
+
+
+class UsageRecorder:
+    """
+    Collect the model calls performed while processing a job.
+
+    A recorder is bound to the current context with `track_usage`.
+    Tasks spawned from that context (graph nodes, tool calls,
+    per-store searches) inherit it, so every call recorded with
+    `record_llm_call` ends up in the same recorder.
+    """
+
+
+    def __init__(
+            self
+        ):
+        """
+        Initialize an empty recorder.
+
+        Attributes
+        ----------
+        calls : list of dict
+            One entry per model call, in completion order.
+        """
+
+        self.calls: list[dict[str, Any]] = []
+
+
+    def totals(
+            self
+        ) -> dict[str, Any]:
+        """
+        Aggregate the recorded calls.
+
+        Returns
+        -------
+        dict[str, Any]
+            Overall `calls`, `input_tokens`, `output_tokens`,
+            `image_bytes`, `latency_ms` and `cost_usd`, plus the
+            same figures per model under `"by_model"`. The cost
+            only covers models with a known price.
+        """
+
+        def empty() -> dict[str, Any]:
+            """
+            Return zeroed counters.
+            """
+
+            return {
+                "calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "image_bytes": 0,
+                "latency_ms": 0.0,
+                "cost_usd": 0.0
+            }
+
+        overall: dict[str, Any] = empty()
+        by_model: dict[str, dict[str, Any]] = {}
+
+        for call in self.calls:
+            for bucket in (
+                overall,
+                by_model.setdefault(call["model"], empty())
+            ):
+                bucket["calls"] += 1
+                bucket["input_tokens"] += call["input_tokens"]
+                bucket["output_tokens"] += call["output_tokens"]
+                bucket["image_bytes"] += call["image_bytes"]
+                bucket["latency_ms"] += call["latency_ms"]
+                bucket["cost_usd"] += call["cost_usd"] or 0.0
+
+        overall["by_model"] = by_model
+
+        return overall
+
+
+_current_recorder: ContextVar[UsageRecorder | None] = ContextVar(
+    "usage_recorder",
+    default = None
+)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageRecorder]:
+    """
+    Bind a new `UsageRecorder` to the current context.
+
+    Yields
+    ------
+    UsageRecorder
+        The recorder collecting the calls made inside the block.
+    """
+
+    recorder: UsageRecorder = UsageRecorder()
+    token: Token = _current_recorder.set(recorder)
+
+    try:
+        yield recorder
+
+    finally:
+        _current_recorder.reset(token)
+
+
+def record_llm_call(
+        model: str,
+        component: str,
+        input_tokens: int | None,
+        output_tokens: int | None,
+        latency_ms: float,
+        image_bytes: int = 0
+    ) -> None:
+    """
+    Record a model call in the current recorder and in `metrics`.
+
+    Calls made outside `track_usage` (e.g. in CLI mode) only
+    update the process-wide metrics.
+
+    Parameters
+    ----------
+    model : str
+        Name of the model.
+
+    component : str
+        Part of the system issuing the call (e.g. `"agent"`,
+        `"computer_use"`).
+
+    input_tokens : int or None
+        Prompt tokens reported by the API.
+
+    output_tokens : int or None
+        Generated tokens reported by the API.
+
+    latency_ms : float
+        Wall-clock duration of the call in milliseconds.
+
+    image_bytes : int, optional
+        Size of the images sent with the call. Default is 0.
+    """
+
+    input_tokens = input_tokens or 0
+    output_tokens = output_tokens or 0
+
+    call: dict[str, Any] = {
+        "model": model,
+        "component": component,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "image_bytes": image_bytes,
+        "latency_ms": round(latency_ms, 1),
+        "cost_usd": estimate_cost(model, input_tokens, output_tokens)
+    }
+
+    metrics.increment(
+        "llm.tokens",
+        input_tokens,
+        model = model,
+        direction = "input"
+    )
+    metrics.increment(
+        "llm.tokens",
+        output_tokens,
+        model = model,
+        direction = "output"
+    )
+    metrics.increment("llm.image_bytes", image_bytes, model = model)
+    metrics.observe("llm.latency_ms", latency_ms, model = model)
+
+    recorder: UsageRecorder | None = _current_recorder.get()
+
+    if recorder:
+        recorder.calls.append(call)
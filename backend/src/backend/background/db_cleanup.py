@@ -6,8 +6,13 @@ from logging import (
     Logger
 )
 
+from backend.agent.checkpointer import checkpointer
+from backend.config import settings
 from backend.database.engine import AsyncSessionLocal
-from backend.database.repositories import ClientRepository
+from backend.database.repositories import (
+    ClientRepository,
+    ToolResultRepository
+)
 
 
 logger: Logger = getLogger("db-cleaner")
@@ -22,8 +27,11 @@ async def cleanup_inactive_clients_task(
 
     This asynchronous task runs indefinitely, checking for 
     clients that have been inactive for a specified number 
-    of hours and removing them from the database. Logs the 
-    number of deleted clients.
+    of hours and removing them from the database, together 
+    with the stored tool results older than 
+    `TOOL_RESULT_MAX_AGE` and the graph checkpoints of 
+    deleted chats. Logs the number of deleted clients, 
+    results and checkpoint threads.
 
     Parameters
     ----------
@@ -63,8 +71,26 @@ async def cleanup_inactive_clients_task(
                 if deleted:
                     logger.info(f"deleted {deleted} inactive client(s)")
 
+                expired = await ToolResultRepository.delete_older_than(
+                    db,
+                    max_age = timedelta(
+                        seconds = settings.TOOL_RESULT_MAX_AGE
+                    )
+                )
+
+                if expired:
+                    logger.info(f"deleted {expired} expired tool result(s)")
+
                 await db.commit()
 
+            if settings.CHECKPOINTER_ENABLED:
+                orphans: int = await checkpointer.adelete_orphans(
+                    older_than = timedelta(hours = 1)
+                )
+
+                if orphans:
+                    logger.info(f"deleted {orphans} orphan checkpoint thread(s)")
+
             await asyncio.sleep(every_seconds)
 
     except asyncio.CancelledError:
@@ -0,0 +1,225 @@
+
+import asyncio
+from functools import partial
+from logging import (
+    getLogger,
+    Logger
+)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import (
+    JobLane,
+    PROCESS_ID
+)
+from backend.backend_utils.exceptions import QueueFullException
+from backend.backend_utils.jobs import (
+    job_scheduler,
+    load_event,
+    run_event_job
+)
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.notifications import (
+    job_events,
+    job_notifier
+)
+from backend.config import settings
+from backend.database.engine import AsyncSessionLocal
+from backend.database.models.job import Job
+from backend.database.repositories import JobRepository
+
+from shared.events.error import ErrorEvent
+from shared.events.metadata import BaseMetadata
+
+
+logger: Logger = getLogger("job-reaper")
+
+
+async def reap_lost_jobs() -> int:
+    """
+    Recover the jobs whose owner stopped renewing their lease.
+
+    The leases of the jobs queued in this process are renewed
+    first. Then each unfinished job of another owner whose lease
+    has expired (e.g. its server or worker crashed) is:
+
+    - re-queued, if it has a payload and ran fewer than
+      `JOB_MAX_ATTEMPTS` times: with external workers it is left
+      to `claim_next`, otherwise it is taken over and queued in
+      this process (or left for the next run if the lane's queue
+      is full);
+    - failed otherwise, with an error event as result.
+
+    The waiters of the recovered jobs are notified.
+
+    Returns
+    -------
+    int
+        Number of recovered jobs.
+    """
+
+    external: bool = settings.JOB_EXECUTION == "external"
+    recovered: list[str] = []
+    resubmit: list[Job] = []
+
+    async with AsyncSessionLocal() as db:
+        if not external:
+            await JobRepository.renew_leases(
+                db,
+                PROCESS_ID,
+                settings.JOB_LEASE_SECONDS
+            )
+
+        for job in await JobRepository.lock_expired(db, PROCESS_ID):
+            lane: JobLane | None = (
+                JobLane(job.lane) if job.lane else None
+            )
+
+            if (
+                job.payload is None
+                or lane is None
+                or job.attempts >= settings.JOB_MAX_ATTEMPTS
+            ):
+                await __fail(db, job)
+
+                metrics.increment("jobs.lost")
+
+            elif external:
+                await JobRepository.requeue(db, job)
+
+                metrics.increment("jobs.requeued", lane = lane.value)
+
+            elif job_scheduler.has_capacity(lane, job.client_id):
+                await JobRepository.requeue(
+                    db,
+                    job,
+                    PROCESS_ID,
+                    settings.JOB_LEASE_SECONDS
+                )
+                resubmit.append(job)
+
+                metrics.increment("jobs.requeued", lane = lane.value)
+
+            else:
+                continue
+
+            recovered.append(job.id)
+
+        await db.commit()
+
+        jobs: list[dict] = [
+            await JobRepository.get(db, job_id) for job_id in recovered
+        ]
+
+    for job in jobs:
+        if job:
+            job_notifier.notify(job["job_id"])
+            job_events.publish(job["job_id"], "status", job)
+
+    for job in resubmit:
+        await __resubmit(job)
+
+    return len(recovered)
+
+
+async def __fail(
+        db: AsyncSession,
+        job: Job
+    ) -> None:
+    """
+    Fail a lost job, the same way as a job whose event raised.
+    """
+
+    message: str = (
+        f"Job lost after {job.attempts} attempt(s), "
+        f"its process stopped responding"
+    )
+    error_event: ErrorEvent = ErrorEvent(
+        message = message,
+        metadata = (
+            BaseMetadata(chat_id = job.chat_id) if job.chat_id else None
+        )
+    )
+
+    await JobRepository.set_error(db, job.id, message)
+    await JobRepository.set_result(db, job.id, error_event.model_dump())
+
+    logger.warning(f"job {job.id} failed: {message}")
+
+
+async def __resubmit(
+        job: Job
+    ) -> None:
+    """
+    Queue a re-queued job in this process. Jobs that cannot be
+    queued are failed.
+    """
+
+    try:
+        job_scheduler.submit(
+            JobLane(job.lane),
+            job.id,
+            partial(
+                run_event_job,
+                job.id,
+                job.client_id,
+                load_event(job.payload)
+            ),
+            job.client_id
+        )
+
+        logger.info(f"job {job.id} re-queued (attempt {job.attempts + 1})")
+
+    except (QueueFullException, ValueError) as e:
+        async with AsyncSessionLocal() as db:
+            await JobRepository.set_error(db, job.id, str(e))
+            await db.commit()
+
+        job_notifier.notify(job.id)
+
+
+async def job_reaper_task(
+        every_seconds: int = 30
+    ) -> None:
+    """
+    Recover the lost jobs at startup, then periodically.
+
+    Each run calls `reap_lost_jobs`, which also renews the leases
+    of the jobs queued in this process, so `every_seconds` must be
+    shorter than `JOB_LEASE_SECONDS`. Errors are logged and the
+    task goes on.
+
+    Parameters
+    ----------
+    every_seconds : int, optional
+        Interval in seconds between consecutive runs
+        (default is 30).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    asyncio.CancelledError
+        If the task is cancelled while sleeping or recovering jobs.
+    """
+
+    logger.info(f"job reaper started (every={every_seconds}s)")
+
+    try:
+        while True:
+            try:
+                recovered: int = await reap_lost_jobs()
+
+                if recovered:
+                    logger.info(f"recovered {recovered} lost job(s)")
+
+            except Exception as e:
+                logger.warning(f"could not recover lost jobs: {e}")
+
+            await asyncio.sleep(every_seconds)
+
+    except asyncio.CancelledError:
+        logger.info("job reaper cancelled")
+        raise
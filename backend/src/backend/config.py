@@ -25,6 +25,20 @@ class Settings:
         - Playwright / Browser automation
         - Login behavior
         - Secret key for encryption
+        - Learned providers for external stores
+        - Structured-data search for external stores
+        - Computer-use observation mode
+        - Politeness limits of the store sites
+        - Quote result cache
+        - Chat fast path for product-code messages
+        - Speculative product searches
+        - Rendering of the search results
+        - Conversation history window and summary
+        - Stored search results
+        - Agent graph checkpoints
+        - Job scheduler
+        - External job workers
+        - Recovery of lost jobs
 
     Attributes
     ----------
@@ -49,11 +63,183 @@ class Settings:
     HEADLESS : bool
         Whether Playwright runs in headless mode.
 
+    CLIENT_MAX_PAGES : int
+        Maximum number of store pages open at the same time for 
+        one client; further store searches of the client wait.
+
     AUTO_LOGIN_ONLY : bool
         If True, only automatic logins are allowed.
 
     SECRET_KEY : str | None
         Secret key used for encryption.
+
+    LEARNED_PROVIDERS_ENABLED : bool
+        If True, selectors are inferred from successful computer-use 
+        runs and promoted to scripted providers once validated.
+
+    LEARNED_PROVIDER_PROMOTION_THRESHOLD : int
+        Number of consecutive successful validations required 
+        before a learned provider replaces computer use.
+
+    LEARNED_PROVIDER_DEMOTION_THRESHOLD : int
+        Number of consecutive failed searches after which a 
+        promoted learned provider is rejected and the store goes 
+        back to computer use.
+
+    STRUCTURED_DATA_ENABLED : bool
+        If True, external stores are first searched through the 
+        schema.org / OpenGraph data of their result pages, and 
+        computer use only runs for the products left unanswered.
+
+    STRUCTURED_DATA_MISS_TTL : int
+        Seconds during which a store without a usable search URL 
+        (no OpenSearch description, search form or common search 
+        path returning offers) skips the structured-data search.
+
+    COMPUTER_USE_OBSERVATION : str
+        What the computer-use model observes after each action: 
+        "screenshot", "dom" (pruned text snapshot with element IDs) 
+        or "hybrid" (text snapshot plus periodic screenshots). 
+        Default is "screenshot".
+
+    COMPUTER_USE_SCREENSHOT_EVERY : int
+        In "hybrid" mode, number of turns between two screenshots.
+
+    COMPUTER_USE_SHARD_SIZE : int
+        Maximum number of products handled by one computer-use 
+        session. Larger product lists are split into shards run 
+        concurrently in separate pages. 0 disables sharding.
+
+    COMPUTER_USE_MAX_SESSIONS : int
+        Maximum number of computer-use sessions running at the 
+        same time across the whole server.
+
+    PROVIDER_MAX_PAGES : int
+        Default maximum number of pages open on one store site at 
+        the same time, across all jobs. Providers can override it 
+        with `max_concurrent_pages`.
+
+    PROVIDER_REQUESTS_PER_SECOND : float
+        Default maximum requests per second sent to one store site. 
+        Providers can override it with `requests_per_second`. The 
+        default (10) is above what `PROVIDER_MAX_PAGES` pages of a 
+        healthy site send, so it does not throttle concurrent 
+        searches: it only paces a site whose limits were lowered, 
+        or providers setting a lower value.
+
+    PROVIDER_SLOW_FACTOR : float
+        A request slower than this multiple of the site's average 
+        latency halves the site's limits, like a failed request.
+
+    QUOTE_CACHE_ENABLED : bool
+        If True, search results are cached per provider, query and 
+        number of items, and served without opening a browser.
+
+    QUOTE_CACHE_TTL : int
+        Default number of seconds a cached quote stays fresh. 
+        Providers can override it with `cache_ttl`.
+
+    QUOTE_CACHE_STALE_TTL : int
+        Number of seconds after the TTL during which a stale quote 
+        is still served while it is refreshed in the background.
+
+    QUOTE_CACHE_MAX_ENTRIES : int
+        Maximum number of cached quotes.
+
+    FAST_PATH_ENABLED : bool
+        If True, chat messages made only of product codes are 
+        searched directly and answered from a template, without 
+        invoking the agent.
+
+    SPECULATION_ENABLED : bool
+        If True, the products a chat message most likely refers to 
+        are searched while the agent is still deciding whether to 
+        call the search tool.
+
+    SPECULATION_MAX_QUERIES : int
+        Maximum number of products searched speculatively per 
+        message.
+
+    RESULT_RENDERING : str
+        How search results become the answer: "template" renders 
+        them as a quotation table, "llm" lets the model write the 
+        answer, "auto" renders them unless the user asks for an 
+        explanation.
+
+    HISTORY_WINDOW_MESSAGES : int
+        Maximum number of recent messages sent to the agent. When 
+        the window is full, the older half is folded into the chat 
+        summary in the background.
+
+    HISTORY_TOKEN_BUDGET : int
+        Estimated token budget of the summary and the recent 
+        messages sent to the agent.
+
+    TOOL_RESULT_MAX_AGE : int
+        Number of seconds the search results of a chat can be 
+        recalled by the agent. Older results are deleted.
+
+    CHECKPOINTER_ENABLED : bool
+        If True (and not in CLI mode), the agent graph state is 
+        checkpointed in the database after every step, so that an 
+        interrupted turn resumes where it stopped.
+
+    CHECKPOINT_KEEP : int
+        Number of checkpoints kept per chat.
+
+    JOB_HEAVY_WORKERS : int
+        Number of heavy jobs (chat messages, logins) processed at 
+        the same time.
+
+    JOB_HEAVY_QUEUE_SIZE : int
+        Maximum number of heavy jobs waiting for a worker. Further 
+        requests are rejected with HTTP 429.
+
+    JOB_LIGHT_WORKERS : int
+        Number of light jobs (login status checks, chat clearing) 
+        processed at the same time.
+
+    JOB_LIGHT_QUEUE_SIZE : int
+        Maximum number of light jobs waiting for a worker.
+
+    JOB_CLIENT_MAX_RUNNING : int
+        Maximum number of jobs of a lane processed at the same 
+        time for one client. The workers serve the clients in 
+        turn, so the other clients are not delayed.
+
+    JOB_CLIENT_QUEUE_SIZE : int
+        Maximum number of jobs of a lane waiting for a worker for 
+        one client. Further requests of the client are rejected 
+        with HTTP 429.
+
+    JOB_EXECUTION : str
+        Where jobs run: "inline" (in the server process) or 
+        "external" (in worker processes started with 
+        `python -m backend.worker`, which claim them from the 
+        database).
+
+    IDEMPOTENCY_WINDOW : int
+        Seconds during which an event sent again with the same 
+        idempotency key returns the existing job.
+
+    WORKER_POLL_INTERVAL : float
+        Seconds a worker waits before looking for new jobs when 
+        none is pending.
+
+    WORKER_HEARTBEAT_INTERVAL : int
+        Seconds between two heartbeats of a job run by a worker.
+
+    JOB_LEASE_SECONDS : int
+        Seconds a job stays owned by its process without a 
+        heartbeat. Jobs whose lease expired (e.g. after a crash) 
+        are re-queued or failed by the job reaper.
+
+    JOB_MAX_ATTEMPTS : int
+        Number of times a job is run before a lost job is failed 
+        instead of re-queued.
+
+    JOB_REAPER_INTERVAL : int
+        Seconds between two runs of the job reaper.
     """
     
     def __init__(self):
@@ -76,6 +262,9 @@ class Settings:
         
         # Playwright / Browser
         self.HEADLESS: bool = os.getenv("HEADLESS", "true").lower() == "true"
+        self.CLIENT_MAX_PAGES: int = int(
+            os.getenv("CLIENT_MAX_PAGES", "6")
+        )
 
         # Login mode
         self.AUTO_LOGIN_ONLY: bool = (
@@ -85,6 +274,148 @@ class Settings:
         # Secret key
         self.SECRET_KEY: str | None = os.getenv("SECRET_KEY", None)
 
+        # Learned providers
+        self.LEARNED_PROVIDERS_ENABLED: bool = (
+            os.getenv("LEARNED_PROVIDERS_ENABLED", "true").lower() == "true"
+        )
+        self.LEARNED_PROVIDER_PROMOTION_THRESHOLD: int = int(
+            os.getenv("LEARNED_PROVIDER_PROMOTION_THRESHOLD", "3")
+        )
+        self.LEARNED_PROVIDER_DEMOTION_THRESHOLD: int = int(
+            os.getenv("LEARNED_PROVIDER_DEMOTION_THRESHOLD", "3")
+        )
+
+        # Structured data
+        self.STRUCTURED_DATA_ENABLED: bool = (
+            os.getenv("STRUCTURED_DATA_ENABLED", "true").lower() == "true"
+        )
+        self.STRUCTURED_DATA_MISS_TTL: int = int(
+            os.getenv("STRUCTURED_DATA_MISS_TTL", "3600")
+        )
+
+        # Computer use
+        self.COMPUTER_USE_OBSERVATION: str = (
+            os.getenv("COMPUTER_USE_OBSERVATION", "screenshot").lower()
+        )
+        self.COMPUTER_USE_SCREENSHOT_EVERY: int = int(
+            os.getenv("COMPUTER_USE_SCREENSHOT_EVERY", "3")
+        )
+        self.COMPUTER_USE_SHARD_SIZE: int = int(
+            os.getenv("COMPUTER_USE_SHARD_SIZE", "0")
+        )
+        self.COMPUTER_USE_MAX_SESSIONS: int = int(
+            os.getenv("COMPUTER_USE_MAX_SESSIONS", "4")
+        )
+
+        # Provider governor
+        self.PROVIDER_MAX_PAGES: int = int(
+            os.getenv("PROVIDER_MAX_PAGES", "4")
+        )
+        self.PROVIDER_REQUESTS_PER_SECOND: float = float(
+            os.getenv("PROVIDER_REQUESTS_PER_SECOND", "10.0")
+        )
+        self.PROVIDER_SLOW_FACTOR: float = float(
+            os.getenv("PROVIDER_SLOW_FACTOR", "3.0")
+        )
+
+        # Quote cache
+        self.QUOTE_CACHE_ENABLED: bool = (
+            os.getenv("QUOTE_CACHE_ENABLED", "true").lower() == "true"
+        )
+        self.QUOTE_CACHE_TTL: int = int(
+            os.getenv("QUOTE_CACHE_TTL", "3600")
+        )
+        self.QUOTE_CACHE_STALE_TTL: int = int(
+            os.getenv("QUOTE_CACHE_STALE_TTL", "21600")
+        )
+        self.QUOTE_CACHE_MAX_ENTRIES: int = int(
+            os.getenv("QUOTE_CACHE_MAX_ENTRIES", "2000")
+        )
+
+        # Chat fast path
+        self.FAST_PATH_ENABLED: bool = (
+            os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+        )
+
+        # Speculative searches
+        self.SPECULATION_ENABLED: bool = (
+            os.getenv("SPECULATION_ENABLED", "true").lower() == "true"
+        )
+        self.SPECULATION_MAX_QUERIES: int = int(
+            os.getenv("SPECULATION_MAX_QUERIES", "3")
+        )
+
+        # Result rendering
+        self.RESULT_RENDERING: str = (
+            os.getenv("RESULT_RENDERING", "auto").lower()
+        )
+
+        # Conversation history
+        self.HISTORY_WINDOW_MESSAGES: int = int(
+            os.getenv("HISTORY_WINDOW_MESSAGES", "20")
+        )
+        self.HISTORY_TOKEN_BUDGET: int = int(
+            os.getenv("HISTORY_TOKEN_BUDGET", "6000")
+        )
+
+        # Stored search results
+        self.TOOL_RESULT_MAX_AGE: int = int(
+            os.getenv("TOOL_RESULT_MAX_AGE", "3600")
+        )
+
+        # Agent graph checkpoints
+        self.CHECKPOINTER_ENABLED: bool = (
+            os.getenv("CHECKPOINTER_ENABLED", "true").lower() == "true"
+        )
+        self.CHECKPOINT_KEEP: int = int(
+            os.getenv("CHECKPOINT_KEEP", "3")
+        )
+
+        # Job scheduler
+        self.JOB_HEAVY_WORKERS: int = int(
+            os.getenv("JOB_HEAVY_WORKERS", "4")
+        )
+        self.JOB_HEAVY_QUEUE_SIZE: int = int(
+            os.getenv("JOB_HEAVY_QUEUE_SIZE", "32")
+        )
+        self.JOB_LIGHT_WORKERS: int = int(
+            os.getenv("JOB_LIGHT_WORKERS", "8")
+        )
+        self.JOB_LIGHT_QUEUE_SIZE: int = int(
+            os.getenv("JOB_LIGHT_QUEUE_SIZE", "128")
+        )
+        self.JOB_CLIENT_MAX_RUNNING: int = int(
+            os.getenv("JOB_CLIENT_MAX_RUNNING", "2")
+        )
+        self.JOB_CLIENT_QUEUE_SIZE: int = int(
+            os.getenv("JOB_CLIENT_QUEUE_SIZE", "8")
+        )
+        self.JOB_EXECUTION: str = os.getenv(
+            "JOB_EXECUTION", "inline"
+        ).lower()
+        self.IDEMPOTENCY_WINDOW: int = int(
+            os.getenv("IDEMPOTENCY_WINDOW", "600")
+        )
+
+        # Job workers
+        self.WORKER_POLL_INTERVAL: float = float(
+            os.getenv("WORKER_POLL_INTERVAL", "1.0")
+        )
+        self.WORKER_HEARTBEAT_INTERVAL: int = int(
+            os.getenv("WORKER_HEARTBEAT_INTERVAL", "10")
+        )
+
+        # Job recovery
+        self.JOB_LEASE_SECONDS: int = int(
+            os.getenv("JOB_LEASE_SECONDS", "60")
+        )
+        self.JOB_MAX_ATTEMPTS: int = int(
+            os.getenv("JOB_MAX_ATTEMPTS", "2")
+        )
+        self.JOB_REAPER_INTERVAL: int = int(
+            os.getenv("JOB_REAPER_INTERVAL", "30")
+        )
+
 
     def validate(self) -> tuple[bool, list[str]]:
         """
@@ -110,6 +441,42 @@ class Settings:
         ):
             errors.append("GOOGLE_API_KEY is missing or set to default.")
         
+        if self.COMPUTER_USE_OBSERVATION not in ("screenshot", "dom", "hybrid"):
+            errors.append(
+                "COMPUTER_USE_OBSERVATION must be one of "
+                "'screenshot', 'dom' or 'hybrid'."
+            )
+
+        if self.RESULT_RENDERING not in ("auto", "template", "llm"):
+            errors.append(
+                "RESULT_RENDERING must be one of "
+                "'auto', 'template' or 'llm'."
+            )
+
+        if self.JOB_EXECUTION not in ("inline", "external"):
+            errors.append(
+                "JOB_EXECUTION must be one of 'inline' or 'external'."
+            )
+
+        if self.JOB_LEASE_SECONDS <= self.WORKER_HEARTBEAT_INTERVAL:
+            errors.append(
+                "JOB_LEASE_SECONDS must be greater than "
+                "WORKER_HEARTBEAT_INTERVAL."
+            )
+
+        if self.JOB_REAPER_INTERVAL >= self.JOB_LEASE_SECONDS:
+            errors.append(
+                "JOB_REAPER_INTERVAL must be less than JOB_LEASE_SECONDS."
+            )
+
+        if self.PROVIDER_REQUESTS_PER_SECOND <= 0:
+            errors.append(
+                "PROVIDER_REQUESTS_PER_SECOND must be greater than 0."
+            )
+
+        if self.PROVIDER_SLOW_FACTOR <= 1:
+            errors.append("PROVIDER_SLOW_FACTOR must be greater than 1.")
+
         if "protocol://" in self.DATABASE_URL:
             if not self.CLI_MODE:
                 errors.append("DATABASE_URL is not configured.")
@@ -0,0 +1,53 @@
+import json
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import PROCESS_ID
+
+
+JOB_CHANNEL: str = "job_changes"
+
+
+async def notify_job(
+        db: AsyncSession,
+        job_id: str,
+        kind: str,
+        status: str
+    ) -> None:
+    """
+    Announce a change of a job to the other processes sharing 
+    the database.
+
+    On PostgreSQL a `NOTIFY` is sent on the `job_changes` channel 
+    within the current transaction, so it is only delivered if 
+    the change is committed. Other databases (e.g. SQLite) have 
+    no cross-process notifications, and nothing is sent.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The SQLAlchemy asynchronous session making the change.
+
+    job_id : str
+        The unique identifier of the changed job.
+
+    kind : str
+        What changed: `"status"` or `"progress"`.
+
+    status : str
+        The status of the job after the change.
+    """
+
+    if db.get_bind().dialect.name != "postgresql":
+        return
+
+    payload: str = json.dumps({
+        "job_id": job_id,
+        "kind": kind,
+        "status": status,
+        "origin": PROCESS_ID
+    })
+
+    await db.execute(
+        select(func.pg_notify(JOB_CHANNEL, payload))
+    )
@@ -2,16 +2,28 @@
 from backend.database.models.chat import Chat
 from backend.database.models.client import Client
 from backend.database.models.credential import Credential
+from backend.database.models.graph_checkpoint import (
+    GraphCheckpoint,
+    GraphCheckpointWrite
+)
 from backend.database.models.job import Job
+from backend.database.models.learned_provider import LearnedProvider
+from backend.database.models.llm_call import LLMCall
 from backend.database.models.login_context import LoginContext
 from backend.database.models.message import Message
+from backend.database.models.tool_result import ToolResult
 
 
 __all__ = [
     "Chat",
     "Client",
     "Credential",
+    "GraphCheckpoint",
+    "GraphCheckpointWrite",
     "Job",
+    "LearnedProvider",
+    "LLMCall",
     "LoginContext",
     "Message",
+    "ToolResult",
 ]
\ No newline at end of file
@@ -6,7 +6,9 @@ from datetime import (
 from sqlalchemy import (
     DateTime, 
     ForeignKey, 
-    String
+    Integer,
+    String,
+    Text
 )
 from sqlalchemy.orm import (
     Mapped, 
@@ -34,12 +36,23 @@ class Chat(Base):
     created_at : datetime
         Timestamp of when the chat was created (UTC).
 
+    summary : str | None
+        Rolling summary of the messages that no longer fit in 
+        the history window, or None if nothing was summarized.
+
+    summary_message_id : int | None
+        ID of the last message folded into `summary`.
+
     client : Client
         SQLAlchemy relationship to the owning client.
         
     messages : list[Message]
         SQLAlchemy relationship to the messages in this chat, 
         with cascading delete behavior.
+
+    tool_results : list[ToolResult]
+        SQLAlchemy relationship to the tool outputs stored for 
+        this chat, with cascading delete behavior.
     """
 
     __tablename__ = "chats"
@@ -63,6 +76,16 @@ class Chat(Base):
         nullable = False
     )
 
+    summary: Mapped[str | None] = mapped_column(
+        Text,
+        nullable = True
+    )
+
+    summary_message_id: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable = True
+    )
+
     client = relationship(
         "Client", 
         back_populates = "chats"
@@ -72,4 +95,10 @@ class Chat(Base):
         "Message", 
         back_populates = "chat", 
         cascade = "all, delete-orphan"
+    )
+
+    tool_results = relationship(
+        "ToolResult",
+        back_populates = "chat",
+        cascade = "all, delete-orphan"
     )
\ No newline at end of file
@@ -0,0 +1,188 @@
+from datetime import (
+    datetime,
+    timezone
+)
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    LargeBinary,
+    String
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column
+)
+
+from backend.database.base import Base
+
+
+class GraphCheckpoint(Base):
+    """
+    Database model representing a checkpoint of the agent graph.
+
+    Attributes
+    ----------
+    thread_id : str
+        Thread of the checkpoint (the chat ID in server mode).
+
+    checkpoint_ns : str
+        Namespace of the checkpoint (empty for the root graph).
+
+    checkpoint_id : str
+        Identifier of the checkpoint. Identifiers of the same 
+        thread sort in creation order.
+
+    parent_checkpoint_id : str | None
+        Identifier of the previous checkpoint of the thread.
+
+    checkpoint_type : str
+        Serialization format of `checkpoint`.
+
+    checkpoint : bytes
+        Serialized and compressed checkpoint, channel values 
+        included.
+
+    metadata_type : str
+        Serialization format of `checkpoint_metadata`.
+
+    checkpoint_metadata : bytes
+        Serialized and compressed checkpoint metadata.
+
+    created_at : datetime
+        Timestamp when the checkpoint was stored (UTC).
+    """
+
+    __tablename__ = "graph_checkpoints"
+
+    thread_id: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    checkpoint_ns: Mapped[str] = mapped_column(
+        String,
+        primary_key = True,
+        default = ""
+    )
+
+    checkpoint_id: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    parent_checkpoint_id: Mapped[str | None] = mapped_column(
+        String,
+        nullable = True
+    )
+
+    checkpoint_type: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    checkpoint: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable = False
+    )
+
+    metadata_type: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    checkpoint_metadata: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable = False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone = True),
+        default = lambda: datetime.now(timezone.utc),
+        nullable = False
+    )
+
+
+class GraphCheckpointWrite(Base):
+    """
+    Database model representing a pending write of a graph task, 
+    stored so that an interrupted step does not run again.
+
+    Attributes
+    ----------
+    thread_id : str
+        Thread of the checkpoint the write belongs to.
+
+    checkpoint_ns : str
+        Namespace of the checkpoint.
+
+    checkpoint_id : str
+        Checkpoint the write belongs to.
+
+    task_id : str
+        Identifier of the task that produced the write.
+
+    idx : int
+        Position of the write in the task's output. Special 
+        channels (errors, interrupts) use negative indexes.
+
+    channel : str
+        Channel written to.
+
+    value_type : str
+        Serialization format of `value`.
+
+    value : bytes
+        Serialized and compressed value.
+
+    task_path : str
+        Path of the task in the graph.
+    """
+
+    __tablename__ = "graph_checkpoint_writes"
+
+    thread_id: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    checkpoint_ns: Mapped[str] = mapped_column(
+        String,
+        primary_key = True,
+        default = ""
+    )
+
+    checkpoint_id: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    task_id: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    idx: Mapped[int] = mapped_column(
+        Integer,
+        primary_key = True
+    )
+
+    channel: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    value_type: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    value: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable = False
+    )
+
+    task_path: Mapped[str] = mapped_column(
+        String,
+        default = "",
+        nullable = False
+    )
@@ -7,6 +7,8 @@ from sqlalchemy import (
     DateTime, 
     Enum, 
     ForeignKey, 
+    Index,
+    Integer,
     JSON, 
     String
 )
@@ -51,12 +53,60 @@ class Job(Base):
 
     updated_at : datetime
         Timestamp when the job was last updated (UTC).
+
+    usage : dict | None
+        Aggregated token, image-byte, latency and cost figures 
+        of the model calls performed by the job.
+
+    progress : dict | None
+        Partial results published while the job runs (e.g. the 
+        stores whose search has completed and their records).
+
+    lane : str | None
+        Scheduler lane of the job ("heavy" or "light").
+
+    payload : dict | None
+        The event to process, as JSON, so that any process can 
+        run the job.
+
+    owner_id : str | None
+        Identifier of the process that runs (or has queued) the 
+        job, or None while the job waits for an external worker.
+
+    heartbeat_at : datetime | None
+        Last time the owner reported the job as alive.
+
+    lease_expires_at : datetime | None
+        Time until which the job belongs to its owner. Renewed 
+        by the heartbeats; once expired, the job is recovered.
+
+    attempts : int
+        Number of times the job has started running.
+
+    idempotency_key : str | None
+        Key of the submission that created the job, if the client 
+        sent one. Unique per client, so concurrent submissions of 
+        several processes create a single job.
         
     client : Client
         SQLAlchemy relationship to the associated client.
+
+    llm_calls : list[LLMCall]
+        SQLAlchemy relationship to the model calls performed 
+        by the job, with cascading delete behavior.
     """
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_lane_created", "status", "lane", "created_at"),
+        Index("ix_jobs_client_lane_status", "client_id", "lane", "status"),
+        Index(
+            "ix_jobs_client_idempotency_key", 
+            "client_id", 
+            "idempotency_key",
+            unique = True
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String, 
@@ -111,7 +161,60 @@ class Job(Base):
         nullable = False
     )
 
+    usage: Mapped[dict | None] = mapped_column(
+        JSON,
+        nullable = True
+    )
+
+    progress: Mapped[dict | None] = mapped_column(
+        JSON,
+        nullable = True
+    )
+
+    lane: Mapped[str | None] = mapped_column(
+        String,
+        nullable = True
+    )
+
+    payload: Mapped[dict | None] = mapped_column(
+        JSON,
+        nullable = True
+    )
+
+    owner_id: Mapped[str | None] = mapped_column(
+        String,
+        nullable = True
+    )
+
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone = True),
+        nullable = True
+    )
+
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone = True),
+        nullable = True
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    idempotency_key: Mapped[str | None] = mapped_column(
+        String,
+        nullable = True
+    )
+
     client = relationship(
         "Client", 
         back_populates = "jobs"
+    )
+
+    llm_calls = relationship(
+        "LLMCall",
+        back_populates = "job",
+        cascade = "all, delete-orphan",
+        passive_deletes = True
     )
\ No newline at end of file
@@ -0,0 +1,97 @@
+from datetime import (
+    datetime, 
+    timezone
+)
+from sqlalchemy import (
+    DateTime, 
+    Enum, 
+    Integer, 
+    JSON, 
+    String
+)
+from sqlalchemy.orm import (
+    Mapped, 
+    mapped_column
+)
+
+from backend.backend_utils.common import LearnedProviderStatus
+from backend.database.base import Base
+
+
+class LearnedProvider(Base):
+    """
+    Database model storing a provider definition inferred from 
+    successful computer-use runs on an external store.
+
+    Attributes
+    ----------
+    domain : str
+        Normalized domain of the external store (primary key).
+
+    definition : dict
+        JSON-serialized `ProviderDefinition`.
+
+    status : LearnedProviderStatus
+        Current lifecycle state of the definition.
+
+    successful_validations : int
+        Number of consecutive later runs that the definition 
+        reproduced successfully.
+
+    failed_validations : int
+        Number of consecutive later runs (or searches, once 
+        promoted) that the definition failed to reproduce.
+
+    created_at : datetime
+        Timestamp when the definition was first inferred (UTC).
+
+    updated_at : datetime
+        Timestamp when the definition was last updated (UTC).
+    """
+
+    __tablename__ = "learned_providers"
+
+    domain: Mapped[str] = mapped_column(
+        String,
+        primary_key = True
+    )
+
+    definition: Mapped[dict] = mapped_column(
+        JSON,
+        nullable = False
+    )
+
+    status: Mapped[LearnedProviderStatus] = mapped_column(
+        Enum(
+            LearnedProviderStatus,
+            name = "learned_provider_status",
+            native_enum = True
+        ),
+        default = LearnedProviderStatus.CANDIDATE,
+        nullable = False
+    )
+
+    successful_validations: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    failed_validations: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone = True),
+        default = lambda: datetime.now(timezone.utc),
+        nullable = False
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone = True),
+        default = lambda: datetime.now(timezone.utc),
+        onupdate = lambda: datetime.now(timezone.utc),
+        nullable = False
+    )
@@ -0,0 +1,127 @@
+from datetime import (
+    datetime,
+    timezone
+)
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+    relationship
+)
+
+from backend.database.base import Base
+
+
+class LLMCall(Base):
+    """
+    Database model representing a single model call performed
+    while processing a job.
+
+    Attributes
+    ----------
+    id : int
+        Auto-incremented identifier of the call.
+
+    job_id : str
+        Foreign key referencing the job that issued the call.
+
+    model : str
+        Name of the model.
+
+    component : str
+        Part of the system issuing the call (e.g. "agent",
+        "computer_use").
+
+    input_tokens : int
+        Prompt tokens reported by the API.
+
+    output_tokens : int
+        Generated tokens reported by the API.
+
+    image_bytes : int
+        Size of the images sent with the call.
+
+    latency_ms : float
+        Wall-clock duration of the call in milliseconds.
+
+    cost_usd : float | None
+        Estimated cost in USD, or None if the model has no
+        known price.
+
+    created_at : datetime
+        Timestamp when the call was stored (UTC).
+
+    job : Job
+        SQLAlchemy relationship to the associated job.
+    """
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key = True,
+        autoincrement = True
+    )
+
+    job_id: Mapped[str] = mapped_column(
+        ForeignKey(
+            "jobs.id",
+            ondelete = "CASCADE"
+        ),
+        index = True
+    )
+
+    model: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    component: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    input_tokens: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    output_tokens: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    image_bytes: Mapped[int] = mapped_column(
+        Integer,
+        default = 0,
+        nullable = False
+    )
+
+    latency_ms: Mapped[float] = mapped_column(
+        Float,
+        nullable = False
+    )
+
+    cost_usd: Mapped[float | None] = mapped_column(
+        Float,
+        nullable = True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone = True),
+        default = lambda: datetime.now(timezone.utc),
+        nullable = False
+    )
+
+    job = relationship(
+        "Job",
+        back_populates = "llm_calls"
+    )
@@ -41,6 +41,10 @@ class Message(Base):
 
     created_at : datetime
         Timestamp when the message was created (UTC).
+
+    job_id : str | None
+        ID of the job that saved the message, used to avoid 
+        saving it again when the job is retried.
         
     chat : Chat
         SQLAlchemy relationship to the associated chat.
@@ -82,6 +86,12 @@ class Message(Base):
         nullable = False
     )
 
+    job_id: Mapped[str | None] = mapped_column(
+        String,
+        nullable = True,
+        index = True
+    )
+
     chat = relationship(
         "Chat",
         back_populates = "messages"
@@ -0,0 +1,116 @@
+from datetime import (
+    datetime,
+    timezone
+)
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    JSON,
+    String,
+    Text
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+    relationship
+)
+
+from backend.database.base import Base
+
+
+class ToolResult(Base):
+    """
+    Database model representing the output of a tool call made 
+    in a chat, kept so that follow-up questions can be answered 
+    without running the tool again.
+
+    Attributes
+    ----------
+    id : int
+        Auto-incremented identifier of the result.
+
+    client_id : str
+        Foreign key referencing the client owning the chat.
+
+    chat_id : str
+        Foreign key referencing the chat the tool was called in.
+
+    tool : str
+        Name of the tool (e.g. "search_products").
+
+    products : list[str]
+        Products the tool was called with.
+
+    stores : list[str]
+        Stores selected when the tool was called.
+
+    content : str
+        Output of the tool, as shown to the model.
+
+    records : list[dict] or None
+        Quote records and provider notices returned by the tool 
+        as its artifact, as dumped by `dump_entries`.
+
+    created_at : datetime
+        Timestamp when the tool returned (UTC).
+
+    chat : Chat
+        SQLAlchemy relationship to the associated chat.
+    """
+
+    __tablename__ = "tool_results"
+
+    id: Mapped[int] = mapped_column(primary_key = True)
+
+    client_id: Mapped[str] = mapped_column(
+        ForeignKey(
+            "clients.client_id",
+            ondelete = "CASCADE"
+        ),
+        nullable = False
+    )
+
+    chat_id: Mapped[str] = mapped_column(
+        ForeignKey(
+            "chats.chat_id",
+            ondelete = "CASCADE"
+        ),
+        index = True,
+        nullable = False
+    )
+
+    tool: Mapped[str] = mapped_column(
+        String,
+        nullable = False
+    )
+
+    products: Mapped[list[str]] = mapped_column(
+        JSON,
+        nullable = False
+    )
+
+    stores: Mapped[list[str]] = mapped_column(
+        JSON,
+        nullable = False
+    )
+
+    content: Mapped[str] = mapped_column(
+        Text,
+        nullable = False
+    )
+
+    records: Mapped[list[dict] | None] = mapped_column(
+        JSON,
+        nullable = True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone = True),
+        default = lambda: datetime.now(timezone.utc),
+        nullable = False
+    )
+
+    chat = relationship(
+        "Chat",
+        back_populates = "tool_results"
+    )
@@ -5,10 +5,16 @@ from backend.database.repositories.credentials_repo import (
     CredentialsRepository
 )
 from backend.database.repositories.job_repo import JobRepository
+from backend.database.repositories.learned_provider_repo import (
+    LearnedProviderRepository
+)
 from backend.database.repositories.login_context_repo import (
     LoginContextRepository
 )
 from backend.database.repositories.message_repo import MessageRepository
+from backend.database.repositories.tool_result_repo import (
+    ToolResultRepository
+)
 
 
 __all__ = [
@@ -16,6 +22,8 @@ __all__ = [
     "ClientRepository",
     "CredentialsRepository",
     "JobRepository",
+    "LearnedProviderRepository",
     "LoginContextRepository",
     "MessageRepository",
+    "ToolResultRepository",
 ]
\ No newline at end of file
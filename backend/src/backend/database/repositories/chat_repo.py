@@ -54,6 +54,43 @@ class ChatRepository:
         return chat
 
 
+    @staticmethod
+    async def update_summary(
+            db: AsyncSession,
+            chat_id: str,
+            summary: str | None,
+            summary_message_id: int | None
+        ) -> None:
+        """
+        Store the rolling summary of a chat. Pass None for both 
+        values to reset it.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        chat_id : str
+            The unique identifier of the chat.
+
+        summary : str | None
+            The updated summary.
+
+        summary_message_id : int | None
+            ID of the last message folded into the summary.
+
+        Returns
+        -------
+        None
+        """
+
+        chat = await db.get(Chat, chat_id)
+
+        if chat:
+            chat.summary = summary
+            chat.summary_message_id = summary_message_id
+
+
     @staticmethod
     async def delete_all_chats_for_client(
             db: AsyncSession,
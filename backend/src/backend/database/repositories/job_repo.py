@@ -1,14 +1,39 @@
 
 import uuid
+from datetime import (
+    datetime, 
+    timedelta,
+    timezone
+)
+from sqlalchemy import (
+    case,
+    ColumnElement,
+    func, 
+    select,
+    update
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from typing import Any
 
+from backend.database.actions.job_notify import notify_job
 from backend.database.actions.job_touch import touch_job
 from backend.database.models.job import Job
+from backend.database.models.llm_call import LLMCall
 
 from shared.shared_utils.common import JobStatus
 
 
+def _lease_until(
+        lease_seconds: float
+    ) -> datetime:
+    """
+    Return the expiry of a lease starting now.
+    """
+
+    return datetime.now(timezone.utc) + timedelta(seconds = lease_seconds)
+
+
 class JobRepository:
     """
     Repository class for managing jobs for clients and chats.
@@ -19,7 +44,12 @@ class JobRepository:
     async def create_job(
             db: AsyncSession, 
             client_id: str,
-            chat_id: str | None
+            chat_id: str | None,
+            lane: str | None = None,
+            payload: dict[str, Any] | None = None,
+            owner_id: str | None = None,
+            lease_seconds: float | None = None,
+            idempotency_key: str | None = None
         ) -> str:
         """
         Create a new job entry in the database.
@@ -35,6 +65,24 @@ class JobRepository:
         chat_id : str | None
             The ID of the chat associated with the job, if any.
 
+        lane : str | None, optional
+            Scheduler lane of the job.
+
+        payload : dict[str, Any] | None, optional
+            The event to process, as JSON. Jobs without a payload 
+            are never claimed by external workers.
+
+        owner_id : str | None, optional
+            The process that will run the job. Jobs left without 
+            an owner wait for `claim_next`.
+
+        lease_seconds : float | None, optional
+            Lease given to the owner; the owner must start the 
+            job or renew the lease before it expires.
+
+        idempotency_key : str | None, optional
+            Key of the submission, found by `find_by_idempotency_key`.
+
         Returns
         -------
         str
@@ -47,7 +95,14 @@ class JobRepository:
             id = job_id, 
             client_id = client_id, 
             chat_id = chat_id,
-            status = JobStatus.PENDING
+            status = JobStatus.PENDING,
+            lane = lane,
+            payload = payload,
+            owner_id = owner_id,
+            lease_expires_at = (
+                _lease_until(lease_seconds) if lease_seconds else None
+            ),
+            idempotency_key = idempotency_key
         )
 
         db.add(job)
@@ -60,10 +115,17 @@ class JobRepository:
     @staticmethod
     async def set_running(
             db: AsyncSession, 
-            job_id: str
-        ) -> None:
+            job_id: str,
+            owner_id: str,
+            lease_seconds: float
+        ) -> bool:
         """
-        Mark a job as running.
+        Mark a job as running and lease it to its owner. Starting 
+        a pending job counts as a new attempt; jobs already marked 
+        as running by `claim_next` keep their owner and attempts. 
+        Jobs in any other state (e.g. cancelled while queued) are 
+        left unchanged; the check and the update are a single 
+        statement, so a concurrent cancellation is never undone.
 
         Parameters
         ----------
@@ -74,17 +136,45 @@ class JobRepository:
         job_id : str
             The ID of the job to update.
 
+        owner_id : str
+            The process running the job.
+
+        lease_seconds : float
+            Duration of the lease, renewed by the heartbeats.
+
         Returns
         -------
-        None
+        bool
+            True if the job was started, False if it does not 
+            exist or is no longer pending or running.
         """
 
-        job: Job | None = await db.get(Job, job_id)
+        pending: ColumnElement[bool] = Job.status == JobStatus.PENDING
+
+        result = await db.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status.in_((JobStatus.PENDING, JobStatus.RUNNING))
+            )
+            .values(
+                owner_id = case((pending, owner_id), else_ = Job.owner_id),
+                attempts = case(
+                    (pending, Job.attempts + 1), 
+                    else_ = Job.attempts
+                ),
+                status = JobStatus.RUNNING,
+                heartbeat_at = datetime.now(timezone.utc),
+                lease_expires_at = _lease_until(lease_seconds)
+            )
+        )
 
-        if job:
-            job.status = JobStatus.RUNNING
+        if not result.rowcount:
+            return False
 
-            await touch_job(db, job.id)
+        await touch_job(db, job_id)
+
+        return True
 
 
     @staticmethod
@@ -94,7 +184,9 @@ class JobRepository:
             result: dict
         ) -> None:
         """
-        Set the result of a completed job and mark it as completed.
+        Set the result of a completed job and mark it as completed. 
+        The change is announced to the other processes with 
+        `notify_job`. Cancelled jobs are left unchanged.
 
         Parameters
         ----------
@@ -112,13 +204,19 @@ class JobRepository:
         None
         """
 
-        job: Job | None = await db.get(Job, job_id)
+        # read again, the job may have been cancelled meanwhile
+        job: Job | None = await db.get(
+            Job, 
+            job_id, 
+            populate_existing = True
+        )
 
-        if job:
+        if job and job.status != JobStatus.CANCELLED:
             job.status = JobStatus.COMPLETED
             job.result = result
 
             await touch_job(db, job.id)
+            await notify_job(db, job.id, "status", job.status.value)
 
 
     @staticmethod
@@ -128,7 +226,9 @@ class JobRepository:
             error: str
         ) -> None:
         """
-        Mark a job as failed and store the associated error message.
+        Mark a job as failed and store the associated error message. 
+        The change is announced to the other processes with 
+        `notify_job`. Cancelled jobs are left unchanged.
 
         Parameters
         ----------
@@ -146,13 +246,539 @@ class JobRepository:
         None
         """
 
-        job: Job | None = await db.get(Job, job_id)
+        # read again, the job may have been cancelled meanwhile
+        job: Job | None = await db.get(
+            Job, 
+            job_id, 
+            populate_existing = True
+        )
 
-        if job:
+        if job and job.status != JobStatus.CANCELLED:
             job.status = JobStatus.FAILED
             job.error = error
 
             await touch_job(db, job.id)
+            await notify_job(db, job.id, "status", job.status.value)
+
+
+    @staticmethod
+    async def set_usage(
+            db: AsyncSession, 
+            job_id: str, 
+            calls: list[dict[str, Any]],
+            totals: dict[str, Any]
+        ) -> None:
+        """
+        Store the model calls performed by a job and their totals.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job_id : str
+            The ID of the job to update.
+
+        calls : list[dict[str, Any]]
+            One entry per model call, as collected by 
+            `UsageRecorder`.
+
+        totals : dict[str, Any]
+            Aggregated figures of `calls`.
+
+        Returns
+        -------
+        None
+        """
+
+        job: Job | None = await db.get(Job, job_id)
+
+        if job:
+            job.usage = totals
+
+            db.add_all(
+                LLMCall(job_id = job_id, **call) for call in calls
+            )
+
+            await touch_job(db, job.id)
+
+
+    @staticmethod
+    async def set_progress(
+            db: AsyncSession, 
+            job_id: str, 
+            progress: dict[str, Any]
+        ) -> None:
+        """
+        Store the partial progress of a running job.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job_id : str
+            The ID of the job to update.
+
+        progress : dict[str, Any]
+            Snapshot of the progress, replacing the previous one.
+
+        Returns
+        -------
+        None
+        """
+
+        job: Job | None = await db.get(Job, job_id)
+
+        if job:
+            job.progress = progress
+
+            await touch_job(db, job.id)
+            await notify_job(db, job.id, "progress", job.status.value)
+
+
+    @staticmethod
+    async def claim_next(
+            db: AsyncSession, 
+            owner_id: str,
+            lanes: list[str],
+            lease_seconds: float,
+            client_running: int | None = None
+        ) -> Job | None:
+        """
+        Claim the next pending job of some lanes that has no 
+        owner, mark it as running and lease it to the worker.
+
+        Jobs are claimed fairly across clients: the oldest job of 
+        the clients with the fewest running jobs in its lane comes 
+        first, and clients already running `client_running` jobs 
+        of a lane are skipped.
+
+        The row is selected with `FOR UPDATE SKIP LOCKED`, so 
+        concurrent workers (in any process or node) never claim 
+        the same job; the claim holds once the session commits.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        owner_id : str
+            Identifier of the claiming worker.
+
+        lanes : list[str]
+            The lanes the worker has free capacity for.
+
+        lease_seconds : float
+            Duration of the lease, renewed by the heartbeats.
+
+        client_running : int | None, optional
+            Maximum number of running jobs of a lane per client, 
+            or None for no limit.
+
+        Returns
+        -------
+        Job | None
+            The claimed job, or None if no job is waiting.
+        """
+
+        running: Job = aliased(Job)
+        client_jobs = (
+            select(func.count())
+            .select_from(running)
+            .where(
+                running.client_id == Job.client_id,
+                running.lane == Job.lane,
+                running.status == JobStatus.RUNNING
+            )
+            .correlate(Job)
+            .scalar_subquery()
+        )
+
+        stmt = (
+            select(Job)
+            .where(
+                Job.status == JobStatus.PENDING,
+                Job.owner_id.is_(None),
+                Job.payload.is_not(None),
+                Job.lane.in_(lanes)
+            )
+            .order_by(client_jobs, Job.created_at)
+            .limit(1)
+            .with_for_update(of = Job, skip_locked = True)
+        )
+
+        if client_running is not None:
+            stmt = stmt.where(client_jobs < client_running)
+
+        result = await db.execute(stmt)
+        job: Job | None = result.scalar_one_or_none()
+
+        if job:
+            job.status = JobStatus.RUNNING
+            job.owner_id = owner_id
+            job.attempts += 1
+            job.heartbeat_at = datetime.now(timezone.utc)
+            job.lease_expires_at = _lease_until(lease_seconds)
+
+            await touch_job(db, job.id)
+            await notify_job(db, job.id, "status", job.status.value)
+
+        return job
+
+
+    @staticmethod
+    async def set_cancelled(
+            db: AsyncSession, 
+            job_id: str
+        ) -> bool:
+        """
+        Mark a pending or running job as cancelled. The change is 
+        announced to the other processes with `notify_job`, and 
+        the owner of the job stops it at its next heartbeat.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job_id : str
+            The ID of the job to cancel.
+
+        Returns
+        -------
+        bool
+            True if the job was cancelled, False if it does not 
+            exist or has already finished.
+        """
+
+        job: Job | None = await db.get(Job, job_id)
+
+        if not job or job.status not in (
+            JobStatus.PENDING, 
+            JobStatus.RUNNING
+        ):
+            return False
+
+        job.status = JobStatus.CANCELLED
+        job.error = "Job cancelled"
+
+        await touch_job(db, job.id)
+        await notify_job(db, job.id, "status", job.status.value)
+
+        return True
+
+
+    @staticmethod
+    async def heartbeat(
+            db: AsyncSession, 
+            job_id: str,
+            owner_id: str,
+            lease_seconds: float
+        ) -> JobStatus | None:
+        """
+        Record that the owner of a running job is still alive, 
+        renew its lease, and return the current status of the job 
+        (e.g. to notice that it was cancelled by another process).
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job_id : str
+            The ID of the job to update.
+
+        owner_id : str
+            The process running the job.
+
+        lease_seconds : float
+            Duration of the renewed lease.
+
+        Returns
+        -------
+        JobStatus | None
+            The status of the job, or None if it does not exist or 
+            was recovered by another process after the lease 
+            expired.
+        """
+
+        job: Job | None = await db.get(Job, job_id)
+
+        if job and job.owner_id == owner_id:
+            job.heartbeat_at = datetime.now(timezone.utc)
+            job.lease_expires_at = _lease_until(lease_seconds)
+
+            return job.status
+
+        return None
+
+
+    @staticmethod
+    async def renew_leases(
+            db: AsyncSession, 
+            owner_id: str,
+            lease_seconds: float
+        ) -> int:
+        """
+        Renew the leases of the pending jobs of an owner, i.e. the 
+        jobs queued in its process that did not start yet.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        owner_id : str
+            The owner of the jobs.
+
+        lease_seconds : float
+            Duration of the renewed leases.
+
+        Returns
+        -------
+        int
+            Number of renewed leases.
+        """
+
+        result = await db.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.PENDING,
+                Job.owner_id == owner_id
+            )
+            .values(lease_expires_at = _lease_until(lease_seconds))
+        )
+
+        return result.rowcount or 0
+
+
+    @staticmethod
+    async def lock_expired(
+            db: AsyncSession, 
+            owner_id: str,
+            limit: int = 100
+        ) -> list[Job]:
+        """
+        Lock the unfinished jobs of other owners whose lease has 
+        expired, e.g. because their process crashed.
+
+        The rows are selected with `FOR UPDATE SKIP LOCKED`, so 
+        concurrent reapers never recover the same job.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        owner_id : str
+            The process recovering the jobs; its own jobs are 
+            skipped.
+
+        limit : int, optional
+            Maximum number of jobs returned. Default is 100.
+
+        Returns
+        -------
+        list[Job]
+            The expired jobs, oldest first.
+        """
+
+        stmt = (
+            select(Job)
+            .where(
+                Job.status.in_((JobStatus.PENDING, JobStatus.RUNNING)),
+                Job.owner_id.is_not(None),
+                Job.owner_id != owner_id,
+                Job.lease_expires_at < datetime.now(timezone.utc)
+            )
+            .order_by(Job.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked = True)
+        )
+
+        result = await db.execute(stmt)
+
+        return list(result.scalars().all())
+
+
+    @staticmethod
+    async def requeue(
+            db: AsyncSession, 
+            job: Job,
+            owner_id: str | None = None,
+            lease_seconds: float | None = None
+        ) -> None:
+        """
+        Put a lost job back in the queue. Its partial progress is 
+        discarded; the attempts made so far are kept.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job : Job
+            The job, as locked by `lock_expired`.
+
+        owner_id : str | None, optional
+            The process that will run the job, or None to leave it 
+            to `claim_next`.
+
+        lease_seconds : float | None, optional
+            Lease given to `owner_id`.
+
+        Returns
+        -------
+        None
+        """
+
+        job.status = JobStatus.PENDING
+        job.owner_id = owner_id
+        job.progress = None
+        job.heartbeat_at = None
+        job.lease_expires_at = (
+            _lease_until(lease_seconds) 
+            if owner_id and lease_seconds else None
+        )
+
+        await touch_job(db, job.id)
+        await notify_job(db, job.id, "status", job.status.value)
+
+
+    @staticmethod
+    async def find_by_idempotency_key(
+            db: AsyncSession, 
+            client_id: str,
+            idempotency_key: str,
+            max_age: timedelta
+        ) -> Job | None:
+        """
+        Retrieve the latest job created by a client with an 
+        idempotency key.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        client_id : str
+            The unique identifier of the client.
+
+        idempotency_key : str
+            The key sent with the submission.
+
+        max_age : timedelta
+            Jobs created earlier are ignored.
+
+        Returns
+        -------
+        Job | None
+            The job, or None if the key was not used recently.
+        """
+
+        stmt = (
+            select(Job)
+            .where(
+                Job.client_id == client_id,
+                Job.idempotency_key == idempotency_key,
+                Job.created_at >= datetime.now(timezone.utc) - max_age
+            )
+            .order_by(Job.created_at.desc())
+            .limit(1)
+        )
+
+        result = await db.execute(stmt)
+
+        return result.scalar_one_or_none()
+
+
+    @staticmethod
+    async def release_idempotency_key(
+            db: AsyncSession, 
+            client_id: str,
+            idempotency_key: str,
+            max_age: timedelta
+        ) -> int:
+        """
+        Free an idempotency key held by older jobs of a client, so 
+        that it can be used again.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        client_id : str
+            The unique identifier of the client.
+
+        idempotency_key : str
+            The key sent with the submission.
+
+        max_age : timedelta
+            Jobs created earlier lose the key.
+
+        Returns
+        -------
+        int
+            Number of jobs that lost the key.
+        """
+
+        result = await db.execute(
+            update(Job)
+            .where(
+                Job.client_id == client_id,
+                Job.idempotency_key == idempotency_key,
+                Job.created_at < datetime.now(timezone.utc) - max_age
+            )
+            .values(idempotency_key = None)
+        )
+
+        return result.rowcount or 0
+
+
+    @staticmethod
+    async def count_pending(
+            db: AsyncSession, 
+            lane: str,
+            client_id: str | None = None
+        ) -> int:
+        """
+        Count the jobs of a lane waiting for an external worker.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        lane : str
+            The lane.
+
+        client_id : str | None, optional
+            If given, only the jobs of this client are counted.
+
+        Returns
+        -------
+        int
+            Number of pending jobs of the lane without an owner.
+        """
+
+        stmt = (
+            select(func.count())
+            .select_from(Job)
+            .where(
+                Job.status == JobStatus.PENDING,
+                Job.owner_id.is_(None),
+                Job.lane == lane
+            )
+        )
+
+        if client_id is not None:
+            stmt = stmt.where(Job.client_id == client_id)
+
+        result = await db.execute(stmt)
+
+        return result.scalar_one()
 
 
     @staticmethod
@@ -175,7 +801,8 @@ class JobRepository:
         -------
         dict[str, Any] | None
             A dictionary containing job details (status, result, 
-            error, timestamps) if the job exists, otherwise None.
+            error, usage, progress, timestamps) if the job exists, 
+            otherwise None.
         """
 
         job: Job | None = await db.get(Job, job_id)
@@ -188,6 +815,9 @@ class JobRepository:
                 "status": job.status,
                 "result": job.result,
                 "error": job.error,
+                "usage": job.usage,
+                "progress": job.progress,
+                "attempts": job.attempts,
                 "created_at": str(job.created_at),
                 "updated_at": str(job.updated_at)
             }
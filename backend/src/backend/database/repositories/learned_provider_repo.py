@@ -0,0 +1,189 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import LearnedProviderStatus
+from backend.database.models.learned_provider import LearnedProvider
+
+from shared.shared_utils.common import ProviderDefinition
+
+
+class LearnedProviderRepository:
+    """
+    Repository class for managing provider definitions inferred
+    from computer-use runs.
+    """
+
+
+    @staticmethod
+    async def get(
+            db: AsyncSession,
+            domain: str
+        ) -> LearnedProvider | None:
+        """
+        Retrieve the learned provider stored for a domain.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        domain : str
+            The normalized domain of the external store.
+
+        Returns
+        -------
+        LearnedProvider | None
+            The stored learned provider, or None if the domain
+            has never been learned.
+        """
+
+        return await db.get(LearnedProvider, domain)
+
+
+    @staticmethod
+    async def upsert_candidate(
+            db: AsyncSession,
+            domain: str,
+            definition: ProviderDefinition
+        ) -> None:
+        """
+        Store a freshly inferred definition as a validation candidate.
+
+        Any previous definition for the domain is replaced and its
+        validation counters are reset.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        domain : str
+            The normalized domain of the external store.
+
+        definition : ProviderDefinition
+            The inferred provider definition.
+
+        Returns
+        -------
+        None
+        """
+
+        learned: LearnedProvider | None = await db.get(
+            LearnedProvider,
+            domain
+        )
+
+        if learned:
+            learned.definition = dict(definition)
+            learned.status = LearnedProviderStatus.CANDIDATE
+            learned.successful_validations = 0
+            learned.failed_validations = 0
+
+        else:
+            db.add(
+                LearnedProvider(
+                    domain = domain,
+                    definition = dict(definition),
+                    status = LearnedProviderStatus.CANDIDATE,
+                    successful_validations = 0,
+                    failed_validations = 0
+                )
+            )
+
+
+    @staticmethod
+    async def record_validation(
+            db: AsyncSession,
+            domain: str,
+            success: bool,
+            promotion_threshold: int,
+            demotion_threshold: int = 1
+        ) -> LearnedProviderStatus | None:
+        """
+        Record the outcome of validating a definition against a
+        later run (or of a search, once promoted) and update its 
+        status accordingly.
+
+        A candidate is promoted once it reaches `promotion_threshold`
+        consecutive successful validations, and rejected by a 
+        failed one. A promoted definition is rejected after 
+        `demotion_threshold` consecutive failures.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        domain : str
+            The normalized domain of the external store.
+
+        success : bool
+            Whether the definition reproduced the run's results.
+
+        promotion_threshold : int
+            Number of consecutive successes required for promotion.
+
+        demotion_threshold : int, optional
+            Number of consecutive failures rejecting a promoted 
+            definition. Default is 1.
+
+        Returns
+        -------
+        LearnedProviderStatus | None
+            The updated status, or None if the domain is unknown.
+        """
+
+        learned: LearnedProvider | None = await db.get(
+            LearnedProvider,
+            domain
+        )
+
+        if not learned:
+            return None
+
+        if success:
+            learned.successful_validations += 1
+            learned.failed_validations = 0
+
+            if learned.successful_validations >= promotion_threshold:
+                learned.status = LearnedProviderStatus.PROMOTED
+
+        else:
+            learned.successful_validations = 0
+            learned.failed_validations += 1
+
+            if (
+                learned.status != LearnedProviderStatus.PROMOTED
+                or learned.failed_validations >= demotion_threshold
+            ):
+                learned.status = LearnedProviderStatus.REJECTED
+
+        return learned.status
+
+
+    @staticmethod
+    async def get_promoted(
+            db: AsyncSession
+        ) -> list[LearnedProvider]:
+        """
+        Retrieve all promoted learned providers.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        Returns
+        -------
+        list[LearnedProvider]
+            All definitions currently replacing computer use.
+        """
+
+        result = await db.execute(
+            select(LearnedProvider)
+            .where(
+                LearnedProvider.status == LearnedProviderStatus.PROMOTED
+            )
+        )
+
+        return list(result.scalars().all())
@@ -65,8 +65,9 @@ class MessageRepository:
             client_id: str, 
             chat_id: str, 
             role: str, 
-            content: str
-        ) -> None:
+            content: str,
+            job_id: str | None = None
+        ) -> Message:
         """
         Save a message for a client in a specific chat.
 
@@ -87,9 +88,13 @@ class MessageRepository:
         content : str
             The message content.
 
+        job_id : str | None, optional
+            The job saving the message, if any. Default is None.
+
         Returns
         -------
-        None
+        Message
+            The saved message, with its ID assigned.
         """
 
         msg = Message(
@@ -97,11 +102,56 @@ class MessageRepository:
             chat_id = chat_id,
             role = role,
             content = content,
+            job_id = job_id
         )
 
         db.add(msg)
 
         await touch_client(db, client_id)
+        await db.flush()
+
+        return msg
+
+
+    @staticmethod
+    async def get_job_message(
+            db: AsyncSession,
+            job_id: str,
+            role: str
+        ) -> Message | None:
+        """
+        Retrieve the message of a given role saved by a job, so 
+        that a retried job does not save it twice.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        job_id : str
+            The ID of the job.
+
+        role : str
+            The role of the sender (e.g., "user" or "assistant").
+
+        Returns
+        -------
+        Message | None
+            The first such message, or None if the job saved none.
+        """
+
+        stmt = (
+            select(Message)
+            .where(
+                Message.job_id == job_id,
+                Message.role == role
+            )
+            .order_by(Message.id)
+            .limit(1)
+        )
+
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
 
 
     @staticmethod
@@ -147,6 +197,71 @@ class MessageRepository:
         return list(result.scalars().all())
 
 
+    @staticmethod
+    async def get_recent_messages(
+            db: AsyncSession,
+            client_id: str,
+            chat_id: str,
+            limit: int | None = None,
+            after_id: int | None = None,
+            exclude_id: int | None = None
+        ) -> list[Message]:
+        """
+        Retrieve the most recent messages of a chat, ordered by 
+        creation time ascending.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        client_id : str
+            The unique identifier of the client.
+
+        chat_id : str
+            The unique identifier of the chat.
+
+        limit : int | None, optional
+            Maximum number of messages returned, the newest ones 
+            being kept. If None, all matching messages are 
+            returned. Default is None.
+
+        after_id : int | None, optional
+            If given, only messages with a greater ID are returned. 
+            Default is None.
+
+        exclude_id : int | None, optional
+            If given, the message with this ID is left out. 
+            Default is None.
+
+        Returns
+        -------
+        list[Message]
+            The selected messages, oldest first.
+        """
+
+        stmt = (
+            select(Message)
+            .where(
+                Message.client_id == client_id,
+                Message.chat_id == chat_id
+            )
+            .order_by(desc(Message.id))
+        )
+
+        if after_id is not None:
+            stmt = stmt.where(Message.id > after_id)
+
+        if exclude_id is not None:
+            stmt = stmt.where(Message.id != exclude_id)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await db.execute(stmt)
+        return list(reversed(result.scalars().all()))
+
+
     @staticmethod
     async def delete_messages_for_chat(
             db: AsyncSession,
@@ -0,0 +1,165 @@
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+from typing import Any
+
+from sqlalchemy import (
+    delete,
+    desc,
+    select
+)
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models.tool_result import ToolResult
+
+
+class ToolResultRepository:
+    """
+    Repository class for managing the tool outputs stored per chat.
+    """
+
+
+    @staticmethod
+    async def save(
+            db: AsyncSession,
+            client_id: str,
+            chat_id: str,
+            tool: str,
+            products: list[str],
+            stores: list[str],
+            content: str,
+            records: list[dict[str, Any]] | None = None
+        ) -> None:
+        """
+        Store the output of a tool call.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        client_id : str
+            The unique identifier of the client.
+
+        chat_id : str
+            The unique identifier of the chat.
+
+        tool : str
+            Name of the tool.
+
+        products : list[str]
+            Products the tool was called with.
+
+        stores : list[str]
+            Stores selected when the tool was called.
+
+        content : str
+            Output of the tool, as shown to the model.
+
+        records : list[dict[str, Any]] or None, optional
+            Records returned by the tool as its artifact. Default 
+            is None.
+
+        Returns
+        -------
+        None
+        """
+
+        db.add(
+            ToolResult(
+                client_id = client_id,
+                chat_id = chat_id,
+                tool = tool,
+                products = products,
+                stores = stores,
+                content = content,
+                records = records
+            )
+        )
+
+
+    @staticmethod
+    async def get_recent(
+            db: AsyncSession,
+            client_id: str,
+            chat_id: str,
+            max_age: timedelta,
+            limit: int = 10
+        ) -> list[ToolResult]:
+        """
+        Retrieve the tool outputs of a chat that are still fresh, 
+        newest first.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        client_id : str
+            The unique identifier of the client.
+
+        chat_id : str
+            The unique identifier of the chat.
+
+        max_age : timedelta
+            Maximum age of the returned outputs.
+
+        limit : int, optional
+            Maximum number of outputs returned. Default is 10.
+
+        Returns
+        -------
+        list[ToolResult]
+            The stored outputs, newest first.
+        """
+
+        threshold: datetime = datetime.now(timezone.utc) - max_age
+
+        stmt = (
+            select(ToolResult)
+            .where(
+                ToolResult.client_id == client_id,
+                ToolResult.chat_id == chat_id,
+                ToolResult.created_at >= threshold
+            )
+            .order_by(desc(ToolResult.id))
+            .limit(limit)
+        )
+
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+
+    @staticmethod
+    async def delete_older_than(
+            db: AsyncSession,
+            max_age: timedelta
+        ) -> int | None:
+        """
+        Delete the tool outputs older than a given age.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The asynchronous SQLAlchemy session for database access.
+
+        max_age : timedelta
+            Outputs older than this duration are deleted.
+
+        Returns
+        -------
+        int | None
+            The number of outputs deleted, or None if not available.
+        """
+
+        threshold: datetime = datetime.now(timezone.utc) - max_age
+
+        result: Result[Any] = await db.execute(
+            delete(ToolResult)
+            .where(ToolResult.created_at < threshold)
+        )
+
+        return getattr(result, "rowcount", None)
@@ -1,6 +1,9 @@
 
 import asyncio
-from datetime import datetime
+import json
+import time
+from datetime import datetime, timedelta
+from functools import partial
 from logging import (
     basicConfig,
     getLogger,
@@ -8,13 +11,44 @@ from logging import (
 )
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator
+from fastapi import (
+    FastAPI, 
+    HTTPException, 
+    Query
+)
+from sqlalchemy.exc import IntegrityError
 from uvicorn import Config, Server
 
 from backend.config import settings
-from backend.backend_utils.events.handler import EventHandler
+from backend.backend_utils.common import (
+    JobLane,
+    PROCESS_ID,
+    SingleFlight
+)
+from backend.backend_utils.computer_use import runtime
+from backend.backend_utils.computer_use.promotion import (
+    load_promoted_providers
+)
+from backend.backend_utils.exceptions import QueueFullException
+from backend.backend_utils.governor import provider_governor
+from backend.backend_utils.jobs import (
+    cancel_job,
+    event_lane,
+    job_scheduler,
+    run_event_job
+)
+from backend.backend_utils.metrics import metrics
+from backend.backend_utils.notifications import (
+    job_events,
+    job_listener,
+    job_notifier
+)
 from backend.background.db_cleanup import cleanup_inactive_clients_task
+from backend.background.job_reaper import job_reaper_task
 from backend.database.engine import AsyncSessionLocal
+from backend.database.models.job import Job
 from backend.database.repositories import (
     ChatRepository,
     ClientRepository,
@@ -22,9 +56,7 @@ from backend.database.repositories import (
 )
 
 from shared.events import Event
-from shared.events.error import ErrorEvent
 from shared.events.job_status import JobStatusEvent
-from shared.events.metadata import BaseMetadata
 from shared.events.transport import EventEnvelope
 from shared.events.utils import extract_chat_id
 from shared.shared_utils.common import JobStatus
@@ -32,6 +64,14 @@ from shared.shared_utils.common import JobStatus
 
 logger: Logger = getLogger("agent-server")
 LOGGER_FORMAT = "%(levelname)s | %(asctime)s | %(message)s"
+TERMINAL_STATUSES: tuple[JobStatus, ...] = (
+    JobStatus.COMPLETED,
+    JobStatus.FAILED,
+    JobStatus.CANCELLED
+)
+
+# concurrent submissions with the same idempotency key
+_submissions: SingleFlight[dict[str, str]] = SingleFlight("submissions")
 
 
 @asynccontextmanager
@@ -41,9 +81,14 @@ async def lifespan(
     """
     Async context manager for the FastAPI application lifespan.
 
-    Initializes logging, sets the server timezone, and starts 
-    the background task for cleaning up inactive clients. 
-    Ensures graceful shutdown by cancelling the background task.
+    Initializes logging, sets the server timezone, registers the 
+    promoted learned providers, starts the job scheduler (unless 
+    jobs run in external workers), the listener of the job changes 
+    made by other processes and the background tasks for cleaning 
+    up inactive clients and recovering lost jobs (at startup, then 
+    every `JOB_REAPER_INTERVAL` seconds). Ensures graceful shutdown 
+    by cancelling the background tasks, stopping the listener and 
+    the scheduler and closing the shared computer-use client.
 
     Parameters
     ----------
@@ -67,12 +112,30 @@ async def lifespan(
 
     logger.info(f"server timezone: {app.state.timezone}")
 
+    if settings.LEARNED_PROVIDERS_ENABLED:
+        try:
+            loaded: int = await load_promoted_providers()
+            logger.info(f"loaded {loaded} learned provider(s)")
+
+        except Exception as e:
+            logger.warning(f"could not load learned providers: {e}")
+
+    if settings.JOB_EXECUTION == "inline":
+        job_scheduler.start()
+
+    job_listener.start()
+
     cleanup_task: asyncio.Task = asyncio.create_task(
         cleanup_inactive_clients_task(
             every_seconds = 1800,
             inactive_for_hours = 24
         )
     )
+    reaper_task: asyncio.Task = asyncio.create_task(
+        job_reaper_task(
+            every_seconds = settings.JOB_REAPER_INTERVAL
+        )
+    )
 
     try:
         yield
@@ -80,13 +143,18 @@ async def lifespan(
     finally:
         logger.info("server shutting down...")
 
-        cleanup_task.cancel()
+        for task in (cleanup_task, reaper_task):
+            task.cancel()
 
-        try:
-            await cleanup_task
+            try:
+                await task
+
+            except asyncio.CancelledError:
+                pass
 
-        except asyncio.CancelledError:
-            pass
+        await job_listener.stop()
+        await job_scheduler.stop()
+        await runtime.aclose()
 
         logger.info("shutdown complete")
 
@@ -94,6 +162,72 @@ async def lifespan(
 app: FastAPI = FastAPI(lifespan = lifespan)
 
 
+def __recheck_interval(
+        default: float
+    ) -> float:
+    """
+    Return how often a waiter must read a job again, because its 
+    changes may not be notified to this process.
+    """
+
+    if settings.JOB_EXECUTION == "external" and not job_listener.active:
+        return settings.WORKER_POLL_INTERVAL
+
+    return default
+
+
+def __queue_full(
+        exc: QueueFullException
+    ) -> HTTPException:
+    """
+    Build the HTTP 429 response of a rejected event.
+    """
+
+    return HTTPException(
+        status_code = 429,
+        detail = str(exc),
+        headers = {"Retry-After": str(exc.retry_after)}
+    )
+
+
+async def __check_backlog(
+        lane: JobLane,
+        client_id: str
+    ) -> None:
+    """
+    Reject an event whose lane, or whose client's share of the 
+    lane, already has a full backlog of jobs waiting for the 
+    external workers.
+    """
+
+    queue_size: int = (
+        settings.JOB_HEAVY_QUEUE_SIZE if lane == JobLane.HEAVY
+        else settings.JOB_LIGHT_QUEUE_SIZE
+    )
+
+    async with AsyncSessionLocal() as db:
+        pending: int = await JobRepository.count_pending(db, lane.value)
+        client_pending: int = await JobRepository.count_pending(
+            db,
+            lane.value,
+            client_id
+        )
+
+    if (
+        pending >= queue_size 
+        or 
+        client_pending >= settings.JOB_CLIENT_QUEUE_SIZE
+    ):
+        metrics.increment("jobs.rejected", lane = lane.value)
+
+        raise __queue_full(
+            QueueFullException(
+                lane.value,
+                settings.WORKER_HEARTBEAT_INTERVAL
+            )
+        )
+
+
 @app.post("/event")
 async def create_event_job(
         envelope: EventEnvelope
@@ -102,8 +236,18 @@ async def create_event_job(
     Endpoint to create a new job for an incoming event.
 
     The function stores or ensures the existence of the client 
-    and chat, creates a job record, and triggers asynchronous 
-    processing of the event.
+    and chat, creates a job record, and queues the processing of 
+    the event in the job scheduler. Chat messages and logins run 
+    in the heavy lane, the other events in the light lane. With 
+    `JOB_EXECUTION=external` the job record, which holds the 
+    event, is only left for the worker processes to claim.
+
+    Envelopes with an idempotency key already used by the client 
+    in the last `IDEMPOTENCY_WINDOW` seconds return the status of 
+    the existing job instead, counted as `jobs.deduplicated`. 
+    Concurrent envelopes with the same key create a single job: 
+    in one process they share one submission, and across processes 
+    the unique index on the key lets only one of them insert it.
 
     Parameters
     ----------
@@ -114,10 +258,91 @@ async def create_event_job(
     -------
     dict[str, str]
         Dictionary containing the job status with job ID.
+
+    Raises
+    ------
+    HTTPException
+        With status 429 and a `Retry-After` header if the queue 
+        (or, with external workers, the backlog) of the event's 
+        lane is full.
+    """
+
+    if envelope.idempotency_key is None:
+        return await __submit_event(envelope)
+
+    return await _submissions.do(
+        (envelope.client_id, envelope.idempotency_key),
+        partial(__submit_event_once, envelope)
+    )
+
+
+async def __submit_event_once(
+        envelope: EventEnvelope
+    ) -> dict[str, str]:
+    """
+    Return the job created with the idempotency key of an envelope, 
+    or submit the envelope if there is none.
+    """
+
+    existing: dict[str, str] | None = await __find_submitted(envelope)
+
+    if existing is None:
+        return await __submit_event(envelope)
+
+    return existing
+
+
+async def __find_submitted(
+        envelope: EventEnvelope
+    ) -> dict[str, str] | None:
+    """
+    Return the status of the job created with the idempotency key 
+    of an envelope in the last `IDEMPOTENCY_WINDOW` seconds, if any.
+    """
+
+    async with AsyncSessionLocal() as db:
+        job: Job | None = await JobRepository.find_by_idempotency_key(
+            db,
+            envelope.client_id,
+            envelope.idempotency_key,
+            max_age = timedelta(seconds = settings.IDEMPOTENCY_WINDOW)
+        )
+
+    if job is None:
+        return None
+
+    metrics.increment("jobs.deduplicated")
+
+    return JobStatusEvent(
+        job_id = job.id,
+        status = job.status
+    ).model_dump()
+
+
+async def __submit_event(
+        envelope: EventEnvelope
+    ) -> dict[str, str]:
+    """
+    Create the job of an envelope and queue it.
     """
 
     client_id: str = envelope.client_id
     event: Event = envelope.event
+    lane: JobLane = event_lane(event)
+    external: bool = settings.JOB_EXECUTION == "external"
+
+    if external:
+        await __check_backlog(lane, client_id)
+
+    elif not job_scheduler.has_capacity(lane, client_id):
+        metrics.increment("jobs.rejected", lane = lane.value)
+
+        raise __queue_full(
+            QueueFullException(
+                lane.value, 
+                job_scheduler.retry_after(lane, client_id)
+            )
+        )
 
     chat_id: str | None = extract_chat_id(
         event
@@ -139,149 +364,375 @@ async def create_event_job(
                     client_id
                 )
 
+            if envelope.idempotency_key is not None:
+                # jobs older than the window give their key back
+                await JobRepository.release_idempotency_key(
+                    db,
+                    client_id,
+                    envelope.idempotency_key,
+                    max_age = timedelta(
+                        seconds = settings.IDEMPOTENCY_WINDOW
+                    )
+                )
+
             job_id: str = await JobRepository.create_job(
                 db,
                 client_id,
-                chat_id
+                chat_id,
+                lane = lane.value,
+                payload = event.model_dump(mode = "json"),
+                owner_id = None if external else PROCESS_ID,
+                lease_seconds = (
+                    None if external else settings.JOB_LEASE_SECONDS
+                ),
+                idempotency_key = envelope.idempotency_key
             )
 
             await db.commit()
 
-        except:
+        except IntegrityError:
             await db.rollback()
 
-    asyncio.create_task(
-        run_event_job(
-            job_id,
-            client_id, 
-            event
-        )
-    )
+            # another process inserted the job of the key first
+            if envelope.idempotency_key is not None:
+                existing: dict[str, str] | None = await __find_submitted(
+                    envelope
+                )
+
+                if existing is not None:
+                    return existing
+
+        except:
+            await db.rollback()
 
     status_event: JobStatusEvent = JobStatusEvent(
         job_id = job_id,
         status = JobStatus.PENDING
     )
 
+    if external:
+        return status_event.model_dump()
+
+    async def runner() -> None:
+        """
+        Process the event of the job.
+        """
+
+        await run_event_job(job_id, client_id, event)
+
+    try:
+        job_scheduler.submit(lane, job_id, runner, client_id)
+
+    except QueueFullException as qfe:
+        async with AsyncSessionLocal() as db:
+            await JobRepository.set_error(db, job_id, str(qfe))
+            await db.commit()
+
+        raise __queue_full(qfe)
+
     return status_event.model_dump()
 
 
-async def run_event_job(
-        job_id: str, 
-        client_id: str,
-        event: Event
-    ) -> None:
+@app.get("/event/{event_id}")
+async def get_event_result(
+        event_id: str,
+        wait: float = Query(0, ge = 0, le = 60),
+        progress: bool = False
+    ) -> dict:
     """
-    Execute the event asynchronously and update job status in 
-    the database.
+    Retrieve the result of a previously created job/event.
+
+    Queries the database for the job by ID and returns its 
+    current status, result, or error information. Raises 
+    HTTP 404 if the job is not found.
 
-    Processes the event via the EventHandler, sets job status to 
-    RUNNING, COMPLETED, or FAILED, and records the results or errors. 
-    Commits all changes to the database.
+    With `wait`, the request is held until the job completes or 
+    fails (or, with `progress`, until its progress changes) or 
+    the timeout passes. The request is woken by the process 
+    running the job or, on PostgreSQL, by the notifications of 
+    the other processes. Otherwise, jobs run by external workers 
+    are re-read every `WORKER_POLL_INTERVAL` seconds.
 
     Parameters
     ----------
-    job_id : str
-        ID of the job to update.
+    event_id : str
+        The ID of the event/job to retrieve.
 
-    client_id : str
-        ID of the client associated with the job.
+    wait : float, optional
+        Maximum number of seconds to wait for the job to settle 
+        (default is 0, at most 60).
 
-    event : Event
-        The event to process.
+    progress : bool, optional
+        If True, a waiting request also returns as soon as the 
+        progress of the job changes (default is False).
 
     Returns
     -------
-    None
+    dict
+        Dictionary containing job details including status, 
+        result, and timestamps.
     """
 
-    async with AsyncSessionLocal() as db:
-        try:
-            await JobRepository.set_running(
-                db,
-                job_id
-            )
-        
-            result: dict = await EventHandler.handle_event(
-                db,
-                event,
-                client_id
-            )
+    deadline: float = time.monotonic() + wait
+    recheck: float = __recheck_interval(wait)
+    first: dict | None = None
 
-            await JobRepository.set_result(
-                db,
-                job_id, 
-                result
-            )
-
-        except Exception as e:
-            await db.rollback()
+    while True:
+        with job_notifier.watch(event_id) as changed:
+            async with AsyncSessionLocal() as db:
+                job: dict | None = await JobRepository.get(
+                    db,
+                    event_id
+                )
 
-            metadata: BaseMetadata | None = None
+            if not job:
+                raise HTTPException(
+                    status_code = 404,
+                    detail = "Event not found"
+                )
 
-            if getattr(getattr(event, "metadata", None), "chat_id", None):
-                metadata = BaseMetadata(
-                    chat_id = event.metadata.chat_id
+            first = first or job
+            remaining: float = deadline - time.monotonic()
+
+            if (
+                remaining <= 0
+                or
+                job["status"] in TERMINAL_STATUSES
+                or
+                (progress and job["progress"] != first["progress"])
+            ):
+                return job
+
+            try:
+                await asyncio.wait_for(
+                    changed.wait(), 
+                    min(remaining, recheck)
                 )
 
-            error_event: Event = ErrorEvent(
-                message = str(e),
-                metadata = metadata
-            )
+            except TimeoutError:
+                pass
 
-            await JobRepository.set_error(
-                db,
-                job_id, 
-                str(e)
-            )
 
-            await JobRepository.set_result(
-                db,
-                job_id,
-                result = error_event.model_dump()
-            )
+@app.delete("/event/{event_id}")
+async def cancel_event(
+        event_id: str
+    ) -> dict[str, str]:
+    """
+    Cancel a pending or running job.
+
+    The job is marked as `CANCELLED`. If it runs in this process, 
+    its processing is cancelled right away, closing its browsers 
+    and stopping its model calls, and its scheduler slot is freed; 
+    a job running in another process (e.g. an external worker) is 
+    stopped by its owner at the next heartbeat. A job queued in 
+    this process is removed from the scheduler queues, freeing 
+    its place at once.
+
+    Parameters
+    ----------
+    event_id : str
+        The ID of the event/job to cancel.
 
+    Returns
+    -------
+    dict[str, str]
+        Dictionary containing the job status with job ID.
+
+    Raises
+    ------
+    HTTPException
+        With status 404 if the job is not found, or 409 if it 
+        has already completed or failed.
+    """
+
+    async with AsyncSessionLocal() as db:
+        cancelled: bool = await JobRepository.set_cancelled(db, event_id)
         await db.commit()
 
+        job: dict | None = await JobRepository.get(db, event_id)
 
-@app.get("/event/{event_id}")
-async def get_event_result(
+    if not job:
+        raise HTTPException(
+            status_code = 404,
+            detail = "Event not found"
+        )
+
+    if not cancelled and job["status"] != JobStatus.CANCELLED:
+        raise HTTPException(
+            status_code = 409,
+            detail = f"Event already {job['status'].value.lower()}"
+        )
+
+    if cancelled:
+        metrics.increment("jobs.cancelled")
+
+        job_scheduler.remove(event_id)
+
+        # a running job publishes its final status once stopped
+        if not cancel_job(event_id):
+            job_notifier.notify(event_id)
+            job_events.publish(event_id, "status", job)
+
+    status_event: JobStatusEvent = JobStatusEvent(
+        job_id = event_id,
+        status = JobStatus.CANCELLED
+    )
+
+    return status_event.model_dump()
+
+
+def __sse(
+        kind: str,
+        data: dict[str, Any]
+    ) -> str:
+    """
+    Format an event of the stream endpoint.
+    """
+
+    return f"event: {kind}\ndata: {json.dumps(data, default = str)}\n\n"
+
+
+async def __job_stream(
         event_id: str
-    ) -> dict:
+    ) -> AsyncIterator[str]:
+    """
+    Yield the events of a job until it completes or fails.
     """
-    Retrieve the result of a previously created job/event.
 
-    Queries the database for the job by ID and returns its 
-    current status, result, or error information. Raises 
-    HTTP 404 if the job is not found.
+    recheck: float = __recheck_interval(15.0)
+
+    with job_events.subscribe(event_id) as queue:
+        async with AsyncSessionLocal() as db:
+            job: dict | None = await JobRepository.get(db, event_id)
+
+        if not job:
+            return
+
+        if job["status"] in TERMINAL_STATUSES:
+            yield __sse("status", job)
+            return
+
+        progress: dict | None = job["progress"]
+
+        yield __sse(
+            "snapshot", 
+            {"status": job["status"], "progress": progress}
+        )
+
+        while True:
+            try:
+                kind, data = await asyncio.wait_for(queue.get(), recheck)
+
+            except TimeoutError:
+                kind, data = "timeout", {}
+
+            if kind in ("changed", "timeout"):
+                async with AsyncSessionLocal() as db:
+                    job = await JobRepository.get(db, event_id)
+
+                if not job:
+                    return
+
+                if job["status"] in TERMINAL_STATUSES:
+                    yield __sse("status", job)
+                    return
+
+                if job["progress"] != progress:
+                    progress = job["progress"]
+
+                    yield __sse(
+                        "snapshot", 
+                        {"status": job["status"], "progress": progress}
+                    )
+
+                elif kind == "timeout":
+                    yield ": keepalive\n\n"
+
+                continue
+
+            yield __sse(kind, data)
+
+            if kind == "status" and data["status"] in TERMINAL_STATUSES:
+                return
+
+
+@app.get("/event/{event_id}/stream")
+async def stream_event(
+        event_id: str
+    ) -> StreamingResponse:
+    """
+    Stream the events of a job with Server-Sent Events.
+
+    The stream opens with a `snapshot` event (the current status 
+    and progress of the job), then forwards as they happen:
+
+    - `status`: status changes. The last one holds the whole job, 
+      as returned by the polling endpoint, and closes the stream.
+    - `search`: the stores a search started on.
+    - `store`: a store whose search completed, with its records.
+    - `token`: a piece of the final answer of the agent.
+
+    Jobs run by other processes (e.g. external workers) only 
+    produce a `snapshot` event each time their stored progress 
+    changes and their final `status`. The job is read again when 
+    another process notifies a change (on PostgreSQL) or, without 
+    notifications, every `WORKER_POLL_INTERVAL` seconds.
 
     Parameters
     ----------
     event_id : str
-        The ID of the event/job to retrieve.
+        The ID of the event/job to stream.
 
     Returns
     -------
-    dict
-        Dictionary containing job details including status, 
-        result, and timestamps.
-    """
+    StreamingResponse
+        The `text/event-stream` response.
 
-    job: dict | None = None
+    Raises
+    ------
+    HTTPException
+        With status 404 if the job is not found.
+    """
 
     async with AsyncSessionLocal() as db:
-        job = await JobRepository.get(
-            db,
-            event_id
-        )
+        job: dict | None = await JobRepository.get(db, event_id)
 
     if not job:
         raise HTTPException(
             status_code = 404,
             detail = "Event not found"
         )
-    
-    return job
+
+    return StreamingResponse(
+        __job_stream(event_id),
+        media_type = "text/event-stream",
+        headers = {
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/metrics")
+async def get_metrics() -> dict:
+    """
+    Retrieve the in-process metrics of the server.
+
+    Exposes counters, gauges and summaries collected since the 
+    server started, such as the attempts and hits of each 
+    search tier, and the current limits of each store site.
+
+    Returns
+    -------
+    dict
+        Snapshot of all metrics, grouped by kind, and the limits 
+        of the provider governor under `providers`.
+    """
+
+    return {
+        **metrics.snapshot(),
+        "providers": provider_governor.snapshot()
+    }
 
 
 async def start_server(
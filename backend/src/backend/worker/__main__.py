@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import sys
+
+from backend.backend_utils.common import JobLane
+from backend.backend_utils.computer_use import runtime
+from backend.backend_utils.computer_use.promotion import (
+    load_promoted_providers
+)
+from backend.backend_utils.jobs import JobWorker
+from backend.config import settings
+
+
+logging.basicConfig(
+    level = settings.LOG_LEVEL,
+    format = "%(levelname)s | %(asctime)s | %(message)s",
+    datefmt = "%Y-%m-%d %H:%M:%S"
+)
+logger = logging.getLogger("agent-worker")
+
+
+async def main() -> int:
+    """
+    Validate configuration and run a job worker.
+
+    The worker claims the jobs queued by servers started with 
+    `JOB_EXECUTION=external` and runs them until interrupted. 
+    Several workers, on one or more nodes, can share the same 
+    database.
+
+    Returns
+    -------
+    int
+        Exit code. 0 if successful, 1 if configuration errors or 
+        worker errors occur.
+    """
+
+    logger.info("initializing Agentic Job Worker...")
+
+    is_valid: bool = False
+    errors: list[str] = []
+
+    is_valid, errors = settings.validate()
+
+    if not is_valid:
+        logger.error("configuration errors found:")
+
+        for err in errors:
+            logger.error(f"   - {err}")
+
+        logger.info("please edit your .env file to fix these issues.")
+        return 1
+
+    logger.info("configuration validated and loaded")
+
+    if settings.LEARNED_PROVIDERS_ENABLED:
+        try:
+            loaded: int = await load_promoted_providers()
+            logger.info(f"loaded {loaded} learned provider(s)")
+
+        except Exception as e:
+            logger.warning(f"could not load learned providers: {e}")
+
+    worker: JobWorker = JobWorker({
+        JobLane.HEAVY: settings.JOB_HEAVY_WORKERS,
+        JobLane.LIGHT: settings.JOB_LIGHT_WORKERS
+    })
+
+    try:
+        await worker.run()
+
+    except Exception as e:
+        logger.exception(f"worker error: {e}")
+        return 1
+
+    finally:
+        await runtime.aclose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = asyncio.run(main())
+
+    except KeyboardInterrupt:
+        logger.info("shutdown requested by user")
+        exit_code = 0
+
+    sys.exit(exit_code)
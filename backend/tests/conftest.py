@@ -0,0 +1,49 @@
+import os
+import tempfile
+from typing import AsyncIterator
+
+from cryptography.fernet import Fernet
+
+
+# the settings are read when `backend.config` is first imported:
+# the tests run on a throwaway SQLite database
+os.environ["DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/backend-tests.db"
+)
+os.environ.setdefault("SECRET_KEY", Fernet.generate_key().decode())
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import models  # noqa: F401 (registers the tables)
+from backend.database.base import Base
+from backend.database.engine import AsyncSessionLocal, engine
+
+
+@pytest.fixture(autouse = True)
+async def database() -> AsyncIterator[None]:
+    """
+    Create the tables before each test and drop them after it.
+    """
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+
+    # pooled connections belong to the test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    """
+    A session of the test database.
+    """
+
+    async with AsyncSessionLocal() as session:
+        yield session
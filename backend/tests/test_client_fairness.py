@@ -0,0 +1,147 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import KeyedSemaphore
+from backend.database.models.job import Job
+from backend.database.repositories import (
+    ClientRepository,
+    JobRepository
+)
+
+from shared.shared_utils.common import JobStatus
+
+
+WORKER: str = "worker-1"
+PAYLOAD: dict = {"type": "chat"}
+
+
+async def test_keyed_semaphore_limits_each_key() -> None:
+    semaphore: KeyedSemaphore = KeyedSemaphore("test", 2)
+    running: dict[str, int] = {"a": 0, "b": 0}
+    peaks: dict[str, int] = {"a": 0, "b": 0}
+
+    async def hold(
+            key: str
+        ) -> None:
+        async with semaphore.hold(key):
+            running[key] += 1
+            peaks[key] = max(peaks[key], running[key])
+            await asyncio.sleep(0.01)
+            running[key] -= 1
+
+    await asyncio.gather(*(hold(key) for key in "aaaaabbb"))
+
+    assert peaks == {"a": 2, "b": 2}
+
+    # unused keys are dropped
+    assert semaphore._semaphores == {}
+    assert semaphore._users == {}
+
+
+async def __submit(
+        db: AsyncSession,
+        client_id: str,
+        count: int
+    ) -> None:
+    """
+    Create pending jobs of a client.
+    """
+
+    await ClientRepository.get_or_create_client(db, client_id)
+
+    for _ in range(count):
+        await JobRepository.create_job(
+            db,
+            client_id,
+            None,
+            lane = "heavy",
+            payload = PAYLOAD
+        )
+
+    await db.commit()
+
+
+async def __claim(
+        db: AsyncSession,
+        client_running: int | None = None
+    ) -> str | None:
+    """
+    Claim the next job and return its client.
+    """
+
+    job: Job | None = await JobRepository.claim_next(
+        db,
+        WORKER,
+        ["heavy"],
+        lease_seconds = 60,
+        client_running = client_running
+    )
+    await db.commit()
+
+    return job.client_id if job else None
+
+
+async def test_claims_alternate_between_clients(
+        db: AsyncSession
+    ) -> None:
+    # the first client submits its burst before the second one
+    await __submit(db, "client-1", 3)
+    await __submit(db, "client-2", 2)
+
+    assert [await __claim(db) for _ in range(5)] == [
+        "client-1",
+        "client-2",
+        "client-1",
+        "client-2",
+        "client-1"
+    ]
+
+
+async def test_claims_skip_clients_at_their_running_cap(
+        db: AsyncSession
+    ) -> None:
+    await __submit(db, "client-1", 3)
+
+    assert await __claim(db, client_running = 2) == "client-1"
+    assert await __claim(db, client_running = 2) == "client-1"
+    assert await __claim(db, client_running = 2) is None
+
+    await __submit(db, "client-2", 1)
+
+    assert await __claim(db, client_running = 2) == "client-2"
+    assert await JobRepository.count_pending(
+        db,
+        "heavy",
+        "client-1"
+    ) == 1
+
+
+async def test_claims_ignore_jobs_of_other_lanes_and_owners(
+        db: AsyncSession
+    ) -> None:
+    await __submit(db, "client-1", 1)
+
+    job_id: str = await JobRepository.create_job(
+        db,
+        "client-1",
+        None,
+        lane = "heavy",
+        payload = PAYLOAD,
+        owner_id = "server-1",
+        lease_seconds = 60
+    )
+    await db.commit()
+
+    assert await JobRepository.claim_next(
+        db,
+        WORKER,
+        ["light"],
+        lease_seconds = 60
+    ) is None
+    assert await __claim(db) == "client-1"
+    assert await __claim(db) is None
+
+    job: Job = await db.get(Job, job_id)
+
+    assert job.status == JobStatus.PENDING
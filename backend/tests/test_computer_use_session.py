@@ -0,0 +1,64 @@
+from google.genai.types import FunctionResponse
+
+from backend.backend_utils.computer_use.session import (
+    ComputerUseSession,
+    OUTDATED_SNAPSHOT
+)
+
+
+def __snapshots(
+        session: ComputerUseSession
+    ) -> list[str]:
+    """
+    Return the text snapshots still carried by a session.
+    """
+
+    snapshots: list[str] = []
+
+    for content in session.contents:
+        for part in content.parts or []:
+            if part.text and part.text.startswith("snapshot"):
+                snapshots.append(part.text)
+
+            response: dict = (
+                part.function_response.response or {}
+                if part.function_response else {}
+            )
+
+            if str(response.get("page", "")).startswith("snapshot"):
+                snapshots.append(response["page"])
+
+    return snapshots
+
+
+def test_only_the_latest_snapshot_is_kept() -> None:
+    session: ComputerUseSession = ComputerUseSession(
+        "find MX-5521",
+        initial_snapshot = "snapshot 0"
+    )
+
+    for turn in range(1, 4):
+        session.add_function_responses([
+            FunctionResponse(name = "click_element", response = {"url": "u"}),
+            FunctionResponse(
+                name = "type_into_element",
+                response = {"url": "u", "page": f"snapshot {turn}"}
+            )
+        ])
+
+        assert __snapshots(session) == [f"snapshot {turn}"]
+
+    assert session.contents[0].parts[1].text == OUTDATED_SNAPSHOT
+
+
+def test_responses_without_snapshot_keep_the_previous_one() -> None:
+    session: ComputerUseSession = ComputerUseSession(
+        "find MX-5521",
+        initial_snapshot = "snapshot 0"
+    )
+
+    session.add_function_responses([
+        FunctionResponse(name = "save_product", response = {"ok": True})
+    ])
+
+    assert __snapshots(session) == ["snapshot 0"]
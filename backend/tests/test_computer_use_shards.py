@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from backend.agent import agent_tools
+from backend.backend_utils.common import KeyedSemaphore
+from backend.backend_utils.governor import ProviderGovernor
+
+
+STORE_URL: str = "https://shards.example.it"
+CLIENT_ID: str = "client-1"
+
+
+async def __run_shards(
+        monkeypatch: pytest.MonkeyPatch,
+        client_pages: int,
+        store_pages: int,
+        shards: int
+    ) -> tuple[list[list[dict[str, str]]], int]:
+    """
+    Run shards from a search holding one page slot, with a fake
+    session, and return their results and the peak of concurrent
+    sessions.
+    """
+
+    running: int = 0
+    peak: int = 0
+
+    async def session(
+            provider_url: str,
+            page: object,
+            products: list[str],
+            limit_per_product: int,
+            learner: object,
+            own_page: bool = False
+        ) -> list[dict[str, str]]:
+        nonlocal running, peak
+
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+        return [{"name": products[0]}]
+
+    semaphore: KeyedSemaphore = KeyedSemaphore("client_pages", client_pages)
+    governor: ProviderGovernor = ProviderGovernor()
+
+    monkeypatch.setitem(
+        agent_tools.__dict__,
+        "__run_computer_use_session",
+        session
+    )
+    monkeypatch.setattr(agent_tools, "_client_pages", semaphore)
+    monkeypatch.setattr(agent_tools, "provider_governor", governor)
+
+    run_shards = agent_tools.__dict__["__run_computer_use_shards"]
+    domain: str = agent_tools.normalize_domain(STORE_URL)
+
+    async with (
+        semaphore.hold(CLIENT_ID),
+        governor.page(domain, max_pages = store_pages)
+    ):
+        results: list[list[dict[str, str]]] = await asyncio.wait_for(
+            run_shards(
+                STORE_URL,
+                None,
+                [[f"p{i}"] for i in range(shards)],
+                1,
+                None,
+                CLIENT_ID
+            ),
+            timeout = 5
+        )
+
+    return results, peak
+
+
+async def test_shards_take_page_slots(
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    results, peak = await __run_shards(
+        monkeypatch,
+        client_pages = 2,
+        store_pages = 4,
+        shards = 5
+    )
+
+    assert results == [[{"name": f"p{i}"}] for i in range(5)]
+    assert peak == 2
+
+
+async def test_shards_do_not_deadlock_without_free_slots(
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    results, peak = await __run_shards(
+        monkeypatch,
+        client_pages = 4,
+        store_pages = 1,
+        shards = 3
+    )
+
+    assert len(results) == 3
+    assert peak == 1
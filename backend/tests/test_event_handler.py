@@ -0,0 +1,173 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import (
+    GenericFakeChatModel
+)
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage
+)
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.agent import main_agent
+from backend.agent.checkpointer import checkpointer
+from backend.backend_utils.events.handler import EventHandler
+from backend.database.repositories import (
+    ChatRepository,
+    ClientRepository,
+    MessageRepository
+)
+
+from shared.events.chat import ChatMessageEvent
+from shared.events.clear import ClearChatMessagesEvent
+from shared.events.metadata import (
+    BaseMetadata,
+    StoreMetadata
+)
+
+
+CLIENT_ID: str = "client-1"
+CHAT_ID: str = "chat-1"
+
+
+async def test_clear_chat_deletes_messages_and_checkpoints(
+        db: AsyncSession
+    ) -> None:
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    await ChatRepository.get_or_create_chat(db, CHAT_ID, CLIENT_ID)
+    await MessageRepository.save_message(
+        db,
+        CLIENT_ID,
+        CHAT_ID,
+        "user",
+        "ciao"
+    )
+    await db.commit()
+
+    config: dict = {"configurable": {"thread_id": CHAT_ID}}
+
+    await checkpointer.aput(config, empty_checkpoint(), {}, {})
+
+    assert await checkpointer.aget_tuple(config) is not None
+
+    result: dict = await EventHandler.handle_event(
+        db,
+        ClearChatMessagesEvent(metadata = BaseMetadata(chat_id = CHAT_ID)),
+        CLIENT_ID
+    )
+
+    assert result["success"] is True
+    assert await MessageRepository.get_all_messages(
+        db,
+        CLIENT_ID,
+        CHAT_ID
+    ) == []
+    assert await checkpointer.aget_tuple(config) is None
+
+
+class FakeChatModel(GenericFakeChatModel):
+    """
+    Chat model replaying canned answers, with tools ignored. The 
+    messages of each call are kept in `inputs`.
+    """
+
+    inputs: list[list[BaseMessage]] = []
+
+    def bind_tools(
+            self,
+            tools: list,
+            **kwargs
+        ) -> "FakeChatModel":
+        return self
+
+
+    def astream(
+            self,
+            input: list[BaseMessage],
+            *args,
+            **kwargs
+        ):
+        self.inputs.append(list(input))
+
+        return super().astream(input, *args, **kwargs)
+
+
+async def __send(
+        db: AsyncSession,
+        content: str
+    ) -> dict:
+    """
+    Send a chat message of the user.
+    """
+
+    result: dict = await EventHandler.handle_event(
+        db,
+        ChatMessageEvent(
+            role = "user",
+            content = content,
+            metadata = StoreMetadata(
+                chat_id = CHAT_ID,
+                selected_stores = [],
+                selected_external_store_urls = []
+            )
+        ),
+        CLIENT_ID
+    )
+    await db.commit()
+
+    return result
+
+
+async def test_chat_turn_is_answered_and_checkpointed(
+        db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    monkeypatch.setattr(
+        main_agent,
+        "llm",
+        FakeChatModel(messages = iter([AIMessage(content = "Ciao!")]))
+    )
+
+    result: dict = await __send(db, "ciao")
+
+    assert result["content"] == "Ciao!"
+    assert [
+        (m.role, m.content)
+        for m in await MessageRepository.get_all_messages(
+            db,
+            CLIENT_ID,
+            CHAT_ID
+        )
+    ] == [("user", "ciao"), ("assistant", "Ciao!")]
+    assert await checkpointer.aget_tuple(
+        {"configurable": {"thread_id": CHAT_ID}}
+    ) is not None
+
+
+async def test_current_message_is_sent_to_the_model_once(
+        db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    model: FakeChatModel = FakeChatModel(
+        messages = iter([
+            AIMessage(content = "Ciao!"),
+            AIMessage(content = "Certo.")
+        ])
+    )
+    monkeypatch.setattr(main_agent, "llm", model)
+
+    await __send(db, "ciao")
+    await __send(db, "cerca un mouse")
+
+    # the system prompt comes first
+    assert [
+        (type(m), m.text) for m in model.inputs[0][1:]
+    ] == [(HumanMessage, "ciao")]
+    assert [
+        (type(m), m.text) for m in model.inputs[1][1:]
+    ] == [
+        (HumanMessage, "ciao"),
+        (AIMessage, "Ciao!"),
+        (HumanMessage, "cerca un mouse")
+    ]
@@ -0,0 +1,108 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import JobLane
+from backend.backend_utils.jobs import JobScheduler
+from backend.database.models.job import Job
+from backend.database.repositories import (
+    ClientRepository,
+    JobRepository
+)
+
+from shared.shared_utils.common import JobStatus
+
+
+CLIENT_ID: str = "client-1"
+WORKER: str = "worker-1"
+PAYLOAD: dict = {"type": "chat"}
+
+
+async def test_cancelled_job_is_not_started(
+        db: AsyncSession
+    ) -> None:
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    job_id: str = await JobRepository.create_job(
+        db,
+        CLIENT_ID,
+        None,
+        lane = "heavy",
+        payload = PAYLOAD,
+        owner_id = WORKER,
+        lease_seconds = 60
+    )
+    await db.commit()
+
+    assert await JobRepository.set_cancelled(db, job_id)
+    await db.commit()
+
+    assert not await JobRepository.set_running(db, job_id, WORKER, 60)
+    await db.commit()
+
+    job: Job = await db.get(Job, job_id, populate_existing = True)
+
+    assert job.status == JobStatus.CANCELLED
+    assert job.attempts == 0
+
+
+async def test_started_job_counts_one_attempt(
+        db: AsyncSession
+    ) -> None:
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    job_id: str = await JobRepository.create_job(
+        db,
+        CLIENT_ID,
+        None,
+        lane = "heavy",
+        payload = PAYLOAD,
+        owner_id = WORKER,
+        lease_seconds = 60
+    )
+    await db.commit()
+
+    assert await JobRepository.set_running(db, job_id, WORKER, 60)
+    # a job claimed by a worker is already running
+    assert await JobRepository.set_running(db, job_id, WORKER, 60)
+    await db.commit()
+
+    job: Job = await db.get(Job, job_id, populate_existing = True)
+
+    assert job.status == JobStatus.RUNNING
+    assert job.owner_id == WORKER
+    assert job.attempts == 1
+
+
+async def test_removed_job_frees_its_queue_slots() -> None:
+    scheduler: JobScheduler = JobScheduler(
+        {JobLane.HEAVY: (1, 2)},
+        client_running = 1,
+        client_queue_size = 2
+    )
+    ran: list[str] = []
+
+    def runner(
+            job_id: str
+        ):
+        async def run() -> None:
+            ran.append(job_id)
+
+        return run
+
+    scheduler.submit(JobLane.HEAVY, "job-1", runner("job-1"), CLIENT_ID)
+    scheduler.submit(JobLane.HEAVY, "job-2", runner("job-2"), CLIENT_ID)
+
+    assert not scheduler.has_capacity(JobLane.HEAVY, CLIENT_ID)
+
+    assert scheduler.remove("job-1")
+    assert not scheduler.remove("job-1")
+    assert scheduler.has_capacity(JobLane.HEAVY, CLIENT_ID)
+
+    assert scheduler.remove("job-2")
+    assert scheduler.retry_after(JobLane.HEAVY, CLIENT_ID) == 1
+
+    scheduler.submit(JobLane.HEAVY, "job-3", runner("job-3"), CLIENT_ID)
+    scheduler.start()
+    await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+    assert ran == ["job-3"]
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.background.job_reaper import reap_lost_jobs
+from backend.config import settings
+from backend.database.models.job import Job
+from backend.database.repositories import (
+    ClientRepository,
+    JobRepository
+)
+
+from shared.shared_utils.common import JobStatus
+
+
+CLIENT_ID: str = "client-1"
+WORKER: str = "worker-1"
+CRASHED: str = "worker-2"
+PAYLOAD: dict = {"type": "chat"}
+
+
+async def __running_job(
+        db: AsyncSession,
+        owner_id: str,
+        payload: dict | None = PAYLOAD
+    ) -> Job:
+    """
+    Create a job and let an owner claim it.
+    """
+
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    job_id: str = await JobRepository.create_job(
+        db,
+        CLIENT_ID,
+        None,
+        lane = "heavy",
+        payload = payload
+    )
+    job: Job = await db.get(Job, job_id)
+
+    job.status = JobStatus.RUNNING
+    job.owner_id = owner_id
+    job.attempts = 1
+    job.lease_expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds = 60
+    )
+    await db.commit()
+
+    return job
+
+
+async def __expire(
+        db: AsyncSession,
+        job: Job
+    ) -> None:
+    """
+    Let the lease of a job expire.
+    """
+
+    job.lease_expires_at = datetime.now(timezone.utc) - timedelta(
+        seconds = 1
+    )
+    await db.commit()
+
+
+async def test_claimed_job_is_leased_to_its_worker(
+        db: AsyncSession
+    ) -> None:
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    job_id: str = await JobRepository.create_job(
+        db,
+        CLIENT_ID,
+        None,
+        lane = "heavy",
+        payload = PAYLOAD
+    )
+    await db.commit()
+
+    job: Job | None = await JobRepository.claim_next(
+        db,
+        WORKER,
+        ["heavy"],
+        lease_seconds = 60
+    )
+    await db.commit()
+
+    assert job is not None and job.id == job_id
+    assert job.status == JobStatus.RUNNING
+    assert job.attempts == 1
+    assert await JobRepository.claim_next(
+        db,
+        CRASHED,
+        ["heavy"],
+        lease_seconds = 60
+    ) is None
+
+    # only the owner renews the lease
+    assert await JobRepository.heartbeat(
+        db,
+        job_id,
+        WORKER,
+        60
+    ) == JobStatus.RUNNING
+    assert await JobRepository.heartbeat(db, job_id, CRASHED, 60) is None
+
+
+async def test_only_expired_leases_of_other_owners_are_locked(
+        db: AsyncSession
+    ) -> None:
+    await __running_job(db, CRASHED)
+    own: Job = await __running_job(db, WORKER)
+    lost: Job = await __running_job(db, CRASHED)
+
+    lost_id: str = lost.id
+
+    await __expire(db, own)
+    await __expire(db, lost)
+
+    assert [
+        job.id for job in await JobRepository.lock_expired(db, WORKER)
+    ] == [lost_id]
+
+
+async def test_reaper_requeues_lost_jobs_and_fails_exhausted_ones(
+        db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    monkeypatch.setattr(settings, "JOB_EXECUTION", "external")
+
+    requeued: Job = await __running_job(db, CRASHED)
+    exhausted: Job = await __running_job(db, CRASHED)
+    without_payload: Job = await __running_job(db, CRASHED, None)
+
+    exhausted.attempts = settings.JOB_MAX_ATTEMPTS
+
+    job_ids: list[str] = [
+        requeued.id,
+        exhausted.id,
+        without_payload.id
+    ]
+
+    for job in (requeued, exhausted, without_payload):
+        await __expire(db, job)
+
+    assert await reap_lost_jobs() == 3
+
+    db.expire_all()
+
+    job: Job = await db.get(Job, job_ids[0])
+
+    assert job.status == JobStatus.PENDING
+    assert job.owner_id is None
+    assert job.lease_expires_at is None
+
+    for job_id in job_ids[1:]:
+        job = await db.get(Job, job_id)
+
+        # like a job whose event raised: the error event is its result
+        assert job.error.startswith("Job lost")
+        assert job.result["type"] == "error.event"
+
+    # the requeued job is claimed again, as a new attempt
+    job = await JobRepository.claim_next(
+        db,
+        WORKER,
+        ["heavy"],
+        lease_seconds = 60
+    )
+
+    assert job.id == job_ids[0]
+    assert job.attempts == 2
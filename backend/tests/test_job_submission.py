@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.database.models.job import Job
+from backend.database.repositories import (
+    ChatRepository,
+    ClientRepository,
+    JobRepository
+)
+from backend.server import rest_server
+
+from shared.events.clear import ClearChatMessagesEvent
+from shared.events.metadata import BaseMetadata
+from shared.events.transport import EventEnvelope
+
+
+CLIENT_ID: str = "client-1"
+CHAT_ID: str = "chat-1"
+KEY: str = "submission-1"
+
+
+@pytest.fixture(autouse = True)
+def external_jobs(
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    """
+    Leave the submitted jobs to the workers.
+    """
+
+    monkeypatch.setattr(settings, "JOB_EXECUTION", "external")
+
+
+def __envelope() -> EventEnvelope:
+    """
+    Return an envelope with the idempotency key.
+    """
+
+    return EventEnvelope(
+        client_id = CLIENT_ID,
+        event = ClearChatMessagesEvent(
+            metadata = BaseMetadata(chat_id = CHAT_ID)
+        ),
+        idempotency_key = KEY
+    )
+
+
+async def __create_job(
+        db: AsyncSession
+    ) -> str:
+    """
+    Create a job with the idempotency key.
+    """
+
+    await ClientRepository.get_or_create_client(db, CLIENT_ID)
+    await ChatRepository.get_or_create_chat(db, CHAT_ID, CLIENT_ID)
+
+    job_id: str = await JobRepository.create_job(
+        db,
+        CLIENT_ID,
+        CHAT_ID,
+        idempotency_key = KEY
+    )
+    await db.commit()
+
+    return job_id
+
+
+async def test_resent_envelopes_return_the_existing_job(
+        db: AsyncSession
+    ) -> None:
+    first: dict[str, str] = await rest_server.create_event_job(__envelope())
+    second: dict[str, str] = await rest_server.create_event_job(__envelope())
+
+    assert first["job_id"] == second["job_id"]
+    assert await db.get(Job, first["job_id"]) is not None
+
+
+async def test_key_inserted_by_another_process_returns_its_job(
+        db: AsyncSession
+    ) -> None:
+    job_id: str = await __create_job(db)
+
+    # the lookup of this process ran before the other insert
+    submit = rest_server.__dict__["__submit_event"]
+    result: dict[str, str] = await submit(__envelope())
+
+    assert result["job_id"] == job_id
+
+
+async def test_key_is_used_again_after_the_window(
+        db: AsyncSession
+    ) -> None:
+    job_id: str = await __create_job(db)
+    job: Job = await db.get(Job, job_id)
+    job.created_at = datetime.now(timezone.utc) - timedelta(
+        seconds = settings.IDEMPOTENCY_WINDOW + 1
+    )
+    await db.commit()
+
+    result: dict[str, str] = await rest_server.create_event_job(__envelope())
+
+    assert result["job_id"] != job_id
+
+    await db.refresh(job)
+
+    assert job.idempotency_key is None
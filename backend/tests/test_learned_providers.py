@@ -0,0 +1,57 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.backend_utils.common import LearnedProviderStatus
+from backend.database.repositories import LearnedProviderRepository
+
+
+DOMAIN: str = "store.it"
+
+
+async def __record(
+        db: AsyncSession,
+        *outcomes: bool
+    ) -> LearnedProviderStatus | None:
+    """
+    Record validation outcomes and return the last status.
+    """
+
+    status: LearnedProviderStatus | None = None
+
+    for success in outcomes:
+        status = await LearnedProviderRepository.record_validation(
+            db,
+            DOMAIN,
+            success,
+            promotion_threshold = 2,
+            demotion_threshold = 3
+        )
+
+    return status
+
+
+async def test_candidate_is_promoted_then_rejected_by_failures_in_a_row(
+        db: AsyncSession
+    ) -> None:
+    await LearnedProviderRepository.upsert_candidate(db, DOMAIN, {})
+
+    assert await __record(db, True) == LearnedProviderStatus.CANDIDATE
+    assert await __record(db, True) == LearnedProviderStatus.PROMOTED
+
+    # a success between failures resets the count
+    assert await __record(
+        db,
+        False,
+        False,
+        True,
+        False,
+        False
+    ) == LearnedProviderStatus.PROMOTED
+    assert await __record(db, False) == LearnedProviderStatus.REJECTED
+
+
+async def test_candidate_is_rejected_by_one_failed_validation(
+        db: AsyncSession
+    ) -> None:
+    await LearnedProviderRepository.upsert_candidate(db, DOMAIN, {})
+
+    assert await __record(db, True, False) == LearnedProviderStatus.REJECTED
@@ -0,0 +1,102 @@
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    ToolMessage
+)
+
+from backend.agent.main_agent import route_after_search
+from backend.backend_utils.quotes import dump_entries, QuoteRecord
+
+
+RECORD: QuoteRecord = QuoteRecord(
+    provider = "store.it",
+    query = "MX-5521",
+    title = "MX-5521",
+    price = "10,00 €",
+    amount = 10.0,
+    currency = "EUR",
+    availability = "available",
+    source = "scripted"
+)
+
+
+def __state(
+        question: str,
+        tool: str,
+        records: list[QuoteRecord]
+    ) -> dict:
+    """
+    Return a graph state ending with the output of one tool call.
+    """
+
+    return {
+        "messages": [
+            HumanMessage(content = question),
+            AIMessage(
+                content = "",
+                tool_calls = [{
+                    "id": "call-1",
+                    "name": tool,
+                    "args": {"products": ["MX-5521"]}
+                }]
+            ),
+            ToolMessage(
+                content = "results",
+                name = tool,
+                tool_call_id = "call-1",
+                artifact = dump_entries(records)
+            )
+        ]
+    }
+
+
+def __route(
+        state: dict,
+        render_mode: str = "auto"
+    ) -> str:
+    """
+    Route a state with the given rendering mode.
+    """
+
+    return route_after_search(
+        state,
+        {"configurable": {"render_mode": render_mode}}
+    )
+
+
+def test_fresh_search_results_are_rendered() -> None:
+    state: dict = __state("Cerca MX-5521", "search_products", [RECORD])
+
+    assert __route(state) == "render"
+    assert __route(state, "llm") == "agent"
+
+
+def test_messages_of_unknown_language_go_back_to_the_model() -> None:
+    state: dict = __state("MX-5521", "search_products", [RECORD])
+
+    assert __route(state) == "agent"
+    assert __route(state, "template") == "render"
+
+
+def test_questions_go_back_to_the_model() -> None:
+    state: dict = __state(
+        "Quale conviene?",
+        "search_products",
+        [RECORD]
+    )
+
+    assert __route(state) == "agent"
+    assert __route(state, "template") == "render"
+
+
+def test_searches_without_records_go_back_to_the_model() -> None:
+    state: dict = __state("MX-5521", "search_products", [])
+
+    assert __route(state, "template") == "agent"
+
+
+def test_recalled_results_go_back_to_the_model() -> None:
+    state: dict = __state("MX-5521", "recall_search_results", [RECORD])
+
+    assert __route(state) == "agent"
+    assert __route(state, "template") == "agent"
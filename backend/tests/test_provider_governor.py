@@ -0,0 +1,207 @@
+import asyncio
+import time
+from importlib import import_module
+from types import SimpleNamespace
+
+import pytest
+
+from backend.backend_utils.governor import ProviderGovernor
+
+
+# the package exports the `provider_governor` instance under the
+# name of its module
+governor_module = import_module(
+    "backend.backend_utils.governor.provider_governor"
+)
+
+DOMAIN: str = "store.it"
+
+
+async def __fail(
+        governor: ProviderGovernor
+    ) -> None:
+    """
+    Run a failing request.
+    """
+
+    with pytest.raises(RuntimeError):
+        async with governor.request(DOMAIN):
+            raise RuntimeError("503")
+
+
+def __end_cooldown(
+        governor: ProviderGovernor
+    ) -> None:
+    """
+    Let the next failure lower the limits again.
+    """
+
+    governor.limits(DOMAIN).decreased_at -= 60
+
+
+async def test_pages_are_capped() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 2, requests_per_second = 100)
+
+    open_pages: int = 0
+    peak: int = 0
+
+    async def search() -> None:
+        nonlocal open_pages, peak
+
+        async with governor.page(DOMAIN):
+            open_pages += 1
+            peak = max(peak, open_pages)
+            await asyncio.sleep(0.01)
+            open_pages -= 1
+
+    await asyncio.gather(*(search() for _ in range(6)))
+
+    assert peak == 2
+    assert governor.snapshot()[DOMAIN]["pages"] == 0
+
+
+async def test_requests_are_paced() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 1, requests_per_second = 20)
+
+    started: float = time.monotonic()
+
+    for _ in range(5):
+        async with governor.request(DOMAIN):
+            pass
+
+    # the first request starts at once, the next 4 are 50 ms apart
+    assert time.monotonic() - started >= 0.19
+
+
+async def test_failures_halve_the_limits_once_per_cooldown() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 8, requests_per_second = 100)
+
+    for _ in range(3):
+        await __fail(governor)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 4
+    assert governor.snapshot()[DOMAIN]["requests_per_second"] == 50
+
+    __end_cooldown(governor)
+    await __fail(governor)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 2
+
+    for _ in range(3):
+        __end_cooldown(governor)
+        await __fail(governor)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 1
+
+
+async def test_slow_responses_halve_the_limits() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 4, requests_per_second = 100)
+
+    for _ in range(3):
+        async with governor.request(DOMAIN):
+            await asyncio.sleep(0.01)
+
+    async with governor.request(DOMAIN):
+        await asyncio.sleep(0.1)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 2
+
+    # untimed requests never count as slow
+    __end_cooldown(governor)
+
+    async with governor.request(DOMAIN, timed = False):
+        await asyncio.sleep(0.1)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 2
+
+
+async def test_successes_restore_the_limits_additively() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 4, requests_per_second = 1000)
+
+    for _ in range(2):
+        __end_cooldown(governor)
+        await __fail(governor)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 1
+
+    # +1/limit per success: one success from 1 to 2, two from 2 to 3
+    async with governor.request(DOMAIN, timed = False):
+        pass
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 2
+
+    for _ in range(20):
+        async with governor.request(DOMAIN, timed = False):
+            pass
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 4
+    assert governor.snapshot()[DOMAIN]["requests_per_second"] == 1000
+
+
+async def test_waiting_pages_resume_when_the_limit_grows() -> None:
+    governor: ProviderGovernor = ProviderGovernor()
+    governor.limits(DOMAIN, max_pages = 2, requests_per_second = 1000)
+    await __fail(governor)
+
+    assert governor.snapshot()[DOMAIN]["limit"] == 1
+
+    release: asyncio.Event = asyncio.Event()
+
+    async def hold_page() -> None:
+        async with governor.page(DOMAIN):
+            await release.wait()
+
+    holder: asyncio.Task = asyncio.create_task(hold_page())
+    await asyncio.sleep(0)
+
+    waiter: asyncio.Task = asyncio.create_task(hold_page())
+    await asyncio.sleep(0.01)
+
+    assert governor.snapshot()[DOMAIN]["pages"] == 1
+
+    async with governor.request(DOMAIN, timed = False):
+        pass
+
+    await asyncio.sleep(0.01)
+
+    assert governor.snapshot()[DOMAIN]["pages"] == 2
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+
+
+async def test_provider_limits_apply_from_any_first_use(
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    monkeypatch.setattr(
+        governor_module,
+        "all_providers",
+        lambda: [
+            SimpleNamespace(
+                url = "https://www.store.it",
+                max_concurrent_pages = 2,
+                requests_per_second = 5.0
+            )
+        ]
+    )
+    governor: ProviderGovernor = ProviderGovernor()
+
+    # a request before any page of the store
+    async with governor.request(DOMAIN, timed = False):
+        pass
+
+    assert governor.snapshot()[DOMAIN]["max_pages"] == 2
+    assert governor.snapshot()[DOMAIN]["max_requests_per_second"] == 5.0
+
+    # external stores keep the defaults
+    async with governor.request("other.it", timed = False):
+        pass
+
+    assert governor.snapshot()["other.it"]["max_pages"] == (
+        governor_module.settings.PROVIDER_MAX_PAGES
+    )
@@ -0,0 +1,33 @@
+from backend.backend_utils.quotes import make_records, QuoteRecord
+
+
+STORE_URL: str = "https://store.it"
+
+
+def test_records_answer_the_query_reported_by_the_model() -> None:
+    records: list[QuoteRecord] = make_records(
+        STORE_URL,
+        [
+            {"name": "Mouse ottico USB", "query": "MX-5521"},
+            {"name": "Mouse MX-6000", "query": "N/A"},
+            {"name": "Tastiera", "query": "unrelated"}
+        ],
+        ["MX-5521", "Mouse MX-6000", "Monitor 27"]
+    )
+
+    assert [r.query for r in records] == [
+        "MX-5521",
+        "Mouse MX-6000",
+        None
+    ]
+
+
+def test_records_of_a_single_query_answer_it() -> None:
+    records: list[QuoteRecord] = make_records(
+        STORE_URL,
+        [{"name": "Mouse ottico USB", "price": "9,90 €"}],
+        ["MX-5521"]
+    )
+
+    assert records[0].query == "MX-5521"
+    assert records[0].amount == 9.9
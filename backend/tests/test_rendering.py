@@ -0,0 +1,83 @@
+import pytest
+
+from backend.agent.rendering import (
+    detect_language,
+    needs_explanation,
+    render_quotation
+)
+from backend.backend_utils.quotes import ProviderNotice, QuoteRecord
+
+
+@pytest.mark.parametrize("message", [
+    "MX-5521, 8GB-DDR4 2666",
+    "Cerca il prezzo di MX-5521 e dimmi come è disponibile",
+    "Trova un mouse che costi poco",
+    "Voglio una scheda madre come quella dell'altra volta",
+    "Find the cheapest price for a 1TB SSD",
+])
+def test_searches_are_rendered(
+        message: str
+    ) -> None:
+    assert not needs_explanation(message)
+
+
+@pytest.mark.parametrize("message", [
+    "Quanto costa MX-5521?",
+    "Quale conviene tra MX-5521 e MX-6000",
+    "Cerca MX-5521. Come si installa",
+    "Confronta i prezzi di MX-5521 e MX-6000",
+    "Spiegami la differenza tra DDR4 e DDR5",
+    "Which one is better for gaming",
+    "Search MX-5521 and explain the results",
+])
+def test_questions_and_advice_requests_are_explained(
+        message: str
+    ) -> None:
+    assert needs_explanation(message)
+
+
+@pytest.mark.parametrize(("message", "language"), [
+    ("Cerca il prezzo di MX-5521", "it"),
+    ("Trovami una tastiera economica", "it"),
+    ("Find the price of MX-5521", "en"),
+    ("Search for a cheap keyboard", "en"),
+    ("MX-5521, 8GB-DDR4 2666", None),
+])
+def test_language_is_detected_from_common_words(
+        message: str,
+        language: str | None
+    ) -> None:
+    assert detect_language(message) == language
+
+
+def test_quotation_labels_follow_the_language() -> None:
+    record: QuoteRecord = QuoteRecord(
+        provider = "store.it",
+        query = "MX-5521",
+        title = "Mouse MX-5521",
+        price = "10,00 €",
+        amount = 10.0,
+        currency = "EUR",
+        availability = "Disponibile",
+        link = "https://store.it/mx-5521",
+        source = "scripted"
+    )
+
+    italian: str = render_quotation([record], ["MX-5521"], "it")
+    english: str = render_quotation([record], ["MX-5521"])
+
+    assert "| Articolo | Negozio |" in italian
+    assert "[Vedi prodotto](https://store.it/mx-5521)" in italian
+    assert "**Miglior prezzo per articolo**" in italian
+    assert "| Item | Store |" in english
+    assert "**Best price per item**" in english
+    assert render_quotation(
+        [],
+        ["MX-5521"],
+        "it"
+    ) == "Nessun risultato trovato per 'MX-5521'."
+    assert "STORE.IT" in render_quotation(
+        [ProviderNotice(provider = "store.it", message = "Login failed")],
+        ["MX-5521"],
+        "it"
+    )
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from backend.backend_utils.common import SingleFlight
+
+
+async def test_concurrent_calls_share_one_run() -> None:
+    flight: SingleFlight[int] = SingleFlight("test")
+    runs: int = 0
+
+    async def call() -> int:
+        nonlocal runs
+
+        runs += 1
+        await asyncio.sleep(0.01)
+
+        return runs
+
+    results: list[int] = await asyncio.gather(
+        *(flight.do("key", call) for _ in range(5))
+    )
+
+    assert results == [1] * 5
+    assert not flight.in_flight("key")
+
+    # a later call runs again
+    assert await flight.do("key", call) == 2
+
+
+async def test_waiters_receive_the_exception_of_the_run() -> None:
+    flight: SingleFlight[int] = SingleFlight("test")
+
+    async def call() -> int:
+        await asyncio.sleep(0.01)
+
+        raise ValueError("store down")
+
+    results: list = await asyncio.gather(
+        *(flight.do("key", call) for _ in range(3)),
+        return_exceptions = True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+async def test_a_waiter_runs_the_call_when_the_leader_is_cancelled() -> None:
+    flight: SingleFlight[str] = SingleFlight("test")
+    started: asyncio.Event = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+        await asyncio.sleep(0.05)
+
+        return "quotes"
+
+    leader: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    await started.wait()
+
+    waiter: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await waiter == "quotes"
+
+
+async def test_all_waiters_survive_the_cancelled_leader() -> None:
+    flight: SingleFlight[str] = SingleFlight("test")
+    started: asyncio.Event = asyncio.Event()
+    runs: int = 0
+
+    async def call() -> str:
+        nonlocal runs
+
+        runs += 1
+        started.set()
+        await asyncio.sleep(0.05)
+
+        return "quotes"
+
+    leader: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    await started.wait()
+
+    waiters: list[asyncio.Task] = [
+        asyncio.create_task(flight.do("key", call)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == ["quotes"] * 3
+    assert leader.cancelled()
+    assert runs == 2
+
+
+async def test_a_cancelled_waiter_does_not_cancel_the_others() -> None:
+    flight: SingleFlight[str] = SingleFlight("test")
+    started: asyncio.Event = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+        await asyncio.sleep(0.05)
+
+        return "quotes"
+
+    leader: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    await started.wait()
+
+    cancelled: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    waiter: asyncio.Task = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert await asyncio.gather(leader, waiter) == ["quotes"] * 2
@@ -0,0 +1,115 @@
+import pytest
+
+from backend.backend_utils.structured_data import (
+    discovery,
+    extract_products,
+    search_structured_data
+)
+
+
+class FakePage:
+    """
+    Page serving the same HTML for every URL and counting the 
+    navigations.
+    """
+
+    def __init__(
+            self,
+            html: str
+        ):
+        self.html: str = html
+        self.url: str = "about:blank"
+        self.visited: list[str] = []
+
+
+    async def goto(
+            self,
+            url: str,
+            timeout: int | None = None
+        ) -> None:
+        self.url = url
+        self.visited.append(url)
+
+
+    async def wait_for_load_state(
+            self,
+            state: str
+        ) -> None:
+        pass
+
+
+    async def content(
+            self
+        ) -> str:
+        return self.html
+
+
+async def test_store_without_search_is_probed_once() -> None:
+    page: FakePage = FakePage("<html><body>Benvenuti</body></html>")
+
+    assert await search_structured_data(page, "nosearch.it", "MX-5521") == []
+    assert len(page.visited) == 1 + len(discovery.COMMON_SEARCH_PATHS)
+
+    page.visited.clear()
+
+    assert await search_structured_data(page, "nosearch.it", "8GB") == []
+    assert page.visited == []
+
+
+async def test_store_miss_expires(
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+    monkeypatch.setattr(discovery.settings, "STRUCTURED_DATA_MISS_TTL", 0)
+
+    page: FakePage = FakePage("<html><body>Benvenuti</body></html>")
+
+    await search_structured_data(page, "expiring.it", "MX-5521")
+    page.visited.clear()
+    await search_structured_data(page, "expiring.it", "8GB")
+
+    assert page.visited
+
+
+def __json_ld_page(
+        *names: str
+    ) -> str:
+    """
+    Build a page listing products as JSON-LD.
+    """
+
+    products: str = ",".join(
+        '{"@type": "Product", "name": "%s", "url": "/p/%d", '
+        '"offers": {"@type": "Offer", "price": "10.00", '
+        '"priceCurrency": "EUR"}}' % (name, i)
+        for i, name in enumerate(names)
+    )
+
+    return (
+        '<script type="application/ld+json">'
+        f'{{"@graph": [{products}]}}'
+        "</script>"
+    )
+
+
+def test_unrelated_products_are_not_returned() -> None:
+    html: str = __json_ld_page("Cuffie Bluetooth", "Tastiera Meccanica")
+
+    assert extract_products(html, "https://s.it/search", "MX-5521") == []
+    assert extract_products(html, "https://s.it/search", "scarpe nike") == []
+
+
+def test_matching_products_are_ranked_first() -> None:
+    html: str = __json_ld_page(
+        "Mouse Logitech MX Master 3",
+        "Kingston 8GB DDR4 2666MHz",
+        "Kingston 16GB DDR4 3200MHz"
+    )
+
+    products: list[dict[str, str]] = extract_products(
+        html,
+        "https://s.it/search",
+        "8GB DDR4 2666",
+        limit = 3
+    )
+
+    assert [p["name"] for p in products] == ["Kingston 8GB DDR4 2666MHz"]
@@ -1,6 +1,8 @@
 
+import json
 import time
-from typing import Any
+import uuid
+from typing import Any, Callable, Iterator
 
 import requests
 from requests import Response
@@ -10,6 +12,9 @@ from shared.events import Event, ErrorEvent
 from shared.events.transport import EventEnvelope
 
 
+TERMINAL_STATUSES: tuple[str, ...] = ("COMPLETED", "FAILED", "CANCELLED")
+
+
 class RESTClient:
     """
     HTTP client responsible for sending events to the backend and
@@ -21,7 +26,7 @@ class RESTClient:
 
     1. An event is submitted via POST.
     2. A `job_id` is returned.
-    3. The job status is polled until completion or failure.
+    3. The job status is long-polled until completion or failure.
     4. The final result is deserialized into an `Event` instance.
 
     Event deserialization is performed using a Pydantic `TypeAdapter`.
@@ -59,7 +64,9 @@ class RESTClient:
 
     def send_event(
             self,
-            event: Event
+            event: Event,
+            max_retries: int = 3,
+            idempotency_key: str | None = None
         ) -> str | None:
         """
         Send an event to the backend for asynchronous processing.
@@ -69,6 +76,17 @@ class RESTClient:
         event : Event
             The event instance to be sent.
 
+        max_retries : int, default=3
+            Number of times the event is sent again when the 
+            backend queue is full (HTTP 429), after waiting for 
+            the `Retry-After` delay, or when the connection fails.
+
+        idempotency_key : str or None, default=None
+            Key identifying the submission. Every attempt is sent 
+            with the same key, so a retry after a connection error 
+            returns the job created by the first attempt, if any. 
+            A random key is generated if not given.
+
         Returns
         -------
         str or None
@@ -78,26 +96,50 @@ class RESTClient:
         Raises
         ------
         requests.HTTPError
-            If the HTTP request fails.
+            If the HTTP request fails, or if the backend is still 
+            busy after `max_retries` retries.
+
+        requests.ConnectionError
+            If the backend cannot be reached after `max_retries` 
+            retries.
 
         Notes
         -----
         The event is wrapped inside an `EventEnvelope` containing the
-        client identifier before being serialized and sent.
+        client identifier and the idempotency key before being 
+        serialized and sent.
         """
 
         envelope: EventEnvelope = EventEnvelope(
             client_id = self.client_id,
-            event = event
+            event = event,
+            idempotency_key = idempotency_key or uuid.uuid4().hex
         )
 
-        response: Response = requests.post(
-            url = f"{self.base_url}/event",
-            json = envelope.model_dump(
-                serialize_as_any = True, 
-                mode = "json"
+        for attempt in range(max_retries + 1):
+            try:
+                response: Response = requests.post(
+                    url = f"{self.base_url}/event",
+                    json = envelope.model_dump(
+                        serialize_as_any = True, 
+                        mode = "json"
+                    )
+                )
+
+            except requests.ConnectionError:
+                if attempt == max_retries:
+                    raise
+
+                time.sleep(1)
+                continue
+
+            if response.status_code != 429 or attempt == max_retries:
+                break
+
+            retry_after: str = response.headers.get("Retry-After", "1")
+            time.sleep(
+                min(int(retry_after) if retry_after.isdigit() else 1, 30)
             )
-        )
 
         response.raise_for_status()
 
@@ -108,7 +150,9 @@ class RESTClient:
 
     def get_job(
             self,
-            event_id: str
+            event_id: str,
+            wait: float = 0.0,
+            progress: bool = False
         ) -> dict[str, Any]:
         """
         Retrieve the status and result of a previously submitted job.
@@ -118,6 +162,14 @@ class RESTClient:
         event_id : str
             The identifier of the job returned by `send_event`.
 
+        wait : float, default=0.0
+            Seconds the backend may hold the request until the job 
+            completes or fails (at most 60).
+
+        progress : bool, default=False
+            If True, a held request also returns as soon as the 
+            progress of the job changes.
+
         Returns
         -------
         dict[str, Any]
@@ -131,7 +183,12 @@ class RESTClient:
         """
 
         response: Response = requests.get(
-            url = f"{self.base_url}/event/{event_id}"
+            url = f"{self.base_url}/event/{event_id}",
+            params = {
+                "wait": wait, 
+                "progress": str(progress).lower()
+            },
+            timeout = wait + 10
         )
 
         response.raise_for_status()
@@ -139,11 +196,44 @@ class RESTClient:
         return response.json()
     
 
+    def cancel_job(
+            self,
+            event_id: str
+        ) -> bool:
+        """
+        Cancel a previously submitted job, releasing the browsers 
+        and model calls it holds on the backend.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the job returned by `send_event`.
+
+        Returns
+        -------
+        bool
+            True if the job is cancelled, False if it had already 
+            finished or the request failed.
+        """
+
+        try:
+            response: Response = requests.delete(
+                url = f"{self.base_url}/event/{event_id}",
+                timeout = 10
+            )
+
+        except requests.RequestException:
+            return False
+
+        return response.ok
+    
+
     def send_and_wait(
             self,
             event: Event,
-            poll_interval: float = 0.5,
-            timeout: float = 120.0
+            wait: float = 30.0,
+            timeout: float = 120.0,
+            on_progress: Callable[[dict[str, Any]], None] | None = None
         ) -> Event:
         """
         Send an event and block until the corresponding 
@@ -154,13 +244,18 @@ class RESTClient:
         event : Event
             The event to be sent to the backend.
 
-        poll_interval : float, default=0.5
-            Time interval (in seconds) between successive 
-            polling attempts.
+        wait : float, default=30.0
+            Maximum time (in seconds) each status request is held 
+            by the backend while the job runs.
 
         timeout : float, default=120.0
             Maximum time (in seconds) to wait for job completion.
 
+        on_progress : callable or None, default=None
+            Called with the job's `progress` each time it changes 
+            while the job runs (e.g. when the search on a store 
+            completes).
+
         Returns
         -------
         Event
@@ -174,17 +269,20 @@ class RESTClient:
             If no job identifier is returned after submitting the event.
 
         TimeoutError
-            If the job does not complete within the specified timeout.
+            If the job does not complete within the specified timeout. 
+            The job is cancelled on the backend.
 
         requests.HTTPError
             If any HTTP request fails.
 
         Notes
         -----
-        The method implements a polling mechanism:
+        The method implements a long-polling mechanism:
 
         - Submits the event.
-        - Periodically checks job status.
+        - Requests the job status, which the backend returns when 
+        the job settles or its progress changes, reporting 
+        progress updates to `on_progress`.
         - Deserializes the result into an `Event` instance using a
         Pydantic `TypeAdapter`.
         - Returns an `ErrorEvent` if validation fails.
@@ -199,33 +297,207 @@ class RESTClient:
             )
         
         deadline: float = time.time() + timeout
+        last_progress: dict[str, Any] | None = None
 
         while time.time() < deadline:
-            job_data: dict[str, Any] = self.get_job(event_id)
+            job_data: dict[str, Any] = self.get_job(
+                event_id,
+                wait = max(0.0, min(wait, deadline - time.time())),
+                progress = on_progress is not None
+            )
             status: str = job_data.get("status", "FAILED")
+            progress: dict[str, Any] | None = job_data.get("progress")
 
-            if status in ("COMPLETED", "FAILED"):
-                result_data: dict[str, Any] = job_data.get(
-                    "result", 
-                    {}
-                )
+            if on_progress and progress and progress != last_progress:
+                last_progress = progress
+                on_progress(progress)
 
-                try:
-                    return self.__event_adapter.validate_python(
-                        result_data
-                    )
-                
-                except Exception as e:
-                    error_msg: str = job_data.get("error") or str(e)
-                    return ErrorEvent(
-                        message = error_msg,
-                        metadata = (
-                            getattr(event, "metadata", None) 
-                            or 
-                            None
-                        )
-                    )
-                
-            time.sleep(poll_interval)
+            if status in TERMINAL_STATUSES:
+                return self.__job_result(event, job_data)
             
-        raise TimeoutError(f"Timeout waiting for job {event_id}")
\ No newline at end of file
+        self.cancel_job(event_id)
+
+        raise TimeoutError(f"Timeout waiting for job {event_id}")
+
+
+    def stream_job(
+            self,
+            event_id: str,
+            timeout: float = 120.0
+        ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Stream the events of a job until it completes or fails.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the job returned by `send_event`.
+
+        timeout : float, default=120.0
+            Maximum time (in seconds) to wait for the next event.
+
+        Yields
+        ------
+        tuple[str, dict[str, Any]]
+            The type (`"snapshot"`, `"status"`, `"search"`, 
+            `"store"` or `"token"`) and the data of each event.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the HTTP request fails.
+        """
+
+        with requests.get(
+            url = f"{self.base_url}/event/{event_id}/stream",
+            stream = True,
+            timeout = timeout
+        ) as response:
+            response.raise_for_status()
+
+            kind: str = "message"
+
+            for line in response.iter_lines(decode_unicode = True):
+                if line.startswith("event:"):
+                    kind = line[6:].strip()
+
+                elif line.startswith("data:"):
+                    yield kind, json.loads(line[5:])
+
+                    kind = "message"
+
+
+    def send_and_stream(
+            self,
+            event: Event,
+            timeout: float = 120.0,
+            on_progress: Callable[[dict[str, Any]], None] | None = None,
+            on_token: Callable[[str], None] | None = None
+        ) -> Event:
+        """
+        Send an event and follow its job through the event stream 
+        until it completes.
+
+        Parameters
+        ----------
+        event : Event
+            The event to be sent to the backend.
+
+        timeout : float, default=120.0
+            Maximum time (in seconds) to wait for the job.
+
+        on_progress : callable or None, default=None
+            Called with the job's progress, in the same shape as 
+            the `progress` of `get_job`, each time a store 
+            completes.
+
+        on_token : callable or None, default=None
+            Called with the text written so far by the agent each 
+            time it writes a new piece of it.
+
+        Returns
+        -------
+        Event
+            The resulting event returned by the backend. If 
+            deserialization fails or the backend reports an 
+            error, an `ErrorEvent` is returned.
+
+        Raises
+        ------
+        RuntimeError
+            If no job identifier is returned after submitting the event.
+
+        TimeoutError
+            If the job does not complete within the specified timeout. 
+            The job is cancelled on the backend.
+
+        requests.HTTPError
+            If any HTTP request fails.
+        """
+
+        event_id: str | None = self.send_event(event)
+
+        if not event_id:
+            raise RuntimeError(
+                f"Backend did not return a job_id for event of type "
+                f"{type(event).__name__}."
+            )
+
+        deadline: float = time.time() + timeout
+        progress: dict[str, Any] = {
+            "stores_total": 0,
+            "stores_done": 0,
+            "stores": [],
+            "records": []
+        }
+        answer: str = ""
+
+        for kind, data in self.stream_job(event_id, timeout):
+            if time.time() > deadline:
+                break
+
+            if kind == "snapshot" and data.get("progress"):
+                progress = data["progress"]
+
+            elif kind == "search":
+                progress["stores_total"] = data["stores_total"]
+
+            elif kind == "store":
+                progress["stores_total"] = data["stores_total"]
+                progress["stores_done"] = data["stores_done"]
+                progress["stores"].append({
+                    key: data[key] 
+                    for key in ("store", "results", "elapsed_ms", "completed_at")
+                })
+                progress["records"].extend(data["records"])
+
+            elif kind == "token":
+                answer += data["text"]
+
+                if on_token:
+                    on_token(answer)
+
+                continue
+
+            elif (
+                kind == "status" 
+                and 
+                data.get("status") in TERMINAL_STATUSES
+            ):
+                return self.__job_result(event, data)
+
+            else:
+                continue
+
+            if on_progress:
+                on_progress(progress)
+
+        self.cancel_job(event_id)
+
+        raise TimeoutError(f"Timeout waiting for job {event_id}")
+
+
+    def __job_result(
+            self,
+            event: Event,
+            job_data: dict[str, Any]
+        ) -> Event:
+        """
+        Deserialize the result of a finished job.
+        """
+
+        result_data: dict[str, Any] = job_data.get("result") or {}
+
+        try:
+            return self.__event_adapter.validate_python(result_data)
+
+        except Exception as e:
+            error_msg: str = job_data.get("error") or str(e)
+            return ErrorEvent(
+                message = error_msg,
+                metadata = (
+                    getattr(event, "metadata", None) 
+                    or 
+                    None
+                )
+            )
\ No newline at end of file
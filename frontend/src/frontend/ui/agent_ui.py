@@ -170,6 +170,45 @@ def __next_phase(
             return "result"
 
 
+def progress_text(
+        progress: dict[str, Any]
+    ) -> str:
+    """
+    Describe the partial results of a running chat job.
+
+    Parameters
+    ----------
+    progress : dict[str, Any]
+        The `progress` of the job, with the searched stores and 
+        the records found so far.
+
+    Returns
+    -------
+    str
+        Markdown text with the number of stores searched and the 
+        products already found.
+    """
+
+    lines: list[str] = [
+        "Searching... {} of {} store(s) done.".format(
+            progress.get("stores_done", 0),
+            progress.get("stores_total", 0)
+        )
+    ]
+
+    for record in progress.get("records", []):
+        if record.get("type") == "quote":
+            lines.append(
+                "- **{}**: {} — {}".format(
+                    record["provider"].upper(),
+                    record["title"],
+                    record["price"]
+                )
+            )
+
+    return "\n".join(lines)
+
+
 def stream_data(
         text: str,
         placeholder: DeltaGenerator
@@ -817,9 +856,15 @@ if prompt:
         placeholder.markdown("Thinking...")
 
         try:
-            result: Event = st.session_state.rest_client.send_and_wait(
+            result: Event = st.session_state.rest_client.send_and_stream(
                 event,
-                timeout = timeout
+                timeout = timeout,
+                on_progress = lambda progress: placeholder.markdown(
+                    progress_text(progress)
+                ),
+                on_token = lambda answer: placeholder.markdown(
+                    answer + "▌"
+                )
             )
 
             process_result(result)
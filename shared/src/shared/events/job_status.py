@@ -20,7 +20,7 @@ class JobStatusEvent(BaseModel):
 
     status : JobStatus, default=JobStatus.PENDING
         Current status of the job. Can be one of `PENDING`,
-        `RUNNING`, `COMPLETED`, or `FAILED`.
+        `RUNNING`, `COMPLETED`, `FAILED` or `CANCELLED`.
     
     Notes
     -----
@@ -16,7 +16,14 @@ class EventEnvelope(BaseModel):
     event : Event
         The event object being sent, must be an instance of a 
         subclass of Event.
+
+    idempotency_key : str | None
+        Optional key identifying the submission. Envelopes sent 
+        again with the same key (e.g. retries after a network 
+        error) return the job created for the first one instead 
+        of creating a new job.
     """
 
     client_id: str
-    event: Event
\ No newline at end of file
+    event: Event
+    idempotency_key: str | None = None
\ No newline at end of file
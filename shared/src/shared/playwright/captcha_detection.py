@@ -78,5 +78,5 @@ async def detect_captcha(
         else:
             return True
 
-    except: 
+    except Exception: 
         return True
\ No newline at end of file
@@ -170,7 +170,9 @@ async def close_page_resources(
     Close Playwright resources associated with a page.
 
     This includes the page itself, its browser context, and
-    the underlying browser. Errors during cleanup are ignored.
+    the underlying browser. Each resource is closed even if 
+    closing the previous one failed; errors during cleanup are 
+    ignored, cancellation is not.
 
     Parameters
     ----------
@@ -178,16 +180,18 @@ async def close_page_resources(
         The Playwright page to close.
     """
 
-    try:
-        context: BrowserContext = page.context
-        browser: Browser | None = context.browser
+    context: BrowserContext = page.context
+    browser: Browser | None = context.browser
 
-        await page.close()
-        await context.close()
-        await browser.close() if browser else None
+    for resource in (page, context, browser):
+        if resource is None:
+            continue
+
+        try:
+            await resource.close()
 
-    except:
-        pass
+        except Exception:
+            pass
 
 
 async def close_popups(
@@ -253,7 +257,7 @@ async def close_popups(
             ):
                 await accept_cookie.click()
                 
-        except:
+        except Exception:
             continue
 
     await page.keyboard.press("Escape")
\ No newline at end of file
@@ -29,6 +29,11 @@ class BaseProvider:
         on specific text. If `None`, availability is determined 
         only via CSS classes.
 
+    cache_ttl : int | None
+        Seconds a quote from this provider stays fresh in the 
+        backend result cache. If `None`, the backend default 
+        applies.
+
     login_required : bool
         Indicates whether authentication is required to browse 
         the provider's site.
@@ -41,6 +46,12 @@ class BaseProvider:
         Regex to match logout-related visible text elements. 
         `None` if not needed.
 
+    max_concurrent_pages : int | None
+        Maximum pages open on the provider's site at the same time, 
+        across all jobs of the backend. The backend lowers it while 
+        the site fails or slows down. If `None`, the backend 
+        default applies.
+
     name : str
         The provider's display name.
 
@@ -50,6 +61,11 @@ class BaseProvider:
     price_classes : list[str]
         CSS classes used to extract product price.
 
+    requests_per_second : float | None
+        Maximum requests per second sent to the provider's site, 
+        across all jobs of the backend. If `None`, the backend 
+        default applies.
+
     product_link_selectors : list[str]
         HTML selectors to locate product links or parent containers.
 
@@ -92,15 +108,21 @@ class BaseProvider:
         result_container: list[str],
         search_texts: Pattern[str],
         title_classes: list[str],
+        cache_ttl: int | None = None,
+        max_concurrent_pages: int | None = None,
+        requests_per_second: float | None = None
     ):
         self.availability_classes = availability_classes
         self.availability_texts = availability_texts
+        self.cache_ttl = cache_ttl
         self.login_required = login_required
         self.logout_selectors = logout_selectors
         self.logout_texts = logout_texts
+        self.max_concurrent_pages = max_concurrent_pages
         self.name = provider_name
         self.popup_selectors = popup_selectors
         self.price_classes = price_classes
+        self.requests_per_second = requests_per_second
         self.product_link_selectors = product_link_selectors
         self.result_container = result_container
         self.search_texts = search_texts
@@ -223,7 +245,7 @@ class BaseProvider:
                 else:
                     return True
             
-        except:
+        except Exception:
             pass
 
         return False
@@ -0,0 +1,121 @@
+import re
+from urllib.parse import urlparse
+
+from shared.provider.base_provider import BaseProvider
+from shared.shared_utils.common.dictionaries import ProviderDefinition
+
+
+def normalize_domain(
+        url: str
+    ) -> str:
+    """
+    Reduce a store URL (or bare host) to a comparable domain.
+
+    The scheme, path, port and a leading `www.` are removed and
+    the result is lowercased, so that `https://www.Store.it/x`
+    and `store.it` map to the same key.
+
+    Parameters
+    ----------
+    url : str
+        URL or host name of the store.
+
+    Returns
+    -------
+    str
+        The normalized domain, or an empty string if none
+        can be extracted.
+    """
+
+    candidate: str = url.strip().lower()
+
+    if "://" not in candidate:
+        candidate = f"https://{candidate}"
+
+    host: str = urlparse(candidate).hostname or ""
+
+    return host.removeprefix("www.")
+
+
+class LearnedProvider(BaseProvider):
+    """
+    Provider built from a `ProviderDefinition` instead of a
+    hand-written module.
+
+    Learned providers never require login and have no auto-login
+    implementation: they describe public search pages whose
+    selectors were inferred from previous computer-use runs.
+
+    Parameters
+    ----------
+    definition : ProviderDefinition
+        Serializable description of the provider.
+
+    Attributes
+    ----------
+    domain : str
+        Normalized domain the provider is registered under.
+    """
+
+
+    def __init__(
+            self,
+            definition: ProviderDefinition
+        ):
+
+        availability_texts: str | None = definition.get(
+            "availability_texts"
+        )
+
+        super().__init__(
+            availability_classes = definition["availability_classes"],
+            availability_texts = (
+                re.compile(availability_texts, re.IGNORECASE)
+                if availability_texts
+                else None
+            ),
+            login_required = False,
+            logout_selectors = None,
+            logout_texts = None,
+            popup_selectors = definition.get("popup_selectors", []),
+            price_classes = definition["price_classes"],
+            product_link_selectors = definition["product_link_selectors"],
+            provider_name = definition["provider_name"],
+            provider_url = definition["provider_url"],
+            result_container = definition["result_container"],
+            search_texts = re.compile(
+                definition["search_texts"],
+                re.IGNORECASE
+            ),
+            title_classes = definition["title_classes"]
+        )
+
+        self.domain = normalize_domain(self.url)
+
+
+    def to_definition(self) -> ProviderDefinition:
+        """
+        Serialize the provider back into a `ProviderDefinition`.
+
+        Returns
+        -------
+        ProviderDefinition
+            Plain-data description of this provider.
+        """
+
+        return ProviderDefinition(
+            availability_classes = self.availability_classes,
+            availability_texts = (
+                self.availability_texts.pattern
+                if self.availability_texts
+                else None
+            ),
+            popup_selectors = self.popup_selectors,
+            price_classes = self.price_classes,
+            product_link_selectors = self.product_link_selectors,
+            provider_name = self.name,
+            provider_url = self.url,
+            result_container = self.result_container,
+            search_texts = self.search_texts.pattern,
+            title_classes = self.title_classes
+        )
@@ -77,7 +77,7 @@ class GruppoComet(BaseProvider):
 
             return await self.is_logged_in(page)
 
-        except:
+        except Exception:
             return False
         
 provider: BaseProvider = GruppoComet()
\ No newline at end of file
@@ -7,10 +7,17 @@ import types
 from shared.exceptions import ProviderNotSupportedException
 from shared.provider import providers as providers_pkg
 from shared.provider.base_provider import BaseProvider
+from shared.provider.learned_provider import (
+    LearnedProvider,
+    normalize_domain
+)
 
 
 PROVIDER_REGISTRY: dict[str, BaseProvider] = {}
 
+# learned providers are keyed by domain, not by name
+LEARNED_PROVIDER_REGISTRY: dict[str, LearnedProvider] = {}
+
 
 def register_provider(
         provider_instance: BaseProvider
@@ -64,6 +71,40 @@ def autodiscover_providers() -> None:
 autodiscover_providers()
 
 
+def register_learned_provider(
+        provider_instance: LearnedProvider
+    ) -> None:
+    """
+    Register (or replace) a learned provider for its domain.
+
+    Unlike `register_provider`, registering a learned provider 
+    for an already known domain replaces the previous definition,
+    since learned definitions are refined over time.
+
+    Parameters
+    ----------
+    provider_instance : LearnedProvider
+        The learned provider to register.
+    """
+
+    LEARNED_PROVIDER_REGISTRY[provider_instance.domain] = provider_instance
+
+
+def unregister_learned_provider(
+        url: str
+    ) -> None:
+    """
+    Remove the learned provider registered for a store URL, if any.
+
+    Parameters
+    ----------
+    url : str
+        URL or domain of the store.
+    """
+
+    LEARNED_PROVIDER_REGISTRY.pop(normalize_domain(url), None)
+
+
 def all_providers() -> list[BaseProvider]:
     """
     Return a list of all registered provider instances.
@@ -132,7 +173,9 @@ def get_provider(provider_name: str) -> BaseProvider:
     Retrieve a provider instance from the registry by name.
 
     The lookup is case-insensitive and allows optional spaces 
-    between words derived from camel case names.
+    between words derived from camel case names. If no hand-written 
+    provider matches, the name is treated as a store URL and looked 
+    up among the learned providers.
 
     Parameters
     ----------
@@ -157,5 +200,12 @@ def get_provider(provider_name: str) -> BaseProvider:
         
         if re.fullmatch(pattern, normalized_input, re.IGNORECASE):
             return provider_instance
+        
+    learned: LearnedProvider | None = LEARNED_PROVIDER_REGISTRY.get(
+        normalize_domain(provider_name)
+    )
+
+    if learned:
+        return learned
     
     raise ProviderNotSupportedException(provider_name)
\ No newline at end of file
@@ -1,3 +1,6 @@
 
-from shared.shared_utils.common.dictionaries import AvailabilityDict
+from shared.shared_utils.common.dictionaries import (
+    AvailabilityDict,
+    ProviderDefinition
+)
 from shared.shared_utils.common.enums import JobStatus, LoginStatus
\ No newline at end of file
@@ -17,4 +17,59 @@ class AvailabilityDict(TypedDict):
     """
 
     available: list[str]
-    not_available: list[str]
\ No newline at end of file
+    not_available: list[str]
+
+class ProviderDefinition(TypedDict):
+    """
+    Serializable description of a scripted provider.
+
+    It mirrors the arguments of `BaseProvider.__init__` that can be 
+    expressed as plain data, so that a provider inferred at runtime 
+    can be stored, reloaded and instantiated without writing a new 
+    provider module.
+
+    Attributes
+    ----------
+    availability_classes : AvailabilityDict
+        CSS selectors used to detect product availability.
+
+    availability_texts : str or None
+        Regular expression source used to normalize availability 
+        texts, or `None`.
+
+    popup_selectors : list[str]
+        CSS selectors for popups to be closed.
+
+    price_classes : list[str]
+        CSS selectors used to extract the product price.
+
+    product_link_selectors : list[str]
+        CSS selectors used to locate the product link.
+
+    provider_name : str
+        Display name of the provider.
+
+    provider_url : str
+        URL of the provider's website.
+
+    result_container : list[str]
+        CSS selectors identifying a single search result.
+
+    search_texts : str
+        Regular expression source matching the accessible name 
+        of the search input.
+
+    title_classes : list[str]
+        CSS selectors of the title element within a search result.
+    """
+
+    availability_classes: AvailabilityDict
+    availability_texts: str | None
+    popup_selectors: list[str]
+    price_classes: list[str]
+    product_link_selectors: list[str]
+    provider_name: str
+    provider_url: str
+    result_container: list[str]
+    search_texts: str
+    title_classes: list[str]
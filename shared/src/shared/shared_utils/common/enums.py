@@ -19,12 +19,16 @@ class JobStatus(str, Enum):
 
     FAILED : str
         The job has finished with an error.
+
+    CANCELLED : str
+        The job was cancelled by the client before finishing.
     """
     
     PENDING = "PENDING"
     RUNNING = "RUNNING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
 
 
 class LoginStatus(str, Enum):